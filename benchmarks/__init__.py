@@ -0,0 +1,12 @@
+"""
+Offline benchmarks for the heaviest dipper parsers.
+
+Synthetic inputs shaped like the real downloads are generated
+(see generators.py) and each parser is driven against them in a fresh
+process, recording rows/sec, triples/sec, peak RSS and output size.
+
+    python3 -m benchmarks.run_benchmarks run --output out/benchmarks.json
+    python3 -m benchmarks.run_benchmarks compare \\
+        out/benchmarks.json benchmarks/baseline.json
+
+"""
@@ -0,0 +1,792 @@
+"""
+Deterministic synthetic inputs for the parser benchmarks.
+
+Every generator writes files shaped like the real downloads
+(same names, columns, headers and compression) into a raw directory,
+using a random.Random seeded by the caller, so that two runs with the
+same size and seed produce byte identical inputs.
+Each returns the number of data rows (records) it wrote;
+that is the denominator of the rows/sec figure.
+
+"""
+import os
+import io
+import csv
+import gzip
+import json
+import random
+import tarfile
+import zipfile
+
+from dipper.utils.ResolverCache import ResolverCache
+
+CHROMOSOMES = [str(c) for c in range(1, 20)] + ['X', 'Y']
+
+
+def _symbol(rng, prefix=''):
+    """
+    A gene symbol like thing, e.g. 'Abc12'
+    :param rng: random.Random
+    :param prefix:
+    :return: str
+    """
+    letters = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz')
+                      for _ in range(rng.randint(2, 4)))
+    return prefix + letters.capitalize() + str(rng.randint(1, 99))
+
+
+def _words(rng, count):
+    vocabulary = [
+        'protein', 'kinase', 'receptor', 'domain', 'containing', 'family',
+        'member', 'binding', 'factor', 'transcription', 'channel',
+        'subunit', 'associated', 'regulator', 'homolog', 'like']
+    return ' '.join(rng.choice(vocabulary) for _ in range(count))
+
+
+def _uniprot(rng):
+    """
+    An accession matching the UniProtKB pattern, e.g. 'Q8VBT6'
+    :param rng:
+    :return: str
+    """
+    alnum = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    return ''.join((
+        rng.choice('OPQ'), str(rng.randint(0, 9)),
+        ''.join(rng.choice(alnum) for _ in range(3)), str(rng.randint(0, 9))))
+
+
+def _write_tsv(path, rows, header=None, compress=False):
+    if compress:
+        handle = gzip.open(path, 'wt', encoding='utf-8', newline='')
+    else:
+        handle = open(path, 'w', encoding='utf-8', newline='')
+    with handle:
+        if header is not None:
+            handle.write('\t'.join(header) + '\n')
+        for row in rows:
+            handle.write('\t'.join(row) + '\n')
+    return
+
+
+def mgi_views(rawdir, size, seed=0):
+    """
+    The MGI database views used by the marker, allele and genotype passes.
+    One marker and one allele per record, one genotype for every two.
+    :param rawdir: directory to write into
+    :param size: number of markers
+    :param seed:
+    :return: int number of rows written over all the views
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+    markers = []
+    for marker_key in range(1, size + 1):
+        markers.append((
+            str(marker_key), 'MGI:' + str(1000000 + marker_key),
+            _symbol(rng)))
+
+    acc_rows = [
+        (mgiid, 'MGI:', '1', key, '1', '1') for (key, mgiid, sym) in markers]
+    _write_tsv(
+        os.path.join(rawdir, 'mrk_acc_view'), acc_rows,
+        ('accid', 'prefix_part', '_logicaldb_key', '_object_key',
+         'preferred', '_organism_key'))
+
+    marker_rows = []
+    for (key, mgiid, sym) in markers:
+        marker_type = rng.choice(
+            ['Gene', 'Gene', 'Gene', 'Pseudogene', 'Complex/Cluster/Region'])
+        marker_rows.append((
+            key, '1', '1', sym, _words(rng, 3), 'Mus musculus/domesticus',
+            marker_type))
+    _write_tsv(
+        os.path.join(rawdir, 'mrk_marker_view'), marker_rows,
+        ('_marker_key', '_organism_key', '_marker_status_key', 'symbol',
+         'name', 'latinname', 'markertype'))
+
+    strains = [
+        (str(strain_key), 'MGI:' + str(4000000 + strain_key),
+         'C57BL/6J-' + str(strain_key))
+        for strain_key in range(1, max(2, size // 50) + 1)]
+
+    alleles = []
+    summary_rows = []
+    allele_rows = []
+    for (key, mgiid, sym) in markers:
+        allele_key = key
+        allele_id = 'MGI:' + str(2000000 + int(key))
+        wildtype = rng.random() < 0.05
+        if wildtype:
+            allele_sym = sym + '<+>'
+        else:
+            allele_sym = sym + '<tm' + str(rng.randint(1, 5)) + \
+                rng.choice(['Lex', 'Mbp', 'Wtsi', 'Jae']) + '>'
+        alleles.append((allele_key, allele_id, allele_sym))
+        summary_rows.append((
+            allele_key, '1', allele_id, 'targeted mutation, ' + sym,
+            allele_sym))
+        allele_rows.append((
+            allele_key, key, rng.choice(strains)[0], allele_sym,
+            'targeted mutation ' + _words(rng, 2), '1' if wildtype else '0'))
+    _write_tsv(
+        os.path.join(rawdir, 'all_summary_view'), summary_rows,
+        ('_object_key', 'preferred', 'accid', 'description', 'short_description'))
+    _write_tsv(
+        os.path.join(rawdir, 'all_allele_view'), allele_rows,
+        ('_allele_key', '_marker_key', '_strain_key', 'symbol', 'name',
+         'iswildtype'))
+
+    genotype_summary_rows = []
+    genotype_rows = []
+    pair_rows = []
+    pair_key = 0
+    for genotype_key in range(1, size // 2 + 1):
+        genotype_id = 'MGI:' + str(3000000 + genotype_key)
+        strain = rng.choice(strains)
+        parts = rng.sample(alleles, min(len(alleles), rng.randint(1, 3)))
+        for (allele_key, allele_id, allele_sym) in parts:
+            state = rng.choice(
+                ['Homozygous', 'Heterozygous', 'Hemizygous X-linked',
+                 'Indeterminate'])
+            if state == 'Homozygous':
+                allele_key_2, allele_sym_2 = allele_key, allele_sym
+            else:
+                allele_key_2, allele_sym_2 = '', ''
+            pair_key += 1
+            pair_rows.append((
+                str(pair_key), str(genotype_key), allele_key, allele_key_2,
+                allele_sym, allele_sym_2, state))
+            genotype_summary_rows.append((
+                str(genotype_key), '1', genotype_id, 'Homozygous',
+                allele_sym + ',' + (allele_sym_2 or allele_sym)))
+        genotype_rows.append(
+            (str(genotype_key), strain[0], strain[2], genotype_id))
+    _write_tsv(
+        os.path.join(rawdir, 'gxd_genotype_summary_view'),
+        genotype_summary_rows,
+        ('_object_key', 'preferred', 'mgiid', 'subtype', 'short_description'))
+    _write_tsv(
+        os.path.join(rawdir, 'gxd_genotype_view'), genotype_rows,
+        ('_genotype_key', '_strain_key', 'strain', 'mgiid'))
+    _write_tsv(
+        os.path.join(rawdir, 'gxd_allelepair_view'), pair_rows,
+        ('_allelepair_key', '_genotype_key', '_allele_key_1',
+         '_allele_key_2', 'allele1', 'allele2', 'allelestate'))
+
+    return len(acc_rows) + len(marker_rows) + len(summary_rows) + \
+        len(allele_rows) + len(genotype_summary_rows) + len(genotype_rows) + \
+        len(pair_rows)
+
+
+def zfin_files(rawdir, size, seed=0):
+    """
+    The ZFIN flat files for genes, features (alleles),
+    wildtype fish and the intrinsic genotypes.
+    :param rawdir: directory to write into
+    :param size: number of genes
+    :param seed:
+    :return: int number of rows written
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+
+    genes = []
+    for i in range(1, size + 1):
+        genes.append((
+            'ZDB-GENE-0{:05d}-{}'.format(i, i % 7 + 1),
+            'SO:0000704', _symbol(rng).lower(), str(30000000 + i), ''))
+    _write_tsv(os.path.join(rawdir, 'gene.txt'), genes)
+
+    allele_types = [
+        'point_mutation', 'deletion', 'insertion', 'indel',
+        'transgenic_insertion', 'unspecified']
+    features = []
+    for i, gene in enumerate(genes, 1):
+        abbreviation = gene[2] + '-' + 'sa' + str(i)
+        construct_id = construct_name = construct_so = ''
+        allele_type = rng.choice(allele_types)
+        if allele_type == 'transgenic_insertion':
+            construct_id = 'ZDB-TGCONSTRCT-0{:05d}-1'.format(i)
+            construct_name = 'Tg(' + gene[2] + ':EGFP)'
+            construct_so = 'SO:0000796'
+        features.append((
+            'ZDB-ALT-0{:05d}-1'.format(i), 'SO:1000008', abbreviation,
+            abbreviation, allele_type, 'ENU', 'adult males', construct_id,
+            construct_name, construct_so, '', '', ''))
+    _write_tsv(os.path.join(rawdir, 'features.txt'), features)
+
+    wildtypes = []
+    for i in range(1, max(2, size // 100) + 1):
+        wildtypes.append((
+            'ZDB-FISH-1{:05d}-1'.format(i), 'WT' + str(i), 'WT' + str(i),
+            'ZDB-GENO-9{:05d}-1'.format(i), ''))
+    _write_tsv(os.path.join(rawdir, 'wildtypes.txt'), wildtypes)
+
+    zygosities = ['homozygous', 'heterozygous', 'unknown', 'complex',
+                  'hemizygous']
+    genotype_rows = []
+    for i in range(1, size // 2 + 1):
+        genotype_num = 'ZDB-GENO-1{:05d}-1'.format(i)
+        parts = rng.sample(range(len(genes)), min(len(genes), rng.randint(1, 3)))
+        names = []
+        for j in parts:
+            names.append(features[j][2] + '/' + features[j][2])
+        name = '; '.join(names)
+        for j in parts:
+            gene = genes[j]
+            feature = features[j]
+            genotype_rows.append((
+                genotype_num, name, name, feature[0], feature[3], feature[2],
+                feature[4], feature[4].replace('_', ' '), gene[2], gene[0],
+                rng.choice(zygosities), feature[8], feature[7], ''))
+    _write_tsv(os.path.join(rawdir, 'genotype_features.txt'), genotype_rows)
+
+    return len(genes) + len(features) + len(wildtypes) + len(genotype_rows)
+
+
+def flybase_files(rawdir, size, seed=0):
+    """
+    The chado tables FlyBase builds its lookups from: dbxref, cvterm,
+    organism, organism_dbxref, feature and feature_dbxref.
+    The NCBI taxa of the organisms are put in the resolver's cache,
+    as a previous run would have left them, so none are fetched.
+    :param rawdir: directory to write into
+    :param size: number of features
+    :param seed:
+    :return: int number of rows written
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+
+    dbxrefs = []
+
+    def dbxref(db_id, accession, url=''):
+        dbxrefs.append((
+            str(100000 + len(dbxrefs)), str(db_id), accession, '', '', url))
+        return dbxrefs[-1][0]
+
+    organisms = [
+        ('1', 'Dmel', 'Drosophila', 'melanogaster', 'fruit fly', ''),
+        ('2', 'Comp', 'Computational', 'result', '', ''),
+        ('3', 'Dsim', 'Drosophila', 'simulans', '', '')]
+    _write_tsv(
+        os.path.join(rawdir, 'organism'), organisms,
+        ['organism_id', 'abbreviation', 'genus', 'species', 'common_name',
+         'comment'])
+    organism_dbxrefs = [
+        ('1', '1', dbxref(140, '7227'), 't'),
+        ('2', '3', dbxref(140, '7240'), 't')]
+    _write_tsv(
+        os.path.join(rawdir, 'organism_dbxref'), organism_dbxrefs,
+        ['organism_dbxref_id', 'organism_id', 'dbxref_id', 'is_current'])
+    ResolverCache(
+        os.path.join(os.path.dirname(rawdir), 'resolver_cache.db')).put_many(
+            'taxon', {'Drosophila melanogaster': '7227',
+                      'Drosophila simulans': '7240'})
+
+    # type_id: (SO accession, name, uniquename prefix)
+    types = {
+        '219': ('0000704', 'gene', 'FBgn'),
+        '604': ('0000336', 'RNAi_reagent', 'FBtr'),
+        '33': ('0001023', 'allele', 'FBal'),
+        '257': ('0000147', 'exon', 'CG'),
+        '1002': ('0001218', 'transgenic_insertion', 'FBti')}
+    cvterms = []
+    for (type_id, (accession, name, _)) in sorted(types.items()):
+        cvterms.append((
+            type_id, '6', '', dbxref(2, 'SO:' + accession), '0', '0', name))
+    _write_tsv(
+        os.path.join(rawdir, 'cvterm'), cvterms,
+        ['cvterm_id', 'cv_id', 'definition', 'dbxref_id', 'is_obsolete',
+         'is_relationshiptype', 'name'])
+
+    features = []
+    feature_dbxrefs = []
+    type_ids = list(types)
+    for i in range(1, size + 1):
+        feature_id = str(3000000 + i * 3)
+        type_id = rng.choice(type_ids)
+        uniquename = '{}{:07d}'.format(types[type_id][2], i)
+        name = _symbol(rng)
+        features.append((
+            feature_id, dbxref(4, uniquename), rng.choice('11132'), name,
+            uniquename, '', str(rng.randint(100, 9999)), '', type_id,
+            'f', '2017-04-01', '2017-04-01'))
+        feature_dbxrefs.append((
+            str(len(feature_dbxrefs) + 1), feature_id,
+            dbxref(180, str(30000000 + i)), rng.choice('ttttf')))
+        if rng.random() < 0.3:
+            feature_dbxrefs.append((
+                str(len(feature_dbxrefs) + 1), feature_id,
+                dbxref(0, '', 'http://flybase.org/reports/' + uniquename),
+                't'))
+    _write_tsv(
+        os.path.join(rawdir, 'feature'), features,
+        ['feature_id', 'dbxref_id', 'organism_id', 'name', 'uniquename',
+         'residues', 'seqlen', 'md5checksum', 'type_id', 'is_analysis',
+         'timeaccessioned', 'timelastmodified'])
+    _write_tsv(
+        os.path.join(rawdir, 'feature_dbxref'), feature_dbxrefs,
+        ['feature_dbxref_id', 'feature_id', 'dbxref_id', 'is_current'])
+    _write_tsv(
+        os.path.join(rawdir, 'dbxref'), dbxrefs,
+        ['dbxref_id', 'db_id', 'accession', 'version', 'description', 'url'])
+
+    return len(organisms) + len(organism_dbxrefs) + len(cvterms) + \
+        len(features) + len(feature_dbxrefs) + len(dbxrefs)
+
+
+def ncbigene_files(rawdir, size, seed=0, other_taxa=3):
+    """
+    gene_info.gz, gene_history.gz and gene2pubmed.gz.
+    By default half of the genes belong to taxa outside of the default
+    filter (human, mouse, fish); with more other_taxa, more of them do,
+    as in the real all-taxa file.
+    :param rawdir: directory to write into
+    :param size: number of gene_info rows
+    :param seed:
+    :param other_taxa: number of taxa besides human, mouse and fish
+    :return: int number of rows written
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+    taxa = ['9606', '10090', '7955', '10116', '7227', '559292']
+    # with made up taxa past the real ones
+    taxa = taxa[:3 + other_taxa] + [
+        str(1000000 + n) for n in range(other_taxa - 3)]
+    gene_types = [
+        'protein-coding', 'protein-coding', 'protein-coding', 'ncRNA',
+        'pseudo', 'biological-region']
+
+    info_rows = []
+    for gene_num in range(1, size + 1):
+        tax_num = rng.choice(taxa)
+        symbol = _symbol(rng)
+        chrom = rng.choice(CHROMOSOMES)
+        if tax_num == '9606':
+            xrefs = 'HGNC:HGNC:{0}|Ensembl:ENSG{1:011d}|HPRD:{0:05d}'.format(
+                gene_num, gene_num)
+            map_loc = chrom + rng.choice('pq') + str(rng.randint(11, 36)) + \
+                '.' + str(rng.randint(1, 3))
+        elif tax_num == '10090':
+            xrefs = 'MGI:MGI:{0}|Ensembl:ENSMUSG{1:011d}'.format(
+                1000000 + gene_num, gene_num)
+            map_loc = chrom + ' ' + rng.choice('ABCDEFG') + \
+                str(rng.randint(1, 3)) + '|' + chrom + ' ' + \
+                str(rng.randint(1, 90)) + '.' + str(rng.randint(1, 99)) + ' cM'
+        elif tax_num == '7955':
+            xrefs = 'ZFIN:ZDB-GENE-0{:05d}-1'.format(gene_num)
+            map_loc = '-'
+        else:
+            xrefs = '-'
+            map_loc = '-'
+        info_rows.append((
+            tax_num, str(gene_num), symbol, '-',
+            '|'.join(_symbol(rng) for _ in range(rng.randint(0, 3))) or '-',
+            xrefs, chrom, map_loc, _words(rng, 4), rng.choice(gene_types),
+            symbol, _words(rng, 4), 'O', _words(rng, 2), '20170425', '-'))
+    _write_tsv(
+        os.path.join(rawdir, 'gene_info.gz'), info_rows,
+        ('#tax_id', 'GeneID', 'Symbol', 'LocusTag', 'Synonyms', 'dbXrefs',
+         'chromosome', 'map_location', 'description', 'type_of_gene',
+         'Symbol_from_nomenclature_authority',
+         'Full_name_from_nomenclature_authority', 'Nomenclature_status',
+         'Other_designations', 'Modification_date', 'Feature_type'),
+        compress=True)
+
+    history_rows = []
+    for row in rng.sample(info_rows, len(info_rows) // 10):
+        history_rows.append((
+            row[0], row[1], str(size + 1 + len(history_rows)),
+            'LOC' + str(size + 1 + len(history_rows)), '20150101'))
+    _write_tsv(
+        os.path.join(rawdir, 'gene_history.gz'), history_rows,
+        ('#tax_id', 'GeneID', 'Discontinued_GeneID', 'Discontinued_Symbol',
+         'Discontinue_Date'), compress=True)
+
+    pubmed_rows = []
+    for row in info_rows:
+        for _ in range(rng.randint(0, 3)):
+            pubmed_rows.append(
+                (row[0], row[1], str(rng.randint(1000000, 29000000))))
+    _write_tsv(
+        os.path.join(rawdir, 'gene2pubmed.gz'), pubmed_rows,
+        ('#tax_id', 'GeneID', 'PubMed_ID'), compress=True)
+
+    return len(info_rows) + len(history_rows) + len(pubmed_rows)
+
+
+def go_files(rawdir, size, seed=0):
+    """
+    A mouse GAF (gene_association.mgi.gz) and the UniProt idmapping
+    used to map the UniProtKB annotated rows to genes.
+    :param rawdir: directory to write into
+    :param size: number of annotation rows
+    :param seed:
+    :return: int number of rows written
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+    evidence_codes = ['IDA', 'IMP', 'IEA', 'ISS', 'IPI', 'TAS', 'ND', 'IBA']
+    genes = [('MGI:' + str(1000000 + i), _symbol(rng))
+             for i in range(1, size // 4 + 2)]
+    proteins = {}
+
+    gaf_rows = []
+    for i in range(size):
+        aspect = rng.choice('PFC')
+        eco = rng.choice(evidence_codes)
+        with_or_from = ''
+        if eco == 'IMP' and rng.random() < 0.5:
+            with_or_from = 'MGI:MGI:' + str(2000000 + i)
+        if rng.random() < 0.2:
+            accession = _uniprot(rng)
+            proteins[accession] = str(rng.randint(10000, 300000))
+            db, gene_num, symbol = 'UniProtKB', accession, _symbol(rng)
+        else:
+            (gene_num, symbol) = rng.choice(genes)
+            db = 'MGI'
+        gaf_rows.append((
+            db, gene_num, symbol, rng.choice(['', '', '', 'NOT']),
+            'GO:{:07d}'.format(rng.randint(1, 90000)),
+            'MGI:MGI:{}|PMID:{}'.format(
+                rng.randint(1000000, 6000000), rng.randint(1000000, 29000000)),
+            eco, with_or_from, aspect, _words(rng, 3), '', 'protein',
+            'taxon:10090', '20170425', 'MGI', '', ''))
+    with gzip.open(os.path.join(rawdir, 'gene_association.mgi.gz'), 'wt',
+                   encoding='utf-8', newline='') as gaf:
+        gaf.write('!gaf-version: 2.1\n')
+        gaf.write('!generated by the dipper benchmarks\n')
+        for row in gaf_rows:
+            gaf.write('\t'.join(row) + '\n')
+
+    idmap_rows = []
+    for accession in sorted(proteins):
+        row = [''] * 22
+        row[0] = accession
+        row[1] = accession + '_MOUSE'
+        row[2] = proteins[accession]
+        row[12] = '10090'
+        idmap_rows.append(row)
+    for i in range(size // 2):
+        row = [''] * 22
+        row[0] = _uniprot(rng)
+        row[1] = row[0] + '_HUMAN'
+        row[2] = str(rng.randint(1, 100000))
+        row[12] = '9606'
+        idmap_rows.append(row)
+    _write_tsv(
+        os.path.join(rawdir, 'idmapping_selected.tab.gz'), idmap_rows,
+        compress=True)
+
+    return len(gaf_rows) + len(idmap_rows)
+
+
+PANTHER_SPECIES = {
+    'HUMAN': lambda rng, i: 'HGNC=' + str(i),
+    'MOUSE': lambda rng, i: 'MGI=MGI=' + str(1000000 + i),
+    'RAT': lambda rng, i: 'RGD=' + str(700000 + i),
+    'DANRE': lambda rng, i: 'ZFIN=ZDB-GENE-0{:05d}-1'.format(i),
+    'DROME': lambda rng, i: 'FlyBase=FBgn{:07d}'.format(i),
+    'CAEEL': lambda rng, i: 'WormBase=WBGene{:08d}'.format(i),
+    'CHICK': lambda rng, i: 'Ensembl=ENSGALG{:011d}'.format(i),
+    'YEAST': lambda rng, i: 'SGD=S{:09d}'.format(i),
+}
+
+
+def panther_files(rawdir, size, seed=0):
+    """
+    RefGenomeOrthologs.tar.gz and Orthologs_HCOP.tar.gz, each a tarball
+    of a single tab delimited file of pairwise calls like
+    HUMAN|HGNC=11477|UniProtKB=Q6GZX4  MOUSE|MGI=MGI=2176230|UniProtKB=Q8VBT6
+    LDO  Euarchontoglires  PTHR15964
+    :param rawdir: directory to write into
+    :param size: number of pairs in each of the two files
+    :param seed:
+    :return: int number of rows written
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+    species = sorted(PANTHER_SPECIES)
+    count = 0
+    for (tarname, member, pairs) in (
+            ('RefGenomeOrthologs.tar.gz', 'RefGenomeOrthologs', species),
+            ('Orthologs_HCOP.tar.gz', 'Orthologs_HCOP', ['HUMAN', 'MOUSE'])):
+        lines = []
+        for _ in range(size):
+            (sp_a, sp_b) = (rng.choice(pairs), rng.choice(pairs))
+            gene_a = PANTHER_SPECIES[sp_a](rng, rng.randint(1, size))
+            gene_b = PANTHER_SPECIES[sp_b](rng, rng.randint(1, size))
+            lines.append('\t'.join((
+                '|'.join((sp_a, gene_a, 'UniProtKB=' + _uniprot(rng))),
+                '|'.join((sp_b, gene_b, 'UniProtKB=' + _uniprot(rng))),
+                rng.choice(['LDO', 'O', 'O', 'P', 'X', 'LDX']),
+                rng.choice(['Euarchontoglires', 'Eumetazoa', 'Bilateria']),
+                'PTHR{:05d}'.format(rng.randint(10000, 24000)))))
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        info = tarfile.TarInfo(member)
+        info.size = len(data)
+        # fixed mtime so the tarball is reproducible
+        info.mtime = 1500000000
+        with tarfile.open(os.path.join(rawdir, tarname), 'w:gz') as mytar:
+            mytar.addfile(info, io.BytesIO(data))
+        count += len(lines)
+    return count
+
+
+def biogrid_files(rawdir, size, seed=0):
+    """
+    interactions.mitab.zip, a zip of a single PSI-MITAB 2.5 file
+    of pairwise gene interactions like
+    entrez gene/locuslink:6416|BIOGRID:112315  entrez gene/locuslink:2318|...
+    :param rawdir: directory to write into
+    :param size: number of interactions
+    :param seed:
+    :return: int number of rows written
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+    methods = [
+        'MI:0018"(two hybrid)', 'MI:0004"(affinity chromatography)',
+        'MI:0096"(pull down)', 'MI:0254"(genetic interference)',
+        'MI:0686"(unspecified method)']
+    types = [
+        'MI:0407"(direct interaction)', 'MI:0915"(physical association)',
+        'MI:0794"(synthetic genetic interaction defined by inequality)',
+        'MI:0403"(colocalization)']
+    lines = ['\t'.join((
+        '#ID Interactor A', 'ID Interactor B', 'Alt IDs Interactor A',
+        'Alt IDs Interactor B', 'Aliases Interactor A',
+        'Aliases Interactor B', 'Interaction Detection Method',
+        'Publication 1st Author', 'Publication Identifiers',
+        'Taxid Interactor A', 'Taxid Interactor B', 'Interaction Types',
+        'Source Database', 'Interaction Identifiers', 'Confidence Values'))]
+    for i in range(size):
+        taxa = []
+        interactors = []
+        for _ in range(2):
+            taxa.append(rng.choice(['9606', '9606', '10090', '7955', '7227']))
+            gene = rng.randint(1, 10 * size)
+            interactors.append(
+                'entrez gene/locuslink:{}|BIOGRID:{}'.format(
+                    gene, 100000 + gene))
+        lines.append('\t'.join((
+            interactors[0], interactors[1],
+            'entrez gene/locuslink:' + _symbol(rng),
+            'entrez gene/locuslink:' + _symbol(rng),
+            '-', '-',
+            'psi-mi:"' + rng.choice(methods),
+            '"{} (20{:02d})"'.format(_symbol(rng), rng.randint(0, 17)),
+            'pubmed:{}'.format(rng.randint(1000000, 29000000)),
+            'taxid:' + taxa[0], 'taxid:' + taxa[1],
+            'psi-mi:"' + rng.choice(types),
+            'psi-mi:"MI:0463"(biogrid)',
+            'biogrid:{}'.format(200000 + i), '-')))
+    data = ('\n'.join(lines) + '\n').encode('utf-8')
+    # fixed date so the zip is reproducible
+    info = zipfile.ZipInfo(
+        'BIOGRID-ALL-3.4.150.mitab.txt', date_time=(2017, 7, 14, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(
+            os.path.join(rawdir, 'interactions.mitab.zip'), 'w') as myzip:
+        myzip.writestr(info, data)
+    return size
+
+
+def orthoxml_file(path, size, seed=0):
+    """
+    An OrthoXML document (gzipped) of nested orthologous and paralogous
+    groups over a handful of species, as distributed by OMA.
+    :param path: file to write
+    :param size: number of genes
+    :param seed:
+    :return: int number of genes written
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    species = [
+        ('Homo sapiens', '9606'), ('Mus musculus', '10090'),
+        ('Danio rerio', '7955'), ('Drosophila melanogaster', '7227'),
+        ('Rattus norvegicus', '10116')]
+    genes = {taxon: [] for (name, taxon) in species}
+    for gene_id in range(1, size + 1):
+        taxon = species[gene_id % len(species)][1]
+        if rng.random() < 0.5:
+            prot_id = _uniprot(rng)
+        else:
+            prot_id = 'ENSP{:011d}'.format(gene_id)
+        genes[taxon].append((str(gene_id), prot_id))
+
+    def group(members, depth):
+        if len(members) <= 2 or depth > 3:
+            return ''.join('<geneRef id="{}"/>'.format(m) for m in members)
+        split = rng.randint(1, len(members) - 1)
+        tag = 'paralogGroup' if rng.random() < 0.3 else 'orthologGroup'
+        return '<{0}>{1}{2}</{0}>'.format(
+            tag, group(members[:split], depth + 1),
+            group(members[split:], depth + 1))
+
+    all_ids = [str(gene_id) for gene_id in range(1, size + 1)]
+    with gzip.open(path, 'wt', encoding='utf-8') as xml:
+        xml.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        xml.write('<orthoXML xmlns="http://orthoXML.org/2011/" '
+                  'origin="OMA" originVersion="benchmark" version="0.3">\n')
+        for (name, taxon) in species:
+            xml.write('<species name="{}" NCBITaxId="{}">'.format(name, taxon))
+            xml.write('<database name="synthetic" version="1"><genes>')
+            for (gene_id, prot_id) in genes[taxon]:
+                xml.write('<gene id="{}" protId="{}"/>'.format(gene_id, prot_id))
+            xml.write('</genes></database></species>\n')
+        xml.write('<groups>\n')
+        start = 0
+        hog = 0
+        while start < len(all_ids):
+            width = rng.randint(3, 12)
+            hog += 1
+            xml.write('<orthologGroup id="{}">{}</orthologGroup>\n'.format(
+                hog, group(all_ids[start:start + width], 0)))
+            start += width
+        xml.write('</groups>\n</orthoXML>\n')
+    return size
+
+
+def clinvar_xml(path, size, seed=0):
+    """
+    A gzipped ClinVar full release with one RCV and one to three SCVs
+    per ClinVarSet.
+    :param path: file to write
+    :param size: number of ClinVarSets
+    :param seed:
+    :return: int number of ClinVarSets written
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    significance = [
+        'Pathogenic', 'Likely pathogenic', 'Benign', 'Likely benign',
+        'Uncertain significance']
+    variant_types = ['single nucleotide variant', 'Deletion', 'Duplication',
+                     'Insertion', 'Indel']
+    methods = ['clinical testing', 'literature only', 'research']
+    with gzip.open(path, 'wt', encoding='utf-8') as xml:
+        xml.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        xml.write('<ReleaseSet Dated="2017-04-01" Type="full">\n')
+        for i in range(1, size + 1):
+            gene = _symbol(rng).upper()
+            variant = 'NM_{:06d}.1({}):c.{}A>G'.format(
+                i, gene, rng.randint(1, 5000))
+            xml.write(
+                '<ClinVarSet ID="{0}"><RecordStatus>current</RecordStatus>'
+                '<ReferenceClinVarAssertion DateCreated="2012-08-13" '
+                'DateLastUpdated="2017-03-01" ID="{0}">'
+                '<ClinVarAccession Acc="RCV{0:09d}" Version="1" Type="RCV"/>'
+                '<RecordStatus>current</RecordStatus>'
+                '<MeasureSet Type="Variant" ID="{1}">'
+                '<Measure Type="{2}" ID="{1}">'
+                '<Name><ElementValue Type="Preferred">{3}</ElementValue></Name>'
+                '<AttributeSet><Attribute Type="HGVS, coding, RefSeq">{3}'
+                '</Attribute></AttributeSet>'
+                '<MeasureRelationship Type="variant in gene">'
+                '<Symbol><ElementValue Type="Preferred">{4}</ElementValue>'
+                '</Symbol><XRef ID="{5}" DB="Gene"/></MeasureRelationship>'
+                '<XRef Type="rs" ID="{6}" DB="dbSNP"/>'
+                '</Measure></MeasureSet>'
+                '<TraitSet Type="Disease" ID="{0}"><Trait Type="Disease">'
+                '<Name><ElementValue Type="Preferred">{7}</ElementValue></Name>'
+                '<XRef ID="{8}" DB="{9}"/></Trait></TraitSet>'
+                '</ReferenceClinVarAssertion>'.format(
+                    i, 10000 + i, rng.choice(variant_types),
+                    variant.replace('>', '&gt;'), gene,
+                    rng.randint(1, 100000), rng.randint(1, 900000000),
+                    _words(rng, 3) + ' syndrome',
+                    rng.randint(100000, 620000),
+                    rng.choice(['OMIM', 'OMIM', 'Orphanet', 'MedGen'])))
+            for j in range(rng.randint(1, 3)):
+                scv = i * 10 + j
+                xml.write(
+                    '<ClinVarAssertion ID="{0}">'
+                    '<ClinVarSubmissionID submitter="Laboratory {1}"/>'
+                    '<ClinVarAccession Acc="SCV{0:09d}" Version="1" '
+                    'Type="SCV" OrgID="{1}" DateUpdated="2017-01-01"/>'
+                    '<RecordStatus>current</RecordStatus>'
+                    '<ClinicalSignificance DateLastEvaluated="2016-05-01">'
+                    '<Description>{2}</Description>'
+                    '<Citation><ID Source="PubMed">{3}</ID></Citation>'
+                    '</ClinicalSignificance>'
+                    '<AttributeSet><Attribute Type="AssertionMethod">'
+                    'ACMG Guidelines, 2015</Attribute><Citation>'
+                    '<URL>https://example.org/acmg.pdf</URL></Citation>'
+                    '</AttributeSet>'
+                    '<ObservedIn><Method><MethodType>{4}</MethodType></Method>'
+                    '<ObservedData><Attribute Type="Description">'
+                    'not provided</Attribute></ObservedData></ObservedIn>'
+                    '</ClinVarAssertion>'.format(
+                        scv, rng.randint(1, 500), rng.choice(significance),
+                        rng.randint(1000000, 29000000), rng.choice(methods)))
+            xml.write('</ClinVarSet>\n')
+        xml.write('</ReleaseSet>\n')
+    return size
+
+
+def impc_files(rawdir, size, seed=0):
+    """
+    ALL_genotype_phenotype.csv.gz and a local copy of the IMPReSS
+    code map (impress_codes.json) so the parse does not need the network.
+    Phenotyping centers, projects and statistical methods are drawn from
+    resources/impc_mappings.yaml so they all resolve.
+    :param rawdir: directory to write into
+    :param size: number of phenotype calls
+    :param seed:
+    :return: int number of rows written
+    """
+    rng = random.Random(seed)
+    os.makedirs(rawdir, exist_ok=True)
+    centers = ['BCM', 'HMGU', 'ICS', 'JAX', 'MRC Harwell', 'TCP', 'WTSI']
+    projects = ['KOMP2 BaSH consortium', 'Jackson Laboratory', 'MRC project',
+                'Phenomin']
+    methods = ["Fisher's exact test",
+               'Mixed Model framework, linear mixed-effects model, '
+               'equation withoutWeight',
+               'Wilcoxon rank sum test with continuity correction']
+    impress = {}
+    rows = []
+    for i in range(size):
+        marker = 1000000 + rng.randint(1, max(1, size // 5))
+        symbol = 'Gene' + str(marker)
+        center = rng.choice(centers)
+        pipeline = center.split()[0].upper() + '_001'
+        procedure = 'IMPC_{}_001'.format(rng.choice(['ABR', 'CSD', 'DXA', 'EYE']))
+        parameter = procedure + '_{:03d}_001'.format(rng.randint(1, 40))
+        for code in (pipeline, procedure, parameter):
+            impress[code] = '_:' + code
+        mp = 'MP:{:07d}'.format(rng.randint(1, 14000))
+        rows.append((
+            'MGI:' + str(marker), symbol, center,
+            '{}_{}'.format(symbol, rng.randint(1, 3)),
+            rng.choice(['male', 'female', 'both']),
+            rng.choice(['heterozygote', 'homozygote', 'hemizygote']),
+            'MGI:' + str(5000000 + marker),
+            symbol + '<tm1a(EUCOMM)Wtsi>', 'targeted mutation 1a',
+            'MGI:' + str(2159965 + rng.randint(0, 3)), 'C57BL/6N',
+            'EUCOMM', rng.choice(projects), center + ' pipeline', pipeline,
+            procedure, 'procedure ' + procedure, parameter,
+            'parameter ' + parameter, 'MP:0005376', 'homeostasis/metabolism',
+            mp, 'phenotype ' + mp, '{:.3e}'.format(rng.random() / 1000),
+            '{:.1f}%'.format(rng.uniform(-50, 50)),
+            '{:.3f}'.format(rng.uniform(-3, 3)), rng.choice(methods), 'IMPC'))
+    with gzip.open(os.path.join(rawdir, 'ALL_genotype_phenotype.csv.gz'), 'wt',
+                   encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile, delimiter=',', quotechar='\"')
+        writer.writerow((
+            'marker_accession_id', 'marker_symbol', 'phenotyping_center',
+            'colony_id', 'sex', 'zygosity', 'allele_accession_id',
+            'allele_symbol', 'allele_name', 'strain_accession_id',
+            'strain_name', 'project_name', 'project_fullname',
+            'pipeline_name', 'pipeline_stable_id', 'procedure_stable_id',
+            'procedure_name', 'parameter_stable_id', 'parameter_name',
+            'top_level_mp_term_id', 'top_level_mp_term_name', 'mp_term_id',
+            'mp_term_name', 'p_value', 'percentage_change', 'effect_size',
+            'statistical_method', 'resource_name'))
+        writer.writerows(rows)
+    with open(os.path.join(rawdir, 'impress_codes.json'), 'w') as codes:
+        json.dump(impress, codes, sort_keys=True)
+    return len(rows)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Per row cost of the model objects in a parser loop.
+
+Compares making new model objects for every row, as parsers like
+Bgee, IMPC and MPD used to, with making one and reset()ing it per row.
+Reports microseconds per row and the bytes held by one object.
+
+    python3 -m benchmarks.model_allocation --rows 100000
+
+"""
+import timeit
+import logging
+import argparse
+import tracemalloc
+
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.models.Model import Model
+from dipper.models.Genotype import Genotype
+from dipper.models.Evidence import Evidence
+from dipper.models.Provenance import Provenance
+from dipper.models.GenomicFeature import Feature
+from dipper.models.Reference import Reference
+from dipper.models.assoc.Association import Assoc
+from dipper.models.assoc.G2PAssoc import G2PAssoc
+
+logger = logging.getLogger(__name__)
+
+GRAPH = RDFGraph(True)
+
+# name: (make a new one for a row, the reused one, reset it for a row)
+CASES = {
+    'assoc': (
+        lambda i: Assoc(GRAPH, 'bench', 'ENSEMBL:1', 'UBERON:1', 'RO:1'),
+        Assoc(GRAPH, 'bench'),
+        lambda o, i: o.reset('ENSEMBL:1', 'UBERON:1', 'RO:1')),
+    'g2p_assoc': (
+        lambda i: G2PAssoc(GRAPH, 'bench', 'MGI:1', 'MP:1'),
+        G2PAssoc(GRAPH, 'bench', None, None),
+        lambda o, i: o.reset('MGI:1', 'MP:1')),
+    'evidence': (
+        lambda i: Evidence(GRAPH, 'MONARCH:1'),
+        Evidence(GRAPH, None),
+        lambda o, i: o.reset('MONARCH:1')),
+    'feature': (
+        lambda i: Feature(GRAPH, 'NCBIGene:1', 'one', 'SO:0000704'),
+        Feature(GRAPH),
+        lambda o, i: o.reset('NCBIGene:1', 'one', 'SO:0000704')),
+    'reference': (
+        lambda i: Reference(GRAPH, 'PMID:1'),
+        Reference(GRAPH),
+        lambda o, i: o.reset('PMID:1')),
+    # what Bgee made for each expression record
+    'bgee_row': (
+        lambda i: (
+            Assoc(GRAPH, 'bench'), Genotype(GRAPH), Model(GRAPH)),
+        Assoc(GRAPH, 'bench'),
+        lambda o, i: o.reset('ENSEMBL:1', 'UBERON:1', 'RO:1')),
+    # and IMPC for each phenotype call
+    'impc_row': (
+        lambda i: (
+            G2PAssoc(GRAPH, 'bench', 'MGI:1', 'MP:1'),
+            Evidence(GRAPH, 'MONARCH:1'), Provenance(GRAPH),
+            Provenance(GRAPH), Provenance(GRAPH), Model(GRAPH),
+            Model(GRAPH), Model(GRAPH)),
+        (G2PAssoc(GRAPH, 'bench', None, None), Evidence(GRAPH, None)),
+        lambda o, i: (o[0].reset('MGI:1', 'MP:1'), o[1].reset('MONARCH:1'))),
+}
+
+
+def _bytes_held(make):
+    """
+    :param make: function of the row number making the object(s)
+    :return: bytes allocated, and still held, by one call
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = make(0)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def run(rows, repeat=5):
+    """
+    :param rows: number of rows to time per repeat
+    :param repeat: best of this many
+    :return: dict of case: {new_us, reset_us, new_bytes}
+    """
+    results = {}
+    for (name, (make, reused, reset)) in sorted(CASES.items()):
+        new_seconds = min(timeit.repeat(
+            lambda: [make(i) for i in range(rows)], number=1, repeat=repeat))
+        reset_seconds = min(timeit.repeat(
+            lambda: [reset(reused, i) for i in range(rows)],
+            number=1, repeat=repeat))
+        results[name] = {
+            'new_us': round(new_seconds / rows * 1e6, 3),
+            'reset_us': round(reset_seconds / rows * 1e6, 3),
+            'new_bytes': _bytes_held(make)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='per row cost of new versus reset model objects')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    results = run(args.rows, args.repeat)
+    columns = ['new_us', 'reset_us', 'new_bytes']
+    print('{:<12}'.format('case') +
+          ''.join('{:>12}'.format(c) for c in columns))
+    for (name, result) in sorted(results.items()):
+        print('{:<12}'.format(name) +
+              ''.join('{:>12}'.format(result[c]) for c in columns))
+
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Run the parser benchmarks, or compare two sets of results.
+
+Each case generates its input into a scratch working directory
+(raw/<source>/...), then parses and writes it exactly as dipper-etl.py
+would, in a freshly spawned process so that peak RSS is per case.
+
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import resource
+import tempfile
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks import generators
+
+logger = logging.getLogger(__name__)
+
+# Cases that expose a simple parse() run it end to end.
+# MGI and ZFIN read a couple of dozen tables in parse(), so for those
+# we drive the heaviest passes (markers, alleles, genotypes) directly,
+# as for FlyBase, whose lookups of the chado keys are what fill memory.
+# For panther and biogrid a row is one association,
+# so rows_per_sec is associations/sec.
+CASES = {
+    'mgi': {
+        'module': 'dipper.sources.MGI', 'class': 'MGI',
+        'generate': lambda size, seed: generators.mgi_views(
+            'raw/mgi', size, seed),
+        'passes': [
+            ('_process_mrk_acc_view',),
+            ('_process_mrk_marker_view', None),
+            ('_process_all_summary_view', None),
+            ('_process_all_allele_view', None),
+            ('_process_gxd_genotype_summary_view', None),
+            ('_process_gxd_genotype_view', None),
+            ('_process_gxd_allele_pair_view', None)]},
+    'zfin': {
+        'module': 'dipper.sources.ZFIN', 'class': 'ZFIN',
+        'generate': lambda size, seed: generators.zfin_files(
+            'raw/zfin', size, seed),
+        'passes': [
+            ('_process_genes', None),
+            ('_process_features', None),
+            ('_process_wildtypes', None),
+            ('_process_genotype_features', None)]},
+    'flybase': {
+        'module': 'dipper.sources.FlyBase', 'class': 'FlyBase',
+        'generate': lambda size, seed: generators.flybase_files(
+            'raw/flybase', size, seed),
+        'passes': [
+            ('_process_dbxref',),
+            ('_process_cvterm',),
+            ('_process_organisms', None),
+            ('_process_organism_dbxref', None),
+            ('_process_features', None),
+            ('_process_feature_dbxref', None)]},
+    'ncbigene': {
+        'module': 'dipper.sources.NCBIGene', 'class': 'NCBIGene',
+        'kwargs': {'tax_ids': [9606, 10090, 7955]},
+        'generate': lambda size, seed: generators.ncbigene_files(
+            'raw/ncbigene', size, seed)},
+    # as in the real gene_info, nearly all of the genes of other taxa
+    'ncbigene_multispecies': {
+        'module': 'dipper.sources.NCBIGene', 'class': 'NCBIGene',
+        'kwargs': {'tax_ids': [9606, 10090, 7955]},
+        'generate': lambda size, seed: generators.ncbigene_files(
+            'raw/ncbigene', size, seed, other_taxa=57)},
+    'go': {
+        'module': 'dipper.sources.GeneOntology', 'class': 'GeneOntology',
+        'kwargs': {'tax_ids': [10090]},
+        'generate': lambda size, seed: generators.go_files(
+            'raw/go', size, seed)},
+    'panther': {
+        'module': 'dipper.sources.Panther', 'class': 'Panther',
+        'kwargs': {'tax_ids': [9606, 10090]},
+        'generate': lambda size, seed: generators.panther_files(
+            'raw/panther', size, seed)},
+    'panther_parallel': {
+        'module': 'dipper.sources.Panther', 'class': 'Panther',
+        'kwargs': {'tax_ids': [9606, 10090]}, 'processes': 4,
+        'generate': lambda size, seed: generators.panther_files(
+            'raw/panther', size, seed)},
+    'biogrid': {
+        'module': 'dipper.sources.BioGrid', 'class': 'BioGrid',
+        'generate': lambda size, seed: generators.biogrid_files(
+            'raw/biogrid', size, seed),
+        'passes': [('_get_interactions', None)]},
+    'oma': {
+        'module': 'dipper.sources.OMA', 'class': 'OMA',
+        'generate': lambda size, seed: generators.orthoxml_file(
+            'raw/OMA/OMA_GETHOGs-2_2017-04.orthoxml.gz', size, seed)},
+    'clinvarxml_alpha': {
+        'module': 'dipper.sources.ClinVarXML', 'class': 'ClinVarXML',
+        'generate': lambda size, seed: generators.clinvar_xml(
+            'raw/clinvarxml_alpha/ClinVarFullRelease_00-latest.xml.gz',
+            size, seed)},
+    'clinvarxml_parallel': {
+        'module': 'dipper.sources.ClinVarXML', 'class': 'ClinVarXML',
+        'processes': 4,
+        'generate': lambda size, seed: generators.clinvar_xml(
+            'raw/clinvarxml_alpha/ClinVarFullRelease_00-latest.xml.gz',
+            size, seed)},
+    'impc': {
+        'module': 'dipper.sources.IMPC', 'class': 'IMPC',
+        'map_files': {'impress_map': 'raw/impc/impress_codes.json'},
+        'generate': lambda size, seed: generators.impc_files(
+            'raw/impc', size, seed)},
+}
+
+# metrics where a drop is a regression, and those where a rise is
+HIGHER_IS_BETTER = ['rows_per_sec', 'triples_per_sec']
+LOWER_IS_BETTER = ['peak_rss_mb', 'output_bytes']
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF):
+    maxrss = resource.getrusage(who).ru_maxrss
+    # linux reports kilobytes, darwin reports bytes
+    if sys.platform == 'darwin':
+        return maxrss / 2**20
+    return maxrss / 2**10
+
+
+def _count_lines(path):
+    count = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                count += 1
+    return count
+
+
+def run_case(name, size, seed, workdir):
+    """
+    Generate the input for one case and process it.
+    Meant to be called in a child process; it changes directory.
+    :param name: key into CASES
+    :param size: number of primary records to generate
+    :param seed:
+    :param workdir: scratch directory holding raw/ and out/
+    :return: dict of measurements
+    """
+    case = CASES[name]
+    os.chdir(workdir)
+
+    start = time.time()
+    rows = case['generate'](size, seed)
+    generate_seconds = time.time() - start
+
+    module = importlib.import_module(case['module'])
+    source = getattr(module, case['class'])(
+        'rdf_graph', True, **case.get('kwargs', {}))
+    if 'processes' in case:
+        source.set_processes(case['processes'])
+    if 'map_files' in case:
+        source.map_files = dict(source.map_files)
+        for (key, path) in case['map_files'].items():
+            source.map_files[key] = 'file://' + os.path.abspath(path)
+
+    start = time.time()
+    if 'passes' in case:
+        for (method, *args) in case['passes']:
+            getattr(source, method)(*args)
+    else:
+        source.parse()
+    parse_seconds = time.time() - start
+
+    start = time.time()
+    source.write(fmt='nt')
+    write_seconds = time.time() - start
+    outfile = '/'.join((source.outdir, source.name + '.nt'))
+    peak_rss_mb = _peak_rss_mb()
+
+    triples = _count_lines(outfile)
+    return {
+        'rows': rows,
+        'triples': triples,
+        'generate_seconds': round(generate_seconds, 3),
+        'parse_seconds': round(parse_seconds, 3),
+        'write_seconds': round(write_seconds, 3),
+        'rows_per_sec': round(rows / max(parse_seconds, 1e-6), 1),
+        'triples_per_sec': round(triples / max(parse_seconds, 1e-6), 1),
+        'peak_rss_mb': round(peak_rss_mb, 1),
+        'output_bytes': os.path.getsize(outfile)}
+
+
+def run(cases, size, seed, keep=False):
+    """
+    Run each case in its own spawned process
+    :param cases: list of case names
+    :param size:
+    :param seed:
+    :param keep: leave the generated inputs and outputs on disk
+    :return: dict of results, suitable for json
+    """
+    results = {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': size,
+        'seed': seed,
+        'cases': {}}
+    context = multiprocessing.get_context('spawn')
+    for name in cases:
+        workdir = tempfile.mkdtemp(prefix='dipper-bench-' + name + '-')
+        logger.info("Running %s in %s", name, workdir)
+        # not a multiprocessing.Pool, whose daemonic workers
+        # could not start the worker processes of a parallel parse
+        pool = ProcessPoolExecutor(1, mp_context=context)
+        try:
+            result = pool.submit(
+                run_case, name, size, seed, workdir).result()
+        except Exception as e:
+            logger.error("%s failed: %s", name, e)
+            result = {'error': '{}: {}'.format(type(e).__name__, e)}
+        finally:
+            pool.shutdown()
+            if not keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+        logger.info("%s: %s", name, result)
+        results['cases'][name] = result
+    return results
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Compare two sets of results.
+    A throughput drop, or a memory or output size increase,
+    of more than the tolerance (a fraction) is a regression.
+    :param results: dict
+    :param baseline: dict
+    :param tolerance: float
+    :return: list of (case, metric, baseline value, new value) regressions
+    """
+    if results.get('size') != baseline.get('size'):
+        logger.warning(
+            "Comparing runs of different sizes (%s vs %s baseline)",
+            results.get('size'), baseline.get('size'))
+
+    regressions = []
+    for (name, base) in sorted(baseline['cases'].items()):
+        new = results['cases'].get(name)
+        if new is None:
+            logger.warning("%s is not in the results", name)
+            continue
+        if 'error' in new and 'error' not in base:
+            regressions.append((name, 'error', None, new['error']))
+            continue
+        if 'error' in new or 'error' in base:
+            continue
+        for metric in HIGHER_IS_BETTER:
+            if new[metric] < base[metric] * (1 - tolerance):
+                regressions.append((name, metric, base[metric], new[metric]))
+        for metric in LOWER_IS_BETTER:
+            if new[metric] > base[metric] * (1 + tolerance):
+                regressions.append((name, metric, base[metric], new[metric]))
+    return regressions
+
+
+def _print_table(results, baseline=None):
+    columns = ['rows_per_sec', 'triples_per_sec', 'peak_rss_mb',
+               'output_bytes']
+    print('{:<18}'.format('case') +
+          ''.join('{:>18}'.format(c) for c in columns))
+    for (name, result) in sorted(results['cases'].items()):
+        if 'error' in result:
+            print('{:<18}{}'.format(name, result['error']))
+            continue
+        line = '{:<18}'.format(name)
+        for c in columns:
+            if isinstance(result[c], int):
+                cell = '{:d}'.format(result[c])
+            else:
+                cell = '{:.1f}'.format(result[c])
+            base = None
+            if baseline is not None:
+                base = baseline['cases'].get(name, {}).get(c)
+            if base:
+                cell += ' ({:+.0%})'.format(result[c] / base - 1)
+            line += '{:>18}'.format(cell)
+        print(line)
+    return
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='dipper parser benchmarks on synthetic data')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser(
+        'run', help='generate inputs, run the parsers, record the results')
+    run_parser.add_argument(
+        '--cases', nargs='+', choices=sorted(CASES), default=sorted(CASES),
+        help='cases to run, default all')
+    run_parser.add_argument(
+        '--size', type=int, default=5000,
+        help='number of primary records generated per case')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument(
+        '--output', default='out/benchmarks.json',
+        help='where to write the json results')
+    run_parser.add_argument(
+        '--keep', action='store_true',
+        help='keep the generated inputs and outputs')
+
+    compare_parser = subparsers.add_parser(
+        'compare', help='flag regressions against a stored baseline')
+    compare_parser.add_argument('results', help='json results of a run')
+    compare_parser.add_argument('baseline', help='json results to compare to')
+    compare_parser.add_argument(
+        '--tolerance', type=float, default=0.1,
+        help='allowed fractional change before flagging, default 0.1')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'run':
+        results = run(args.cases, args.size, args.seed, args.keep)
+        output_dir = os.path.dirname(args.output)
+        if output_dir != '' and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        logger.info("Wrote results to %s", args.output)
+        _print_table(results)
+        failed = [n for n in results['cases'] if 'error' in results['cases'][n]]
+        if failed:
+            logger.error("Failed cases: %s", ', '.join(failed))
+            sys.exit(1)
+    elif args.command == 'compare':
+        with open(args.results) as f:
+            results = json.load(f)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        _print_table(results, baseline)
+        regressions = compare(results, baseline, args.tolerance)
+        for (name, metric, old, new) in regressions:
+            logger.error(
+                "REGRESSION %s %s: %s -> %s", name, metric, old, new)
+        if regressions:
+            sys.exit(1)
+        logger.info("No regressions beyond %.0f%%", args.tolerance * 100)
+    else:
+        parser.print_help()
+        sys.exit(2)
+
+    return
+
+
+if __name__ == "__main__":
+    main()
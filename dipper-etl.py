@@ -13,6 +13,7 @@ import time
 from tests.test_general import GeneralGraphTestCase
 from dipper.utils.TestUtils import TestUtils
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.IdMinter import IdMinter
 
 
 requests_log = logging.getLogger("requests.packages.urllib3")
@@ -29,7 +30,7 @@ def main():
         # 'facebase_alpha': 'FaceBase_alpha',
         'hpoa': 'HPOAnnotations',   # ~3 min
         'zfin': 'ZFIN',
-        'omim': 'OMIM',  # full file takes ~15 min, due to required throttling
+        'omim': 'OMIM',  # first run ~15 min, due to required throttling
         'biogrid': 'BioGrid',  # interactions file takes <10 minutes
         'mgi': 'MGI',
         'impc': 'IMPC',
@@ -43,7 +44,7 @@ def main():
         'eom': 'EOM',  # Takes about 5 seconds.
         'coriell': 'Coriell',
         # 'clinvar': 'ClinVar',                   # takes ~ half hour
-        # 'clinvarxml_alpha': 'ClinVarXML_alpha', # takes ~ five minutes
+        'clinvarxml_alpha': 'ClinVarXML',  # takes ~ five minutes
         'monochrom': 'Monochrom',
         'kegg': 'KEGG',
         'animalqtldb': 'AnimalQTLdb',
@@ -131,6 +132,37 @@ def main():
         help='serialization format: [turtle], nt, nquads, rdfxml, n3, raw',
         type=str)
 
+    parser.add_argument(
+        '--checkpoint',
+        help='save checkpoints while parsing, to continue from with --resume',
+        action="store_true")
+
+    parser.add_argument(
+        '--resume',
+        help='continue parsing from the last checkpoint, if any',
+        action="store_true")
+
+    parser.add_argument(
+        '--memory_budget', '--memory-budget', type=int,
+        help='size of the process in MB past which new triples\n'
+        'are spilled to disk (rdf_graph only)')
+
+    parser.add_argument(
+        '--declared_cache', '--declared-cache', type=int,
+        help='number of class, type and taxon declarations to remember\n'
+        'so that repeats of them are not emitted again')
+
+    parser.add_argument(
+        '--processes', type=int,
+        help='number of worker processes, for the sources that\n'
+        'parse in parallel (Panther)')
+
+    parser.add_argument(
+        '--audit_ids', '--audit-ids',
+        help='check the minted (digest) identifiers for collisions\n'
+        'and report them at the end of the run',
+        action="store_true")
+
     parser.add_argument(
         '--version', '-v',
         help='version of source',
@@ -206,6 +238,8 @@ def main():
     else:
         args.dest_fmt = 'turtle'
 
+    IdMinter.get().set_audit(args.audit_ids)
+
     # iterate through all the sources
     for source in args.sources.split(','):
         logger.info("\n******* %s *******", source)
@@ -228,6 +262,12 @@ def main():
             source_args['version'] = args.version
 
         mysource = source_class(**source_args)
+        if args.memory_budget is not None:
+            mysource.set_memory_budget(args.memory_budget)
+        if args.declared_cache is not None:
+            mysource.set_declared_cache(args.declared_cache)
+        if args.processes is not None:
+            mysource.set_processes(args.processes)
         if args.parse_only is False:
             start_fetch = time.clock()
             mysource.fetch(args.force)
@@ -235,6 +275,8 @@ def main():
             logger.info("Fetching time: %d sec", end_fetch-start_fetch)
 
         mysource.settestonly(args.test_only)
+        mysource.set_checkpointing(args.checkpoint)
+        mysource.setresume(args.resume)
 
         # run tests first
         if (args.no_verify or args.skip_tests) is not True:
@@ -282,6 +324,9 @@ def main():
     # load configuration parameters
     # for example, keys
 
+    if args.audit_ids:
+        IdMinter.get().report()
+
     logger.info("All done.")
 
 
@@ -0,0 +1,108 @@
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class DeclaredCache:
+    """
+    Bounded memory of the declarations (a class, a type, a taxon)
+    already made on a graph, so that a parser repeating one for every
+    row emits its triples only once.
+
+    The least recently seen declarations are forgotten past maxsize;
+    a forgotten declaration is simply emitted again.
+    Repeats that were skipped are counted per method.
+
+    A cache copied into a worker process can record() what is declared
+    there, to be merged into the cache it was copied from.
+
+    """
+
+    def __init__(self, maxsize=2**20):
+        """
+        :param maxsize: number of declarations to remember
+        """
+        self.maxsize = maxsize
+        self.declared = OrderedDict()
+        self.suppressed = {}
+        self.added = None
+        self.suppressed_before = {}
+        return
+
+    def __len__(self):
+        return len(self.declared)
+
+    def seen(self, method, *key):
+        """
+        Record a declaration
+        :param method: name of the declaring method
+        :param key: its arguments
+        :return: True if it was already declared
+        """
+        key = (method,) + key
+        if key in self.declared:
+            self.declared.move_to_end(key)
+            self.suppressed[method] = self.suppressed.get(method, 0) + 1
+            return True
+        self._remember(key)
+        if self.added is not None:
+            self.added.append(key)
+
+        return False
+
+    def _remember(self, key):
+        self.declared[key] = None
+        if len(self.declared) > self.maxsize:
+            self.declared.popitem(last=False)
+
+        return
+
+    def record(self):
+        """
+        Start keeping the declarations made from now on
+        :return: None
+        """
+        self.added = []
+        self.suppressed_before = dict(self.suppressed)
+
+        return
+
+    def recorded(self):
+        """
+        :return: the declarations made since record(),
+            and the number of repeats skipped since, per method
+        """
+        suppressed = {
+            method: count - self.suppressed_before.get(method, 0)
+            for (method, count) in self.suppressed.items()
+            if count != self.suppressed_before.get(method, 0)}
+
+        return (self.added, suppressed)
+
+    def merge(self, recorded):
+        """
+        Add what another copy of this cache recorded
+        :param recorded: as returned by its recorded()
+        :return: None
+        """
+        (added, suppressed) = recorded
+        for key in added:
+            if key in self.declared:
+                self.declared.move_to_end(key)
+            else:
+                self._remember(key)
+        for (method, count) in suppressed.items():
+            self.suppressed[method] = self.suppressed.get(method, 0) + count
+
+        return
+
+    def report(self):
+        """
+        Log the number of repeated declarations skipped by each method
+        :return: None
+        """
+        for (method, count) in sorted(self.suppressed.items()):
+            logger.info("%s: skipped %d repeated declarations", method, count)
+
+        return
@@ -3,11 +3,25 @@ from abc import ABCMeta, abstractmethod
 
 class Graph(metaclass=ABCMeta):
 
+    # an optional DeclaredCache of the declarations made on this graph
+    declared_cache = None
+
     @abstractmethod
     def addTriple(self, subject_id, predicate_id, object_id,
                   object_is_literal, literal_type):
         pass
 
+    def addTriples(self, triples):
+        """
+        Add many triples in one call
+        :param triples: iterable of (subject_id, predicate_id, obj,
+                        object_is_literal, literal_type) tuples
+        :return: None
+        """
+        for triple in triples:
+            self.addTriple(*triple)
+        return
+
     @abstractmethod
     def skolemizeBlankNode(self, curie):
         pass
@@ -1,8 +1,11 @@
-from rdflib import ConjunctiveGraph, Literal, URIRef, BNode, Namespace
+from rdflib import ConjunctiveGraph, Graph, Literal, URIRef, BNode, Namespace
 from dipper.graph.Graph import Graph as DipperGraph
+from dipper.graph.SpillStore import SpillStore, get_rss_mb
 from dipper.utils.CurieUtil import CurieUtil
 from dipper import curie_map
 import re
+import sys
+import itertools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,14 +17,26 @@ class RDFGraph(ConjunctiveGraph, DipperGraph):
     The goal of this class is wrap the creation
     of triples and manage creation of URIRef,
     Bnodes, and literals from an input curie
+
+    If a memory budget is set and the process grows past it,
+    triples added afterwards are spilled to a SpillStore on disk.
+    Spilled triples are not visible to queries on the graph
+    until load_spilled() or write_spilled() is called.
     """
 
     curie_util = CurieUtil(curie_map.get())
     curie_map = curie_map
 
-    def __init__(self, are_bnodes_skized=True):
+    # how many additions between checks on the process size
+    budget_check_interval = 100000
+
+    def __init__(self, are_bnodes_skized=True, memory_budget=None):
         super().__init__()
         self.are_bnodes_skized = are_bnodes_skized
+        self.memory_budget = memory_budget
+        self.spill_store = None
+        self.spilled_predicates = set()
+        self.add_count = 0
 
         # Can be removed when this is resolved
         # https://github.com/RDFLib/rdflib/issues/632
@@ -34,11 +49,11 @@ class RDFGraph(ConjunctiveGraph, DipperGraph):
         if object_is_literal is True:
             if literal_type is not None and obj is not None:
                 literal_type_iri = self._getNode(literal_type)
-                self.add(
+                self._add(
                     (self._getNode(subject_id), self._getNode(predicate_id),
                      Literal(obj, datatype=literal_type_iri)))
             elif obj is not None:
-                self.add(
+                self._add(
                     (self._getNode(subject_id), self._getNode(predicate_id),
                      Literal(obj)))
             else:
@@ -46,7 +61,7 @@ class RDFGraph(ConjunctiveGraph, DipperGraph):
                     "None as literal object for subj: %s and pred: %s",
                     subject_id, predicate_id)
         elif obj is not None and obj != '':
-            self.add(
+            self._add(
                 (self._getNode(subject_id), self._getNode(predicate_id),
                  self._getNode(obj)))
         else:
@@ -55,6 +70,147 @@ class RDFGraph(ConjunctiveGraph, DipperGraph):
                 subject_id, predicate_id)
         return
 
+    def addTriples(self, triples):
+        """
+        Add many triples in one call,
+        making the node for each distinct curie only once
+        :param triples: iterable of (subject_id, predicate_id, obj,
+                        object_is_literal, literal_type) tuples
+        :return: None
+        """
+        nodes = {}
+        for (subject_id, predicate_id, obj, object_is_literal,
+             literal_type) in triples:
+            if obj is None or (obj == '' and not object_is_literal):
+                # let addTriple complain
+                self.addTriple(
+                    subject_id, predicate_id, obj, object_is_literal,
+                    literal_type)
+                continue
+            if object_is_literal:
+                curies = (subject_id, predicate_id, literal_type)
+            else:
+                curies = (subject_id, predicate_id, obj)
+            for curie in curies:
+                if curie is not None and curie not in nodes:
+                    nodes[curie] = self._getNode(curie)
+            if object_is_literal:
+                if literal_type is not None:
+                    obj_node = Literal(obj, datatype=nodes[literal_type])
+                else:
+                    obj_node = Literal(obj)
+            else:
+                obj_node = nodes[obj]
+            self._add((nodes[subject_id], nodes[predicate_id], obj_node))
+        return
+
+    def _add(self, triple):
+        """
+        Add to the in-memory graph, or to the spill store
+        once the memory budget has been exceeded
+        :param triple: tuple of rdflib nodes
+        :return: None
+        """
+        if self.spill_store is not None:
+            self.spill_store.add(self._ntriple(triple))
+            self.spilled_predicates.add(triple[1])
+            return
+
+        self.add(triple)
+        if self.memory_budget is not None:
+            self.add_count += 1
+            if self.add_count % self.budget_check_interval == 0:
+                rss = get_rss_mb()
+                if rss > self.memory_budget:
+                    logger.warning(
+                        "Process size %d MB exceeds memory budget of %d MB "
+                        "with %d triples in memory; spilling to disk",
+                        rss, self.memory_budget, len(self))
+                    self.spill_store = SpillStore()
+        return
+
+    def set_memory_budget(self, megabytes):
+        """
+        :param megabytes: int, resident size of the process past which
+                          new triples are spilled to disk, None for no limit
+        :return: None
+        """
+        self.memory_budget = megabytes
+        return
+
+    def has_spilled(self):
+        return self.spill_store is not None and len(self.spill_store) > 0
+
+    def write_spilled(self, file=None):
+        """
+        Write the in-memory and the spilled triples as one
+        sorted, de-duplicated N-Triples output without
+        loading the spilled triples back into memory
+        :param file: path to write to, stdout if None
+        :return: None
+        """
+        for triple in self.triples((None, None, None)):
+            self.spill_store.add(self._ntriple(triple))
+        if file is None:
+            self.spill_store.write(sys.stdout)
+        else:
+            logger.info("Writing merged triples in nt to %s", file)
+            with open(file, 'w', encoding='utf-8') as filewriter:
+                self.spill_store.write(filewriter)
+        return
+
+    def load_spilled(self, chunk_size=100000):
+        """
+        Read the spilled triples back into the in-memory graph,
+        needed before serializing to anything other than nt.
+        :param chunk_size: number of lines to parse at a time
+        :return: None
+        """
+        if self.spill_store is None:
+            return
+        logger.warning(
+            "Loading %d spilled triples back into memory",
+            len(self.spill_store))
+        chunk = []
+        for line in self.spill_store.iter_lines():
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                self._add_ntriples(chunk)
+                chunk = []
+        self._add_ntriples(chunk)
+        self.spill_store.close()
+        self.spill_store = None
+        return
+
+    def load_ntriples(self, file, chunk_size=100000):
+        """
+        Add the triples of an N-Triples file to the default context
+        as though they were added one by one, so that past the memory
+        budget they go to the spill store rather than into memory.
+        :param file: path to read
+        :param chunk_size: number of lines to parse at a time
+        :return: None
+        """
+        with open(file, 'r', encoding='utf-8') as filereader:
+            while True:
+                chunk = list(itertools.islice(filereader, chunk_size))
+                if not chunk:
+                    break
+                for triple in Graph().parse(
+                        data=''.join(chunk), format='nt'):
+                    self._add(triple)
+        return
+
+    def _add_ntriples(self, lines):
+        if lines:
+            for triple in Graph().parse(data=''.join(lines), format='nt'):
+                self.add(triple)
+        return
+
+    @staticmethod
+    def _ntriple(triple):
+        return ' '.join([node.n3() for node in triple]) + ' .'
+
     def skolemizeBlankNode(self, curie):
         stripped_id = re.sub(r'^_:|^_', '', curie, 1)
         node = BNode(stripped_id).skolemize(self.curie_map.get_base())
@@ -0,0 +1,47 @@
+import logging
+from dipper.graph.Graph import Graph
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingGraph(Graph):
+    """
+    Stands in for a graph in a worker process, keeping the triples
+    added to it, as the (subject_id, predicate_id, obj, object_is_literal,
+    literal_type) tuples of Graph.addTriples, to be added to the graph
+    it stands in for back in the parent process.
+
+    Repeated declarations are skipped as the graph's DeclaredCache
+    (as of when the worker started) would skip them.
+
+    """
+
+    def __init__(self, graph):
+        """
+        :param graph: the graph the triples are for
+        """
+        self.graph = graph
+        self.declared_cache = graph.declared_cache
+        self.triples = []
+
+        return
+
+    def addTriple(self, subject_id, predicate_id, obj,
+                  object_is_literal=False, literal_type=None):
+        self.triples.append(
+            (subject_id, predicate_id, obj, object_is_literal, literal_type))
+
+        return
+
+    def addTriples(self, triples):
+        self.triples.extend(triples)
+
+        return
+
+    def skolemizeBlankNode(self, curie):
+        return self.graph.skolemizeBlankNode(curie)
+
+    def serialize(self, subject_iri, predicate_iri, obj,
+                  object_is_literal, literal_type):
+        return self.graph.serialize(
+            subject_iri, predicate_iri, obj, object_is_literal, literal_type)
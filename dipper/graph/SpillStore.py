@@ -0,0 +1,137 @@
+import os
+import atexit
+import heapq
+import shutil
+import logging
+import resource
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def get_rss_mb():
+    """
+    Resident set size of this process in megabytes.
+    Reads the current value from /proc where available (linux),
+    otherwise falls back to the peak reported by getrusage.
+    :return: float
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except (OSError, IndexError, ValueError):
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # linux reports kilobytes, darwin reports bytes
+        if maxrss > 2**32:
+            return maxrss / 2**20
+        return maxrss / 2**10
+
+
+class SpillStore:
+    """
+    On disk overflow for a graph that has outgrown its memory budget.
+
+    Triples are handed over as serialized N-Triples lines.
+    They are buffered in a set, and when the buffer is full it is sorted
+    and written out as a "run" file.  Each run is sorted and unique,
+    so the runs can later be merged lazily (heapq.merge) into a single
+    sorted, de-duplicated stream without loading them back into memory.
+
+    """
+
+    def __init__(self, run_size=500000, directory=None):
+        """
+        :param run_size: number of distinct lines to buffer per run file
+        :param directory: parent directory for the run files,
+                          defaults to the system temp dir
+        """
+        self.run_size = run_size
+        self.directory = tempfile.mkdtemp(prefix='dipper-spill-', dir=directory)
+        self.buffer = set()
+        self.runs = []
+        self.line_count = 0
+        atexit.register(self.close)
+        logger.info("Spilling triples to %s", self.directory)
+        return
+
+    def __len__(self):
+        return self.line_count
+
+    def add(self, line):
+        """
+        Add one serialized triple (without the trailing newline)
+        :param line: str
+        :return: None
+        """
+        self.buffer.add(line)
+        self.line_count += 1
+        if len(self.buffer) >= self.run_size:
+            self.flush()
+        return
+
+    def flush(self):
+        """
+        Sort the buffer and write it as a new run file
+        :return: None
+        """
+        if not self.buffer:
+            return
+        start = time.time()
+        run_file = os.path.join(
+            self.directory, 'run{:05d}.nt'.format(len(self.runs)))
+        with open(run_file, 'w', encoding='utf-8') as run:
+            for line in sorted(self.buffer):
+                run.write(line)
+                run.write('\n')
+        self.runs.append(run_file)
+        logger.info(
+            "Spilled run %d: %d triples, %d bytes in %.2f sec",
+            len(self.runs), len(self.buffer), os.path.getsize(run_file),
+            time.time() - start)
+        self.buffer = set()
+        return
+
+    def iter_lines(self):
+        """
+        Merge all runs into one sorted stream of unique lines
+        :return: generator of str, each ending in a newline
+        """
+        self.flush()
+        handles = [open(run, encoding='utf-8') for run in self.runs]
+        try:
+            previous = None
+            for line in heapq.merge(*handles):
+                if line != previous:
+                    yield line
+                    previous = line
+        finally:
+            for handle in handles:
+                handle.close()
+
+    def write(self, stream):
+        """
+        Write the merged runs to an open text stream
+        :param stream: file like object
+        :return: int number of lines written
+        """
+        start = time.time()
+        count = 0
+        for line in self.iter_lines():
+            stream.write(line)
+            count += 1
+        logger.info(
+            "Merged %d spill runs into %d triples in %.2f sec",
+            len(self.runs), count, time.time() - start)
+        return count
+
+    def close(self):
+        """
+        Remove the run files
+        :return: None
+        """
+        self.buffer = set()
+        self.runs = []
+        shutil.rmtree(self.directory, ignore_errors=True)
+        return
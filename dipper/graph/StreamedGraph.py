@@ -43,6 +43,44 @@ class StreamedGraph(DipperGraph):
             logger.warn("Null value passed as object")
         return
 
+    def addTriples(self, triples):
+        """
+        Add many triples in one call, and one write,
+        making the iri for each distinct curie only once
+        :param triples: iterable of (subject_id, predicate_id, object_id,
+                        object_is_literal, literal_type) tuples
+        :return: None
+        """
+        nodes = {}
+        lines = []
+        for (subject_id, predicate_id, object_id, object_is_literal,
+             literal_type) in triples:
+            if object_id is None:
+                logger.warn("Null value passed as object")
+                continue
+            if object_is_literal:
+                curies = (subject_id, predicate_id, literal_type)
+            else:
+                curies = (subject_id, predicate_id, object_id)
+            for curie in curies:
+                if curie is not None and curie not in nodes:
+                    nodes[curie] = self._getNode(curie)
+            if object_is_literal:
+                obj = object_id
+            else:
+                obj = nodes[object_id]
+            lines.append(self._ntriple(
+                nodes[subject_id], nodes[predicate_id], obj,
+                object_is_literal, nodes.get(literal_type)))
+
+        if not lines:
+            return
+        if self.file_handle is None:
+            print('\n'.join(lines))
+        else:
+            self.file_handle.write('\n'.join(lines) + '\n')
+        return
+
     def skolemizeBlankNode(self, curie):
         base_iri = StreamedGraph.curie_map.get_base()
         curie_id = curie.split(':')[1]
@@ -51,6 +89,16 @@ class StreamedGraph(DipperGraph):
 
     def serialize(self, subject_iri, predicate_iri, obj,
                   object_is_literal=False, literal_type=None):
+        triple = self._ntriple(
+            subject_iri, predicate_iri, obj, object_is_literal, literal_type)
+
+        if self.file_handle is None:
+            print(triple)
+        else:
+            self.file_handle.write("{}\n".format(triple))
+
+    def _ntriple(self, subject_iri, predicate_iri, obj,
+                 object_is_literal=False, literal_type=None):
         if not object_is_literal:
             triple = "<{}> <{}> <{}> .".format(subject_iri, predicate_iri, obj)
         elif literal_type is not None:
@@ -69,10 +117,7 @@ class StreamedGraph(DipperGraph):
                 else:
                     raise TypeError("Cannot determine type of {}".format(obj))
 
-        if self.file_handle is None:
-            print(triple)
-        else:
-            self.file_handle.write("{}\n".format(triple))
+        return triple
 
     def _getNode(self, curie):
         """
@@ -54,6 +54,8 @@ class Evidence:
         'has_measurement': 'IAO:0000004'
     }
 
+    __slots__ = ('graph', 'model', 'association')
+
     def __init__(self, graph, association):
         if isinstance(graph, Graph):
             self.graph = graph
@@ -64,6 +66,16 @@ class Evidence:
 
         return
 
+    def reset(self, association):
+        """
+        Reuse this object for the evidence of another association
+        :param association: association id
+        :return: self
+        """
+        self.association = association
+
+        return self
+
     def add_supporting_evidence(self, evidence_line, type=None, label=None):
         """
         Add supporting line of evidence node to association id
@@ -95,6 +107,37 @@ class Evidence:
             self.model.addIndividualToGraph(evidence_line, label, ev_type)
         return
 
+    def add_shared_evidence(self, ev_type, description=None):
+        """
+        Add a line of evidence identified by its content, so that
+        associations with the same evidence share one node,
+        described once (see Model.addSharedNode)
+
+        :param ev_type: curie, type of the evidence line
+        :param description: list of (predicate_id, object_id,
+                            object_is_literal) tuples
+        :return: str, evidence line bnode
+        """
+        evidence_line = self.model.addSharedNode(ev_type, description or [])
+        self.graph.addTriple(self.association,
+                             self.object_properties['has_supporting_evidence'],
+                             evidence_line)
+        return evidence_line
+
+    def add_shared_data(self, data_type, value, description=None):
+        """
+        Add a datum, such as a measurement, identified by its content
+        <datum> a <data_type> ; STATO:has_value value
+        :param data_type: curie
+        :param value: the measured value
+        :param description: more (predicate_id, object_id,
+                            object_is_literal) tuples
+        :return: str, datum bnode
+        """
+        description = [(self.data_property['has_value'], value, True)] + \
+            list(description or [])
+        return self.model.addSharedNode(data_type, description)
+
     def add_data_individual(self, data_curie, label=None, ind_type=None):
         """
         Add data individual
@@ -0,0 +1,222 @@
+import logging
+from dipper.models.Model import Model
+from dipper.models.GenomicFeature import Feature, position_reference, \
+    region_reference, make_region_id
+from dipper.graph.Graph import Graph
+from dipper.graph.DeclaredCache import DeclaredCache
+
+logger = logging.getLogger(__name__)
+
+
+class FaldoEmitter:
+    """
+    Adds the faldo locations of many features at a time,
+    making the same triples as Feature.addFeatureToGraph():
+
+        feature faldo:location region
+        region a faldo:Region ; faldo:begin begin ; faldo:end end
+        begin a <strand>Position ; faldo:position n ; faldo:reference ref
+
+    Positions and regions are interned on
+    (reference, coordinate, strand): features sharing a coordinate
+    share the position, and each distinct position or region is
+    declared once, however many features it is the location of.
+    Features are given as parallel lists, and their triples handed to
+    the graph in one addTriples() call.
+
+    Only the location is added; declare the features themselves
+    as usual.
+
+    """
+
+    strand_types = {
+        '+': (Feature.types['plus_strand'], 'plus'),
+        '-': (Feature.types['minus_strand'], 'minus'),
+        '.': (Feature.types['both_strand'], 'both'),
+        None: (None, None)
+    }
+
+    def __init__(self, graph, cache_size=2**20):
+        """
+        :param graph: the graph to add the locations to
+        :param cache_size: number of positions and regions to remember
+        """
+        if isinstance(graph, Graph):
+            self.graph = graph
+        else:
+            raise ValueError("{} is not a graph".format(graph))
+        self.declared = DeclaredCache(cache_size)
+
+        return
+
+    def _strand(self, strand):
+        if strand not in self.strand_types:
+            logger.warning("strand type could not be mapped: %s", str(strand))
+            return (None, None)
+        return self.strand_types[strand]
+
+    def position_id(self, reference, coordinate, strand=None):
+        """
+        As Feature._makePositionId()
+        :param reference: curie
+        :param coordinate: may be None
+        :param strand: one of '+', '-', '.' or None
+        :return: bnode curie
+        """
+        return self._position_id(
+            reference, coordinate, self._strand(strand)[1])
+
+    @staticmethod
+    def _position_id(reference, coordinate, strand_label):
+        curie = '_:' + position_reference(reference)
+        if coordinate is not None:
+            curie = '-'.join((curie, str(coordinate)))
+        if strand_label is not None:
+            curie = '-'.join((curie, strand_label))
+
+        return curie
+
+    def region_id(self, reference, begin, end, strand=None):
+        """
+        As Feature.addFeatureToGraph() would make
+        :param reference: curie
+        :param begin: may be None
+        :param end: may be None
+        :param strand: one of '+', '-', '.' or None
+        :return: bnode curie
+        """
+        return self._region_id(
+            reference, begin, end, self._strand(strand)[1])
+
+    @staticmethod
+    def _region_id(reference, begin, end, strand_label):
+        region_items = [
+            region_reference(reference),
+            'UN' if begin is None else str(begin),
+            'UN' if end is None else str(end)]
+        # as in Feature, the strand is only known from a begin coordinate
+        if strand_label is not None and begin is not None:
+            region_items.append(strand_label)
+
+        return make_region_id(region_items)
+
+    def _position(self, triples, reference, coordinate, strand_type,
+                  strand_label, position_types):
+        types = [] if strand_type is None else [strand_type]
+        if position_types is not None:
+            types += position_types
+        if types == []:
+            types.append(Feature.types['Position'])
+        pos_id = self._position_id(reference, coordinate, strand_label)
+        if self.declared.seen(
+                'position', reference, coordinate, tuple(types)):
+            return pos_id
+        if coordinate is not None:
+            triples.append((
+                pos_id, Feature.properties['position'], coordinate,
+                True, 'xsd:integer'))
+        triples.append((
+            pos_id, Feature.properties['reference'], reference, False, None))
+        for pos_type in types:
+            triples.append((
+                pos_id, Model.object_properties['type'], pos_type,
+                False, None))
+
+        return pos_id
+
+    def _location(self, triples, feature_id, reference, begin, end, strand,
+                  position_types, region_id, add_region):
+        (strand_type, strand_label) = self._strand(strand)
+        if add_region:
+            if region_id is None:
+                region_id = self._region_id(
+                    reference, begin, end, strand_label)
+            if not self.declared.seen('location', feature_id, region_id):
+                triples.append((
+                    feature_id, Feature.properties['location'], region_id,
+                    False, None))
+        else:
+            region_id = feature_id
+        beginp = self._position(
+            triples, reference, begin, strand_type, strand_label,
+            position_types)
+        endp = self._position(
+            triples, reference, end, strand_type, strand_label,
+            position_types)
+        if not self.declared.seen('region', region_id, beginp, endp):
+            triples.append((
+                region_id, Model.object_properties['type'],
+                Feature.types['region'], False, None))
+            triples.append((
+                region_id, Feature.properties['begin'], beginp, False, None))
+            triples.append((
+                region_id, Feature.properties['end'], endp, False, None))
+
+        return region_id
+
+    def add_location(self, feature_id, reference, begin, end, strand=None,
+                     position_types=None, region_id=None, add_region=True):
+        """
+        Locate one feature
+        :param feature_id:
+        :param reference: curie of the sequence the feature is on
+        :param begin: coordinate
+        :param end: coordinate
+        :param strand: one of '+', '-', '.' or None
+        :param position_types: list of extra types for both positions
+        :param region_id: defaults to one made from the location
+        :param add_region: False to make the feature itself the region
+        :return: the region id
+        """
+        triples = []
+        region_id = self._location(
+            triples, feature_id, reference, begin, end, strand,
+            position_types, region_id, add_region)
+        self.graph.addTriples(triples)
+
+        return region_id
+
+    def add_locations(self, feature_ids, references, begins, ends,
+                      strands=None, position_types=None, region_ids=None,
+                      add_region=True):
+        """
+        Locate many features, given as parallel lists
+        :param feature_ids: list
+        :param references: list, or one reference for all features
+        :param begins: list
+        :param ends: list
+        :param strands: list, or one strand for all features
+        :param position_types: list of extra types for all positions
+        :param region_ids: list, defaults to ones made from the locations
+        :param add_region: False to make the features themselves the regions
+        :return: list of region ids
+        """
+        count = len(feature_ids)
+        if references is None or isinstance(references, str):
+            references = [references] * count
+        if strands is None or isinstance(strands, str):
+            strands = [strands] * count
+        if region_ids is None:
+            region_ids = [None] * count
+
+        triples = []
+        location = self._location
+        region_ids = [
+            location(triples, feature_id, reference, begin, end, strand,
+                     position_types, region_id, add_region)
+            for (feature_id, reference, begin, end, strand, region_id)
+            in zip(feature_ids, references, begins, ends, strands,
+                   region_ids)]
+        self.graph.addTriples(triples)
+
+        return region_ids
+
+    def report(self):
+        """
+        Log the number of shared positions and regions
+        :return: None
+        """
+        for (kind, count) in sorted(self.declared.suppressed.items()):
+            logger.info("Reused %d %s declarations", count, kind)
+
+        return
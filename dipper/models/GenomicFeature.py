@@ -1,5 +1,6 @@
 import logging
 import re
+import functools
 from dipper.models.assoc.Association import Assoc
 from dipper.models.Model import Model
 from dipper.graph.Graph import Graph
@@ -87,6 +88,10 @@ class Feature():
         'gpos66': 'GENO:0000632'
     }
 
+    __slots__ = (
+        'graph', 'model', 'id', 'label', 'type', 'description', 'start',
+        'stop', 'taxon')
+
     def __init__(self, graph, feature_id=None, label=None,
                  feature_type=None, description=None):
         if isinstance(graph, Graph):
@@ -94,13 +99,27 @@ class Feature():
         else:
             raise ValueError("{} is not a graph".graph)
         self.model = Model(self.graph)
+        self.reset(feature_id, label, feature_type, description)
+        return
+
+    def reset(self, feature_id=None, label=None,
+              feature_type=None, description=None):
+        """
+        Reuse this object for another feature
+        :param feature_id:
+        :param label:
+        :param feature_type:
+        :param description:
+        :return: self
+        """
         self.id = feature_id
         self.label = label
         self.type = feature_type
         self.description = description
         self.start = None
         self.stop = None
-        return
+        self.taxon = None
+        return self
 
     def addFeatureStartLocation(
             self, coordinate, reference_id, strand=None,
@@ -232,7 +251,7 @@ class Feature():
 
         if add_region:
             # create a region that has the begin/end positions
-            regionchr = re.sub(r'\w+\:_?', '', self.start['reference'])
+            regionchr = region_reference(self.start['reference'])
             if region_id is None:
                 # in case the values are undefined
                 # if we know only one of the coordinates,
@@ -255,15 +274,13 @@ class Feature():
                 region_items = [regionchr, st, sp]
                 if strand is not None:
                     region_items += [strand]
-                region_id = '-'.join(region_items)
-                rid = region_id
-                rid = re.sub(r'\w+\:', '', rid, 1)  # replace the id prefix
-                rid = '_:'+rid+"-Region"
-                region_id = rid
+                region_id = make_region_id(region_items)
 
             self.graph.addTriple(self.id, self.properties['location'],
                                  region_id)
-            self.model.addIndividualToGraph(region_id, None, 'faldo:Region')
+            if not self.model.is_declared('addRegion', region_id):
+                self.model.addIndividualToGraph(
+                    region_id, None, 'faldo:Region')
         else:
             region_id = self.id
             self.model.addType(region_id, 'faldo:Region')
@@ -319,12 +336,7 @@ class Feature():
             logger.error("Trying to make position with no reference.")
             return None
 
-        curie = '_:'
-        reference = re.sub(r'\w+\:', '', reference, 1)
-        if re.match(r'^_', reference):
-            # this is in the case if the reference is a bnode
-            reference = re.sub(r'^_', '', reference)
-        curie += reference
+        curie = '_:' + position_reference(reference)
         if coordinate is not None:
             # just in case it isn't a string already
             curie = '-'.join((curie, str(coordinate)))
@@ -339,6 +351,11 @@ class Feature():
             self, region_id, begin_position_id,
             end_position_id):
 
+        if self.model.is_declared(
+                'addRegionPositionToGraph', region_id, begin_position_id,
+                end_position_id):
+            return
+
         if begin_position_id is None:
             pass
             # logger.warn(
@@ -378,6 +395,11 @@ class Feature():
 
         """
         pos_id = self._makePositionId(reference_id, position, position_types)
+        if self.model.is_declared(
+                'addPositionToGraph', reference_id, position,
+                None if position_types is None else tuple(position_types),
+                strand):
+            return pos_id
         if position is not None:
             self.graph.addTriple(pos_id, self.properties['position'],
                                  position, object_is_literal=True,
@@ -441,6 +463,44 @@ class Feature():
         return
 
 
+@functools.lru_cache(maxsize=2**12)
+def position_reference(reference):
+    """
+    The part of a reference curie used in position ids:
+    without its prefix, nor the underscore of a bnode
+    :param reference: curie
+    :return: str
+    """
+    reference = re.sub(r'\w+\:', '', reference, 1)
+    if re.match(r'^_', reference):
+        # this is in the case if the reference is a bnode
+        reference = re.sub(r'^_', '', reference)
+    return reference
+
+
+@functools.lru_cache(maxsize=2**12)
+def region_reference(reference):
+    """
+    The part of a reference curie used in region ids
+    :param reference: curie
+    :return: str
+    """
+    return re.sub(r'\w+\:_?', '', reference)
+
+
+def make_region_id(region_items):
+    """
+    Region ids are a bnode of the reference, begin, end and strand,
+    e.g. _:chr1-100-200-plus-Region
+    :param region_items: list of [region_reference, begin, end(, strand)]
+    :return: str
+    """
+    region_id = '-'.join(region_items)
+    if ':' in region_id:
+        region_id = re.sub(r'\w+\:', '', region_id, 1)  # replace the id prefix
+    return '_:' + region_id + '-Region'
+
+
 def makeChromID(chrom, reference=None, prefix=None):
     """
     This will take a chromosome number and a NCBI taxon number,
@@ -137,6 +137,8 @@ class Genotype():
     properties = object_properties.copy()
     properties.update(annotation_properties)
 
+    __slots__ = ('graph', 'model')
+
     def __init__(self, graph):
         if isinstance(graph, Graph):
             self.graph = graph
@@ -437,6 +439,8 @@ class Genotype():
         :return:
 
         """
+        if self.model.is_declared('addTaxon', taxon_id, genopart_id):
+            return
         self.graph.addTriple(
             genopart_id, self.properties['in_taxon'], taxon_id)
 
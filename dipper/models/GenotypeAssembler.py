@@ -0,0 +1,286 @@
+import logging
+import re
+from dipper.models.Model import Model
+from dipper.models.Genotype import Genotype
+from dipper.graph.Graph import Graph
+
+logger = logging.getLogger(__name__)
+
+
+class GenotypeAssembler:
+    """
+    Builds intrinsic genotypes from keyed records gathered over one or
+    more table passes, then adds all of their nodes in a single pass:
+
+        <vslc> a GENO:variant_single_locus_complement ; has_zygosity z
+        <vslc> has_alternate_part <allele1>, <allele2>
+        <gvc> a GENO:genomic_variation_complement ; rdfs:label "v1; v2"
+        <gvc> has_alternate_part <vslc>
+        <genotype> has_alternate_part <gvc>
+        <genotype> rdfs:label "<gvc> [<background>]"
+
+    A genotype with a single VSLC uses it as its GVC.
+
+    Every id is interned once, and the records refer to each other by
+    the index of their ids, so the memory held grows with the number of
+    distinct ids and records, not with the rows they are read from.
+    Everything is released once assemble() is done.
+
+    Sources differ in how they name a GVC after its VSLCs:
+    gvc_id_subs are the (pattern, replacement) substitutions applied,
+    in order, to the hyphen-joined VSLC ids.
+
+    """
+
+    __slots__ = (
+        'graph', 'model', 'geno', 'labels', 'gvc_id_subs', 'sort_labels',
+        'genotype_type', 'ids', 'index', 'vslcs', 'parts', 'allele_pairs',
+        'node_labels', 'backgrounds')
+
+    def __init__(
+            self, graph, labels=None, gvc_id_subs=((r'[_:]', ''),),
+            sort_labels=False, genotype_type=None):
+        """
+        :param graph: the graph to add the genotypes to
+        :param labels: dict of the source's labels, used for the
+            backgrounds, and updated with the VSLC, GVC and genotype labels
+        :param gvc_id_subs: substitutions making a GVC id from its VSLC ids
+        :param sort_labels: order the GVC label by the VSLC labels,
+            rather than by the VSLC ids
+        :param genotype_type: type for the genotypes; none by default
+        """
+        if isinstance(graph, Graph):
+            self.graph = graph
+        else:
+            raise ValueError("{} is not a graph".format(graph))
+        self.model = Model(self.graph)
+        self.geno = Genotype(self.graph)
+        self.labels = labels
+        self.gvc_id_subs = [
+            (re.compile(pattern), replacement)
+            for (pattern, replacement) in gvc_id_subs]
+        self.sort_labels = sort_labels
+        self.genotype_type = genotype_type
+        self.clear()
+
+        return
+
+    def clear(self):
+        """
+        Forget all the records
+        :return: None
+        """
+        self.ids = []           # index: id
+        self.index = {}         # id: index
+        self.vslcs = {}         # genotype: [vslc]
+        self.parts = {}         # genotype: [part]
+        self.allele_pairs = {}  # vslc: (allele1, allele2, zygosity, r1, r2)
+        self.node_labels = {}   # node: label
+        self.backgrounds = {}   # genotype: background
+
+        return
+
+    def _intern(self, curie):
+        if curie is None:
+            return None
+        idx = self.index.get(curie)
+        if idx is None:
+            idx = len(self.ids)
+            self.index[curie] = idx
+            self.ids.append(curie)
+        return idx
+
+    def _curie(self, idx):
+        if idx is None:
+            return None
+        return self.ids[idx]
+
+    def add_genotype(self, genotype_id):
+        """
+        Record a genotype, so that it is labelled by assemble()
+        even if no allele pairs are added to it
+        :param genotype_id:
+        :return: None
+        """
+        self.vslcs.setdefault(self._intern(genotype_id), [])
+
+        return
+
+    def add_allele_pair(
+            self, genotype_id, vslc_id, vslc_label, allele1_id, allele2_id,
+            zygosity_id=None, allele1_rel=None, allele2_rel=None):
+        """
+        Record a VSLC, the pair of alleles at one locus, of a genotype
+        :param genotype_id:
+        :param vslc_id:
+        :param vslc_label:
+        :param allele1_id:
+        :param allele2_id:
+        :param zygosity_id:
+        :param allele1_rel: defaults to has_alternate_part
+        :param allele2_rel: defaults to has_alternate_part
+        :return: None
+        """
+        vslc = self._intern(vslc_id)
+        self.vslcs.setdefault(self._intern(genotype_id), []).append(vslc)
+        if vslc not in self.allele_pairs:
+            alt = self.geno.object_properties['has_alternate_part']
+            self.allele_pairs[vslc] = tuple(
+                self._intern(curie) for curie in (
+                    allele1_id, allele2_id, zygosity_id,
+                    alt if allele1_rel is None else allele1_rel,
+                    alt if allele2_rel is None else allele2_rel))
+            if vslc_label is not None:
+                self.node_labels[vslc] = vslc_label
+
+        return
+
+    def add_part(self, genotype_id, part_id):
+        """
+        Record a part added directly to the genotype, outside of any VSLC
+        :param genotype_id:
+        :param part_id:
+        :return: None
+        """
+        self.parts.setdefault(
+            self._intern(genotype_id), []).append(self._intern(part_id))
+
+        return
+
+    def set_background(self, genotype_id, background_id):
+        """
+        :param genotype_id:
+        :param background_id: may be None, for an unspecified background
+        :return: None
+        """
+        if background_id is not None:
+            self.backgrounds[self._intern(genotype_id)] = \
+                self._intern(background_id)
+
+        return
+
+    def set_label(self, node_id, label):
+        """
+        Label a node for the genotype labels,
+        in place of the one in the source's labels
+        :param node_id:
+        :param label:
+        :return: None
+        """
+        self.node_labels[self._intern(node_id)] = label
+
+        return
+
+    def genotypes(self):
+        """
+        :return: list of the ids of the genotypes recorded so far
+        """
+        return [self.ids[gt] for gt in set(self.vslcs) | set(self.parts)]
+
+    def _label(self, idx):
+        label = self.node_labels.get(idx)
+        if label is None and self.labels is not None:
+            label = self.labels.get(self.ids[idx])
+        return label
+
+    def make_gvc_id(self, vslc_ids):
+        """
+        :param vslc_ids: sorted list of the VSLC ids
+        :return: bnode curie
+        """
+        gvc_id = '-'.join(vslc_ids)
+        for (pattern, replacement) in self.gvc_id_subs:
+            gvc_id = pattern.sub(replacement, gvc_id)
+
+        return '_:' + gvc_id
+
+    def _add_vslc(self, vslc, vslc_id):
+        (allele1, allele2, zygosity, rel1, rel2) = self.allele_pairs.pop(vslc)
+        vslc_label = self.node_labels.get(vslc)
+        self.model.addIndividualToGraph(
+            vslc_id, vslc_label,
+            self.geno.genoparts['variant_single_locus_complement'])
+        self.geno.addPartsToVSLC(
+            vslc_id, self._curie(allele1), self._curie(allele2),
+            self._curie(zygosity), self._curie(rel1), self._curie(rel2))
+        if self.labels is not None and vslc_label is not None:
+            self.labels[vslc_id] = vslc_label
+
+        return
+
+    def _add_gvc(self, gt_id, vslcs):
+        alt = self.geno.object_properties['has_alternate_part']
+        gvc_type = self.geno.genoparts['genomic_variation_complement']
+        vslc_ids = sorted(self.ids[vslc] for vslc in vslcs)
+        if len(vslc_ids) == 1:
+            gvc_id = vslc_ids[0]
+            gvc_label = self._label(self.index[gvc_id])
+            # type the VSLC as also a GVC
+            self.model.addType(gvc_id, gvc_type)
+            self.geno.addParts(gvc_id, gt_id, alt)
+            return gvc_label
+
+        gvc_id = self.make_gvc_id(vslc_ids)
+        gvc_labels = []
+        for vslc_id in vslc_ids:
+            self.geno.addVSLCtoParent(vslc_id, gvc_id)
+            vslc_label = self._label(self.index[vslc_id])
+            gvc_labels.append(vslc_id if vslc_label is None else vslc_label)
+        if self.sort_labels:
+            gvc_labels.sort()
+        gvc_label = '; '.join(gvc_labels)
+        self.model.addIndividualToGraph(gvc_id, gvc_label, gvc_type)
+        self.geno.addParts(gvc_id, gt_id, alt)
+        if self.labels is not None:
+            self.labels[gvc_id] = gvc_label
+
+        return gvc_label
+
+    def assemble(self):
+        """
+        Add the VSLCs, GVCs and labelled genotypes recorded,
+        then forget them.
+        Genotypes with only direct parts keep their own labels;
+        those added without any allele pairs are labelled by background.
+        :return: number of genotypes assembled
+        """
+        alt = self.geno.object_properties['has_alternate_part']
+        genotypes = set(self.vslcs) | set(self.parts)
+        logger.info("Assembling %d genotypes from %d ids",
+                    len(genotypes), len(self.ids))
+        for gt in genotypes:
+            gt_id = self.ids[gt]
+            for part in set(self.parts.get(gt, ())):
+                self.geno.addParts(self.ids[part], gt_id, alt)
+            if gt not in self.vslcs:
+                continue
+            vslcs = set(self.vslcs[gt])
+            if len(vslcs) > 0:
+                for vslc in vslcs:
+                    if vslc in self.allele_pairs:
+                        self._add_vslc(vslc, self.ids[vslc])
+                gvc_label = self._add_gvc(gt_id, vslcs)
+            else:
+                logger.error("No GVC parts for %s", gt_id)
+                gvc_label = ''
+
+            # make the genotype label = gvc + background
+            background = self.backgrounds.get(gt)
+            if background is not None:
+                bkgd_label = self._label(background)
+                if bkgd_label is None:
+                    bkgd_label = self.ids[background]  # just in case
+            else:
+                bkgd_label = 'n.s.'
+            if gvc_label is not None:
+                genotype_label = gvc_label + ' [' + bkgd_label + ']'
+            else:
+                genotype_label = '[' + bkgd_label + ']'
+            self.model.addIndividualToGraph(
+                gt_id, genotype_label, self.genotype_type)
+            if self.labels is not None:
+                self.labels[gt_id] = genotype_label
+
+        self.clear()
+
+        return len(genotypes)
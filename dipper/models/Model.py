@@ -1,6 +1,7 @@
 import logging
 import re
 from dipper.graph.Graph import Graph
+from dipper.utils.IdMinter import IdMinter
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +97,8 @@ class Model():
         'has_measurement': 'IAO:0000004'
     }
 
+    __slots__ = ('graph',)
+
     def __init__(self, graph):
         if isinstance(graph, Graph):
             self.graph = graph
@@ -107,7 +110,47 @@ class Model():
         self.graph.addTriple(subject_id, predicate_id, obj,
                              object_is_literal, literal_type)
 
+    def is_declared(self, method, *key):
+        """
+        Check, and remember, a declaration made by method,
+        when the graph keeps a cache of them
+        :param method: name of the declaring method
+        :param key: its arguments
+        :return: True if it was made before and can be skipped
+        """
+        cache = self.graph.declared_cache
+        return cache is not None and cache.seen(method, *key)
+
+    def addSharedNode(self, node_type, description):
+        """
+        Add a blank node known only by what is said about it.
+        Its id is the digest of its type and description, so identical
+        descriptions make the same node, and when the graph keeps a
+        declared_cache, its triples are added only the first time.
+        :param node_type: curie
+        :param description: list of (predicate_id, object_id,
+                            object_is_literal) tuples
+        :return: the node's bnode curie
+        """
+        description = sorted(
+            description, key=lambda part: (part[0], str(part[1]), part[2]))
+        node_id = '_:' + IdMinter.get().mint('\t'.join(
+            [node_type] + ['{} {} {}'.format(*part) for part in description]))
+        if self.is_declared('addSharedNode', node_id):
+            return node_id
+
+        triples = [(
+            node_id, self.object_properties['type'], node_type, False, None)]
+        triples += [
+            (node_id, predicate_id, obj, is_literal, None)
+            for (predicate_id, obj, is_literal) in description]
+        self.graph.addTriples(triples)
+
+        return node_id
+
     def addType(self, subject_id, subject_type):
+        if self.is_declared('addType', subject_id, subject_type):
+            return
         self.graph.addTriple(subject_id, self.object_properties['type'],
                              subject_type)
         return
@@ -134,6 +177,9 @@ class Model():
         :return:
 
         """
+        if self.is_declared(
+                'addClassToGraph', class_id, label, class_type, description):
+            return
 
         self.graph.addTriple(class_id, self.object_properties['type'],
                              self.types['class'])
@@ -50,6 +50,8 @@ class Provenance:
         'created_on': 'pav:createdOn'
     }
 
+    __slots__ = ('graph', 'model')
+
     def __init__(self, graph):
         if isinstance(graph, Graph):
             self.graph = graph
@@ -109,11 +111,27 @@ class Provenance:
 
         return
 
+    def add_shared_provenance(self, prov_type, description=None):
+        """
+        Add a provenance node, such as a study or an assertion,
+        identified by its content, so that identical descriptions
+        share one node, described once (see Model.addSharedNode)
+        :param prov_type: curie
+        :param description: list of (predicate_id, object_id,
+                            object_is_literal) tuples
+        :return: str, bnode
+        """
+        return self.model.addSharedNode(prov_type, description or [])
+
     def add_agent_to_graph(self, agent_id, agent_label, agent_type=None,
                            agent_description=None):
 
         if agent_type is None:
             agent_type = self.provenance_types['organization']
+        if self.model.is_declared(
+                'add_agent_to_graph', agent_id, agent_label, agent_type,
+                agent_description):
+            return
         self.model.addIndividualToGraph(
             agent_id, agent_label, agent_type, agent_description)
 
@@ -123,6 +141,10 @@ class Provenance:
                            assay_description=None):
         if assay_type is None:
             assay_type = self.provenance_types['assay']
+        if self.model.is_declared(
+                'add_assay_to_graph', assay_id, assay_label, assay_type,
+                assay_description):
+            return
         self.model.addIndividualToGraph(
             assay_id, assay_label, assay_type, assay_description)
 
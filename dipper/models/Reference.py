@@ -35,11 +35,27 @@ class Reference:
         'title': 'dc:title'
     }
 
+    __slots__ = (
+        'graph', 'model', 'ref_id', 'ref_url', 'ref_type', 'title', 'year',
+        'author_list', 'short_citation')
+
     def __init__(self, graph, ref_id=None, ref_type=None):
         if isinstance(graph, Graph):
             self.graph = graph
         else:
             raise ValueError("{} is not a graph".graph)
+        self.model = Model(self.graph)
+        self.reset(ref_id, ref_type)
+
+        return
+
+    def reset(self, ref_id=None, ref_type=None):
+        """
+        Reuse this object for another reference
+        :param ref_id:
+        :param ref_type: defaults to document
+        :return: self
+        """
         self.ref_id = ref_id
         self.ref_url = None
         self.title = None
@@ -47,8 +63,6 @@ class Reference:
         self.author_list = None
         self.short_citation = None
 
-        self.model = Model(self.graph)
-
         if ref_type is None:
             self.ref_type = self.ref_types['document']
         else:
@@ -57,7 +71,7 @@ class Reference:
         if ref_id is not None and re.match(r'http', ref_id):
             self.ref_url = ref_id
 
-        return
+        return self
 
     def setTitle(self, title):
         self.title = title
@@ -1,7 +1,7 @@
 import re
 import logging
-import hashlib
 from dipper.models.Model import Model
+from dipper.utils.IdMinter import IdMinter
 from dipper.graph.Graph import Graph
 
 __author__ = 'nlw'
@@ -15,6 +15,9 @@ class Assoc:
     to enable attribution of source and evidence
     on statements.
 
+    An Assoc can be reset() and reused for the next association
+    rather than making a new one per row.
+
     """
 
     assoc_types = {
@@ -60,15 +63,32 @@ class Assoc:
     properties.update(object_properties)
     properties.update(datatype_properties)
 
+    __slots__ = (
+        'graph', 'model', 'definedby', 'sub', 'obj', 'rel', 'assoc_id',
+        'description', 'source', 'evidence', 'date', 'provenance',
+        'score', 'score_type', 'score_unit')
+
     def __init__(self, graph, definedby, sub=None, obj=None, pred=None):
         if isinstance(graph, Graph):
             self.graph = graph
         else:
             raise ValueError("{} is not a graph".graph)
         self.model = Model(self.graph)
+        self.definedby = definedby
+        Assoc.reset(self, sub, obj, pred)
+
+        return
 
+    def reset(self, sub=None, obj=None, pred=None):
+        """
+        Forget the parts of the previous association,
+        keeping the graph and the definedby
+        :param sub:
+        :param obj:
+        :param pred:
+        :return: self
+        """
         # core parts of the association
-        self.definedby = definedby
         self.sub = sub
         self.obj = obj
         self.rel = pred
@@ -85,7 +105,7 @@ class Assoc:
         self.score_type = None
         self.score_unit = None
 
-        return
+        return self
 
     def get_properties(self):
         return self.properties
@@ -318,7 +338,6 @@ class Assoc:
             if val is None:
                 items_to_hash[i] = ''
 
-        byte_string = '+'.join(items_to_hash).encode("utf-8")
-
-        # TODO put this in a util?
-        return ':'.join(('MONARCH', hashlib.sha1(byte_string).hexdigest()[0:16]))
+        return ':'.join((
+            'MONARCH',
+            IdMinter.get().mint('+'.join(items_to_hash), 0, 16, '')))
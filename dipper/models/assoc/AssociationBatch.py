@@ -0,0 +1,178 @@
+import re
+import logging
+from dipper.models.assoc.Association import Assoc
+from dipper.models.Model import Model
+from dipper.utils.IdMinter import IdMinter
+from dipper.graph.Graph import Graph
+
+logger = logging.getLogger(__name__)
+
+
+class AssociationBatch:
+    """
+    Bulk version of Assoc for parsers that make one association per row.
+
+    Associations are added as plain values, rather than as an Assoc
+    object per row, and are buffered as the same OBAN triples that
+    Assoc.add_association_to_graph() would make.
+    Every batch_size associations the buffer is handed to the graph
+    in a single addTriples() call.
+
+    Call flush() when done, or use the batch as a context manager.
+
+    """
+
+    def __init__(self, graph, definedby, batch_size=10000):
+        """
+        :param graph: the graph to add the associations to
+        :param definedby: the resource defining the associations
+        :param batch_size: number of associations to buffer
+        """
+        if isinstance(graph, Graph):
+            self.graph = graph
+        else:
+            raise ValueError("{} is not a graph".format(graph))
+        self.definedby = definedby
+        self.batch_size = batch_size
+        self.triples = []
+        self.pending = 0
+        self.count = 0
+
+        return
+
+    def __len__(self):
+        return self.count + self.pending
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def add(self, sub, rel, obj, evidence=None, source=None,
+            provenance=None, date=None, description=None, score=None,
+            assoc_id=None):
+        """
+        Add one association
+        :param sub:
+        :param rel:
+        :param obj:
+        :param evidence: list of evidence ids
+        :param source: list of source ids (or urls)
+        :param provenance: list of provenance ids
+        :param date: list of dates
+        :param description:
+        :param score: float
+        :param assoc_id: defaults to one minted from the parts above
+        :return: the association id
+        """
+        if sub is None:
+            raise ValueError('No subject set for this association')
+        if obj is None:
+            raise ValueError('No object set for this association')
+        if rel is None:
+            raise ValueError('No relation set for this association')
+        if assoc_id is None:
+            assoc_id = Assoc.make_association_id(
+                self.definedby, sub, rel, obj)
+
+        props = Assoc.object_properties
+        triples = self.triples
+        triples.append((sub, rel, obj, False, None))
+        triples.append((
+            assoc_id, Model.object_properties['type'],
+            Assoc.assoc_types['association'], False, None))
+        triples.append((assoc_id, props['has_subject'], sub, False, None))
+        triples.append((assoc_id, props['has_object'], obj, False, None))
+        triples.append((assoc_id, props['has_predicate'], rel, False, None))
+
+        if description is not None:
+            triples.append((
+                assoc_id, Model.annotation_properties['description'],
+                description.strip(), True, None))
+        for e in self._ids(evidence):
+            triples.append((assoc_id, props['has_evidence'], e, False, None))
+        for s in self._ids(source):
+            # TODO assume that the source is a publication?
+            triples.append((
+                assoc_id, props['has_source'], s,
+                re.match('http', s) is not None, None))
+        for p in self._ids(provenance):
+            triples.append((assoc_id, props['has_provenance'], p, False, None))
+        for d in self._ids(date):
+            triples.append((
+                assoc_id, Assoc.datatype_properties['created_on'], d,
+                True, None))
+        if score is not None:
+            triples.append((
+                assoc_id, Assoc.properties['has_measurement'], score,
+                True, 'xsd:float'))
+
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+        return assoc_id
+
+    def add_many(self, rows):
+        """
+        Add an iterable of associations, each a tuple of the arguments
+        to add(): (sub, rel, obj, evidence, source, ...)
+        :param rows: iterable of tuples
+        :return: list of association ids
+        """
+        return [self.add(*row) for row in rows]
+
+    def add_columns(self, subjects, relations, objects, **columns):
+        """
+        Add associations given as columns, one list per part, e.g.
+        add_columns(genes_a, rels, genes_b, evidence=evidence_lists)
+        :param subjects: list
+        :param relations: list, or a single relation for all rows
+        :param objects: list
+        :param columns: optional lists keyed by the argument names of add()
+        :return: list of association ids
+        """
+        if isinstance(relations, str):
+            relations = [relations] * len(subjects)
+        if 'assoc_id' not in columns:
+            # as Assoc.make_association_id() would, in one go
+            definedby = '' if self.definedby is None else self.definedby
+            columns['assoc_id'] = IdMinter.get().mint_many(
+                ('+'.join((definedby, sub or '', rel or '', obj or ''))
+                 for (sub, rel, obj) in zip(subjects, relations, objects)),
+                0, 16, 'MONARCH:')
+        names = sorted(columns)
+        assoc_ids = []
+        for (i, row) in enumerate(zip(subjects, relations, objects)):
+            kwargs = {name: columns[name][i] for name in names}
+            assoc_ids.append(self.add(*row, **kwargs))
+
+        return assoc_ids
+
+    def flush(self):
+        """
+        Add the buffered associations to the graph
+        :return: None
+        """
+        if self.pending == 0:
+            return
+        self.graph.addTriples(self.triples)
+        self.count += self.pending
+        self.triples = []
+        self.pending = 0
+
+        return
+
+    @staticmethod
+    def _ids(identifiers):
+        """
+        Skip the empty ones, as Assoc.add_evidence() and friends do
+        """
+        if identifiers is None:
+            return []
+        if isinstance(identifiers, str):
+            identifiers = [identifiers]
+        return [i for i in identifiers if i is not None and i.strip() != '']
@@ -13,18 +13,33 @@ class Chem2DiseaseAssoc(Assoc):
 
     """
 
+    __slots__ = ('chem_id', 'phenotype_id')
+
     def __init__(self, graph, definedby, chem_id, phenotype_id, rel_id=None):
         super().__init__(graph, definedby)
+        Chem2DiseaseAssoc.reset(self, chem_id, phenotype_id, rel_id)
+
+        return
+
+    def reset(self, chem_id, phenotype_id, rel_id=None):
+        """
+        Reuse this association for another chemical and phenotype
+        :param chem_id:
+        :param phenotype_id:
+        :param rel_id: defaults to has_phenotype
+        :return: self
+        """
+        super().reset()
         self.chem_id = chem_id
         self.phenotype_id = phenotype_id
 
         self.set_subject(chem_id)
         self.set_object(phenotype_id)
         if rel_id is None:
-            rel_id = self.gu.object_properties['has_phenotype']
+            rel_id = self.object_properties['has_phenotype']
         self.set_relationship(rel_id)
 
-        return
+        return self
 
     def set_association_id(self, assoc_id=None):
         """
@@ -19,9 +19,27 @@ class D2PAssoc(Assoc):
         'frequency': ':frequencyOfPhenotype'
     }
 
+    __slots__ = ('disease_id', 'phenotype_id', 'onset', 'frequency')
+
     def __init__(self, graph, definedby, disease_id, phenotype_id, onset=None,
                  frequency=None, rel=None):
         super().__init__(graph, definedby)
+        D2PAssoc.reset(self, disease_id, phenotype_id, onset, frequency, rel)
+
+        return
+
+    def reset(self, disease_id, phenotype_id, onset=None, frequency=None,
+              rel=None):
+        """
+        Reuse this association for another disease and phenotype
+        :param disease_id:
+        :param phenotype_id:
+        :param onset:
+        :param frequency:
+        :param rel: defaults to has_phenotype
+        :return: self
+        """
+        super().reset()
         self.disease_id = disease_id
         self.phenotype_id = phenotype_id
         self.onset = onset
@@ -33,7 +51,7 @@ class D2PAssoc(Assoc):
         self.set_subject(disease_id)
         self.set_object(phenotype_id)
 
-        return
+        return self
 
     def set_association_id(self, assoc_id=None):
 
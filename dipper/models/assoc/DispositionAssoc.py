@@ -9,6 +9,8 @@ class DispositionAssoc(Assoc):
     These are to be used between diseases and a heritability disposition.
     """
 
+    __slots__ = ()
+
     def __init__(self, graph, definedby, entity_id, heritability_id):
         super().__init__(graph, definedby)
 
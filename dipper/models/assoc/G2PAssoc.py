@@ -25,8 +25,25 @@ class G2PAssoc(Assoc):
         'developmental_process': 'GO:0032502'
     }
 
+    __slots__ = (
+        'entity_id', 'phenotype_id', 'start_stage_id', 'end_stage_id',
+        'environment_id', 'stage_process_id')
+
     def __init__(self, graph, definedby, entity_id, phenotype_id, rel=None):
         super().__init__(graph, definedby)
+        G2PAssoc.reset(self, entity_id, phenotype_id, rel)
+
+        return
+
+    def reset(self, entity_id, phenotype_id, rel=None):
+        """
+        Reuse this association for another genotype and phenotype
+        :param entity_id:
+        :param phenotype_id:
+        :param rel: defaults to has_phenotype
+        :return: self
+        """
+        super().reset()
         self.entity_id = entity_id
         self.phenotype_id = phenotype_id
 
@@ -42,7 +59,7 @@ class G2PAssoc(Assoc):
         self.set_object(phenotype_id)
         self.set_relationship(rel)
 
-        return
+        return self
 
     def set_stage(self, start_stage_id, end_stage_id):
         if start_stage_id is not None and start_stage_id.strip() != '':
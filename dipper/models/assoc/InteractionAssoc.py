@@ -19,6 +19,8 @@ class InteractionAssoc(Assoc):
         'negatively_regulates': 'RO:0003002',
     }
 
+    __slots__ = ()
+
     def __init__(self, graph, definedby, subj, obj, rel=None):
         super().__init__(graph, definedby)
 
@@ -23,6 +23,8 @@ class OrthologyAssoc(Assoc):
         'gene_family': 'DATA:3148'  # http://edamontology.org/data_3148
     }
 
+    __slots__ = ()
+
     def __init__(self, graph, definedby, gene1, gene2, rel=None):
         super().__init__(graph, definedby)
         if rel is None:
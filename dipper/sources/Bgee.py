@@ -124,32 +124,38 @@ class Bgee(Source):
         if limit is not None:
             gene_groups = gene_groups.head(limit).groupby('Ensembl gene ID')
 
+        # one association and model, reused for every row
+        g2a_association = Assoc(self.graph, self.name)
+        model = Model(self.graph)
         for gene, group in gene_groups:
             for index, row in group.iterrows():
                 self._add_gene_anatomy_association(
                     row['Ensembl gene ID'], row['anatomical entity ID'],
-                    row['rank score']
+                    row['rank score'], g2a_association, model
                 )
         return
 
-    def _add_gene_anatomy_association(self, gene_id, anatomy_curie, rank):
+    def _add_gene_anatomy_association(self, gene_id, anatomy_curie, rank,
+                                      g2a_association=None, model=None):
         """
         :param gene_id: str Non curified ID
         :param gene_label: str Gene symbol
         :param anatomy_curie: str curified anatomy term
         :param rank: str rank
+        :param g2a_association: Assoc to reuse, else a new one is made
+        :param model: Model to reuse, else a new one is made
         :return: None
         """
-        g2a_association = Assoc(self.graph, self.name)
-        genotype = Genotype(self.graph)
-        model = Model(self.graph)
+        if g2a_association is None:
+            g2a_association = Assoc(self.graph, self.name)
+        if model is None:
+            model = Model(self.graph)
         gene_curie = "ENSEMBL:{}".format(gene_id)
         rank = re.sub(r',', '', rank)
         model.addIndividualToGraph(ind_id=gene_curie, label=None,
-                                   ind_type=genotype.genoparts['gene'])
-        g2a_association.sub = gene_curie
-        g2a_association.obj = anatomy_curie
-        g2a_association.rel = Assoc.object_properties['expressed_in']
+                                   ind_type=Genotype.genoparts['gene'])
+        g2a_association.reset(
+            gene_curie, anatomy_curie, Assoc.object_properties['expressed_in'])
         g2a_association.add_association_to_graph()
         g2a_association.add_predicate_object(
             Assoc.datatype_properties['has_quantifier'],
@@ -10,6 +10,7 @@ from dipper import config
 from dipper.sources.Source import Source
 from dipper.models.Model import Model
 from dipper.models.assoc.InteractionAssoc import InteractionAssoc
+from dipper.models.assoc.AssociationBatch import AssociationBatch
 from dipper.models.Dataset import Dataset
 
 __author__ = 'nicole'
@@ -122,6 +123,11 @@ class BioGrid(Source):
         # assume that the first entry is the item
         fname = myzip.namelist()[0]
         matchcounter = 0
+        if self.testMode:
+            g = self.testgraph
+        else:
+            g = self.graph
+        batch = AssociationBatch(g, self.name)
 
         with myzip.open(fname, 'r') as csvfile:
             for line in csvfile:
@@ -145,13 +151,11 @@ class BioGrid(Source):
                     r'locuslink\:(\d+)\|?', interactor_b).groups()[0]
 
                 if self.testMode:
-                    g = self.testgraph
                     # skip any genes that don't match our test set
                     if (int(gene_a_num) not in self.test_ids) or\
                             (int(gene_b_num) not in self.test_ids):
                         continue
                 else:
-                    g = self.graph
                     # when not in test mode, filter by taxon
                     if int(re.sub(r'taxid:', '', taxid_a.rstrip())) not in\
                             self.tax_ids or\
@@ -183,16 +187,16 @@ class BioGrid(Source):
                 # identifier that does not map to a public URI.
                 # we will construct a monarch identifier from this
 
-                assoc = InteractionAssoc(g, self.name, gene_a, gene_b, rel)
-                assoc.add_evidence(evidence)
-                assoc.add_source(pub_id)
-                assoc.add_association_to_graph()
+                batch.add(
+                    gene_a, rel, gene_b, evidence=[evidence], source=[pub_id])
 
                 if not self.testMode and (
                         limit is not None and line_counter > limit):
                     break
 
         myzip.close()
+        batch.flush()
+        logger.info("Added %d interactions", len(batch))
 
         return
 
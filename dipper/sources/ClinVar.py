@@ -112,8 +112,9 @@ class ClinVar(Source):
         if self.testOnly:
             self.testMode = True
 
-        self._get_variants(limit)
-        self._get_var_citations(limit)
+        self.run_stage('variants', self._get_variants, limit)
+        self.run_stage('var_citations', self._get_var_citations, limit)
+        self.clear_checkpoint()
 
         print("Done parsing files.")
 
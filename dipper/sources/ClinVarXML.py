@@ -0,0 +1,1237 @@
+'''
+    ClinVarXML
+    Converts the ClinVar XML release into
+    RDF triples to be ingested by SciGraph.
+    These triples comform to the core of the
+    SEPIO Evidence & Provenance model 2016 Apr
+
+    creating a test set.
+        get a full dataset   default ClinVarFullRelease_00-latest.xml.gz
+        get a list of RCV    default CV_test_RCV.txt
+        put the input files the raw directory
+        write the test set back to the raw directory
+    ./scripts/ClinVarXML_Subset.sh | gzip > raw/clinvarxml_alpha/ClinVarTestSet.xml.gz
+
+    The release is read as a stream of ClinVarSet stanzas,
+    each converted on its own (see convert_clinvarset),
+    so that with more processes the stanzas are converted
+    in a pool of them as they are read.
+    The release's triples are de-duplicated on disk (see SpillStore)
+    rather than held in memory.
+
+    For while we are still required to redundantly conflate the owl properties
+    in with the data files.
+
+    python3 ./scripts/add-properties2turtle.py --input ./out/clinvarxml_alpha.nt --output ./out/clinvarxml_alpha.nt --format nt
+
+'''
+import os
+import re
+import sys
+import gzip
+import queue
+import logging
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
+import yaml
+
+from dipper.sources.Source import Source
+from dipper.models.Dataset import Dataset
+from dipper.graph.SpillStore import SpillStore
+from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.IdMinter import IdMinter
+
+LOG = logging.getLogger(__name__)
+
+# regular expression to limit what is found in the CURIE identifier
+# it is ascii centric and may(will) not pass some valid utf8 curies
+CURIERE = re.compile(r'^.*:[A-Za-z0-9_][A-Za-z0-9_.]*[A-Za-z0-9_]*$')
+
+# the RCV and SCV accessions in (the bytes of) a ClinVarSet
+ACCESSIONRE = re.compile(rb'<ClinVarAccession [^>]*Acc="([^"]+)"')
+
+# hardcoding this while my loading from curie_map.yaml is wonky
+CURIEMAP = {
+    '':     'https://monarchinitiative.org',
+    '_':    'https://monarchinitiative.org/.well-known/genid/',
+    'MONARCH':  'https://monarchinitiative.org/MONARCH_',
+    'MonarchData': 'https://data.monarchinitiative.org/ttl/',
+    'dc':   'http://purl.org/dc/elements/1.1/',
+    'rdf':  'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+    'foaf': 'http://xmlns.com/foaf/0.1/',
+    'owl':  'http://www.w3.org/2002/07/owl#',
+    'BFO':  'http://purl.obolibrary.org/obo/BFO_',
+    'ECO':  'http://purl.obolibrary.org/obo/ECO_',
+    'ERO':  'http://purl.obolibrary.org/obo/ERO_',
+    'dbSNP': 'http://www.ncbi.nlm.nih.gov/projects/SNP/snp_ref.cgi?rs=',
+    'GENO': 'http://purl.obolibrary.org/obo/GENO_',
+    'GO':   'http://purl.obolibrary.org/obo/GO_',
+    'RO':   'http://purl.obolibrary.org/obo/RO_',
+    'MP':   'http://purl.obolibrary.org/obo/MP_',
+    'OBAN': 'http://purl.org/oban/',
+    'OMIM': 'http://purl.obolibrary.org/obo/OMIM_',
+    'OBO':  'http://purl.obolibrary.org/obo/',
+    'OIO':  'http://www.geneontology.org/formats/oboInOwl#',
+    'IAO':  'http://purl.obolibrary.org/obo/IAO_',
+    'Orphanet': 'http://www.orpha.net/ORDO/Orphanet_',
+    'MedGen':   'http://www.ncbi.nlm.nih.gov/medgen/',
+    'NCBITaxon': 'http://purl.obolibrary.org/obo/NCBITaxon_',
+    'NCBIGene': 'http://www.ncbi.nlm.nih.gov/gene/',
+    'MmusDv':   'http://purl.obolibrary.org/obo/MmusDv_',
+    'SEPIO':    'http://purl.obolibrary.org/obo/SEPIO_',
+    'SO':   'http://purl.obolibrary.org/obo/SO_',
+    'PMID': 'http://www.ncbi.nlm.nih.gov/pubmed/',
+    'ClinVarSubmitters': 'http://www.ncbi.nlm.nih.gov/clinvar/submitters/',
+    'ClinVarVariant':    'http://www.ncbi.nlm.nih.gov/clinvar/variation/',
+    'ClinVar':           'http://www.ncbi.nlm.nih.gov/clinvar/',
+}
+
+# Global translation table
+# Translate labels found in ontologies
+# to the terms they are for
+GTT = {}
+
+# Local translation table
+# Translate external strings found in datasets
+# to specific labels found in ontologies
+LTT = {}
+
+# Buffer to store the triples below a MONARCH_association
+# before we decide to whether to keep or not"
+rcvtriples = []
+
+
+def make_spo(sub, prd, obj):
+    '''
+    Decorates the three given strings as a line of ntriples
+
+    '''
+    # To establish string as a curie and expand,
+    # we use a global curie_map(.yaml)
+    # sub are allways uri  (unless a bnode)
+    # prd are allways uri (unless prd is 'a')
+    # should fail loudly if curie does not exist
+    if prd == 'a':
+        prd = 'rdf:type'
+
+    (subcuri, subid) = re.split(r':', sub)
+    (prdcuri, prdid) = re.split(r':', prd)
+    objt = ''
+
+    # object is a curie or bnode or literal [string|number]
+
+    match = re.match(CURIERE, obj)
+    objcuri = None
+    if match is not None:
+        try:
+            (objcuri, objid) = re.split(r':', obj)
+        except ValueError:
+            match = None
+    if match is not None and objcuri in CURIEMAP:
+        objt = CURIEMAP[objcuri] + objid.strip()
+        # allow unexpanded bnodes in object
+        if objcuri != '_' or CURIEMAP[objcuri] != '_:':
+            objt = '<' + objt + '>'
+    elif obj.isnumeric():
+        objt = '"' + obj + '"'
+    else:
+        # Literals may not contain the characters ", LF, CR '\'
+        # except in their escaped forms. internal quotes as well.
+        obj = obj.strip('"').replace('\\', '\\\\').replace('"', '\'')
+        obj = obj.replace('\n', '\\n').replace('\r', '\\r')
+        objt = '"' + obj + '"'
+
+    # allow unexpanded bnodes in subject
+    if subcuri is not None and subcuri in CURIEMAP and \
+            prdcuri is not None and prdcuri in CURIEMAP:
+        subjt = CURIEMAP[subcuri] + subid.strip()
+        if subcuri != '_' or CURIEMAP[subcuri] != '_:':
+            subjt = '<' + subjt + '>'
+
+        return subjt + ' <' + CURIEMAP[prdcuri] + prdid.strip() + '> ' + objt + ' .'
+    else:
+        LOG.error(
+            'Cant work with: %s %s %s %s %s',
+            subcuri, subid, prdcuri, prdid, objt)
+        return None
+
+
+def write_spo(sub, prd, obj):
+    '''
+        write triples to a buffer incase we decide to drop them
+    '''
+    rcvtriples.append(make_spo(sub, prd, obj))
+
+
+def scv_link(scv_sig, rcv_trip):
+    '''
+    Creates links between SCV based on their pathonicty/significance calls
+
+    # GENO:0000840 - GENO:0000840 --> equivalent_to SEPIO:0000098
+    # GENO:0000841 - GENO:0000841 --> equivalent_to SEPIO:0000098
+    # GENO:0000843 - GENO:0000843 --> equivalent_to SEPIO:0000098
+    # GENO:0000844 - GENO:0000844 --> equivalent_to SEPIO:0000098
+    # GENO:0000840 - GENO:0000844 --> inconsistent_with SEPIO:0000101
+    # GENO:0000841 - GENO:0000844 --> inconsistent_with SEPIO:0000101
+    # GENO:0000841 - GENO:0000843 --> inconsistent_with SEPIO:0000101
+    # GENO:0000840 - GENO:0000841 --> consistent_with SEPIO:0000099
+    # GENO:0000843 - GENO:0000844 --> consistent_with SEPIO:0000099
+    # GENO:0000840 - GENO:0000843 --> contradicts SEPIO:0000100
+    '''
+
+    sig = {  # 'arbitrary scoring scheme increments as powers of two'
+        'GENO:0000840': 1,   # pathogenic
+        'GENO:0000841': 2,   # likely pathogenic
+        'GENO:0000844': 4,   # likely benign
+        'GENO:0000843': 8,   # benign
+        'GENO:0000845': 16,  # uncertain significance
+    }
+
+    lnk = {  # specific result from diff in 'arbitrary scoring scheme'
+        0: 'SEPIO:0000098',
+        1: 'SEPIO:0000099',
+        2: 'SEPIO:0000101',
+        3: 'SEPIO:0000101',
+        4: 'SEPIO:0000099',
+        6: 'SEPIO:0000101',
+        7: 'SEPIO:0000100',
+        8: 'SEPIO:0000126',
+        12: 'SEPIO:0000126',
+        14: 'SEPIO:0000126',
+        15: 'SEPIO:0000126',
+    }
+    keys = sorted(scv_sig.keys())
+    for scv_a in keys:
+        scv_av = scv_sig.pop(scv_a)
+        for scv_b in scv_sig.keys():
+            link = lnk[abs(sig[scv_av] - sig[scv_sig[scv_b]])]
+            rcv_trip.append(make_spo(scv_a, link, scv_b))
+            rcv_trip.append(make_spo(scv_b, link, scv_a))
+    return
+
+
+# return a deterministic digest of input
+# the 'b' is an experiment forcing the first char to be
+# non numeric but valid hex
+# which is in no way required for RDF
+# but can help when using the identifier in other contexts
+# which do not allow identifiers to begin with a digit
+def digest_id(wordage):
+    return IdMinter.get().mint(wordage, 0, 15, 'b')
+
+
+def resolve(label, local_tt):
+    '''
+    composite mapping
+    given f(x) and g(x)    here:  GTT & LTT respectivly
+    return g(x)|g(f(x))|f(x) in order of preference
+    TODO consider returning x on fall through
+    : return label's mapping
+
+    '''
+
+    if label is not None and label in GTT:
+        term_id = GTT[label]
+    elif label is not None and label in LTT:
+        label = LTT[label]
+        if label in GTT:
+            term_id = GTT[label]
+        else:
+            LOG.warning(
+                'Translated but do not have a term_id for label: ' + label)
+            term_id = label
+    else:
+        LOG.error('Do not have any mapping for label: ' + label)
+
+        term_id = None
+    return term_id
+
+
+def set_translation_tables(globaltt, localtt, skolemize=True):
+    '''
+    Set what the stanzas are converted with, in this process
+    (and as the initializer of each worker process of a pool)
+    : param globaltt: dict of the global translation table
+    : param localtt: dict of the local translation table
+    : param skolemize: False keeps plain blank nodes  "_:xxx"
+
+    '''
+    GTT.clear()
+    GTT.update(globaltt)
+    LTT.clear()
+    LTT.update(localtt)
+    # Overide the given Skolem IRI for our blank nodes
+    # with an unresovable alternative.
+    if skolemize:
+        CURIEMAP['_'] = 'https://monarchinitiative.org/.well-known/genid/'
+    else:
+        CURIEMAP['_'] = '_:'
+
+
+def convert_stanzas(stanzas):
+    '''
+    Convert a batch of ClinVarSet stanzas,
+    in a worker process (see ClinVarXML._queue_stanzas)
+    : param stanzas: list of bytes, each a whole ClinVarSet element
+    : return: list of the ntriples lines of the batch,
+              list of the ClinVarSets rejected, as xml
+
+    '''
+    triples = []
+    rejects = []
+    for stanza in stanzas:
+        (rcv_triples, reject) = convert_clinvarset(ET.fromstring(stanza))
+        triples.extend(rcv_triples)
+        if reject is not None:
+            rejects.append(reject)
+    return (triples, rejects)
+
+
+def convert_clinvarset(ClinVarSet):
+    '''
+    Convert one ClinVarSet, its RCV and the SCVs grouped with it
+    : param ClinVarSet: Element
+    : return: list of the ClinVarSet's ntriples lines,
+              and the ClinVarSet as xml if it was rejected, else None
+
+    '''
+    if ClinVarSet.find('RecordStatus').text != 'current':
+        LOG.warning(
+            ClinVarSet.get('ID') + " is not current")
+
+    # collect svc significance calls within a rcv
+    pathocalls = {}
+
+    # collect a list of othernames for this variant
+    rcv_synonyms = []
+    rcv_dbsnps = []
+
+    # There is only one RCV per ClinVarSet
+    rcv_variant_id = rcv_variant_type = rcv_variant_label = None
+    rcv_disease_db = rcv_disease_id = rcv_disease_label = None
+    rcv_disease_curi = rcv_ncbigene_id = rcv_gene_symbol = None
+
+    RCVAssertion = ClinVarSet.find('./ReferenceClinVarAssertion')
+    rcv_created = RCVAssertion.get('DateCreated')
+    rcv_updated = RCVAssertion.get('DateLastUpdated')
+    rcv_id = RCVAssertion.get('ID')
+    # /ReleaseSet/ClinVarSet/ReferenceClinVarAssertion/ClinVarAccession/@Acc
+    # 162,466  2016-Mar
+    rcv_acc = RCVAssertion.find('./ClinVarAccession').get('Acc')
+
+    # I do not expect we care as we shouldn't keep the RCV.
+    if RCVAssertion.find('./RecordStatus').text != 'current':
+        LOG.warning(
+            rcv_acc + " <is not current on>")  # + rs_dated)
+
+    # # # Child elements
+    #
+    # /RCV/Assertion
+    # /RCV/AttributeSet
+    # /RCV/Citation
+    # /RCV/ClinVarAccession
+    # /RCV/ClinicalSignificance
+    # /RCV/MeasureSet
+    # /RCV/ObservedIn
+    # /RCV/RecordStatus
+    # /RCV/TraitSet
+
+    #######################################################################
+    # Our Genotype/Subject is a sequence alteration / Variant
+    # which apparently was Measured
+
+    # /ReleaseSet/ClinVarSet/ReferenceClinVarAssertion/MeasureSet/@ID
+    # 162,466  2016-Mar
+    # 366,566  2017-Mar
+
+    # are now up to three types
+    # <GenotypeSet ID="424700" Type="CompoundHeterozygote">
+    # <MeasureSet  ID="242681" Type="Variant">
+    # <Measure     ID="46900"  Type="single nucleotide variant">
+
+    RCV_MeasureSet = RCVAssertion.find('./MeasureSet')
+    # Note: it is a "set" but have only seen a half dozen with two,
+    # all of type:  copy number gain  SO:0001742
+
+    if RCV_MeasureSet is None:
+        #  201705 introduced GenotypeSet a CompoundHeterozygote
+        #  with multiple variants
+        RCV_GenotypeSet = RCVAssertion.find('./GenotypeSet')
+        rcv_variant_supertype = RCV_GenotypeSet.get('Type')
+        for RCV_MeasureSet in RCV_GenotypeSet.findall('./MeasureSet'):
+            if rcv_variant_id is not None:
+                rcv_variant_id += ',' + RCV_MeasureSet.get('ID')
+            else:
+                rcv_variant_id = RCV_MeasureSet.get('ID')
+    else:
+        rcv_variant_id = RCV_MeasureSet.get('ID')
+        rcv_variant_supertype = RCV_MeasureSet.get('Type')
+
+    for RCV_Measure in RCV_MeasureSet.findall('./Measure'):
+
+        if rcv_variant_supertype == "Variant":
+            rcv_variant_type = resolve(RCV_Measure.get('Type'), LTT)
+        elif rcv_variant_supertype == "Haplotype":
+            rcv_variant_type = resolve('haplotype', LTT)
+        elif rcv_variant_supertype == "CompoundHeterozygote":
+            rcv_variant_type = resolve(
+                'variant single locus complement', LTT)
+            # this resolve('has_zygosity', LTT)
+            # resolve('complex heterozygous', LTT)
+        # get blessing for this
+        elif rcv_variant_supertype == "Phase unknown":
+            rcv_variant_type = resolve(RCV_Measure.get('Type'), LTT)
+        else:
+            rcv_variant_id = None
+            LOG.warning(
+                rcv_acc + " UNKNOWN VARIANT SUPERTYPE / TYPE \n" +
+                rcv_variant_supertype + " / " + RCV_Measure.get('Type'))
+            continue
+
+        RCV_VariantName = RCV_Measure.find(
+            './Name/ElementValue[@Type="Preferred"]')
+        if RCV_VariantName is not None:
+            rcv_variant_label = RCV_VariantName.text
+        # else:
+        #    LOG.warning(
+        #       rcv_acc + " VARIANT MISSING LABEL")
+
+        # XRef[@DB="dbSNP"]/@ID
+        for RCV_dbSNP in \
+                RCV_Measure.findall('./XRef[@DB="dbSNP"]'):
+
+            rcv_dbsnps.append(RCV_dbSNP.get('ID'))
+
+        # this xpath works but is not supported by ElementTree.
+        # ./AttributeSet/Attribute[starts-with(@Type, "HGVS")]
+        for RCV_Synonym in \
+                RCV_Measure.findall('./AttributeSet/Attribute[@Type]'):
+            if RCV_Synonym.get('Type') is not None and \
+                    RCV_Synonym.text is not None and \
+                    re.match(r'^HGVS', RCV_Synonym.get('Type')):
+                rcv_synonyms.append(RCV_Synonym.text)
+
+        # /RCV/MeasureSet/Measure/Name/ElementValue/[@Type="Preferred"]
+        # /RCV/MeasureSet/Measure/MeasureRelationship[@Type]/XRef[@DB="Gene"]/@ID
+
+        # RCV_Variant = RCV_Measure.find(
+        #    './MeasureRelationship[@Type="variant in gene"]')
+
+        # 540074 genes overlapped by variant
+        # 176970 within single gene
+        # 24746 within multiple genes by overlap
+        # 5698 asserted, but not computed
+        # 439 near gene, upstream
+        # 374 variant in gene
+        # 54 near gene, downstream
+
+        RCV_Variant = RCV_Measure.find('./MeasureRelationship')
+
+        if RCV_Variant is None:  # try letting them all through
+            LOG.info(ET.tostring(RCV_Measure).decode('utf-8'))
+        else:
+            rcv_variant_relationship_type = RCV_Variant.get('Type')
+            # if rcv_variant_relationship_type is not None:
+            #    LOG.warning(
+            #        rcv_acc +
+            #        ' rcv_variant_relationship_type ' +
+            #        rcv_variant_relationship_type)
+
+            # XRef[@DB="Gene"]/@ID
+            RCV_Gene = RCV_Variant.find('./XRef[@DB="Gene"]')
+            if rcv_ncbigene_id is None and RCV_Gene is not None:
+                rcv_ncbigene_id = RCV_Gene.get('ID')
+            # elif rcv_ncbigene_id is None:
+            #    LOG.warning(rcv_acc + " VARIANT MISSING NCBIGene ID")
+
+            # Symbol/ElementValue[@Type="Preferred"]
+            RCV_Symbol = RCV_Variant.find(
+                './Symbol/ElementValue[@Type="Preferred"]')
+            if rcv_gene_symbol is None and RCV_Symbol is not None:
+                rcv_gene_symbol = RCV_Symbol.text
+
+            if rcv_gene_symbol is None:
+                LOG.warning(rcv_acc + " VARIANT MISSING Gene Symbol")
+
+    #######################################################################
+    # the Object is the Disease, here is called a "trait"
+    # reluctantly starting with the RCV disease
+    # not the SCV traits as submitted due to time constraints
+
+    for RCV_TraitSet in RCVAssertion.findall('./TraitSet'):
+        # /RCV/TraitSet/Trait[@Type="Disease"]/@ID
+        # 144,327   2016-Mar
+
+        # /RCV/TraitSet/Trait[@Type="Disease"]/XRef/@DB
+        #     29 Human Phenotype Ontology
+        #     82 EFO
+        #    659 Gene
+        #  53218 Orphanet
+        #  57356 OMIM
+        # 142532 MedGen
+
+        RCV_TraitName = RCV_TraitSet.find(
+            './Trait[@Type="Disease"]/Name/ElementValue[@Type="Preferred"]')
+
+        if RCV_TraitName is not None:
+            rcv_disease_label = RCV_TraitName.text
+        # else:
+        #    LOG.warning(rcv_acc + " MISSING DISEASE NAME")
+
+        # Prioritize OMIM
+        for RCV_Trait in RCV_TraitSet.findall('./Trait[@Type="Disease"]'):
+            if rcv_disease_db is not None:
+                break
+            for RCV_TraitXRef in RCV_Trait.findall(
+                    './XRef[@DB="OMIM"]'):
+                rcv_disease_db = RCV_TraitXRef.get('DB')
+                rcv_disease_id = RCV_TraitXRef.get('ID')
+                break
+
+        # Accept Orphanet if no OMIM
+        if rcv_disease_db is None or rcv_disease_id is None:
+            for RCV_Trait in \
+                    RCV_TraitSet.findall('./Trait[@Type="Disease"]'):
+                if rcv_disease_db is not None:
+                    break
+                for RCV_TraitXRef in RCV_Trait.findall(
+                        './XRef[@DB="Orphanet"]'):
+                    rcv_disease_db = RCV_TraitXRef.get('DB')
+                    rcv_disease_id = RCV_TraitXRef.get('ID')
+                    break
+
+        # Otherwise go with MedGen
+        if rcv_disease_db is None or rcv_disease_id is None:
+            for RCV_Trait in \
+                    RCV_TraitSet.findall('./Trait[@Type="Disease"]'):
+                if rcv_disease_db is not None:
+                    break
+                for RCV_TraitXRef in RCV_Trait.findall(
+                        './XRef[@DB="MedGen"]'):
+                    rcv_disease_db = RCV_TraitXRef.get('DB')
+                    rcv_disease_id = RCV_TraitXRef.get('ID')
+                    break
+
+        # See if there are any leftovers. Possibilities include:
+        # EFO, Gene, Human Phenotype Ontology
+        if rcv_disease_db is None:
+            for RCV_Trait in\
+                    RCV_TraitSet.findall('./Trait[@Type="Disease"]'):
+                for RCV_TraitXRef in RCV_Trait.findall('./XRef'):
+                    LOG.warning(
+                        rcv_acc + " UNKNOWN DISEASE DB:\t" +
+                        RCV_TraitXRef.get('DB') + ":" +
+                        RCV_TraitXRef.get('ID'))
+                    # 82372 MedGen
+                    #    58 EFO
+                    #     1 Human Phenotype Ontology
+                    break
+
+    # Check that we have enough info from the RCV
+    # to justify parsing the related SCVs
+    if rcv_disease_db is None or rcv_disease_id is None or \
+            rcv_disease_label is None or rcv_variant_id is None or \
+            rcv_variant_type is None or rcv_variant_label is None:
+        LOG.info('%s is under specified. SKIPPING', rcv_acc)
+        # Write this Clinvar set out so we can know what we are missing
+        # (minidom's toprettyxml is too slow. doubles time)
+        return ([], ET.tostring(ClinVarSet).decode('utf-8'))
+
+    # start anew
+    del rcvtriples[:]
+
+    rcv_disease_curi = rcv_disease_db + ':' + rcv_disease_id
+    rcv_variant_id = 'ClinVarVariant:' + rcv_variant_id
+
+    if rcv_ncbigene_id is not None and rcv_ncbigene_id.isnumeric():
+        rcv_ncbigene_curi = 'NCBIGene:' + str(rcv_ncbigene_id)
+        #           RCV only TRIPLES
+        term_id = resolve(rcv_variant_relationship_type, LTT)
+        if term_id is not None:
+            # <rcv_variant_id> <GENO:0000418> <scv_ncbigene_id>
+            write_spo(
+                rcv_variant_id,
+                term_id,
+                rcv_ncbigene_curi)
+        else:
+            # LOG.warning(
+            # 'Check relationship type: ' + rcv_variant_relationship_type)
+            return ([], None)
+
+        # <scv_ncbigene_id><rdfs:label><scv_gene_symbol>
+        if rcv_gene_symbol is not None:
+            write_spo(rcv_ncbigene_curi, 'rdfs:label', rcv_gene_symbol)
+
+    #######################################################################
+    # Descend into each SCV grouped with the current RCV
+    #######################################################################
+
+    # keep a collection of a SCV's associations and patho significance call
+    # when this RCV's set is complete, interlink based on patho call
+
+    pathocalls = {}
+
+    for SCV_Assertion in ClinVarSet.findall('./ClinVarAssertion'):
+
+        # /SCV/AdditionalSubmitters
+        # /SCV/Assertion
+        # /SCV/AttributeSet
+        # /SCV/Citation
+        # /SCV/ClinVarAccession
+        # /SCV/ClinVarSubmissionID
+        # /SCV/ClinicalSignificance
+        # /SCV/Comment
+        # /SCV/CustomAssertionScore
+        # /SCV/ExternalID
+        # /SCV/MeasureSet
+        # /SCV/ObservedIn
+        # /SCV/RecordStatus
+        # /SCV/StudyDescription
+        # /SCV/StudyName
+        # /SCV/TraitSet
+
+        # init
+        # scv_review = scv_significance = None
+        # scv_assertcount += 1
+
+        scv_id = SCV_Assertion.get('ID')
+        monarch_id = digest_id(rcv_id + scv_id)
+        monarch_assoc = 'MONARCH:' + monarch_id
+
+        ClinVarAccession = SCV_Assertion.find('./ClinVarAccession')
+        scv_acc = ClinVarAccession.get('Acc')
+        scv_accver = ClinVarAccession.get('Version')
+        scv_orgid = ClinVarAccession.get('OrgID')
+        scv_updated = ClinVarAccession.get('DateUpdated')
+        scv_submitter = None
+        SCV_SubmissionID = SCV_Assertion.find('./ClinVarSubmissionID')
+        if SCV_SubmissionID is not None:
+            scv_submitter = SCV_SubmissionID.get('submitter')
+
+        # blank node identifiers
+        _evidence_id = '_:' + digest_id(monarch_id + '_evidence')
+        write_spo(_evidence_id, 'rdfs:label', monarch_id + '_evidence')
+
+        _assertion_id = '_:' + digest_id(monarch_id + '_assertion')
+        write_spo(_assertion_id, 'rdfs:label', monarch_id + '_assertion')
+
+        #                   TRIPLES
+        # <monarch_assoc><rdf:type><OBAN:association>  .
+        write_spo(monarch_assoc, 'rdf:type', 'OBAN:association')
+        # <monarch_assoc>
+        #   <OBAN:association_has_subject>
+        #       <ClinVarVariant:rcv_variant_id>
+        write_spo(
+            monarch_assoc, 'OBAN:association_has_subject', rcv_variant_id)
+        # <ClinVarVariant:rcv_variant_id><rdfs:label><rcv_variant_label>  .
+        write_spo(rcv_variant_id, 'rdfs:label', rcv_variant_label)
+        # <ClinVarVariant:rcv_variant_id><rdf:type><rcv_variant_type>  .
+        write_spo(rcv_variant_id, 'rdf:type', rcv_variant_type)
+        if rcv_variant_supertype == "CompoundHeterozygote":
+            write_spo(
+               rcv_variant_id,
+               resolve('has_zygosity', LTT),
+               resolve('complex heterozygous', LTT))
+
+        # <ClinVarVariant:rcv_variant_id><GENO:0000418>
+
+        # RCV/MeasureSet/Measure/AttributeSet/XRef[@DB="dbSNP"]/@ID
+        # <ClinVarVariant:rcv_variant_id><OWL:sameAs><dbSNP:rs>
+        for rcv_variant_dbsnp_id in rcv_dbsnps:
+            write_spo(
+                rcv_variant_id,
+                'OIO:hasdbxref',
+                'dbSNP:' + rcv_variant_dbsnp_id)
+        rcv_dbsnps = []
+        # <ClinVarVariant:rcv_variant_id><in_taxon><human>
+        write_spo(
+            rcv_variant_id, resolve('in taxon', LTT),
+            resolve('Homo sapiens', LTT))
+
+        # /RCV/MeasureSet/Measure/AttributeSet/Attribute[@Type="HGVS.*"]
+        for syn in rcv_synonyms:
+            write_spo(rcv_variant_id, 'OIO:hasExactSynonym', syn)
+        rcv_synonyms = []
+        # <monarch_assoc><OBAN:association_has_object><rcv_disease_curi>  .
+        write_spo(
+            monarch_assoc, 'OBAN:association_has_object', rcv_disease_curi)
+        # <rcv_disease_curi><rdfs:label><rcv_disease_label>  .
+        write_spo(rcv_disease_curi, 'rdfs:label', rcv_disease_label)
+        # <monarch_assoc><SEPIO:0000007><:_evidence_id>  .
+        write_spo(
+            monarch_assoc,
+            resolve('has_supporting_evidence', LTT), _evidence_id)
+        # <monarch_assoc><SEPIO:0000015><:_assertion_id>  .
+        write_spo(
+            monarch_assoc, resolve('is_asserted_in', LTT), _assertion_id)
+
+        # <:_evidence_id><rdf:type><ECO:0000000> .
+        write_spo(_evidence_id, 'rdf:type', resolve('evidence', LTT))
+
+        # <:_assertion_id><rdf:type><SEPIO:0000001> .
+        write_spo(_assertion_id, 'rdf:type', resolve('assertion', LTT))
+        # <:_assertion_id><rdfs:label><'assertion'>  .
+        write_spo(
+            _assertion_id, 'rdfs:label', 'ClinVarAssertion_' + scv_id)
+
+        # <:_assertion_id><SEPIO_0000111><:_evidence_id>
+        write_spo(
+            _assertion_id,
+            resolve('is_assertion_supported_by_evidence', LTT),
+            _evidence_id)
+
+        # <:_assertion_id><dc:identifier><scv_acc + '.' + scv_accver>
+        write_spo(
+            _assertion_id, 'dc:identifier', scv_acc + '.' + scv_accver)
+        # <:_assertion_id><SEPIO:0000018><ClinVarSubmitters:scv_orgid>  .
+        write_spo(
+            _assertion_id, resolve('created_by', LTT),
+            'ClinVarSubmitters:' + scv_orgid)
+        # <ClinVarSubmitters:scv_orgid><rdf:type><foaf:organization>  .
+        write_spo(
+            'ClinVarSubmitters:' + scv_orgid,
+            'rdf:type',
+            'foaf:organization')
+        # <ClinVarSubmitters:scv_orgid><rdfs:label><scv_submitter>  .
+        if scv_submitter is not None:
+            write_spo(
+                'ClinVarSubmitters:' + scv_orgid,
+                'rdfs:label',
+                scv_submitter)
+        ################################################################
+        ClinicalSignificance = SCV_Assertion.find('./ClinicalSignificance')
+        if ClinicalSignificance is not None:
+            scv_eval_date = str(
+                ClinicalSignificance.get('DateLastEvaluated'))
+
+        # bummer. cannot specify xpath parent '..' targeting above .find()
+        for SCV_AttributeSet in SCV_Assertion.findall('./AttributeSet'):
+            # /SCV/AttributeSet/Attribute[@Type="AssertionMethod"]
+            SCV_Attribute = SCV_AttributeSet.find(
+                './Attribute[@Type="AssertionMethod"]')
+            if SCV_Attribute is not None:
+                SCV_Citation = SCV_AttributeSet.find(
+                    './Citation')
+
+                # <:_assertion_id><SEPIO:0000021><scv_eval_date>  .
+                if scv_eval_date != "None":
+                    write_spo(
+                        _assertion_id,
+                        resolve('date_created', LTT), scv_eval_date)
+
+                scv_assert_method = SCV_Attribute.text
+                #  need to be mapped to a <sepio:100...n> curie ????
+                # if scv_assert_method in TT:
+                # scv_assert_id = resolve(scv_assert_method, LTT)
+                # _assertion_method_id = '_:' + monarch_id + \
+                #    '_assertionmethod_' + digest_id(scv_assert_method)
+                #
+                # changing to not include context till we have IRI
+
+                # blank node, would be be nice if these were only made once
+                _assertion_method_id = '_:' + digest_id(
+                    scv_assert_method + '_assertionmethod')
+                write_spo(
+                    _assertion_method_id, 'rdfs:label',
+                    scv_assert_method + '_assertionmethod')
+
+                #       TRIPLES   specified_by
+                # <:_assertion_id><SEPIO:0000041><_assertion_method_id>
+                write_spo(
+                    _assertion_id,
+                    resolve('is_specified_by', LTT), _assertion_method_id)
+
+                # <_assertion_method_id><rdf:type><SEPIO:0000037>
+                write_spo(
+                    _assertion_method_id,
+                    'rdf:type', resolve('assertion method', LTT))
+
+                # <_assertion_method_id><rdfs:label><scv_assert_method>
+                write_spo(
+                    _assertion_method_id, 'rdfs:label', scv_assert_method)
+
+                # <_assertion_method_id><ERO:0000480><scv_citation_url>
+                if SCV_Citation is not None:
+                    SCV_Citation_URL = SCV_Citation.find('./URL')
+                    if SCV_Citation_URL is not None:
+                        write_spo(
+                            _assertion_method_id,
+                            resolve('has_url', LTT),
+                            SCV_Citation_URL.text)
+
+        # scv_type = ClinVarAccession.get('Type')  # assert == 'SCV' ?
+        # RecordStatus                             # assert =='current' ?
+
+        # SCV_ReviewStatus = ClinicalSignificance.find('./ReviewStatus')
+        # if SCV_ReviewStatus is not None:
+        #    scv_review = SCV_ReviewStatus.text
+
+        # SCV/ClinicalSignificance/Citation/ID
+        # see also:
+        # SCV/ObservedIn/ObservedData/Citation/'ID[@Source="PubMed"]
+        for SCV_Citation in \
+                ClinicalSignificance.findall(
+                    './Citation/ID[@Source="PubMed"]'):
+            scv_citation_id = SCV_Citation.text
+            #           TRIPLES
+            # has_part -> has_supporting_reference
+            # <:_evidence_id><SEPIO:0000124><PMID:scv_citation_id>  .
+            write_spo(
+                _evidence_id,
+                resolve('has_supporting_reference', LTT),
+                'PMID:' + scv_citation_id)
+            # <:monarch_assoc><dc:source><PMID:scv_citation_id>
+            write_spo(
+                monarch_assoc,
+                'dc:source',
+                'PMID:' + scv_citation_id)
+
+            # <PMID:scv_citation_id><rdf:type><IAO:0000013>
+            write_spo(
+                'PMID:' + scv_citation_id,
+                'rdf:type',
+                resolve('journal article', LTT))
+
+            # <PMID:scv_citation_id><SEPIO:0000123><literal>
+
+        scv_significance = scv_geno = None
+        SCV_Description = ClinicalSignificance.find('./Description')
+        if SCV_Description is not None:
+            scv_significance = SCV_Description.text
+            scv_geno = resolve(scv_significance, LTT)
+            if scv_geno is not None \
+                    and scv_geno != resolve('uncertain significance', LTT):
+                # we have the association's (SCV) pathnogicty call
+                # and its significance is explicit
+                ##########################################################
+                # 2016 july.
+                # We do not want any of the proceeding triples
+                # unless we get here (no implicit "uncertain significance")
+                # TRIPLES
+                # <monarch_assoc>
+                #   <OBAN:association_has_predicate>
+                #       <scv_geno>
+                write_spo(
+                    monarch_assoc,
+                    'OBAN:association_has_predicate',
+                    scv_geno)
+                # <rcv_variant_id><scv_geno><rcv_disease_db:rcv_disease_id>
+                write_spo(rcv_variant_id, scv_geno, rcv_disease_curi)
+                # <monarch_assoc><OIO:hasdbxref><ClinVar:rcv_acc>  .
+                write_spo(
+                    monarch_assoc, 'OIO:hasdbxref', 'ClinVar:' + rcv_acc)
+
+                # store association's significance to compare w/sibs
+                pathocalls[monarch_assoc] = scv_geno
+            else:
+                del rcvtriples[:]
+                continue
+        # if we have deleted the triples buffer then
+        # there is no point in continueing  (I don't think)
+        if len(rcvtriples) == 0:
+            continue
+        # scv_assert_type = SCV_Assertion.find('./Assertion').get('Type')
+        # check scv_assert_type == 'variation to disease'?
+        # /SCV/ObservedIn/ObservedData/Citation/'ID[@Source="PubMed"]
+        for SCV_ObsIn in SCV_Assertion.findall('./ObservedIn'):
+            # /SCV/ObservedIn/Sample
+            # /SCV/ObservedIn/Method
+            for SCV_ObsData in SCV_ObsIn.findall('./ObservedData'):
+                for SCV_Citation in SCV_ObsData.findall('./Citation'):
+
+                    for scv_citation_id in \
+                            SCV_Citation.findall('./ID[@Source="PubMed"]'):
+                        # has_supporting_reference
+                        # see also: SCV/ClinicalSignificance/Citation/ID
+                        # <_evidence_id><SEPIO:0000124><PMID:scv_citation_id>
+                        write_spo(
+                            _evidence_id,
+                            resolve('has_supporting_reference', LTT),
+                            'PMID:' + scv_citation_id.text)
+                        # <PMID:scv_citation_id><rdf:type><IAO:0000013>
+                        write_spo(
+                            'PMID:' + scv_citation_id.text,
+                            'rdf:type',
+                            resolve('journal article', LTT))
+
+                        # <:monarch_assoc><dc:source><PMID:scv_citation_id>
+                        write_spo(
+                            monarch_assoc,
+                            'dc:source',
+                            'PMID:' + scv_citation_id.text)
+                    for scv_pub_comment in \
+                            SCV_Citation.findall(
+                                './Attribute[@Type="Description"]'):
+                        # <PMID:scv_citation_id><rdf:comment><scv_pub_comment>
+                        write_spo(
+                            'PMID:' + scv_citation_id.text,
+                            'rdf:comment',
+                            scv_pub_comment)
+                # for SCV_Citation in SCV_ObsData.findall('./Citation'):
+                for SCV_Description in \
+                        SCV_ObsData.findall(
+                            'Attribute[@Type="Description"]'):
+                    # <_evidence_id> <dc:description> "description"
+                    if SCV_Description.text != 'not provided':
+                        write_spo(
+                            _evidence_id,
+                            'dc:description',
+                            SCV_Description.text)
+
+            # /SCV/ObservedIn/TraitSet
+            # /SCV/ObservedIn/Citation
+            # /SCV/ObservedIn/Co-occurrenceSet
+            # /SCV/ObservedIn/Comment
+            # /SCV/ObservedIn/XRef
+
+            # /SCV/Sample/Origin
+            # /SCV/Sample/Species@TaxonomyId="9606" is a constant
+            # scv_affectedstatus = \
+            #    SCV_ObsIn.find('./Sample').find('./AffectedStatus').text
+
+            # /SCV/ObservedIn/Method/NamePlatform
+            # /SCV/ObservedIn/Method/TypePlatform
+            # /SCV/ObservedIn/Method/Description
+            # /SCV/ObservedIn/Method/SourceType
+            # /SCV/ObservedIn/Method/MethodType
+            # /SCV/ObservedIn/Method/MethodType
+            for SCV_OIMT in SCV_ObsIn.findall('./Method/MethodType'):
+                if SCV_OIMT.text != 'not provided':
+                    scv_evidence_type = resolve(SCV_OIMT.text, LTT)
+                    if scv_evidence_type is None:
+                        LOG.warning(
+                            'No mapping for scv_evidence_type: %s',
+                            SCV_OIMT.text)
+                        continue
+                    # blank node
+                    _provenance_id = '_:' + digest_id(
+                        _evidence_id + scv_evidence_type)
+
+                    write_spo(
+                        _provenance_id, 'rdfs:label',
+                        _evidence_id + scv_evidence_type)
+
+                    # TRIPLES
+                    # has_provenance -> has_supporting_study
+                    # <_evidence_id><SEPIO:0000011><_provenence_id>
+                    write_spo(
+                        _evidence_id,
+                        resolve('has_supporting_activity', LTT),
+                        _provenance_id)
+
+                    # <_:provenance_id><rdf:type><scv_evidence_type>
+                    write_spo(
+                        _provenance_id, 'rdf:type', scv_evidence_type)
+
+                    # <_:provenance_id><rdfs:label><SCV_OIMT.text>
+                    write_spo(
+                        _provenance_id, 'rdfs:label', SCV_OIMT.text)
+        # End of a SCV (a.k.a. MONARCH association)
+    # End of the ClinVarSet.
+    # Output triples that only are known after processing sibbling records
+    scv_link(pathocalls, rcvtriples)
+    return (list(rcvtriples), None)
+
+
+class ClinVarXML(Source):
+    """
+    The full ClinVar release, as SEPIO assertions about the association
+    of each variant (RCV) with a disease, one per submission (SCV).
+
+    The gzipped release is split into its ClinVarSet stanzas
+    on a reader thread, and with more than one process (see
+    set_processes()) batches of them are converted in a pool of
+    worker processes, and their triples added in the order read.
+    The distinct triples are kept in sorted runs on disk (see SpillStore)
+    and merged into the output by write(), so memory does not grow with
+    the size of the release.
+
+    """
+
+    files = {
+        'f1': {
+            'file': 'ClinVarFullRelease_00-latest.xml.gz',
+            'url': 'ftp://ftp.ncbi.nlm.nih.gov/pub/clinvar/xml/ClinVarFullRelease_00-latest.xml.gz'}
+    }
+
+    # the RCV and SCV accessions of the ClinVarSets converted in test mode,
+    # one per line, in the raw directory (as for ClinVarXML_Subset.sh)
+    test_file = 'CV_test_RCV.txt'
+
+    # ClinVarSet stanzas converted at a time
+    batch_size = 100
+    # bytes read from the release at a time
+    block_size = 2**20
+    # distinct triples held in memory before a sorted run is written
+    run_size = 250000
+
+    def __init__(self, graph_type, are_bnodes_skolemized):
+        super().__init__(
+            graph_type, are_bnodes_skolemized, 'clinvarxml_alpha')
+
+        self.dataset = Dataset(
+            'ClinVarXML', 'National Center for Biotechnology Information',
+            'http://www.ncbi.nlm.nih.gov/clinvar/', None,
+            'http://www.ncbi.nlm.nih.gov/About/disclaimer.html',
+            'https://creativecommons.org/publicdomain/mark/1.0/')
+
+        self.outfile = '/'.join((self.outdir, self.name + '.nt'))
+        ttdir = os.path.join(
+            os.path.dirname(__file__), '..', '..', 'translationtable')
+        with open(os.path.join(ttdir, 'global_terms.yaml')) as fh:
+            self.globaltt = yaml.safe_load(fh)
+        with open(os.path.join(ttdir, self.name + '.yaml')) as fh:
+            self.localtt = yaml.safe_load(fh)
+        # the triples of the release, once parsed
+        self.triples = None
+        # the attributes of the ReleaseSet, once read
+        self.release = {}
+
+        return
+
+    def fetch(self, is_dl_forced=False):
+        self.get_files(is_dl_forced)
+
+        return
+
+    def parse(self, limit=None):
+        """
+        Convert the ClinVarSets of the release,
+        writing those that are under specified to <release>_REJECT.xml.
+        In test mode, only those with an accession in test_file.
+        :param limit: number of ClinVarSets to convert
+        :return: None
+        """
+        filename = '/'.join((self.rawdir, self.files['f1']['file']))
+        basename = re.sub(r'\.xml.gz$', '', self.files['f1']['file'])
+        reject_file = '/'.join((self.rawdir, basename + '_REJECT.xml'))
+        LOG.info("Parsing %s", filename)
+
+        if self.testOnly:
+            self.testMode = True
+        test_ids = None
+        if self.testMode:
+            test_ids = self._get_test_ids()
+
+        if self.triples is not None:
+            self.triples.close()
+        self.triples = SpillStore(self.run_size)
+        ontology = 'MonarchData:' + os.path.basename(self._get_output_file())
+        tt_args = (self.globaltt, self.localtt, self.are_bnodes_skized)
+        set_translation_tables(*tt_args)
+        self.triples.add(make_spo(ontology, 'a', 'owl:Ontology'))
+
+        rjct_cnt = tot_cnt = 0
+        with open(reject_file, 'w') as reject:
+            if self.processes > 1:
+                with multiprocessing.Pool(
+                        self.processes, set_translation_tables,
+                        tt_args) as pool:
+                    # bounded, so the reader gets no further ahead than this
+                    results = queue.Queue(maxsize=4 * self.processes)
+                    reader = threading.Thread(
+                        target=self._queue_stanzas,
+                        args=(filename, limit, test_ids, pool, results))
+                    reader.daemon = True
+                    reader.start()
+                    result = results.get()
+                    while result is not None:
+                        if isinstance(result, Exception):
+                            raise result
+                        (stanzas, async_result) = result
+                        rjct_cnt += self._add_converted(
+                            async_result.get(), reject)
+                        tot_cnt += stanzas
+                        result = results.get()
+            else:
+                for stanzas in self._read_stanzas(filename, limit, test_ids):
+                    rjct_cnt += self._add_converted(
+                        convert_stanzas(stanzas), reject)
+                    tot_cnt += len(stanzas)
+
+        # first in is last out
+        if self.release.get('Type') != 'full':
+            LOG.warning('Not a full release')
+        rs_dated = self.release.get('Dated')  # "2016-03-01 (date_last_seen)
+        if rs_dated is not None:
+            self.triples.add(make_spo(ontology, 'owl:versionInfo', rs_dated))
+            if self.dataset.version is None:
+                self.dataset.set_version_by_date(rs_dated)
+        # not finalized
+        # self.triples.add(
+        #     make_spo(
+        #        ontology, owl:versionIRI,
+        #        'MonarchArchive:' RELEASEDATE + '/ttl/' + output'))
+
+        if rjct_cnt > 0:
+            LOG.warning(
+                'The %i out of %i records not included are written back to \n%s',
+                rjct_cnt, tot_cnt, reject_file)
+        LOG.info("Finished parsing %d ClinVarSets", tot_cnt)
+
+        return
+
+    def _get_test_ids(self):
+        """
+        :return: set of the accessions (as bytes) listed in test_file
+        """
+        test_ids = set()
+        test_file = '/'.join((self.rawdir, self.test_file))
+        if not os.path.exists(test_file):
+            LOG.warning(
+                "No %s; no ClinVarSets are converted in test mode", test_file)
+            return test_ids
+        with open(test_file, 'r') as fh:
+            for line in fh:
+                line = line.partition('#')[0].strip()
+                if line != '':
+                    test_ids.add(line.encode('ascii'))
+
+        return test_ids
+
+    def _get_output_file(self):
+        """
+        :return: path of the triples, the test file in test mode
+        """
+        if self.testMode:
+            return self.testfile.replace('.ttl', '.nt')
+
+        return self.outfile
+
+    def _add_converted(self, converted, reject):
+        """
+        :param converted: the triples and rejects of a batch of stanzas
+            (see convert_stanzas)
+        :param reject: file to write the rejected ClinVarSets to
+        :return: number of ClinVarSets rejected
+        """
+        (triples, rejects) = converted
+        for triple in triples:
+            if triple is not None:
+                self.triples.add(triple)
+        for clinvarset in rejects:
+            print(clinvarset, file=reject)
+
+        return len(rejects)
+
+    def _read_stanzas(self, filename, limit=None, test_ids=None):
+        """
+        Split the release into the (bytes of) its ClinVarSet elements,
+        keeping the attributes of the ReleaseSet in self.release.
+        :param filename: of the gzipped release
+        :param limit: number of ClinVarSets to read
+        :param test_ids: set of RCV and SCV accessions (bytes);
+            if given, only the ClinVarSets with one of them are read
+        :return: generator of lists of up to batch_size stanzas
+        """
+        (start_tag, end_tag) = (b'<ClinVarSet', b'</ClinVarSet>')
+        self.release = {}
+        count = 0
+        stanzas = []
+        buffer = b''
+        with gzip.open(filename, 'rb') as xml:
+            for block in iter(lambda: xml.read(self.block_size), b''):
+                buffer += block
+                release = -1
+                if not self.release:
+                    release = buffer.find(b'<ReleaseSet')
+                if release >= 0:
+                    release_end = buffer.find(b'>', release)
+                    if release_end < 0:
+                        continue    # read on to the end of its tag
+                    self.release = dict(ET.fromstring(
+                        buffer[release:release_end + 1].rstrip(b'/>') +
+                        b'></ReleaseSet>').attrib)
+                start = buffer.find(start_tag)
+                while start >= 0:
+                    end = buffer.find(end_tag, start)
+                    if end < 0:
+                        break
+                    end += len(end_tag)
+                    stanza = buffer[start:end]
+                    start = buffer.find(start_tag, end)
+                    if test_ids is not None and test_ids.isdisjoint(
+                            ACCESSIONRE.findall(stanza)):
+                        continue
+                    stanzas.append(stanza)
+                    count += 1
+                    if limit is not None and count >= limit:
+                        yield stanzas
+                        return
+                    if len(stanzas) == self.batch_size:
+                        yield stanzas
+                        stanzas = []
+                if start >= 0:
+                    buffer = buffer[start:]
+                else:
+                    # keep what could be the start of a start tag
+                    buffer = buffer[-len(start_tag):]
+        if stanzas:
+            yield stanzas
+
+        return
+
+    def _queue_stanzas(self, filename, limit, test_ids, pool, results):
+        """
+        Queue up the batches of stanzas of the release for the pool
+        to convert, as (number of stanzas, AsyncResult), then None.
+        :param filename: of the gzipped release
+        :param limit: number of ClinVarSets to read
+        :param test_ids: accessions of the ClinVarSets to read, or None
+        :param pool: of worker processes
+        :param results: Queue
+        :return: None
+        """
+        try:
+            for stanzas in self._read_stanzas(filename, limit, test_ids):
+                results.put((
+                    len(stanzas),
+                    pool.apply_async(convert_stanzas, (stanzas,))))
+        except Exception as e:  # raised again by the one adding the triples
+            results.put(e)
+        results.put(None)
+
+        return
+
+    def write(self, fmt='nt', stream=None):
+        """
+        Write the distinct triples of the release, as ntriples,
+        and the dataset description as turtle
+        :param fmt: only 'nt'
+        :param stream: 'stdout', else the triples go to self.outfile
+            (or the test file, in test mode)
+        :return: None
+        """
+        if fmt != 'nt':
+            LOG.warning("Writing %s as ntriples, not %s", self.name, fmt)
+
+        datasetfile = '/'.join((self.outdir, self.name + '_dataset.ttl'))
+        if self.dataset.version is None:
+            self.dataset.set_version_by_date()
+        GraphUtils(None).write(
+            self.dataset.getGraph(), 'turtle', file=datasetfile)
+
+        if stream is not None and stream.lower().strip() == 'stdout':
+            self.triples.write(sys.stdout)
+        else:
+            # avoid clobbering existing output until we are finished
+            outfile = self._get_output_file()
+            part = outfile + '.part'
+            with open(part, 'w', encoding='utf-8') as output:
+                self.triples.write(output)
+            os.replace(part, outfile)
+        self.triples.close()
+        self.triples = None
+
+        return
+
+    def getTestSuite(self):
+        import unittest
+        from tests.test_clinvarxml import ClinVarXMLTestCase
+
+        test_suite = unittest.TestLoader().loadTestsFromTestCase(
+            ClinVarXMLTestCase)
+
+        return test_suite
@@ -1,9 +1,9 @@
 import logging
 import re
+import sys
 import csv
 import gzip
 import io
-import hashlib
 import os
 
 from dipper.sources.PostgreSQLSource import PostgreSQLSource
@@ -15,6 +15,8 @@ from dipper.models.Genotype import Genotype
 from dipper.models.Reference import Reference
 from dipper.models.Environment import Environment
 from dipper.utils.DipperUtil import DipperUtil
+from dipper.utils.IdMinter import IdMinter
+from dipper.utils.IdTable import IdTable
 from dipper import config
 
 
@@ -218,12 +220,14 @@ class FlyBase(PostgreSQLSource):
         # subsequent views of the table will lookup the identifiers
         # in the hash.
         # This allows us to do the 'joining' on the fly
+        # (the keys being ints, these are compact IdTables, not dicts)
         self.idhash = {
-            'allele': {}, 'gene': {}, 'publication': {}, 'stock': {},
-            'genotype': {}, 'annot': {}, 'notes': {}, 'organism': {},
-            'environment': {}, 'feature': {}, 'phenotype': {}, 'cvterm': {},
-            'reagent': {}}
-        self.dbxrefs = {}
+            key: IdTable() for key in [
+                'allele', 'gene', 'publication', 'stock', 'genotype',
+                'annot', 'notes', 'organism', 'environment', 'feature',
+                'phenotype', 'cvterm', 'reagent']}
+        # the (db_id, identifier) of each dbxref we use
+        self.dbxrefs = IdTable()
         # to store if a marker is a class or indiv
         self.markers = {'classes': [], 'indiv': []}
 
@@ -234,9 +238,9 @@ class FlyBase(PostgreSQLSource):
         # mappings between internal phenotype db key and multiple cv terms
         self.phenocv = {}
         # keep this mapping so we can track fly things to be leaders
-        self.feature_to_organism_hash = {}
+        self.feature_to_organism_hash = IdTable()
         # store the feature types, they are needed for making some triples
-        self.feature_types = {}
+        self.feature_types = IdTable()
         # when we verify a tax id in eutils
         self.checked_organisms = set()
         self.deprecated_features = set()
@@ -1008,7 +1012,7 @@ class FlyBase(PostgreSQLSource):
                 # get any dbxrefs for pubs, including pmids and dois
                 dbxref_key = dbxref_id
                 if str(dbxref_key) in self.dbxrefs:
-                    dbxrefs = self.dbxrefs[str(dbxref_key)]
+                    dbxrefs = self._get_dbxrefs(str(dbxref_key))
                     # pub_dbs = [75, 51, 76, 95, 126]
                     pmid_ids = [50, 77, 275, 286, 347]
                     # flybase_ids = [4]  # TODO unused
@@ -1155,10 +1159,10 @@ class FlyBase(PostgreSQLSource):
                             logger.warning(
                                 'id %s may be malformed; skipping', did)
 
-                    self.dbxrefs[dbxref_id] = {db_id: did}
+                    self.dbxrefs[dbxref_id] = (sys.intern(db_id), did)
 
                 elif url != '':
-                    self.dbxrefs[dbxref_id] = {db_id: url.strip()}
+                    self.dbxrefs[dbxref_id] = (sys.intern(db_id), url.strip())
                 else:
                     continue
 
@@ -1166,7 +1170,7 @@ class FlyBase(PostgreSQLSource):
                 if int(db_id) == 2 \
                         and accession.strip() == 'transgenic_transposon':
                     # transgenic_transposable_element
-                    self.dbxrefs[dbxref_id] = {db_id: 'SO:0000796'}
+                    self.dbxrefs[dbxref_id] = (sys.intern(db_id), 'SO:0000796')
 
                 line_counter += 1
 
@@ -1447,7 +1451,7 @@ class FlyBase(PostgreSQLSource):
                 self.idhash['cvterm'][cvterm_key] = cvterm_id
                 # look up the dbxref_id for the cvterm
                 # hopefully it's one-to-one
-                dbxrefs = self.dbxrefs.get(dbxref_id)
+                dbxrefs = self._get_dbxrefs(dbxref_id)
                 if dbxrefs is not None:
                     if len(dbxrefs) > 1:
                         logger.info(
@@ -1457,6 +1461,8 @@ class FlyBase(PostgreSQLSource):
                         # replace the cvterm with
                         # the dbxref (external) identifier
                         did = dbxrefs.popitem()[1]
+                        # which uses up the dbxref
+                        del self.dbxrefs[dbxref_id]
                         # get the value
                         self.idhash['cvterm'][cvterm_key] = did
                         # also add the label to the dbxref
@@ -1545,7 +1551,7 @@ class FlyBase(PostgreSQLSource):
                     continue
                 feature_id = self.idhash['feature'][feature_key]
                 dbxref_key = dbxref_id
-                dbxrefs = self.dbxrefs.get(dbxref_key)
+                dbxrefs = self._get_dbxrefs(dbxref_key)
 
                 if dbxrefs is not None:
                     for d in dbxrefs:
@@ -1987,7 +1993,7 @@ class FlyBase(PostgreSQLSource):
                 organism_id = self.idhash['organism'][organism_key]
 
                 dbxref_key = dbxref_id
-                dbxrefs = self.dbxrefs.get(dbxref_key)
+                dbxrefs = self._get_dbxrefs(dbxref_key)
                 if dbxrefs is not None:
                     for d in dbxrefs:
                         did = dbxrefs.get(d)
@@ -2175,6 +2181,18 @@ class FlyBase(PostgreSQLSource):
 
         return
 
+    def _get_dbxrefs(self, dbxref_key):
+        """
+        :param dbxref_key: the dbxref_id of the dbxref table
+        :return: dict of the db_id to the identifier of the dbxref;
+            None if we do not use it
+        """
+        dbxref = self.dbxrefs.get(dbxref_key)
+        if dbxref is None:
+            return None
+
+        return dict([dbxref])
+
     def _makeInternalIdentifier(self, prefix, key):
         """
         This is a special Flybase-to-MONARCH-ism.
@@ -2196,8 +2214,7 @@ class FlyBase(PostgreSQLSource):
 
         """
 
-        return '_:' + hashlib.sha1(
-            ('fb'+prefix+'key'+key).encode('utf-8')).hexdigest()[1:20]
+        return IdMinter.get().mint('fb'+prefix+'key'+key, 1, 20, '_:')
 
     def getTestSuite(self):
         import unittest
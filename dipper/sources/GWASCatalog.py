@@ -1,19 +1,22 @@
 import logging
 import csv
 import re
+import os
 
 from dipper.sources.Source import Source
 from dipper.models.Dataset import Dataset
 from dipper import config
 from dipper.utils.CurieUtil import CurieUtil
 from dipper.utils.DipperUtil import DipperUtil
+from dipper.utils.Resolver import Resolver
 from dipper.models.Model import Model
 from dipper import curie_map
 from dipper.models.Genotype import Genotype
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Reference import Reference
 from dipper.models.GenomicFeature import Feature, makeChromID
-from dipper.graph.RDFGraph import RDFGraph
+from dipper.models.FaldoEmitter import FaldoEmitter
+from dipper.utils.OntologyIndex import OntologyIndex
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +86,9 @@ class GWASCatalog(Source):
         # to try to get the equivalences
         self.id_location_map = dict()
 
+        # snps often share a position, see _add_snp_to_graph()
+        self.faldo = None
+
         return
 
     def fetch(self, is_dl_forced=False):
@@ -116,17 +122,10 @@ class GWASCatalog(Source):
         """
         raw = '/'.join((self.rawdir, self.files['catalog']['file']))
         logger.info("Processing Data from %s", raw)
-        efo_ontology = RDFGraph()
-        logger.info("Loading EFO ontology in separate rdf graph")
-        efo_ontology.parse(self.files['efo']['url'], format='xml')
-        efo_ontology.bind_all_namespaces()
-        logger.info("Finished loading EFO ontology")
-
-        so_ontology = RDFGraph()
-        logger.info("Loading SO ontology in separate rdf graph")
-        so_ontology.parse(self.files['so']['url'], format='xml')
-        so_ontology.bind_all_namespaces()
-        logger.info("Finished loading SO ontology")
+        efo_ontology = self._get_ontology_index('efo')
+        so_ontology = self._get_ontology_index('so')
+        if not self.testMode:
+            self._prefetch_gene_symbols(raw, limit)
 
         line_counter = 0
 
@@ -224,6 +223,45 @@ class GWASCatalog(Source):
                 logger.info("%s has >1 snp id: %s", l, str(snp_ids))
         return
 
+    @staticmethod
+    def _prefetch_gene_symbols(raw, limit=None):
+        """
+        Start resolving the mapped genes of the haplotypes in the catalog
+        in the background, in batches, rather than one request each
+        as _process_haplotype() gets to them
+        :param raw: path of the catalog
+        :param limit:
+        :return: None
+        """
+        symbols = set()
+        with open(raw, 'r', encoding="iso-8859-1") as csvfile:
+            filereader = csv.reader(csvfile, delimiter='\t')
+            next(filereader, None)  # the header row
+            for (line_counter, row) in enumerate(filereader):
+                if limit is not None and line_counter > limit:
+                    break
+                # mapped_gene and strongest_snp_risk_allele
+                if len(row) > 20 and ';' in row[20]:
+                    symbols.update(re.split(r';\s?', row[14]))
+        Resolver.get().prefetch('symbol', symbols)
+
+        return
+
+    def _get_ontology_index(self, name):
+        """
+        The subclass closure and labels of one of our ontology files,
+        indexed once and kept in the raw directory;
+        read from its url each time if it has not been fetched
+        :param name: 'efo' or 'so'
+        :return: OntologyIndex
+        """
+        ontology_file = '/'.join((self.rawdir, self.files[name]['file']))
+        index_file = ontology_file + '.idx.gz'
+        if not os.path.exists(ontology_file):
+            ontology_file = self.files[name]['url']
+
+        return OntologyIndex.load(ontology_file, index_file)
+
     def _process_haplotype(
             self, hap_id, hap_label, chrom_num, chrom_pos, context,
             risk_allele_frequency, mapped_gene, so_ontology):
@@ -286,16 +324,9 @@ class GWASCatalog(Source):
                 if so_class is None:
                     raise ValueError("Unknown SO class {} in haplotype {}"
                                      .format(context_list[index], hap_label))
-                so_query = """
-                    SELECT ?variant_label
-                    WHERE {{
-                        {0} rdfs:subClassOf+ SO:0001564 ;
-                            rdfs:label ?variant_label .
-                    }}
-                """.format(so_class)
-
-                query_result = so_ontology.query(so_query)
-                if len(list(query_result)) > 0:
+                # gene variants: so_class rdfs:subClassOf+ SO:0001564
+                if so_ontology.is_descendant(so_class, 'SO:0001564') and \
+                        so_ontology.label(so_class) is not None:
                     gene_id = DipperUtil.get_ncbi_id_from_symbol(
                         mapped_genes[index])
                     if gene_id is not None:
@@ -379,9 +410,13 @@ class GWASCatalog(Source):
             g, snp_id, snp_label.strip(),
             Feature.types['SNP'], snp_description)
         if chrom_num != '' and chrom_pos != '':
-            f.addFeatureStartLocation(chrom_pos, chrom_id)
-            f.addFeatureEndLocation(chrom_pos, chrom_id)
-        f.addFeatureToGraph()
+            model.addIndividualToGraph(
+                f.id, f.label, f.type, f.description)
+            if self.faldo is None or self.faldo.graph is not g:
+                self.faldo = FaldoEmitter(g)
+            self.faldo.add_location(snp_id, chrom_id, chrom_pos, chrom_pos)
+        else:
+            f.addFeatureToGraph()
         f.addTaxonToFeature(tax_id)
         # TODO consider adding allele frequency as property;
         # but would need background info to do that
@@ -474,21 +509,13 @@ class GWASCatalog(Source):
 
                 trait_curie = trait.replace("http://www.ebi.ac.uk/efo/EFO_", "EFO:")
 
-                phenotype_query = """
-                    SELECT ?trait
-                    WHERE {{
-                        <{0}> rdfs:subClassOf+ <http://www.ebi.ac.uk/efo/EFO_0000651> .
-                        <{0}> rdfs:label ?trait .
-                    }}
-                """.format(trait)
-
-                query_result = efo_ontology.query(phenotype_query)
-                if len(list(query_result)) > 0:
+                # phenotypes: trait rdfs:subClassOf+ EFO:0000651
+                trait_label = efo_ontology.label(trait)
+                if trait_label is not None and efo_ontology.is_descendant(
+                        trait, 'http://www.ebi.ac.uk/efo/EFO_0000651'):
                     if re.match(r'^EFO', trait_curie):
                         model.addClassToGraph(
-                            trait_curie,
-                            list(query_result)[0][0],
-                            'UPHENO:0001001')
+                            trait_curie, trait_label, 'UPHENO:0001001')
 
                 pubmed_curie = 'PMID:' + pubmed_id
 
@@ -13,6 +13,7 @@ from dipper.models.Genotype import Genotype
 from dipper.models.Reference import Reference
 from dipper.models.Dataset import Dataset
 from dipper.models.Model import Model
+from dipper.utils.UniProtIdMap import UniProtIdMap
 from dipper import config
 
 
@@ -135,6 +136,7 @@ class GeneOntology(Source):
 
             file = '/'.join((self.rawdir, self.files.get(s)['file']))
             self.process_gaf(file, limit, uniprot_entrez_id_map)
+        uniprot_entrez_id_map.close()
 
         logger.info("Finished parsing.")
 
@@ -343,36 +345,16 @@ class GeneOntology(Source):
         return
 
     def get_uniprot_entrez_id_map(self):
+        """
+        The genes of the UniProtKB accessions of our taxa,
+        looked up in an index of the (multi-GB) idmapping file,
+        built the first time, and again only when the file changes
+        :return: UniProtIdMap, used as a dict of accession: gene ids
+        """
         logger.info("Mapping Uniprot ids to Entrez/ENSEMBL gene ids")
-        import sys
-        id_map = {}
         file = '/'.join((self.rawdir, self.files['id-map']['file']))
-        with gzip.open(file, 'rb') as csvfile:
-            csv.field_size_limit(sys.maxsize)
-            filereader = csv.reader(io.TextIOWrapper(csvfile, newline=""),
-                                    delimiter='\t', quotechar='\"')
-            for row in filereader:
-                (uniprotkb_ac, uniprotkb_id, geneid, refseq, gi, pdb, go,
-                 uniref100, unifref90, uniref50, uniparc, pir, ncbitaxon, mim,
-                 unigene, pubmed, embl, embl_cds, ensembl, ensembl_trs,
-                 ensembl_pro, other_pubmed) = row
 
-                if int(ncbitaxon) not in self.tax_ids:
-                    continue
-                if geneid.strip() != '':
-                    idlist = re.split(r';', geneid)
-                    id_map[
-                        uniprotkb_ac.strip()] = [
-                            'NCBIGene:'+i.strip() for i in idlist]
-                elif ensembl.strip() != '':
-                    idlist = re.split(r';', ensembl)
-                    id_map[
-                        uniprotkb_ac.strip()] = [
-                            'ENSEMBL:'+i.strip() for i in idlist]
-
-        logger.info("Acquired %d uniprot-entrez mappings", len(id_map))
-
-        return id_map
+        return UniProtIdMap(file, self.tax_ids)
 
     @staticmethod
     def map_go_evidence_code_to_eco(evidence_code):
@@ -111,6 +111,15 @@ class IMPC(Source):
         # TODO add a citation for impc dataset as a whole
         # :impc cito:citesAsAuthority PMID:24194600
 
+        # reused for every row, by the _add_* methods below
+        self.model = Model(self.graph)
+        self.evidence_model = Evidence(self.graph, None)
+        self.provenance_model = Provenance(self.graph)
+
+        # studies, their parts and evidence are shared by many calls;
+        # describe each of them once
+        self.set_declared_cache(2**17)
+
         return
 
     def fetch(self, is_dl_forced=False):
@@ -157,6 +166,7 @@ class IMPC(Source):
             g = self.graph
         model = Model(g)
         geno = Genotype(g)
+        assoc = G2PAssoc(g, self.name, None, None)
         line_counter = 0
 
         impc_map = self.open_and_parse_yaml(self.map_files['impc_map'])
@@ -452,8 +462,7 @@ class IMPC(Source):
                 # the association comes as a result of a g2p from
                 # a procedure in a pipeline at a center and parameter tested
 
-                assoc = G2PAssoc(g, self.name, sex_qualified_genotype_id,
-                                 phenotype_id)
+                assoc.reset(sex_qualified_genotype_id, phenotype_id)
                 assoc.add_evidence(eco_id)
                 # assoc.set_score(float(p_value))
 
@@ -496,13 +505,11 @@ class IMPC(Source):
                 evidence_line_bnode = \
                     self._add_evidence(
                         assoc_id, eco_id, impc_map, p_value, percentage_change,
-                        effect_size, study_bnode)
+                        effect_size, study_bnode, description)
 
                 self._add_assertion_provenance(assoc_id,
                                                evidence_line_bnode, impc_map)
 
-                model.addDescription(evidence_line_bnode, description)
-
                 # resource_id = resource_name
                 # assoc.addSource(g, assoc_id, resource_id)
 
@@ -530,33 +537,32 @@ class IMPC(Source):
     def _add_assertion_provenance(
             self, assoc_id, evidence_line_bnode, impc_map):
         """
-        Add assertion level provenance, currently always IMPC
+        Add assertion level provenance, currently always IMPC.
+        The assertion is shared by the associations it is made for
+        on the same line of evidence.
         :param assoc_id:
         :param evidence_line_bnode:
         :return:
         """
-        provenance_model = Provenance(self.graph)
-        model = Model(self.graph)
-        assertion_bnode = self.make_id("assertion{0}{1}".format(
-            assoc_id, impc_map['asserted_by']['IMPC']),  '_')
+        provenance_model = self.provenance_model
+        agent_id = impc_map['asserted_by']['IMPC']
 
-        model.addIndividualToGraph(
-            assertion_bnode, None,
-            provenance_model.provenance_types['assertion'])
+        provenance_model.add_agent_to_graph(
+            agent_id, 'International Mouse Phenotyping Consortium',
+            provenance_model.provenance_types['organization'])
 
-        provenance_model.add_assertion(
-            assertion_bnode, impc_map['asserted_by']['IMPC'],
-            'International Mouse Phenotyping Consortium')
+        assertion_bnode = provenance_model.add_shared_provenance(
+            provenance_model.provenance_types['assertion'], [
+                (provenance_model.object_properties['created_by'],
+                 agent_id, False),
+                (provenance_model.object_properties[
+                    'is_assertion_supported_by'],
+                 evidence_line_bnode, False)])
 
         self.graph.addTriple(
             assoc_id, provenance_model.object_properties['is_asserted_in'],
             assertion_bnode)
 
-        self.graph.addTriple(
-            assertion_bnode,
-            provenance_model.object_properties['is_assertion_supported_by'],
-            evidence_line_bnode)
-
         return
 
     def _add_study_provenance(self, impc_map, impress_map,
@@ -584,74 +590,62 @@ class IMPC(Source):
         :return: study bnode
         """
 
-        provenance_model = Provenance(self.graph)
-        model = Model(self.graph)
+        provenance_model = self.provenance_model
+        model = self.model
 
-        # Add provenance
-        # A study is a blank node equal to its parts
-        study_bnode = self.make_id("{0}{1}{2}{3}{4}{5}{6}{7}".format(
-            phenotyping_center, colony, project_fullname, pipeline_stable_id,
-            procedure_stable_id, parameter_stable_id, statistical_method,
-            resource_name), '_')
-
-        model.addIndividualToGraph(
-            study_bnode, None,
-            provenance_model.provenance_types['study'])
+        # Add Colony
+        colony_bnode = self.make_id("{0}".format(colony), '_')
+        if not model.is_declared('_add_colony', colony_bnode):
+            model.addIndividualToGraph(colony_bnode, colony)
 
-        # List of nodes linked to study with has_part property
-        study_parts = []
+        # Add provenance
+        # A study is a blank node equal to its parts:
+        # its procedure and statistical method, the parameter it
+        # measures, its agent and the pipeline and project it is part of
+        procedure_id = impress_map[procedure_stable_id]
+        parameter_id = impress_map[parameter_stable_id]
+        agent_id = impc_map['phenotyping_center'][phenotyping_center]
+        pipeline_id = impress_map[pipeline_stable_id]
+        project_id = impc_map['project'][project_fullname]
+        study_bnode = provenance_model.add_shared_provenance(
+            provenance_model.provenance_types['study'], [
+                (model.object_properties['has_part'], procedure_id, False),
+                (model.object_properties['has_part'],
+                 impc_map['statistical_method'][statistical_method], False),
+                (provenance_model.object_properties['measures'],
+                 parameter_id, False),
+                (provenance_model.object_properties['has_agent'],
+                 agent_id, False),
+                (model.object_properties['part_of'], pipeline_id, False),
+                (model.object_properties['part_of'], project_id, False)])
+
+        if model.is_declared('_add_study_provenance', study_bnode):
+            return study_bnode
 
         # Add study parts
-        model.addIndividualToGraph(
-            impress_map[procedure_stable_id],
-            procedure_name)
-        study_parts.append(impress_map[procedure_stable_id])
-
-        study_parts.append(
-            impc_map['statistical_method'][statistical_method])
-        provenance_model.add_study_parts(study_bnode, study_parts)
+        model.addIndividualToGraph(procedure_id, procedure_name)
 
         # Add parameter/measure statement: study measures parameter
         parameter_label = "{0} ({1})".format(parameter_name, procedure_name)
-        model.addIndividualToGraph(
-            impress_map[parameter_stable_id], parameter_label)
-        provenance_model.add_study_measure(
-            study_bnode, impress_map[parameter_stable_id])
-
-        # Add Colony
-        colony_bnode = self.make_id("{0}".format(colony), '_')
-        model.addIndividualToGraph(colony_bnode, colony)
+        model.addIndividualToGraph(parameter_id, parameter_label)
 
         # Add study agent
-        model.addIndividualToGraph(
-            impc_map['phenotyping_center'][phenotyping_center],
-            phenotyping_center,
+        provenance_model.add_agent_to_graph(
+            agent_id, phenotyping_center,
             provenance_model.provenance_types['organization'])
-        self.graph.addTriple(
-            study_bnode,
-            provenance_model.object_properties['has_agent'],
-            impc_map['phenotyping_center'][phenotyping_center])
 
         # add pipeline and project
-        model.addIndividualToGraph(
-            impress_map[pipeline_stable_id],
-            pipeline_name)
-
-        self.graph.addTriple(
-            study_bnode, model.object_properties['part_of'],
-            impress_map[pipeline_stable_id])
+        model.addIndividualToGraph(pipeline_id, pipeline_name)
 
         model.addIndividualToGraph(
-            impc_map['project'][project_fullname],
-            project_fullname, provenance_model.provenance_types['project'])
-        self.graph.addTriple(
-            study_bnode, model.object_properties['part_of'],
-            impc_map['project'][project_fullname])
+            project_id, project_fullname,
+            provenance_model.provenance_types['project'])
 
         return study_bnode
 
     def _add_evidence(self, assoc_id, eco_id, impc_map, p_value,
-                      percentage_change, effect_size, study_bnode):
+                      percentage_change, effect_size, study_bnode,
+                      description=None):
         """
         :param assoc_id: assoc curie used to reify a
         genotype to phenotype association, generated in _process_data()
@@ -662,60 +656,48 @@ class IMPC(Source):
         :param percentage_change: str, from self.files['all']
         :param effect_size: str, from self.files['all']
         :param study_bnode: str, from self.files['all']
-        :param phenotyping_center: str, from self.files['all']
+        :param description: str, free-text description of the evidence
         :return: str, evidence_line_bnode as curie
         """
 
-        evidence_model = Evidence(self.graph, assoc_id)
-        provenance_model = Provenance(self.graph)
-        model = Model(self.graph)
+        evidence_model = self.evidence_model.reset(assoc_id)
+        provenance_model = self.provenance_model
 
-        # Add line of evidence
-        evidence_line_bnode = self.make_id(
-            "{0}{1}".format(assoc_id, study_bnode), '_')
-        evidence_model.add_supporting_evidence(evidence_line_bnode)
-        model.addIndividualToGraph(evidence_line_bnode, None, eco_id)
-
-        # Add supporting measurements to line of evidence
-        measurements = {}
+        # Add supporting measurements, as outputs of the study;
+        # the same measurement in the same study is one node
+        output_of = (
+            provenance_model.object_properties['output_of'],
+            study_bnode, False)
+        measurements = []
         if p_value is not None or p_value != "":
-            p_value_bnode = self.make_id("{0}{1}{2}"
-                                         .format(evidence_line_bnode,
-                                                 'p_value', p_value), '_')
-            model.addIndividualToGraph(p_value_bnode, None,
-                                       impc_map['measurements']['p_value'])
             try:
-                measurements[p_value_bnode] = float(p_value)
+                p_value = float(p_value)
             except ValueError:
-                measurements[p_value_bnode] = p_value
+                pass
+            measurements.append(evidence_model.add_shared_data(
+                impc_map['measurements']['p_value'], p_value, [output_of]))
         if percentage_change is not None and percentage_change != '':
-
-            fold_change_bnode = self.make_id(
-                "{0}{1}{2}".format(
-                    evidence_line_bnode, 'percentage_change',
-                    percentage_change), '_')
-            model.addIndividualToGraph(
-                fold_change_bnode, None,
-                impc_map['measurements']['percentage_change'])
-            measurements[fold_change_bnode] = percentage_change
+            measurements.append(evidence_model.add_shared_data(
+                impc_map['measurements']['percentage_change'],
+                percentage_change, [output_of]))
         if effect_size is not None or effect_size != "":
-            fold_change_bnode = self.make_id(
-                "{0}{1}{2}".format(
-                    evidence_line_bnode, 'effect_size', effect_size), '_')
-            model.addIndividualToGraph(
-                fold_change_bnode, None,
-                impc_map['measurements']['effect_size'])
-            measurements[fold_change_bnode] = effect_size
-
-        evidence_model.add_supporting_data(evidence_line_bnode, measurements)
-
-        # Link evidence to provenance by connecting to study node
-        provenance_model.add_study_to_measurements(
-            study_bnode, measurements.keys())
-        self.graph.addTriple(
-            evidence_line_bnode,
+            measurements.append(evidence_model.add_shared_data(
+                impc_map['measurements']['effect_size'], effect_size,
+                [output_of]))
+
+        # Add line of evidence, linked to provenance by the study node
+        evidence_description = [
+            (evidence_model.object_properties['has_supporting_data'],
+             measurement, False) for measurement in measurements]
+        evidence_description.append((
             provenance_model.object_properties['has_supporting_study'],
-            study_bnode)
+            study_bnode, False))
+        if description is not None:
+            evidence_description.append((
+                self.model.annotation_properties['description'],
+                description.strip(), True))
+        evidence_line_bnode = evidence_model.add_shared_evidence(
+            eco_id, evidence_description)
 
         return evidence_line_bnode
 
@@ -9,9 +9,11 @@ from dipper.models.assoc.Association import Assoc
 from dipper.models.Dataset import Dataset
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Genotype import Genotype
+from dipper.models.GenotypeAssembler import GenotypeAssembler
 from dipper.models.Reference import Reference
 from dipper.models.Model import Model
 from dipper import config
+from dipper.utils.IdTable import IdTable
 from dipper.models.GenomicFeature import Feature, makeChromID
 
 
@@ -214,6 +216,27 @@ class MGI(PostgreSQLSource):
             107251870, 107255383, 107256603]
     }
 
+    # for the views filtered on one of the test keys above:
+    # the type of key, and the column holding it
+    test_subset_columns = {
+        'gxd_genotype_view': ('genotype', 0),
+        'gxd_genotype_summary_view': ('genotype', 0),
+        'gxd_allelepair_view': ('genotype', 1),
+        'all_summary_view': ('allele', 0),
+        'all_allele_view': ('allele', 0),
+        'all_allele_mutation_view': ('allele', 0),
+        'voc_annot_view': ('annot', 0),
+        'voc_evidence_view': ('annot', 1),
+        'mrk_marker_view': ('marker', 0),
+        'mrk_summary_view': ('marker', 2),
+        'mrk_acc_view': ('marker', 3),
+    }
+
+    # the lookups built up across tables, kept with each checkpoint
+    checkpoint_attrs = [
+        'idhash', 'markers', 'label_hash', 'geno_bkgd',
+        'strain_to_genotype_map', 'wildtype_alleles']
+
     def __init__(self, graph_type, are_bnodes_skolemized):
         super().__init__(graph_type, are_bnodes_skolemized, 'mgi')
 
@@ -236,9 +259,11 @@ class MGI(PostgreSQLSource):
         # the type-specific-object-keys to MGI public identifiers.
         # then, subsequent views of the table will lookup the identifiers
         # in the hash.  this allows us to do the 'joining' on the fly
+        # (the keys being ints, these are compact IdTables, not dicts)
         self.idhash = {
-            'allele': {}, 'marker': {}, 'publication': {}, 'strain': {},
-            'genotype': {}, 'annot': {}, 'notes': {}, 'seqalt': {}}
+            key: IdTable() for key in [
+                'allele', 'marker', 'publication', 'strain',
+                'genotype', 'annot', 'notes', 'seqalt']}
         # to store if a marker is a class or indiv
         self.markers = {
             'classes': [], 'indiv': []}
@@ -338,32 +363,91 @@ class MGI(PostgreSQLSource):
         if self.testOnly:
             self.testMode = True
 
-        # the following will provide us the hash-lookups
-        # These must be processed in a specific order
-        self._process_prb_strain_acc_view(limit)
-        self._process_mrk_acc_view()
-        self._process_all_summary_view(limit)
-        self._process_bib_acc_view(limit)
-        self._process_gxd_genotype_summary_view(limit)
-
-        # The following will use the hash populated above
-        # to lookup the ids when filling in the graph
-        self._process_prb_strain_view(limit)
-        # self._process_prb_strain_genotype_view(limit)
-        self._process_gxd_genotype_view(limit)
-        self._process_mrk_marker_view(limit)
-        self._process_mrk_acc_view_for_equiv(limit)
-        self._process_mrk_summary_view(limit)
-        self._process_all_allele_view(limit)
-        self._process_all_allele_mutation_view(limit)
-        self._process_gxd_allele_pair_view(limit)
-        self._process_voc_annot_view(limit)
-        self._process_voc_evidence_view(limit)
-        self._process_mgi_note_vocevidence_view(limit)
-        self._process_mrk_location_cache(limit)
-        self.process_mgi_relationship_transgene_genes(limit)
-        self.process_mgi_note_allele_view(limit)
-
+        # the first stages provide us the hash-lookups,
+        # which the later ones use to lookup the ids when filling in
+        # the graph; each says which lookups it needs and gives,
+        # so that with more processes, those not waiting on one another
+        # are run at the same time
+        self.run_stages([
+            {'stage': 'prb_strain_acc_view',
+             'function': self._process_prb_strain_acc_view, 'args': (limit,),
+             'gives': ['idhash:strain']},
+            {'stage': 'mrk_acc_view', 'function': self._process_mrk_acc_view,
+             'gives': ['idhash:marker']},
+            {'stage': 'all_summary_view',
+             'function': self._process_all_summary_view, 'args': (limit,),
+             'gives': ['idhash:allele', 'label_hash:allele']},
+            {'stage': 'bib_acc_view',
+             'function': self._process_bib_acc_view, 'args': (limit,),
+             'gives': ['idhash:publication']},
+            {'stage': 'gxd_genotype_summary_view',
+             'function': self._process_gxd_genotype_summary_view,
+             'args': (limit,),
+             'gives': ['idhash:genotype']},
+            {'stage': 'prb_strain_view',
+             'function': self._process_prb_strain_view, 'args': (limit,),
+             'needs': ['idhash:strain'],
+             'gives': ['label_hash:strain']},
+            # self._process_prb_strain_genotype_view(limit)
+            {'stage': 'gxd_genotype_view',
+             'function': self._process_gxd_genotype_view, 'args': (limit,),
+             'needs': ['idhash:genotype', 'idhash:strain'],
+             'gives': ['idhash:genotype', 'idhash:strain',
+                       'label_hash:strain', 'geno_bkgd']},
+            {'stage': 'mrk_marker_view',
+             'function': self._process_mrk_marker_view, 'args': (limit,),
+             'needs': ['idhash:marker'],
+             'gives': ['markers:classes', 'markers:indiv',
+                       'label_hash:marker']},
+            {'stage': 'mrk_acc_view_for_equiv',
+             'function': self._process_mrk_acc_view_for_equiv,
+             'args': (limit,),
+             'needs': ['idhash:marker', 'markers:classes', 'markers:indiv']},
+            {'stage': 'mrk_summary_view',
+             'function': self._process_mrk_summary_view, 'args': (limit,),
+             'needs': ['markers:classes', 'markers:indiv'],
+             'gives': ['idhash:marker']},
+            {'stage': 'all_allele_view',
+             'function': self._process_all_allele_view, 'args': (limit,),
+             'needs': ['idhash:allele', 'idhash:marker', 'idhash:strain',
+                       'label_hash:allele', 'label_hash:marker'],
+             'gives': ['idhash:seqalt', 'label_hash:allele',
+                       'label_hash:seqalt', 'wildtype_alleles']},
+            {'stage': 'all_allele_mutation_view',
+             'function': self._process_all_allele_mutation_view,
+             'args': (limit,),
+             'needs': ['idhash:allele', 'idhash:seqalt', 'label_hash:allele']},
+            {'stage': 'gxd_allele_pair_view',
+             'function': self._process_gxd_allele_pair_view,
+             'args': (limit,),
+             'needs': ['idhash:allele', 'idhash:genotype',
+                       'label_hash:strain', 'geno_bkgd', 'wildtype_alleles'],
+             'gives': ['label_hash:genotype']},
+            {'stage': 'voc_annot_view',
+             'function': self._process_voc_annot_view, 'args': (limit,),
+             'needs': ['idhash:allele', 'idhash:genotype', 'idhash:marker'],
+             'gives': ['idhash:annot']},
+            {'stage': 'voc_evidence_view',
+             'function': self._process_voc_evidence_view, 'args': (limit,),
+             'needs': ['idhash:annot'],
+             'gives': ['idhash:notes']},
+            {'stage': 'mgi_note_vocevidence_view',
+             'function': self._process_mgi_note_vocevidence_view,
+             'args': (limit,),
+             'needs': ['idhash:annot', 'idhash:notes']},
+            {'stage': 'mrk_location_cache',
+             'function': self._process_mrk_location_cache, 'args': (limit,),
+             'needs': ['idhash:marker', 'markers:classes']},
+            {'stage': 'mgi_relationship_transgene_genes',
+             'function': self.process_mgi_relationship_transgene_genes,
+             'args': (limit,),
+             'needs': ['idhash:seqalt']},
+            {'stage': 'mgi_note_allele_view',
+             'function': self.process_mgi_note_allele_view,
+             'args': (limit,),
+             'needs': ['idhash:allele']}])
+
+        self.clear_checkpoint()
         logger.info("Finished parsing.")
 
         logger.info("Loaded %d nodes", len(self.graph))
@@ -411,6 +495,28 @@ class MGI(PostgreSQLSource):
 
         return
 
+    def _get_view(self, view):
+        """
+        Path to a view's file.
+        In test mode, this is the subset of the view
+        with only the rows for our test keys.
+        :param view: name of the view
+        :return: path
+        """
+        raw = '/'.join((self.rawdir, view))
+        if self.testMode and view in self.test_subset_columns:
+            (key_type, column) = self.test_subset_columns[view]
+            keys = set(str(key) for key in self.test_keys.get(key_type))
+
+            def is_test_row(row):
+                cols = row.split('\t')
+                return len(cols) > column and cols[column] in keys
+
+            raw = self.get_test_subset(
+                raw, is_test_row, keys, header_lines=1)
+
+        return raw
+
     def _process_gxd_genotype_view(self, limit=None):
         """
         This table indicates the relationship between a genotype
@@ -442,7 +548,7 @@ class MGI(PostgreSQLSource):
         geno = Genotype(g)
         model = Model(g)
 
-        raw = '/'.join((self.rawdir, 'gxd_genotype_view'))
+        raw = self._get_view('gxd_genotype_view')
         logger.info("getting genotypes and their backgrounds")
         with open(raw, 'r') as f1:
             f1.readline()  # read the header row; skip
@@ -535,7 +641,7 @@ class MGI(PostgreSQLSource):
         model = Model(g)
         line_counter = 0
         geno_hash = {}
-        raw = '/'.join((self.rawdir, 'gxd_genotype_summary_view'))
+        raw = self._get_view('gxd_genotype_summary_view')
         logger.info("building labels for genotypes")
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
@@ -603,7 +709,7 @@ class MGI(PostgreSQLSource):
             g = self.graph
         model = Model(g)
         line_counter = 0
-        raw = '/'.join((self.rawdir, 'all_summary_view'))
+        raw = self._get_view('all_summary_view')
         logger.info(
             "alleles with labels and descriptions from all_summary_view")
         with open(raw, 'r') as f:
@@ -693,7 +799,7 @@ class MGI(PostgreSQLSource):
             "adding alleles, mapping to markers, " +
             "extracting their sequence alterations " +
             "from all_allele_view")
-        raw = '/'.join((self.rawdir, 'all_allele_view'))
+        raw = self._get_view('all_allele_view')
         with open(raw, 'r') as f:
             col_count = f.readline().count('\t')  # read the header row; skip
             for line in f:
@@ -821,7 +927,8 @@ class MGI(PostgreSQLSource):
         """
         This assumes that the genotype and alleles
         have already been added to the id hashmap.
-        We use the Genotype methods to add all the parts we need.
+        The allele pairs are gathered in a GenotypeAssembler,
+        which adds all the parts we need once the view is read.
         Triples added:
         <genotype_id> has_part <vslc>
         <vslc> has_part <allele1>
@@ -836,12 +943,11 @@ class MGI(PostgreSQLSource):
             g = self.testgraph
         else:
             g = self.graph
-        model = Model(g)
         geno = Genotype(g)
+        assembler = GenotypeAssembler(g, self.label_hash)
         line_counter = 0
-        raw = '/'.join((self.rawdir, 'gxd_allelepair_view'))
+        raw = self._get_view('gxd_allelepair_view')
         logger.info("processing allele pairs (VSLCs) for genotypes")
-        geno_hash = {}
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
             for line in f:
@@ -862,8 +968,6 @@ class MGI(PostgreSQLSource):
                         continue
 
                 genotype_id = self.idhash['genotype'].get(genotype_key)
-                if genotype_id not in geno_hash:
-                    geno_hash[genotype_id] = set()
                 if genotype_id is None:
                     logger.error("genotype_id not found for key %s; skipping",
                                  genotype_key)
@@ -876,7 +980,6 @@ class MGI(PostgreSQLSource):
                 zygosity_id = self._map_zygosity(allelestate)
                 ivslc_id = self._makeInternalIdentifier('vslc', allelepair_key)
 
-                geno_hash[genotype_id].add(ivslc_id)
                 # TODO: VSLC label likely needs processing similar to
                 # the processing in the all_allele_view
                 # FIXME: handle null alleles
@@ -902,80 +1005,23 @@ class MGI(PostgreSQLSource):
                 else:
                     vslc_label += allele2
 
-                model.addIndividualToGraph(
-                    ivslc_id, vslc_label,
-                    geno.genoparts['variant_single_locus_complement'])
-                self.label_hash[ivslc_id] = vslc_label
                 rel1 = rel2 = geno.object_properties['has_alternate_part']
                 if allele1_id in self.wildtype_alleles:
                     rel1 = geno.object_properties['has_reference_part']
                 if allele2_id in self.wildtype_alleles:
                     rel2 = geno.object_properties['has_reference_part']
-                geno.addPartsToVSLC(
-                    ivslc_id, allele1_id, allele2_id, zygosity_id, rel1, rel2)
-
-                # if genotype_id not in geno_hash:
-                #     geno_hash[genotype_id] = [vslc_label]
-                # else:
-                #     geno_hash[genotype_id] += [vslc_label]
+                assembler.add_allele_pair(
+                    genotype_id, ivslc_id, vslc_label, allele1_id, allele2_id,
+                    zygosity_id, rel1, rel2)
 
                 if not self.testMode and \
                         limit is not None and line_counter > limit:
                     break
 
-        # build the gvc and the genotype label
-        for gt in geno_hash.keys():
-            if gt is None:   # not sure why, but sometimes this is the case
-                continue
-            vslcs = sorted(list(geno_hash[gt]))
-            gvc_label = None
-            if len(vslcs) > 1:
-                gvc_id = re.sub(r'_', '', ('-'.join(vslcs)))
-                gvc_id = re.sub(r':', '', gvc_id)
-                gvc_id = '_:'+gvc_id
-                vslc_labels = []
-                for v in vslcs:
-                    vslc_labels.append(self.label_hash[v])
-                gvc_label = '; '.join(vslc_labels)
-
-                model.addIndividualToGraph(
-                    gvc_id, gvc_label,
-                    geno.genoparts['genomic_variation_complement'])
-                self.label_hash[gvc_id] = gvc_label
-                for v in vslcs:
-                    geno.addParts(
-                        v, gvc_id,
-                        geno.object_properties['has_alternate_part'])
-                    geno.addVSLCtoParent(v, gvc_id)
-                geno.addParts(
-                    gvc_id, gt,
-                    geno.object_properties['has_alternate_part'])
-            elif len(vslcs) == 1:
-                gvc_id = vslcs[0]
-                gvc_label = self.label_hash[gvc_id]
-                # type the VSLC as also a GVC
-                model.addIndividualToGraph(
-                    gvc_id, gvc_label,
-                    geno.genoparts['genomic_variation_complement'])
-                geno.addVSLCtoParent(gvc_id, gt)
-            else:
-                logger.info("No VSLCs for %s", gt)
-
-            # make the genotype label = gvc + background
-            bkgd_id = self.geno_bkgd.get(gt)
-            if bkgd_id is not None:
-                bkgd_label = self.label_hash.get(bkgd_id)
-                if bkgd_label is None:
-                    bkgd_label = bkgd_id  # just in case
-            else:
-                bkgd_label = 'n.s.'
-            if gvc_label is not None:
-                genotype_label = gvc_label + ' ['+bkgd_label+']'
-            else:
-                genotype_label = '['+bkgd_label+']'
-
-            model.addIndividualToGraph(gt, genotype_label)
-            self.label_hash[gt] = genotype_label
+        # build the vslcs, the gvc and the genotype label in one pass
+        for gt in assembler.genotypes():
+            assembler.set_background(gt, self.geno_bkgd.get(gt))
+        assembler.assemble()
 
         return
 
@@ -997,7 +1043,7 @@ class MGI(PostgreSQLSource):
             g = self.graph
         model = Model(g)
         line_counter = 0
-        raw = '/'.join((self.rawdir, 'all_allele_mutation_view'))
+        raw = self._get_view('all_allele_mutation_view')
         logger.info("getting mutation types for sequence alterations")
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
@@ -1066,7 +1112,7 @@ class MGI(PostgreSQLSource):
         model = Model(g)
         line_counter = 0
         logger.info("getting G2P associations")
-        raw = '/'.join((self.rawdir, 'voc_annot_view'))
+        raw = self._get_view('voc_annot_view')
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
             for line in f:
@@ -1187,7 +1233,7 @@ class MGI(PostgreSQLSource):
             g = self.graph
         line_counter = 0
         logger.info("getting evidence and pubs for annotations")
-        raw = '/'.join((self.rawdir, 'voc_evidence_view'))
+        raw = self._get_view('voc_evidence_view')
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
             for line in f:
@@ -1426,7 +1472,7 @@ class MGI(PostgreSQLSource):
         model = Model(g)
         geno = Genotype(g)
         line_counter = 0
-        raw = '/'.join((self.rawdir, 'mrk_marker_view'))
+        raw = self._get_view('mrk_marker_view')
         logger.info("getting markers and assigning types")
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
@@ -1510,7 +1556,7 @@ class MGI(PostgreSQLSource):
         model = Model(g)
         logger.info("getting markers and equivalent ids from mrk_summary_view")
         line_counter = 0
-        raw = '/'.join((self.rawdir, 'mrk_summary_view'))
+        raw = self._get_view('mrk_summary_view')
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
             for line in f:
@@ -1577,7 +1623,7 @@ class MGI(PostgreSQLSource):
         # to create the mapping between the external and internal identifiers
         line_counter = 0
         logger.info("mapping markers to internal identifiers")
-        raw = '/'.join((self.rawdir, 'mrk_acc_view'))
+        raw = self._get_view('mrk_acc_view')
         with open(raw, 'r') as f:
             f.readline()  # read the header row; skip
             for line in f:
@@ -1618,7 +1664,7 @@ class MGI(PostgreSQLSource):
         # if nothing, then we should remove one or the other.
         logger.info("mapping marker equivalent identifiers in mrk_acc_view")
         line_counter = 0
-        with open('/'.join((self.rawdir, 'mrk_acc_view')), 'r') as f:
+        with open(self._get_view('mrk_acc_view'), 'r') as f:
             f.readline()  # read the header row; skip
             for line in f:
                 line = line.rstrip("\n")
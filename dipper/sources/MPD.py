@@ -98,6 +98,10 @@ class MPD(Source):
         # to store the mean value for each measure by strain+sex
         self.strain_scores_by_measure = {}
 
+        # every strain passing an assay shares its description;
+        # describe each assay once
+        self.set_declared_cache(2**16)
+
         return
 
     def fetch(self, is_dl_forced=False):
@@ -319,6 +323,7 @@ class MPD(Source):
         scores_passing_threshold_count = 0
         scores_passing_threshold_with_ontologies_count = 0
         scores_not_passing_threshold_count = 0
+        prov = Provenance(self.graph)
 
         # loop through all the strains,
         # and make G2P assoc for those with scores beyond threshold
@@ -340,7 +345,6 @@ class MPD(Source):
                             #   "Score passing threshold: %s | %s | %s",
                             #   strain_id, assay_id, zscore)
                             # add the G2P assoc
-                            prov = Provenance(self.graph)
                             try:
                                 assay_label = self.assayhash[m]['assay_label']
                                 assay_description = \
@@ -441,9 +445,9 @@ class MPD(Source):
         # TODO add more provenance info when that model is completed
 
         if phenotypes is not None:
+            assoc = G2PAssoc(g, self.name, sex_specific_genotype_id, None)
             for phenotype_id in phenotypes:
-                assoc = G2PAssoc(
-                    g, self.name, sex_specific_genotype_id, phenotype_id)
+                assoc.reset(sex_specific_genotype_id, phenotype_id)
                 assoc.add_evidence(assay_id)
                 assoc.add_evidence(eco_id)
                 assoc.add_association_to_graph()
@@ -1,8 +1,8 @@
 import re
 import gzip
 import logging
-import csv
-import io
+import queue
+import threading
 import requests
 
 from dipper.sources.Source import Source
@@ -15,6 +15,7 @@ from dipper import config
 from dipper.models.GenomicFeature import Feature, makeChromID, makeChromLabel
 from dipper.models.Reference import Reference
 from dipper.utils.DipperUtil import DipperUtil
+from dipper.utils.GeneGroupIndex import GeneGroupIndex
 
 
 logger = logging.getLogger(__name__)
@@ -73,6 +74,9 @@ class NCBIGene(Source):
         'clique_leader': '../../resources/clique_leader.yaml'
     }
 
+    # bytes of a gene file decompressed at a time
+    block_size = 2 ** 22
+
     def __init__(self, graph_type, are_bnodes_skolemized,
                  tax_ids=None, gene_ids=None):
         super().__init__(graph_type, are_bnodes_skolemized, 'ncbigene')
@@ -131,6 +135,101 @@ class NCBIGene(Source):
 
         return
 
+    def _get_gene_file(self, file_key, header_lines=0):
+        """
+        Path to one of the gene files, all of which have the gene id
+        in the second column.
+        In test mode, this is the subset with only our test genes.
+        :param file_key: key into self.files
+        :param header_lines: number of leading lines to keep
+        :return: path
+        """
+        myfile = '/'.join((self.rawdir, self.files[file_key]['file']))
+        if self.testMode:
+            gene_ids = set(str(gene_id) for gene_id in self.gene_ids)
+
+            def is_test_row(row):
+                cols = row.split('\t')
+                return row.startswith('#') or \
+                    (len(cols) > 1 and cols[1] in gene_ids)
+
+            myfile = self.get_test_subset(
+                myfile, is_test_row, gene_ids, header_lines)
+
+        return myfile
+
+    def _get_lines(self, myfile):
+        """
+        The lines of one of the gene files, all of which have the taxon
+        in the first column, without the comments, and, unless testing,
+        only those of our taxa.
+        The file is decompressed, a block at a time, on a thread of its
+        own while the lines of the blocks before are being parsed;
+        the lines of other taxa are passed over in the raw bytes,
+        before any are decoded or split.
+        :param myfile: gzipped gene file
+        :return: generator of lines (str, stripped)
+        """
+        if self.testMode:
+            # the test subset is filtered on genes, not taxa
+            pattern = rb'\n([^#\n][^\n]*)'
+        else:
+            pattern = rb'\n((?:' + b'|'.join(
+                str(tax_num).encode() for tax_num in self.tax_ids) + \
+                rb')\t[^\n]*)'
+        # each line is found by the newline before it,
+        # much faster to search for than the start of a line
+        lines = re.compile(pattern)
+
+        blocks = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read_blocks, args=(myfile, blocks, stop))
+        reader.daemon = True
+        reader.start()
+        try:
+            rest = b'\n'
+            block = blocks.get()
+            while block is not None:
+                if isinstance(block, Exception):
+                    raise block
+                block = rest + block
+                end = block.rfind(b'\n')
+                rest = block[end:]
+                for line in lines.finditer(block, 0, end):
+                    yield line.group(1).decode().strip()
+                block = blocks.get()
+            for line in lines.finditer(rest):
+                yield line.group(1).decode().strip()
+        finally:
+            # let the reader finish, when we stop short of the end
+            stop.set()
+            while reader.is_alive():
+                try:
+                    blocks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def _read_blocks(self, myfile, blocks, stop):
+        """
+        Queue up the decompressed blocks of myfile, then None
+        :param myfile: gzipped file
+        :param blocks: Queue
+        :param stop: Event, to stop reading early
+        :return: None
+        """
+        try:
+            with gzip.open(myfile, 'rb') as f:
+                block = f.read(self.block_size)
+                while block != b'' and not stop.is_set():
+                    blocks.put(block)
+                    block = f.read(self.block_size)
+        except Exception as e:
+            blocks.put(e)
+        blocks.put(None)
+
+        return
+
     def _get_gene_info(self, limit):
         """
         Currently loops through the gene_info file and
@@ -155,7 +254,7 @@ class NCBIGene(Source):
         # not unzipping the file
         logger.info("Processing 'Gene Info' records")
         line_counter = 0
-        gene_info = '/'.join((self.rawdir, self.files['gene_info']['file']))
+        gene_info = self._get_gene_file('gene_info', header_lines=1)
         logger.info("FILE: %s", gene_info)
         # Add taxa and genome classes for those in our filter
         for tax_num in self.tax_ids:
@@ -167,171 +266,167 @@ class NCBIGene(Source):
         with gzip.open(gene_info, 'rb') as f:
             row = f.readline().decode().strip().split('\t')
             logger.info("Header has %i columns", len(row))
-            for line in f:
-                # skip comments
-                line = line.decode().strip()
-                if re.match(r'^#', line):
+        for line in self._get_lines(gene_info):
+            (tax_num, gene_num, symbol, locustag, synonyms, xrefs, chrom,
+             map_loc, desc, gtype, authority_symbol, name,
+             nomenclature_status, other_designations,
+             modification_date, feature_type) = line.split('\t')
+
+            # ##set filter=None in init if you don't want to have a filter
+            # if self.filter is not None:
+            #     if ((self.filter == 'taxids' and \
+            #          (int(tax_num) not in self.tax_ids))
+            #           or (self.filter == 'geneids' and \
+            #               (int(gene_num) not in self.gene_ids))):
+            #         continue
+            # #### end filter
+
+            if self.testMode and int(gene_num) not in self.gene_ids:
+                continue
+
+            if not self.testMode and int(tax_num) not in self.tax_ids:
+                continue
+
+            line_counter += 1
+
+            gene_id = ':'.join(('NCBIGene', gene_num))
+            tax_id = ':'.join(('NCBITaxon', tax_num))
+            gene_type_id = self.map_type_of_gene(gtype.strip())
+
+            if symbol == 'NEWENTRY':
+                label = None
+            else:
+                label = symbol
+            # sequence feature, not a gene
+            if gene_type_id == 'SO:0000110':
+                self.class_or_indiv[gene_id] = 'I'
+            else:
+                self.class_or_indiv[gene_id] = 'C'
+
+            if not self.testMode and \
+                    limit is not None and line_counter > limit:
+                continue
+
+            if self.class_or_indiv[gene_id] == 'C':
+                model.addClassToGraph(gene_id, label, gene_type_id, desc)
+                # NCBI will be the default leader,
+                # so we will not add the leader designation here.
+            else:
+                model.addIndividualToGraph(
+                    gene_id, label, gene_type_id, desc)
+                # in this case, they aren't genes.
+                # so we want someone else to be the leader.
+
+            if name != '-':
+                model.addSynonym(gene_id, name)
+            if synonyms.strip() != '-':
+                for s in synonyms.split('|'):
+                    model.addSynonym(
+                        gene_id, s.strip(),
+                        Assoc.annotation_properties['hasRelatedSynonym'])
+            if other_designations.strip() != '-':
+                for s in other_designations.split('|'):
+                    model.addSynonym(
+                        gene_id, s.strip(),
+                        Assoc.annotation_properties['hasRelatedSynonym'])
+            if xrefs.strip() != '-':
+                self._add_gene_equivalencies(xrefs, gene_id, tax_num)
+
+            # edge cases of id | symbol | chr | map_loc:
+            # 263     AMD1P2    X|Y  with   Xq28 and Yq12
+            # 438     ASMT      X|Y  with   Xp22.3 or Yp11.3    # in PAR
+            # no idea why there's two bands listed - possibly 2 assemblies
+            # 419     ART3      4    with   4q21.1|4p15.1-p14
+            # 28227   PPP2R3B   X|Y  Xp22.33; Yp11.3            # in PAR
+            # this is of "unknown" type == susceptibility
+            # 619538  OMS     10|19|3 10q26.3;19q13.42-q13.43;3p25.3
+            # unlocated scaffold
+            # 101928066       LOC101928066    1|Un    -\
+            # mouse --> 2C3
+            # 11435   Chrna1  2       2 C3|2 43.76 cM
+            # mouse --> 11B1.1
+            # 11548   Adra1b  11      11 B1.1|11 25.81 cM
+            # 11717   Ampd3   7       7 57.85 cM|7 E2-E3        # mouse
+            # 14421   B4galnt1        10      10 D3|10 74.5 cM  # mouse
+            # 323212  wu:fb92e12      19|20   -                 # fish
+            # 323368  ints10  6|18    -                         # fish
+            # 323666  wu:fc06e02      11|23   -                 # fish
+
+            # feel that the chr placement can't be trusted in this table
+            # when there is > 1 listed
+            # with the exception of human X|Y,
+            # we will only take those that align to one chr
+
+            # FIXME remove the chr mapping below
+            # when we pull in the genomic coords
+            if str(chrom) != '-' and str(chrom) != '':
+                if re.search(r'\|', str(chrom)) and \
+                        str(chrom) not in ['X|Y', 'X; Y']:
+                    # means that there's uncertainty in the mapping.
+                    # so skip it
+                    # TODO we'll need to figure out how to deal with
+                    # >1 loc mapping
+                    logger.info(
+                        '%s is non-uniquely mapped to %s.' +
+                        ' Skipping for now.',
+                        gene_id, str(chr))
                     continue
-                (tax_num, gene_num, symbol, locustag, synonyms, xrefs, chrom,
-                 map_loc, desc, gtype, authority_symbol, name,
-                 nomenclature_status, other_designations,
-                 modification_date, feature_type) = line.split('\t')
-
-                # ##set filter=None in init if you don't want to have a filter
-                # if self.filter is not None:
-                #     if ((self.filter == 'taxids' and \
-                #          (int(tax_num) not in self.tax_ids))
-                #           or (self.filter == 'geneids' and \
-                #               (int(gene_num) not in self.gene_ids))):
-                #         continue
-                # #### end filter
-
-                if self.testMode and int(gene_num) not in self.gene_ids:
-                    continue
-
-                if not self.testMode and int(tax_num) not in self.tax_ids:
-                    continue
-
-                line_counter += 1
-
-                gene_id = ':'.join(('NCBIGene', gene_num))
-                tax_id = ':'.join(('NCBITaxon', tax_num))
-                gene_type_id = self.map_type_of_gene(gtype.strip())
-
-                if symbol == 'NEWENTRY':
-                    label = None
-                else:
-                    label = symbol
-                # sequence feature, not a gene
-                if gene_type_id == 'SO:0000110':
-                    self.class_or_indiv[gene_id] = 'I'
-                else:
-                    self.class_or_indiv[gene_id] = 'C'
-
-                if not self.testMode and \
-                        limit is not None and line_counter > limit:
-                    continue
-
-                if self.class_or_indiv[gene_id] == 'C':
-                    model.addClassToGraph(gene_id, label, gene_type_id, desc)
-                    # NCBI will be the default leader,
-                    # so we will not add the leader designation here.
-                else:
-                    model.addIndividualToGraph(
-                        gene_id, label, gene_type_id, desc)
-                    # in this case, they aren't genes.
-                    # so we want someone else to be the leader.
-
-                if name != '-':
-                    model.addSynonym(gene_id, name)
-                if synonyms.strip() != '-':
-                    for s in synonyms.split('|'):
-                        model.addSynonym(
-                            gene_id, s.strip(),
-                            Assoc.annotation_properties['hasRelatedSynonym'])
-                if other_designations.strip() != '-':
-                    for s in other_designations.split('|'):
-                        model.addSynonym(
-                            gene_id, s.strip(),
-                            Assoc.annotation_properties['hasRelatedSynonym'])
-                if xrefs.strip() != '-':
-                    self._add_gene_equivalencies(xrefs, gene_id, tax_num)
-
-                # edge cases of id | symbol | chr | map_loc:
-                # 263     AMD1P2    X|Y  with   Xq28 and Yq12
-                # 438     ASMT      X|Y  with   Xp22.3 or Yp11.3    # in PAR
-                # no idea why there's two bands listed - possibly 2 assemblies
-                # 419     ART3      4    with   4q21.1|4p15.1-p14
-                # 28227   PPP2R3B   X|Y  Xp22.33; Yp11.3            # in PAR
-                # this is of "unknown" type == susceptibility
-                # 619538  OMS     10|19|3 10q26.3;19q13.42-q13.43;3p25.3
-                # unlocated scaffold
-                # 101928066       LOC101928066    1|Un    -\
-                # mouse --> 2C3
-                # 11435   Chrna1  2       2 C3|2 43.76 cM
-                # mouse --> 11B1.1
-                # 11548   Adra1b  11      11 B1.1|11 25.81 cM
-                # 11717   Ampd3   7       7 57.85 cM|7 E2-E3        # mouse
-                # 14421   B4galnt1        10      10 D3|10 74.5 cM  # mouse
-                # 323212  wu:fb92e12      19|20   -                 # fish
-                # 323368  ints10  6|18    -                         # fish
-                # 323666  wu:fc06e02      11|23   -                 # fish
-
-                # feel that the chr placement can't be trusted in this table
-                # when there is > 1 listed
-                # with the exception of human X|Y,
-                # we will only take those that align to one chr
-
-                # FIXME remove the chr mapping below
-                # when we pull in the genomic coords
-                if str(chrom) != '-' and str(chrom) != '':
-                    if re.search(r'\|', str(chrom)) and \
-                            str(chrom) not in ['X|Y', 'X; Y']:
-                        # means that there's uncertainty in the mapping.
-                        # so skip it
-                        # TODO we'll need to figure out how to deal with
-                        # >1 loc mapping
-                        logger.info(
-                            '%s is non-uniquely mapped to %s.' +
-                            ' Skipping for now.',
-                            gene_id, str(chr))
-                        continue
-                        # X|Y	Xp22.33;Yp11.3
-
-                    # if(not re.match(
-                    #        r'(\d+|(MT)|[XY]|(Un)$',str(chr).strip())):
-                    #    print('odd chr=',str(chr))
-                    if str(chrom) == 'X; Y':
-                        chrom = 'X|Y'  # rewrite the PAR regions for processing
-                    # do this in a loop to allow PAR regions like X|Y
-                    for c in re.split(r'\|', str(chrom)):
-                        # assume that the chromosome label is added elsewhere
-                        geno.addChromosomeClass(c, tax_id, None)
-                        mychrom = makeChromID(c, tax_num, 'CHR')
-                        # temporarily use taxnum for the disambiguating label
-                        mychrom_syn = makeChromLabel(c, tax_num)
-                        model.addSynonym(mychrom, mychrom_syn)
-                        band_match = re.match(
-                            r'[0-9A-Z]+[pq](\d+)?(\.\d+)?$', map_loc)
-                        if band_match is not None and \
-                                len(band_match.groups()) > 0:
-                            # if tax_num != '9606':
-                            #     continue
-                            # this matches the regular kind of chrs,
-                            # so make that kind of band
-                            # not sure why this matches?
-                            #   chrX|Y or 10090chr12|Un"
-                            # TODO we probably need a different regex
-                            # per organism
-                            # the maploc_id already has the numeric chromosome
-                            # in it, strip it first
-                            bid = re.sub(r'^'+c, '', map_loc)
-                            # the generic location (no coordinates)
-                            maploc_id = makeChromID(c+bid, tax_num, 'CHR')
-                            # print(map_loc,'-->',bid,'-->',maploc_id)
-                            # Assume it's type will be added elsewhere
-                            band = Feature(g, maploc_id, None, None)
-                            band.addFeatureToGraph()
-                            # add the band as the containing feature
-                            g.addTriple(
-                                gene_id,
-                                Feature.object_properties['is_subsequence_of'],
-                                maploc_id)
-                        else:
-                            # TODO handle these cases: examples are:
-                            # 15q11-q22,Xp21.2-p11.23,15q22-qter,10q11.1-q24,
-                            # 12p13.3-p13.2|12p13-p12,1p13.3|1p21.3-p13.1,
-                            # 12cen-q21,22q13.3|22q13.3
-                            logger.debug(
-                                'not regular band pattern for %s: %s',
-                                gene_id, map_loc)
-                            # add the gene as a subsequence of the chromosome
-                            g.addTriple(
-                                gene_id,
-                                Feature.object_properties['is_subsequence_of'],
-                                mychrom)
-
-                geno.addTaxon(tax_id, gene_id)
+                    # X|Y	Xp22.33;Yp11.3
+
+                # if(not re.match(
+                #        r'(\d+|(MT)|[XY]|(Un)$',str(chr).strip())):
+                #    print('odd chr=',str(chr))
+                if str(chrom) == 'X; Y':
+                    chrom = 'X|Y'  # rewrite the PAR regions for processing
+                # do this in a loop to allow PAR regions like X|Y
+                for c in re.split(r'\|', str(chrom)):
+                    # assume that the chromosome label is added elsewhere
+                    geno.addChromosomeClass(c, tax_id, None)
+                    mychrom = makeChromID(c, tax_num, 'CHR')
+                    # temporarily use taxnum for the disambiguating label
+                    mychrom_syn = makeChromLabel(c, tax_num)
+                    model.addSynonym(mychrom, mychrom_syn)
+                    band_match = re.match(
+                        r'[0-9A-Z]+[pq](\d+)?(\.\d+)?$', map_loc)
+                    if band_match is not None and \
+                            len(band_match.groups()) > 0:
+                        # if tax_num != '9606':
+                        #     continue
+                        # this matches the regular kind of chrs,
+                        # so make that kind of band
+                        # not sure why this matches?
+                        #   chrX|Y or 10090chr12|Un"
+                        # TODO we probably need a different regex
+                        # per organism
+                        # the maploc_id already has the numeric chromosome
+                        # in it, strip it first
+                        bid = re.sub(r'^'+c, '', map_loc)
+                        # the generic location (no coordinates)
+                        maploc_id = makeChromID(c+bid, tax_num, 'CHR')
+                        # print(map_loc,'-->',bid,'-->',maploc_id)
+                        # Assume it's type will be added elsewhere
+                        band = Feature(g, maploc_id, None, None)
+                        band.addFeatureToGraph()
+                        # add the band as the containing feature
+                        g.addTriple(
+                            gene_id,
+                            Feature.object_properties['is_subsequence_of'],
+                            maploc_id)
+                    else:
+                        # TODO handle these cases: examples are:
+                        # 15q11-q22,Xp21.2-p11.23,15q22-qter,10q11.1-q24,
+                        # 12p13.3-p13.2|12p13-p12,1p13.3|1p21.3-p13.1,
+                        # 12cen-q21,22q13.3|22q13.3
+                        logger.debug(
+                            'not regular band pattern for %s: %s',
+                            gene_id, map_loc)
+                        # add the gene as a subsequence of the chromosome
+                        g.addTriple(
+                            gene_id,
+                            Feature.object_properties['is_subsequence_of'],
+                            mychrom)
+
+            geno.addTaxon(tax_id, gene_id)
 
         return
 
@@ -413,60 +508,55 @@ class NCBIGene(Source):
         model = Model(g)
         logger.info("Processing Gene records")
         line_counter = 0
-        myfile = '/'.join((self.rawdir, self.files['gene_history']['file']))
+        myfile = self._get_gene_file('gene_history')
         logger.info("FILE: %s", myfile)
-        with gzip.open(myfile, 'rb') as f:
-            for line in f:
-                # skip comments
-                line = line.decode().strip()
-                if re.match(r'^#', line):
-                    continue
-                (tax_num, gene_num, discontinued_num, discontinued_symbol,
-                 discontinued_date) = line.split('\t')
-
-                # set filter=None in init if you don't want to have a filter
-                # if self.filter is not None:
-                #     if ((self.filter == 'taxids' and \
-                #          (int(tax_num) not in self.tax_ids))
-                #             or (self.filter == 'geneids' and \
-                #                 (int(gene_num) not in self.gene_ids))):
-                #         continue
-                #  end filter
-
-                if gene_num == '-' or discontinued_num == '-':
-                    continue
-
-                if self.testMode and int(gene_num) not in self.gene_ids:
-                    continue
-
-                if not self.testMode and int(tax_num) not in self.tax_ids:
-                    continue
-
-                line_counter += 1
-                gene_id = ':'.join(('NCBIGene', gene_num))
-                discontinued_gene_id = ':'.join(('NCBIGene', discontinued_num))
-
-                # add the two genes
-                if self.class_or_indiv.get(gene_id) == 'C':
-                    model.addClassToGraph(gene_id, None)
-                    model.addClassToGraph(
-                        discontinued_gene_id, discontinued_symbol)
-
-                    # add the new gene id to replace the old gene id
-                    model.addDeprecatedClass(discontinued_gene_id, [gene_id])
-                else:
-                    model.addIndividualToGraph(gene_id, None)
-                    model.addIndividualToGraph(
-                        discontinued_gene_id, discontinued_symbol)
-                    model.addDeprecatedIndividual(
-                        discontinued_gene_id, [gene_id])
-
-                # also add the old symbol as a synonym of the new gene
-                model.addSynonym(gene_id, discontinued_symbol)
-
-                if (not self.testMode) and\
-                        (limit is not None and line_counter > limit):
-                    break
+        for line in self._get_lines(myfile):
+            (tax_num, gene_num, discontinued_num, discontinued_symbol,
+             discontinued_date) = line.split('\t')
+
+            # set filter=None in init if you don't want to have a filter
+            # if self.filter is not None:
+            #     if ((self.filter == 'taxids' and \
+            #          (int(tax_num) not in self.tax_ids))
+            #             or (self.filter == 'geneids' and \
+            #                 (int(gene_num) not in self.gene_ids))):
+            #         continue
+            #  end filter
+
+            if gene_num == '-' or discontinued_num == '-':
+                continue
+
+            if self.testMode and int(gene_num) not in self.gene_ids:
+                continue
+
+            if not self.testMode and int(tax_num) not in self.tax_ids:
+                continue
+
+            line_counter += 1
+            gene_id = ':'.join(('NCBIGene', gene_num))
+            discontinued_gene_id = ':'.join(('NCBIGene', discontinued_num))
+
+            # add the two genes
+            if self.class_or_indiv.get(gene_id) == 'C':
+                model.addClassToGraph(gene_id, None)
+                model.addClassToGraph(
+                    discontinued_gene_id, discontinued_symbol)
+
+                # add the new gene id to replace the old gene id
+                model.addDeprecatedClass(discontinued_gene_id, [gene_id])
+            else:
+                model.addIndividualToGraph(gene_id, None)
+                model.addIndividualToGraph(
+                    discontinued_gene_id, discontinued_symbol)
+                model.addDeprecatedIndividual(
+                    discontinued_gene_id, [gene_id])
+
+            # also add the old symbol as a synonym of the new gene
+            model.addSynonym(gene_id, discontinued_symbol)
+
+            if (not self.testMode) and\
+                    (limit is not None and line_counter > limit):
+                break
 
         return
 
@@ -489,55 +579,50 @@ class NCBIGene(Source):
         model = Model(g)
         logger.info("Processing Gene records")
         line_counter = 0
-        myfile = '/'.join((self.rawdir, self.files['gene2pubmed']['file']))
+        myfile = self._get_gene_file('gene2pubmed')
         logger.info("FILE: %s", myfile)
         assoc_counter = 0
-        with gzip.open(myfile, 'rb') as f:
-            for line in f:
-                # skip comments
-                line = line.decode().strip()
-                if re.match(r'^#', line):
-                    continue
-                (tax_num, gene_num, pubmed_num) = line.split('\t')
-
-                # ## set filter=None in init if you don't want to have a filter
-                # if self.filter is not None:
-                #     if ((self.filter == 'taxids' and \
-                #          (int(tax_num) not in self.tax_ids))
-                #        or (self.filter == 'geneids' and \
-                #            (int(gene_num) not in self.gene_ids))):
-                #         continue
-                # #### end filter
-
-                if self.testMode and int(gene_num) not in self.gene_ids:
-                    continue
-
-                if not self.testMode and int(tax_num) not in self.tax_ids:
-                    continue
-
-                if gene_num == '-' or pubmed_num == '-':
-                    continue
-
-                line_counter += 1
-                gene_id = ':'.join(('NCBIGene', gene_num))
-                pubmed_id = ':'.join(('PMID', pubmed_num))
-
-                if self.class_or_indiv.get(gene_id) == 'C':
-                    model.addClassToGraph(gene_id, None)
-                else:
-                    model.addIndividualToGraph(gene_id, None)
-                # add the publication as a NamedIndividual
-                # add type publication
-                model.addIndividualToGraph(pubmed_id, None, None)
-                reference = Reference(
-                    g, pubmed_id, Reference.ref_types['journal_article'])
-                reference.addRefToGraph()
-                g.addTriple(
-                    pubmed_id, model.object_properties['is_about'], gene_id)
-                assoc_counter += 1
-                if not self.testMode and \
-                        limit is not None and line_counter > limit:
-                    break
+        for line in self._get_lines(myfile):
+            (tax_num, gene_num, pubmed_num) = line.split('\t')
+
+            # ## set filter=None in init if you don't want to have a filter
+            # if self.filter is not None:
+            #     if ((self.filter == 'taxids' and \
+            #          (int(tax_num) not in self.tax_ids))
+            #        or (self.filter == 'geneids' and \
+            #            (int(gene_num) not in self.gene_ids))):
+            #         continue
+            # #### end filter
+
+            if self.testMode and int(gene_num) not in self.gene_ids:
+                continue
+
+            if not self.testMode and int(tax_num) not in self.tax_ids:
+                continue
+
+            if gene_num == '-' or pubmed_num == '-':
+                continue
+
+            line_counter += 1
+            gene_id = ':'.join(('NCBIGene', gene_num))
+            pubmed_id = ':'.join(('PMID', pubmed_num))
+
+            if self.class_or_indiv.get(gene_id) == 'C':
+                model.addClassToGraph(gene_id, None)
+            else:
+                model.addIndividualToGraph(gene_id, None)
+            # add the publication as a NamedIndividual
+            # add type publication
+            model.addIndividualToGraph(pubmed_id, None, None)
+            reference = Reference(
+                g, pubmed_id, Reference.ref_types['journal_article'])
+            reference.addRefToGraph()
+            g.addTriple(
+                pubmed_id, model.object_properties['is_about'], gene_id)
+            assoc_counter += 1
+            if not self.testMode and \
+                    limit is not None and line_counter > limit:
+                break
 
         logger.info(
             "Processed %d pub-gene associations", assoc_counter)
@@ -630,73 +715,34 @@ class NCBIGene(Source):
         """
 
         logger.info("getting gene groups")
-        line_counter = 0
         f = '/'.join((self.rawdir, self.files['gene_group']['file']))
         found_counter = 0
-        # because many of the orthologous groups are grouped by human gene,
-        # we need to do this by generating two-way hash
-
-        # group_id => orthologs
-        # ortholog id => group
-        # this will be the fastest approach, though not memory-efficient.
+        # many of the orthologous groups are grouped by human gene,
+        # so we look up the groups the genes are in, then their members,
+        # in an index of the gene_group file shared by all the callers
         geno = Genotype(graph)
         model = Model(graph)
-        group_to_orthology = {}
-        gene_to_group = {}
-        gene_to_taxon = {}
-
-        with gzip.open(f, 'rb') as csvfile:
-            filereader = csv.reader(
-                io.TextIOWrapper(csvfile, newline=""),
-                delimiter='\t',
-                quotechar='\"')
-
-            for row in filereader:
-                # skip comment lines
-                if re.match(r'\#', ''.join(row)):
-                    continue
-                line_counter += 1
-                (tax_a, gene_a, rel, tax_b, gene_b) = row
-
-                if rel != 'Ortholog':
-                    continue
-
-                if gene_a not in group_to_orthology:
-                    group_to_orthology[gene_a] = set()
-                group_to_orthology[gene_a].add(gene_b)
-
-                if gene_b not in gene_to_group:
-                    gene_to_group[gene_b] = set()
-                gene_to_group[gene_b].add(gene_a)
-
-                gene_to_taxon[gene_a] = tax_a
-                gene_to_taxon[gene_b] = tax_b
-
-                # also add the group lead as a member of the group
-                group_to_orthology[gene_a].add(gene_a)
+        gene_nums = {}
+        for gid in gene_ids:
+            gene_num = re.sub(r'NCBIGene:', '', gid)
+            if gene_num.isdigit():
+                gene_nums[gid] = int(gene_num)
+        orthologs = GeneGroupIndex.get(f).get_orthologs(gene_nums.values())
 
-            # end loop through gene_group file
-        logger.debug("Finished hashing gene groups")
         logger.debug("Making orthology associations")
         for gid in gene_ids:
-            gene_num = re.sub(r'NCBIGene:', '', gid)
-            group_nums = gene_to_group.get(gene_num)
-            if group_nums is not None:
-                for group_num in group_nums:
-                    orthologs = group_to_orthology.get(group_num)
-                    if orthologs is not None:
-                        for o in orthologs:
-                            oid = 'NCBIGene:'+str(o)
-                            model.addClassToGraph(
-                                oid, None, Genotype.genoparts['gene'])
-                            otaxid = 'NCBITaxon:'+str(gene_to_taxon[o])
-                            geno.addTaxon(otaxid, oid)
-                            assoc = OrthologyAssoc(graph, self.name, gid, oid)
-                            assoc.add_source('PMID:24063302')
-                            assoc.add_association_to_graph()
-                            # todo get gene label for orthologs -
-                            # this could get expensive
-                            found_counter += 1
+            for (o, otax) in orthologs.get(gene_nums.get(gid), []):
+                oid = 'NCBIGene:'+str(o)
+                model.addClassToGraph(
+                    oid, None, Genotype.genoparts['gene'])
+                otaxid = 'NCBITaxon:'+str(otax)
+                geno.addTaxon(otaxid, oid)
+                assoc = OrthologyAssoc(graph, self.name, gid, oid)
+                assoc.add_source('PMID:24063302')
+                assoc.add_association_to_graph()
+                # todo get gene label for orthologs -
+                # this could get expensive
+                found_counter += 1
 
             # finish loop through annotated genes
         logger.info(
@@ -1,9 +1,7 @@
 import logging
-import xml.etree.ElementTree as ET
 import re
 import gzip
 import io
-import shutil
 
 from dipper.sources.Source import Source
 from dipper.sources.OMIM import OMIM, filter_keep_phenotype_entry_ids
@@ -124,8 +122,6 @@ class OMIA(Source):
         # Landmark, Lida_Links, OMIA_Group, OMIA_author, Omim_Xref, People,
         # Phene, Phene_Gene, Publishers, Resources, Species_gb, Synonyms
 
-        self.scrub()
-
         if limit is not None:
             logger.info("Only parsing first %d rows", limit)
 
@@ -139,15 +135,37 @@ class OMIA(Source):
         else:
             self.g = self.graph
 
-        # we do three passes through the file
-        # first process species (two others reference this one)
-        self.process_species(limit)
-
-        # then, process the breeds, genes, articles, and other static stuff
-        self.process_classes(limit)
-
-        # next process the association data
-        self.process_associations(limit)
+        # we go through the file once, in three stages
+        myfile = '/'.join((self.rawdir, self.files['data']['file']))
+        self.process_xml_tables(self.scrub(myfile), [
+            # first process species (two others reference this one)
+            # Species ids are == genbank species ids!
+            {'tables': {
+                'Species_gb': self._process_species_table_row}},
+            # then, process the breeds, genes, articles, phenes,
+            # and phenotype-grouping classes. We add elements to the graph,
+            # and store the id-to-label in the label_hash dict,
+            # along with the internal key-to-external id in the id_hash dict
+            {'tables': {
+                'Articles': self._process_article_row,
+                'Breed': self._process_breed_row,
+                'Genes_gb': self._process_gene_row,
+                'OMIA_Group': self._process_omia_group_row,
+                'Phene': self._process_phene_row,
+                'Omim_Xref': self._process_omia_omim_map},
+             # post-process the omia-omim associations to filter out the
+             # genes (keep only phenotypes/diseases)
+             'after': self.clean_up_omim_genes},
+            # next process the association data: the article-breed,
+            # article-phene, breed-phene, phene-gene associations,
+            # and the external links to LIDA
+            {'tables': {
+                'Article_Breed': self._process_article_breed_row,
+                'Article_Phene': self._process_article_phene_row,
+                'Breed_Phene': self._process_breed_phene_row,
+                'Lida_Links': self._process_lida_links_row,
+                'Phene_Gene': self._process_phene_gene_row,
+                'Group_MPO': self._process_group_mpo_row}}], limit)
 
         # process the vertebrate orthology for genes
         # that are annotated with phenotypes
@@ -160,7 +178,7 @@ class OMIA(Source):
 
         return
 
-    def scrub(self):
+    def scrub(self, myfile):
         """
         The XML file seems to have mixed-encoding;
         we scrub out the control characters
@@ -168,137 +186,34 @@ class OMIA(Source):
 
         i.e.?i
         omia.xml:1555328.28: PCDATA invalid Char value 2
-        <field name="journal">Bulletin et Memoires de la Societe Centrale de Medic
+        <field name="journal">Bulletin et Memoires de la Societe Centrale de Medic
 
-        :return:
+        The file is scrubbed as it is read, leaving the original data as is.
+        This may be heavy handed as chars which do not break the parser
+        are stripped as well (i.e. tabs), though line ends are kept.
 
+        :param myfile: the gzipped xml
+        :return: generator of the scrubbed text, after the xml declaration
         """
 
         logger.info(
             "Scrubbing out the nasty characters that break our parser.")
 
-        myfile = '/'.join((self.rawdir, self.files['data']['file']))
-        tmpfile = '/'.join((self.rawdir, self.files['data']['file']+'.tmp.gz'))
-        t = gzip.open(tmpfile, 'wb')
         du = DipperUtil()
+        lines = []
         with gzip.open(myfile, 'rb') as f:
             filereader = io.TextIOWrapper(f, newline="")
+            filereader.readline()  # remove the xml declaration line
             for l in filereader:
-                l = du.remove_control_characters(l) + '\n'
-                t.write(l.encode('utf-8'))
-        t.close()
-        # TEC I do not like this at all. original data must be preserved as is.
-        # also may be heavy handed as chars which do not break the parser
-        # are stripped as well (i.e. tabs and newlines)
-        # move the temp file
-        logger.info("Replacing the original data with the scrubbed file.")
-        shutil.move(tmpfile, myfile)
-        return
-
-    # ###################### XML LOOPING FUNCTIONS ##################
-
-    def process_species(self, limit):
-        """
-        Loop through the xml file and process the species.
-        We add elements to the graph, and store the
-        id-to-label in the label_hash dict.
-        :param limit:
-        :return:
-        """
-
-        myfile = '/'.join((self.rawdir, self.files['data']['file']))
-
-        f = gzip.open(myfile, 'rb')
-        filereader = io.TextIOWrapper(f, newline="")
-
-        filereader.readline()  # remove the xml declaration line
-
-        for event, elem in ET.iterparse(filereader):
-            # Species ids are == genbank species ids!
-            self.process_xml_table(
-                elem, 'Species_gb', self._process_species_table_row, limit)
-
-        f.close()
-
-        return
-
-    def process_classes(self, limit):
-        """
-        Loop through the xml file and process the articles,
-        breed, genes, phenes, and phenotype-grouping classes.
-        We add elements to the graph,
-        and store the id-to-label in the label_hash dict,
-        along with the internal key-to-external id in the id_hash dict.
-        The latter are referenced in the association processing functions.
-
-        :param limit:
-        :return:
-
-        """
-
-        myfile = '/'.join((self.rawdir, self.files['data']['file']))
-
-        f = gzip.open(myfile, 'rb')
-        filereader = io.TextIOWrapper(f, newline="")
-
-        filereader.readline()  # remove the xml declaration line
-
-        parser = ET.XMLParser(encoding='utf-8')
-
-        for event, elem in ET.iterparse(filereader, parser=parser):
-            self.process_xml_table(
-                elem, 'Articles', self._process_article_row, limit)
-            self.process_xml_table(
-                elem, 'Breed', self._process_breed_row, limit)
-            self.process_xml_table(
-                elem, 'Genes_gb', self._process_gene_row, limit)
-            self.process_xml_table(
-                elem, 'OMIA_Group', self._process_omia_group_row, limit)
-            self.process_xml_table(
-                elem, 'Phene', self._process_phene_row, limit)
-            self.process_xml_table(
-                elem, 'Omim_Xref', self._process_omia_omim_map, limit)
-
-        f.close()
-
-        # post-process the omia-omim associations to filter out the genes
-        # (keep only phenotypes/diseases)
-        self.clean_up_omim_genes()
-
-        return
-
-    def process_associations(self, limit):
-        """
-        Loop through the xml file and process the article-breed, article-phene,
-        breed-phene, phene-gene associations, and the external links to LIDA.
-
-        :param limit:
-        :return:
-
-        """
-
-        myfile = '/'.join((self.rawdir, self.files['data']['file']))
-
-        f = gzip.open(myfile, 'rb')
-        filereader = io.TextIOWrapper(f, newline="")
-
-        filereader.readline()  # remove the xml declaration line
-
-        for event, elem in ET.iterparse(filereader):
-            self.process_xml_table(
-                elem, 'Article_Breed', self._process_article_breed_row, limit)
-            self.process_xml_table(
-                elem, 'Article_Phene', self._process_article_phene_row, limit)
-            self.process_xml_table(
-                elem, 'Breed_Phene', self._process_breed_phene_row, limit)
-            self.process_xml_table(
-                elem, 'Lida_Links', self._process_lida_links_row, limit)
-            self.process_xml_table(
-                elem, 'Phene_Gene', self._process_phene_gene_row, limit)
-            self.process_xml_table(
-                elem, 'Group_MPO', self._process_group_mpo_row, limit)
-
-        f.close()
+                text = l.rstrip('\r\n')
+                # most lines have nothing to scrub
+                if not text.isprintable():
+                    text = du.remove_control_characters(l)
+                lines.append(text + '\n')
+                if len(lines) == 1000:
+                    yield ''.join(lines)
+                    lines = []
+        yield ''.join(lines)
 
         return
 
@@ -1,7 +1,5 @@
 import logging
 import re
-import json
-import urllib
 
 from dipper.sources.Source import Source
 from dipper.models.Dataset import Dataset
@@ -12,6 +10,7 @@ from dipper.models.GenomicFeature import Feature, makeChromID
 from dipper.models.Reference import Reference
 from dipper import config
 from dipper.utils.romanplus import romanNumeralPattern, fromRoman, toRoman
+from dipper.utils.OMIMClient import OMIMClient
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +91,15 @@ class OMIM(Source):
         # disease with known locus
         102480]
 
+    checkpoint_attrs = ['omim_ncbigene_idmap']
+
+    # the entries fetched from the API are kept in rawdir/entry_store,
+    # and checked for updates once they are entry_max_age seconds old
+    entry_store = 'entries.db'
+    entry_max_age = 7 * 24 * 3600
+    api_rate = 4            # requests per second
+    groupsize = 20
+
     def __init__(self, graph_type, are_bnodes_skolemized):
         super().__init__(graph_type, are_bnodes_skolemized, 'omim')
 
@@ -147,9 +155,11 @@ class OMIM(Source):
         if self.testOnly:
             self.testMode = True
 
-        self._process_all(limit)
-        self._process_morbidmap(limit)
-        self._process_phenotypicseries(limit)
+        self.run_stage('all', self._process_all, limit)
+        self.run_stage('morbidmap', self._process_morbidmap, limit)
+        self.run_stage(
+            'phenotypicseries', self._process_phenotypicseries, limit)
+        self.clear_checkpoint()
 
         logger.info("Done parsing.")
 
@@ -199,11 +209,14 @@ class OMIM(Source):
         return omimids
 
     def process_entries(self, omimids, transform,
-                        included_fields=None, graph=None, limit=None):
+                        included_fields=None, graph=None, limit=None,
+                        stage=None):
         """
         Given a list of omim ids,
         this will use the omim API to fetch the entries, according to the
         ```included_fields``` passed as a parameter.
+        Entries are kept in a local store (see OMIMClient), so only those
+        missing from it, or updated since, are fetched.
         If a transformation function is supplied,
         this will iterate over each entry,
         and either add the results to the supplied ```graph```
@@ -219,15 +232,10 @@ class OMIM(Source):
         :param included_fields: A set of what fields are required to retrieve
          from the API
         :param graph: the graph to add the transformed data into
+        :param stage: name to checkpoint progress under, after each batch
         :return:
         """
 
-        omimparams = {}
-
-        # add the included_fields as parameters
-        if included_fields is not None and len(included_fields) > 0:
-            omimparams['include'] = ','.join(included_fields)
-
         processed_entries = list()
 
         # scrub any omim prefixes from the omimids before processing
@@ -236,69 +244,39 @@ class OMIM(Source):
             scrubbed = re.sub(r'O?MIM:', '', str(o))
             if re.match(r'\d+', str(scrubbed)):
                 cleanomimids.add(scrubbed)
-        omimids = list(cleanomimids)
+        # sorted, so that a checkpointed position means the same next run
+        omimids = sorted(cleanomimids)
 
-        it = 0  # for counting
-
-        # note that you can only do request batches of 20
-        # see info about "Limits" at http://omim.org/help/api
-        # TODO 2017 May seems a majority of many groups of 20
-        # are producing python None for RDF triple Objects
-
-        groupsize = 20
-        if not self.testMode and limit is not None:
-            # just in case the limit is larger than the number of records,
-            # max it out
-            maxit = min((limit, omimids.__len__()))
-        else:
-            maxit = omimids.__len__()
-
-        while it < maxit:
-            end = min((maxit, it + groupsize))
-            # iterate through the omim ids list,
-            # and fetch from the OMIM api in batches of 20
-
-            if self.testMode:
-                intersect = \
-                    list(
-                        set([str(i)
-                            for i in self.test_ids]) & set(omimids[it:end]))
-                # some of the test ids are in the omimids
-                if len(intersect) > 0:
-                    logger.info("found test ids: %s", intersect)
-                    omimparams.update({'mimNumber': ','.join(intersect)})
-                else:
-                    it += groupsize
-                    continue
-            else:
-                omimparams.update({'mimNumber': ','.join(omimids[it:end])})
-
-            url = OMIMAPI + urllib.parse.urlencode(omimparams)
-            logger.info('fetching: %s', url)
-
-            try:
-                d = urllib.request.urlopen(url)
-            except OSError as e:  # URLError?
-                logger.error(e)
-                break
-
-            resp = d.read().decode()
-            it += groupsize
-
-            myjson = json.loads(resp)
-            # snag a copy, hopefully we will get the ftp dl soon
-            # with open('./raw/omim/_' + str(it) + '.json', 'w') as fp:
-            #    json.dump(myjson, fp)
+        if self.testMode:
+            test_ids = set(str(i) for i in self.test_ids)
+            omimids = [o for o in omimids if o in test_ids]
+            logger.info("found test ids: %s", omimids)
+        elif limit is not None:
+            omimids = omimids[:limit]
+
+        # fetch what the local store is missing, then transform from it
+        client = OMIMClient(
+            OMIMAPI, '/'.join((self.rawdir, self.entry_store)),
+            self.api_rate, max_age=self.entry_max_age)
+        client.update(omimids, included_fields)
 
-            entries = myjson['omim']['entryList']
+        it = 0  # for counting
+        if stage is not None and self.checkpoint_position(stage) is not None:
+            it = self.checkpoint_position(stage)
+            logger.info("Resuming from entry %d of %d", it, len(omimids))
 
-            for e in entries:
+        while it < len(omimids):
+            end = min((len(omimids), it + self.groupsize))
+            for e in client.entries(omimids[it:end], included_fields):
                 # apply the data transformation, and save it to the graph
                 processed_entry = transform(e, graph)
                 if processed_entry is not None:
                     processed_entries.append(processed_entry)
+            it = end
+            if stage is not None:
+                self.checkpoint(stage, it)
+        client.close()
 
-                # ### end iterating over batch of entries
         return processed_entries
 
     def _process_all(self, limit):
@@ -342,7 +320,7 @@ class OMIM(Source):
         includes.add('all')
 
         self.process_entries(
-            omimids, self._transform_entry, includes, g, limit)
+            omimids, self._transform_entry, includes, g, limit, 'entries')
 
         return
 
@@ -1,7 +1,7 @@
+import gzip
 import logging
 import itertools
 import re
-import functools
 import lxml.etree
 import os
 
@@ -9,7 +9,7 @@ import time
 
 from dipper.sources.Source import Source
 from dipper.models.assoc.OrthologyAssoc import OrthologyAssoc
-from dipper.models.Model import Model
+from dipper.models.assoc.AssociationBatch import AssociationBatch
 from dipper.models.Genotype import Genotype
 from dipper import config
 
@@ -19,48 +19,87 @@ logger = logging.getLogger(__name__)
 
 
 class OrthoXMLParser(object):
-    def __init__(self, xml):
-        if not (hasattr(xml, 'docinfo') and xml.docinfo.root_name == "orthoXML"):
-            raise ValueError('Expecting an lxml.etree object of an orthoXML file as input')
-        self.obj = xml
-        self.relations = []
-        self.gene_mapping = self._build_gene_mapping()
-
-    def _build_gene_mapping(self):
-        gene_map = {}
-        for gene in self.obj.findall(".//{http://orthoXML.org/2011/}gene"):
-            gene_map[gene.get('id')] = gene
-        return gene_map
-
-    def extract_pairwise_relations(self, node=None):
-        if node is None:
-            root_nodes = self.default_node_list()
-        else:
-            root_nodes = [node]
-
-        for group in root_nodes:
-            self.relations = []
-            self._extract_pw(group)
-            for rel in self.relations:
-                yield rel
-
-    def _extract_pw(self, node):
+    """Streams the induced pairwise relations out of an orthoXML file.
+
+    The file is read with iterparse: the genes of each species are kept
+    in a compact table, gene id -> (protId, taxon), and each top level
+    group is expanded into its pairwise relations as soon as it has been
+    read, then dropped. So memory is bounded by the gene table and the
+    largest single group, rather than the whole tree."""
+
+    ns = '{http://orthoXML.org/2011/}'
+
+    def __init__(self, xml, gene_info=None):
+        """:param xml: file name (possibly gzipped) or file object
+        :param gene_info: function of a gene element, returning what to
+            keep of it in gene_mapping; (protId, None) by default"""
+        self.xml = xml
+        self.gene_info = gene_info
+        if gene_info is None:
+            self.gene_info = lambda gene: (gene.get('protId'), None)
+        self.gene_mapping = {}
+
+    def extract_pairwise_relations(self, keep=None):
+        """:param keep: function of a gene id, whether to expand
+            the relations of the gene; all of them if None
+        :return: generator of (gene id, gene id, group type)"""
+        xml = self.xml
+        if isinstance(xml, str):
+            # gzipped or not, as lxml.etree.parse would take it
+            with open(xml, 'rb') as f:
+                gzipped = f.read(2) == b'\x1f\x8b'
+            xml = gzip.open(xml, 'rb') if gzipped else open(xml, 'rb')
+        try:
+            yield from self._iterparse(xml, keep)
+        finally:
+            if xml is not self.xml:
+                xml.close()
+
+    def _iterparse(self, xml, keep):
+        tags = [self.ns + tag for tag in (
+            'species', 'orthologGroup', 'paralogGroup')]
+        relations = []
+        context = lxml.etree.iterparse(xml, tag=tags, remove_blank_text=True)
+        for event, elem in context:
+            parent = elem.getparent()
+            if elem.tag == self.ns + 'species':
+                for gene in elem.iter(self.ns + 'gene'):
+                    self.gene_mapping[gene.get('id')] = self.gene_info(gene)
+                # (much) faster than clearing the species element of them
+                for genes in elem.iter(self.ns + 'genes'):
+                    del genes[:]
+            elif parent.tag != self.ns + 'groups':
+                continue    # a nested group, expanded with its top group
+            else:
+                self._extract_pw(elem, keep, relations)
+                yield from relations
+                relations.clear()
+            # done with it, and those before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+        if context.root.tag != self.ns + 'orthoXML':
+            raise ValueError('Expecting an orthoXML file as input')
+
+    def _extract_pw(self, node, keep, relations):
+        """adds the relations within node to relations,
+        :return: the set of its gene ids"""
         if self.is_leaf(node):
-            return {self.leaf_label(node)}
+            label = self.leaf_label(node)
+            if keep is not None and not keep(label):
+                return set()
+            return {label}
         elif self.is_internal_node(node):
-            nodes_of_children = [self._extract_pw(child) for child in self.get_children(node)]
+            nodes_of_children = [self._extract_pw(child, keep, relations) for child in self.get_children(node)]
             rel = lxml.etree.QName(node).localname
             for child1, child2 in itertools.combinations(nodes_of_children, 2):
                 for gId1, gId2 in itertools.product(child1, child2):
-                    self.relations.append((gId1, gId2, rel))
-            nodes = set.union(*nodes_of_children)
+                    relations.append((gId1, gId2, rel))
+            nodes = set.union(set(), *nodes_of_children)
             return nodes
         else:
             return set([])
 
-    def default_node_list(self):
-        return self.obj.find(".//{http://orthoXML.org/2011/}groups")
-
     def is_internal_node(self, node):
         return lxml.etree.QName(node).localname in ('orthologGroup', 'paralogGroup')
 
@@ -96,6 +135,7 @@ class OrthoXML(Source):
         self._map_orthology_code_to_RO = {
             'orthologGroup': OrthologyAssoc.ortho_rel['orthologous'],
             'paralogGroup': OrthologyAssoc.ortho_rel['paralogous']}
+        self._taxa = {}
 
         if 'test_ids' not in config.get_config() \
                 or 'protein' not in config.get_config()['test_ids']:
@@ -103,6 +143,9 @@ class OrthoXML(Source):
         else:
             self.test_ids = config.get_config()['test_ids']['protein']
 
+        # proteins take part in many relations; only declare each once
+        self.set_declared_cache(2**15)
+
         return
 
     def fetch(self, is_dl_forced=False):
@@ -158,7 +201,8 @@ class OrthoXML(Source):
         logger.info("getting ortholog and paralog relations")
 
         g = self.testgraph if self.testMode else self.graph
-        model = Model(g)
+        geno = Genotype(g)
+        batch = AssociationBatch(g, self.name)
 
         for k in self.files.keys():
             f = os.path.join(self.rawdir, self.files[k]['file'])
@@ -166,25 +210,27 @@ class OrthoXML(Source):
             logger.info("Parsing %s", f)
 
             time_start = time.time()
-            xml = lxml.etree.parse(f)
-            parser = OrthoXMLParser(xml)
-            logger.info("loaded {} into memory. Took {}sec to load. Starting to extract relations..."
-                        .format(f, time.time()-time_start))
+            parser = OrthoXMLParser(f, self.gene_info)
+            keep = None
+            if self.tax_ids is not None:
+                # so the pairs in other taxa are never expanded
+                keep = self._in_taxa(parser)
+            logger.info("Streaming relations from {}...".format(f))
 
             time0, last_cnt = time.time(), 0
-            for cnts, (protein_nr_a, protein_nr_b, rel_type) in enumerate(parser.extract_pairwise_relations()):
-                protein_a = parser.gene_mapping[protein_nr_a]
-                protein_b = parser.gene_mapping[protein_nr_b]
-
-                protein_id_a = protein_a.get('protId')
-                protein_id_b = protein_b.get('protId')
+            for cnts, (protein_nr_a, protein_nr_b, rel_type) in enumerate(parser.extract_pairwise_relations(keep)):
+                (protein_id_a, taxon_a) = parser.gene_mapping[protein_nr_a]
+                (protein_id_b, taxon_b) = parser.gene_mapping[protein_nr_b]
 
                 if cnts % 100 == 0 and time.time()-time0 > 30:
+                    skipped = 0
+                    if g.declared_cache is not None:
+                        skipped = g.declared_cache.suppressed.get('addTaxon', 0)
                     logger.info("processed {0:d} rels in {1:.1f}sec: {2:.3f}/sec; overall {3:d} in "
-                                "{4:1f}sec ({5:.3f}/sec); cache ratio: {6.hits}/{6.misses}"
+                                "{4:1f}sec ({5:.3f}/sec); repeated proteins: {6:d}"
                                 .format(cnts-last_cnt, time.time()-time0, (cnts-last_cnt)/(time.time()-time0),
                                         cnts, time.time()-time_start, cnts/(time.time()-time_start),
-                                        self.add_protein_to_graph.cache_info()))
+                                        skipped))
                     time0, last_cnt = time.time(), cnts
 
                 if self.testMode and not \
@@ -192,30 +238,18 @@ class OrthoXML(Source):
                     continue
 
                 matchcounter += 1
-                taxon_a = self.extract_taxon_info(protein_a)
-                taxon_b = self.extract_taxon_info(protein_b)
-
-                # check if both protein belong to taxa that are selected
-                if (self.tax_ids is not None and (
-                    (int(re.sub(r'NCBITaxon:', '', taxon_a.rstrip()))
-                            not in self.tax_ids) or
-                    (int(re.sub(r'NCBITaxon:', '', taxon_b.rstrip()))
-                            not in self.tax_ids))):
-                        continue
 
                 protein_id_a = self.clean_protein_id(protein_id_a)
                 protein_id_b = self.clean_protein_id(protein_id_b)
                 # add genes to graph if needed;
                 # assume labels will be taken care of elsewhere
-                self.add_protein_to_graph(protein_id_a, taxon_a, model)
-                self.add_protein_to_graph(protein_id_b, taxon_b, model)
+                self.add_protein_to_graph(protein_id_a, taxon_a, geno)
+                self.add_protein_to_graph(protein_id_b, taxon_b, geno)
 
                 rel = self._map_orthology_code_to_RO[rel_type]
                 evidence_id = 'ECO:0000080'  # phylogenetic evidence
                 # add the association and relevant nodes to graph
-                assoc = OrthologyAssoc(g, self.name, protein_id_a, protein_id_b, rel)
-                assoc.add_evidence(evidence_id)
-                assoc.add_association_to_graph()
+                batch.add(protein_id_a, rel, protein_id_b, evidence=[evidence_id])
 
                 if not self.testMode \
                         and limit is not None and matchcounter > limit:
@@ -223,18 +257,37 @@ class OrthoXML(Source):
                     break
                     # make report on unprocessed_gene_ids
 
+            batch.flush()
             logger.info("finished processing %s", f)
+        logger.info("Added %d associations", len(batch))
         return
 
-    @functools.lru_cache(2**15)
-    def add_protein_to_graph(self, protein_id, taxon, model):
+    def gene_info(self, gene_node):
+        """what is kept of each gene element while streaming: its protId
+        and taxon. The taxon strings are shared between genes."""
+        taxon = self.extract_taxon_info(gene_node)
+        return (gene_node.get('protId'), self._taxa.setdefault(taxon, taxon))
+
+    def _in_taxa(self, parser):
+        """:return: function of a gene id, whether both proteins of a pair
+        with it could be in the selected tax_ids"""
+        wanted = {}
+
+        def keep(gene_id):
+            taxon = parser.gene_mapping[gene_id][1]
+            if taxon not in wanted:
+                wanted[taxon] = int(re.sub(
+                    r'NCBITaxon:', '', taxon.rstrip())) in self.tax_ids
+            return wanted[taxon]
+
+        return keep
+
+    def add_protein_to_graph(self, protein_id, taxon, geno):
         """adds protein nodes to the graph and adds a "in_taxon" triple.
 
-        for efficency reasons, we cache which proteins we have already
-        added using a least recently used cache."""
-        model.addClassToGraph(protein_id, None, Genotype.genoparts['polypeptide'])
-        model.graph.addTriple(
-            protein_id, model.object_properties['in_taxon'], taxon)
+        proteins already added are skipped by the graph's declared_cache."""
+        geno.model.addClassToGraph(protein_id, None, Genotype.genoparts['polypeptide'])
+        geno.addTaxon(taxon, protein_id)
 
     def extract_taxon_info(self, gene_node):
         """extract the ncbi taxon id from a gene_node
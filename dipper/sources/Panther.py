@@ -1,10 +1,16 @@
 import tarfile
 import re
+import queue
 import logging
+import threading
+import multiprocessing
 
 from dipper.sources.Source import Source
 from dipper.models.assoc.OrthologyAssoc import OrthologyAssoc
+from dipper.models.assoc.AssociationBatch import AssociationBatch
 from dipper.models.Model import Model
+from dipper.models.Genotype import Genotype
+from dipper.models.Family import Family
 from dipper.models.Dataset import Dataset
 from dipper import config
 from dipper import curie_map
@@ -51,6 +57,38 @@ class Panther(Source):
             'url': PNTHDL+'/Orthologs_HCOP.tar.gz'}
     }
 
+    # the panther-specific taxon abbreviations, and their NCBI taxon numbers
+    ptax_to_taxid_map = {
+        'ANOCA': 28377,  # green lizard
+        'ARATH': 3702,   # arabadopsis
+        'BOVIN': 9913,   # cow
+        'CAEEL': 6239,   # worm
+        'CANFA': 9615,   # dog
+        'CHICK': 9031,   # chicken
+        'DANRE': 7955,   # zebrafish
+        'DICDI': 44689,  # discodium
+        'DROME': 7227,   # drosophila melanogaster
+        'ECOLI': 562,
+        'HORSE': 9796,   # horses
+        'HUMAN': 9606,   # humans
+        'MACMU': 9544,   # macaque
+        'MONDO': 13616,  # opossum
+        'MOUSE': 10090,  # mouse
+        'ORNAN': 9258,   # orangutan
+        'PANTR': 9598,   # chimp
+        'PIG': 9823,
+        'RAT': 10116,
+        'SCHPO': 4896,   # yeast
+        'TAKRU': 31033,  # pufferfish
+        'XENTR': 8364,   # xenopus
+        'YEAST': 559292,   # yeast
+    }
+
+    # lines handed to a worker process at a time, when parsing in parallel
+    batch_size = 10000
+    # lines between checkpoints of the position within a file
+    checkpoint_lines = 10000
+
     def __init__(self, graph_type, are_bnodes_skolemized, tax_ids=None):
         super().__init__(graph_type, are_bnodes_skolemized, 'panther')
         self.tax_ids = tax_ids
@@ -102,6 +140,7 @@ class Panther(Source):
                 str(self.tax_ids))
 
         self._get_orthologs(limit)
+        self.clear_checkpoint()
 
         return
 
@@ -152,10 +191,32 @@ class Panther(Source):
         else:
             g = self.graph
         model = Model(g)
+        geno = Genotype(g)
+        family = Family(g)
+        batch = AssociationBatch(g, self.name)
+        self.batches.append(batch)
         unprocessed_gene_ids = set()  # may be faster to make a set after
 
+        files = []
         for k in self.files.keys():
+            if self.checkpoint_done(k):
+                logger.info("Skipping %s, completed before the checkpoint", k)
+            else:
+                files.append(k)
+
+        if self.processes > 1 and limit is None and not self.testMode:
+            # those part way through resume where they left off, in turn
+            parallel = [
+                k for k in files if self.checkpoint_position(k) is None]
+            self._get_orthologs_parallel(parallel, batch, model, geno, family)
+            files = [k for k in files if k not in parallel]
+
+        for k in files:
+            # lines of this file already processed before the checkpoint
+            resume_at = self.checkpoint_position(k)
             f = '/'.join((self.rawdir, self.files[k]['file']))
+            if self.testMode:
+                f = self.get_test_subset(f, self._is_test_row, self.test_ids)
             matchcounter = 0
             mytar = tarfile.open(f, 'r:gz')
 
@@ -170,6 +231,10 @@ class Panther(Source):
                         logger.info("Skipping header line")
                         continue
                     line_counter += 1
+                    if resume_at is not None and line_counter <= resume_at:
+                        continue
+                    if (line_counter - 1) % self.checkpoint_lines == 0:
+                        self.checkpoint(k, line_counter - 1)
 
                     # a little feedback to the user since there's so many
                     if line_counter % 1000000 == 0:
@@ -226,63 +291,211 @@ class Panther(Source):
 
                     # ### end code block for filtering on taxon
 
-                    # fix the gene identifiers
-                    gene_a = re.sub(r'=', ':', gene_a)
-                    gene_b = re.sub(r'=', ':', gene_b)
-
-                    clean_gene = self._clean_up_gene_id(gene_a, species_a)
-                    if clean_gene is None:
-                        unprocessed_gene_ids.add(gene_a)
-                    gene_a = clean_gene
-                    clean_gene = self._clean_up_gene_id(gene_b, species_b)
-                    if clean_gene is None:
-                        unprocessed_gene_ids.add(gene_b)
-                    gene_b = clean_gene
+                    row = self._orthology_row(
+                        (species_a, taxon_a, gene_a),
+                        (species_b, taxon_b, gene_b),
+                        orthology_class, panther_id, unprocessed_gene_ids)
 
                     # a special case here; mostly some rat genes
                     # they use symbols instead of identifiers.  will skip
-                    if gene_a is None or gene_b is None:
+                    if row is None:
                         continue
 
-                    rel = self._map_orthology_code_to_RO(orthology_class)
-
-                    evidence_id = 'ECO:0000080'  # phylogenetic evidence
-
-                    # add the association and relevant nodes to graph
-                    assoc = OrthologyAssoc(g, self.name, gene_a, gene_b, rel)
-                    assoc.add_evidence(evidence_id)
-
-                    # add genes to graph;
-                    # assume labels will be taken care of elsewhere
-                    model.addClassToGraph(gene_a, None)
-                    model.addClassToGraph(gene_b, None)
-
-                    # might as well add the taxon info for completeness
-                    g.addTriple(
-                        gene_a, model.object_properties['in_taxon'], taxon_a)
-                    g.addTriple(
-                        gene_b, model.object_properties['in_taxon'], taxon_b)
-
-                    assoc.add_association_to_graph()
-
-                    # note this is incomplete...
-                    # it won't construct the full family hierarchy,
-                    # just the top-grouping
-                    assoc.add_gene_family_to_graph(
-                        ':'.join(('PANTHER', panther_id)))
+                    self._add_orthology(row, batch, model, geno, family)
 
                     if not self.testMode \
                             and limit is not None and line_counter > limit:
                         break
                 # make report on unprocessed_gene_ids
 
+            batch.flush()
+            self.checkpoint(k)
             logger.info("finished processing %s", f)
             logger.warning(
                 "The following gene ids were unable to be processed: %s",
                 str(unprocessed_gene_ids))
 
+        self.batches.remove(batch)
+        logger.info("Added %d orthology associations", len(batch))
+
+        return
+
+    def _get_orthologs_parallel(self, keys, batch, model, geno, family):
+        """
+        Parse the files of keys at the same time.
+        Each is read by its own thread into batches of lines,
+        skipping (on the raw bytes) those without a pair in tax_ids;
+        a pool of self.processes worker processes turns the batches into
+        orthology rows (see _parse_ortholog_lines),
+        and these are added to the graph here, in file then line order,
+        so the graph is the same as from parsing one line at a time.
+
+        :param keys: of the files to parse
+        :return: None
+
+        """
+        codes = None
+        if self.tax_ids is not None:
+            codes = set(
+                ptax.encode() for (ptax, taxnum)
+                in self.ptax_to_taxid_map.items() if taxnum in self.tax_ids)
+
+        with multiprocessing.Pool(self.processes) as pool:
+            readers = {}
+            for k in keys:
+                f = '/'.join((self.rawdir, self.files[k]['file']))
+                # bounded, so a reader gets no further ahead than this
+                results = queue.Queue(maxsize=4 * self.processes)
+                reader = threading.Thread(
+                    target=self._read_line_batches,
+                    args=(f, codes, pool, results))
+                reader.daemon = True
+                reader.start()
+                readers[k] = (f, results)
+
+            for k in keys:
+                (f, results) = readers[k]
+                unprocessed_gene_ids = set()
+                result = results.get()
+                while result is not None:
+                    if isinstance(result, Exception):
+                        raise result
+                    (rows, unprocessed) = result.get()
+                    unprocessed_gene_ids.update(unprocessed)
+                    for row in rows:
+                        self._add_orthology(row, batch, model, geno, family)
+                    result = results.get()
+
+                batch.flush()
+                self.checkpoint(k)
+                logger.info("finished processing %s", f)
+                logger.warning(
+                    "The following gene ids were unable to be processed: %s",
+                    str(unprocessed_gene_ids))
+
+        return
+
+    def _read_line_batches(self, f, codes, pool, results):
+        """
+        Queue up the lines of the tarred file f for the pool to parse,
+        as the AsyncResults of batches of them, then None.
+        :param f: tar.gz file
+        :param codes: the taxon abbreviations (as bytes) to keep lines of,
+            all lines if None
+        :param pool: of worker processes
+        :param results: Queue
+        :return: None
+        """
+        try:
+            with tarfile.open(f, 'r:gz') as mytar:
+                # assume that the first entry is the item
+                fname = mytar.next()
+                logger.info("Parsing %s", fname.name)
+                lines = []
+                with mytar.extractfile(fname) as csvfile:
+                    for line in csvfile:
+                        if line.startswith(b'#'):
+                            continue
+                        if codes is not None:
+                            tab = line.find(b'\t')
+                            if line[:line.find(b'|')] not in codes and \
+                                    line[tab + 1:line.find(b'|', tab)] \
+                                    not in codes:
+                                continue
+                        lines.append(line)
+                        if len(lines) == self.batch_size:
+                            results.put(pool.apply_async(
+                                _parse_ortholog_lines, (lines,)))
+                            lines = []
+                if lines:
+                    results.put(pool.apply_async(
+                        _parse_ortholog_lines, (lines,)))
+        except Exception as e:  # raised again by the one adding the rows
+            results.put(e)
+        results.put(None)
+
         return
 
+    @staticmethod
+    def _orthology_row(
+            pair_a, pair_b, orthology_class, panther_id, unprocessed_gene_ids):
+        """
+        Clean up the gene identifiers of an orthologous pair:
+        MGI:MGI --> MGI
+        Ensembl --> ENSEMBL
+        and map its orthology code to RO.
+        :param pair_a: (panther taxon abbreviation, taxon id, gene id)
+        :param pair_b: (panther taxon abbreviation, taxon id, gene id)
+        :param orthology_class: panther orthology code
+        :param panther_id: of the family
+        :param unprocessed_gene_ids: set to add the unmappable gene ids to
+        :return: (gene_a, relation, gene_b, taxon_a, taxon_b, family_id),
+            or None if either gene id could not be mapped
+        """
+        genes = []
+        for (species, taxon, gene) in (pair_a, pair_b):
+            # fix the gene identifiers
+            gene = re.sub(r'=', ':', gene)
+            clean_gene = Panther._clean_up_gene_id(gene, species)
+            if clean_gene is None:
+                unprocessed_gene_ids.add(gene)
+            genes.append(clean_gene)
+
+        if genes[0] is None or genes[1] is None:
+            return None
+
+        rel = Panther._map_orthology_code_to_RO(orthology_class)
+
+        return (genes[0], rel, genes[1], pair_a[1], pair_b[1],
+                ':'.join(('PANTHER', panther_id)))
+
+    @staticmethod
+    def _add_orthology(row, batch, model, geno, family):
+        """
+        Add an orthology row (see _orthology_row) to the graph
+        :return: None
+        """
+        (gene_a, rel, gene_b, taxon_a, taxon_b, family_id) = row
+
+        evidence_id = 'ECO:0000080'  # phylogenetic evidence
+
+        # add the association and relevant nodes to graph
+        batch.add(gene_a, rel, gene_b, evidence=[evidence_id])
+
+        # add genes to graph;
+        # assume labels will be taken care of elsewhere
+        model.addClassToGraph(gene_a, None)
+        model.addClassToGraph(gene_b, None)
+
+        # might as well add the taxon info for completeness
+        geno.addTaxon(taxon_a, gene_a)
+        geno.addTaxon(taxon_b, gene_b)
+
+        # note this is incomplete...
+        # it won't construct the full family hierarchy,
+        # just the top-grouping
+        model.addIndividualToGraph(
+            family_id, None, OrthologyAssoc.terms['gene_family'])
+        family.addMember(family_id, gene_a)
+        family.addMember(family_id, gene_b)
+
+        return
+
+    def _is_test_row(self, row):
+        """
+        Keep the comment lines,
+        and the pairs where either protein is one of the test ids
+        :param row:
+        :return: boolean
+        """
+        if row.startswith('#'):
+            return True
+        for protein in re.findall(r'UniProtKB=([^\t|]+)', row):
+            if protein in self.test_ids:
+                return True
+
+        return False
+
     @staticmethod
     def _map_taxon_abbr_to_id(ptax):
         """
@@ -291,31 +504,7 @@ class Panther(Source):
         :return: NCBITaxon id
         """
         taxid = None
-        ptax_to_taxid_map = {
-            'ANOCA': 28377,  # green lizard
-            'ARATH': 3702,   # arabadopsis
-            'BOVIN': 9913,   # cow
-            'CAEEL': 6239,   # worm
-            'CANFA': 9615,   # dog
-            'CHICK': 9031,   # chicken
-            'DANRE': 7955,   # zebrafish
-            'DICDI': 44689,  # discodium
-            'DROME': 7227,   # drosophila melanogaster
-            'ECOLI': 562,
-            'HORSE': 9796,   # horses
-            'HUMAN': 9606,   # humans
-            'MACMU': 9544,   # macaque
-            'MONDO': 13616,  # opossum
-            'MOUSE': 10090,  # mouse
-            'ORNAN': 9258,   # orangutan
-            'PANTR': 9598,   # chimp
-            'PIG': 9823,
-            'RAT': 10116,
-            'SCHPO': 4896,   # yeast
-            'TAKRU': 31033,  # pufferfish
-            'XENTR': 8364,   # xenopus
-            'YEAST': 559292,   # yeast
-        }
+        ptax_to_taxid_map = Panther.ptax_to_taxid_map
 
         if ptax in ptax_to_taxid_map:
             taxid = ':'.join(('NCBITaxon', str(ptax_to_taxid_map.get(ptax))))
@@ -422,3 +611,29 @@ class Panther(Source):
             PantherTestCase)
 
         return test_suite
+
+
+def _parse_ortholog_lines(lines):
+    """
+    Parse a batch of lines of a panther ortholog file,
+    in a worker process (see Panther._get_orthologs_parallel)
+    :param lines: list of bytes
+    :return: list of orthology rows, set of the gene ids not mapped
+    """
+    rows = []
+    unprocessed_gene_ids = set()
+    for line in lines:
+        (a, b, orthology_class, ancestor_taxon,
+         panther_id) = line.decode().strip().split('\t')
+        pairs = []
+        for pair in (a, b):
+            (species, gene, protein) = pair.split('|')
+            pairs.append(
+                (species, Panther._map_taxon_abbr_to_id(species), gene))
+        row = Panther._orthology_row(
+            pairs[0], pairs[1], orthology_class, panther_id,
+            unprocessed_gene_ids)
+        if row is not None:
+            rows.append(row)
+
+    return (rows, unprocessed_gene_ids)
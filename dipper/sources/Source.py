@@ -1,16 +1,34 @@
 import re
+import gzip
+import json
 import hashlib
 import os
+import pickle
+import shutil
 import time
 import logging
 import urllib
 import csv
+import tarfile
+import tempfile
+import traceback
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import xml.etree.ElementTree as ET
 import yaml
 from datetime import datetime
+from collections.abc import Mapping
 from stat import ST_CTIME, ST_SIZE
 from dipper.graph.RDFGraph import RDFGraph
 from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.graph.DeclaredCache import DeclaredCache
+from dipper.graph.RecordingGraph import RecordingGraph
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.IdMinter import IdMinter
+from dipper.utils.IdTable import IdTable
+from dipper.utils.Resolver import Resolver
+from dipper import config
 from dipper.models.Model import Model
 
 logger = logging.getLogger(__name__)
@@ -28,6 +46,12 @@ class Source:
     namespaces = {}
     files = {}
 
+    # names of the lookup tables a parser builds while parsing,
+    # saved with each checkpoint and restored on resume
+    checkpoint_attrs = []
+    # minimum number of seconds between row level checkpoints
+    checkpoint_interval = 600
+
     def __init__(self, graph_type, are_bnodes_skized=False, name=None):
 
         self.graph_type = graph_type
@@ -43,6 +67,7 @@ class Source:
         self.outdir = 'out'
         self.testdir = 'tests'
         self.rawdir = 'raw'
+        rawroot = self.rawdir
         self.dataset = None
         # set to True if you want to materialze identifiers for BNodes
 
@@ -65,6 +90,10 @@ class Source:
             p = os.path.abspath(self.rawdir)
             logger.info("creating raw directory for %s at %s", self.name, p)
 
+        # remote lookups are cached with the raw data, unless configured
+        Resolver.set_cache_file(config.get_config().get(
+            'resolver_cache', '/'.join((rawroot, 'resolver_cache.db'))))
+
         # if output dir doesn't exist, create it
         if not os.path.exists(self.outdir):
             os.makedirs(self.outdir)
@@ -75,8 +104,20 @@ class Source:
             self.graph = RDFGraph(are_bnodes_skized)  # TODO named graph IRI?
             self.testgraph = RDFGraph(True)
         elif graph_type == 'streamed_graph':
-            source_file = open(self.outfile.replace(".ttl", ".nt"), 'w')
-            test_file = open(self.testfile.replace(".ttl", ".nt"), 'w')
+            source_file = None
+            test_file = None
+            if self.name is not None:
+                self.outfile = '/'.join((self.outdir, self.name + '.nt'))
+                logger.info("Streaming triples to %s", self.outfile)
+                # keep the output of a parse that left a checkpoint
+                # with it, for setresume() to continue from
+                checkpoint_dir = '/'.join(
+                    (self.outdir, self.name + '_checkpoint'))
+                if os.path.exists(checkpoint_dir + '/state.pickle') and \
+                        os.path.exists(self.outfile):
+                    os.replace(self.outfile, checkpoint_dir + '/graph.nt')
+                source_file = open(self.outfile, 'w')
+                test_file = open(self.testfile.replace(".ttl", ".nt"), 'w')
             self.graph = StreamedGraph(are_bnodes_skized, source_file)
             self.testgraph = StreamedGraph(are_bnodes_skized, test_file)
         else:
@@ -89,6 +130,21 @@ class Source:
         self.testOnly = False
         self.testMode = False
 
+        # will be set to True to save checkpoints to continue from
+        self.checkpointing = False
+        # will be set to True to continue from the last checkpoint
+        self.resume = False
+        self.checkpoint_state = None
+        self.last_checkpoint = time.time()
+        self.checkpoint_dir = None
+        # AssociationBatches to flush into the graph before checkpointing
+        self.batches = []
+        # worker processes, for the sources that can parse in parallel
+        self.processes = 1
+        if self.name is not None:
+            self.checkpoint_dir = '/'.join(
+                (self.outdir, self.name + '_checkpoint'))
+
         for g in [self.graph, self.testgraph]:
             self.declareAsOntology(g)
 
@@ -155,6 +211,9 @@ class Source:
             logger.warning("No output file set. Using stdout")
             stream = 'stdout'
 
+        if self.graph.declared_cache is not None:
+            self.graph.declared_cache.report()
+
         gu = GraphUtils(None)
 
         # the  _dataset descriptions is always turtle
@@ -173,6 +232,13 @@ class Source:
             logger.error("I don't understand your stream.")
             return
 
+        if isinstance(self.graph, RDFGraph) and self.graph.has_spilled():
+            # merge the in-memory and on-disk parts of the graph
+            if fmt == 'nt':
+                self.graph.write_spilled(file=f)
+                return
+            self.graph.load_spilled()
+
         gu.write(self.graph, fmt, file=f)
         return
 
@@ -200,8 +266,7 @@ class Source:
         :param long_string: str string to be hashed
         :return: str hash of id
         """
-        return r'b' + hashlib.sha1(
-            long_string.encode('utf-8')).hexdigest()[0:15]
+        return IdMinter.get().mint(long_string, 0, 15, 'b')
 
     def checkIfRemoteIsNewer(self, remote, local, headers):
         """
@@ -382,15 +447,11 @@ class Source:
         """
 
         line_counter = 0
-        table_data = elem.find("[@name='"+table_name+"']")
-        if table_data is not None:
+        if elem.tag == 'table_data' and elem.get('name') == table_name:
+            table_data = elem
             logger.info("Processing "+table_name)
-            row = {}
-            for r in table_data.findall('row'):
-                for f in r.findall('field'):
-                    ats = f.attrib
-                    row[ats['name']] = f.text
-                processing_function(row)
+            for r in table_data.iter('row'):
+                processing_function(self._xml_row(r))
                 line_counter += 1
                 if self.testMode \
                         and limit is not None and line_counter > limit:
@@ -400,6 +461,152 @@ class Source:
 
         return
 
+    @staticmethod
+    def _xml_row(row):
+        """
+        :param row: a row Element of an xml table
+        :return: dict of field name: text
+        """
+        return {field.get('name'): field.text for field in row}
+
+    def process_xml_tables(self, xml, stages, limit=None):
+        """
+        Process the tables of an xml document distributing sql-like tables,
+        as from mysqldump --xml, in a single pass over it:
+            <table_data name="..."><row><field name="...">text</field>...
+
+        The stages are processed in order: the tables of each stage
+        with what the stages before it gave, in the order they are in
+        the document, then the stage's 'after' function.
+        A table is processed as it is read when the stages before its own
+        are done; a table that comes before then is kept aside in a
+        temporary file until they are. Elements are discarded once read,
+        so only one row is held in memory at a time.
+
+        :param xml: iterable of the (str or bytes) text of the document,
+            such as the open file
+        :param stages: list of dicts of
+            'tables': dict of table name: function of a row,
+                      a dict of field name: text
+            'after':  function to call once the tables are done (optional)
+        :param limit: in test mode, the number of rows of each table
+            to process
+        :return: None
+        """
+        stage_of = {}
+        for (i, stage) in enumerate(stages):
+            for table in stage['tables']:
+                stage_of[table] = i
+        # the tables of each stage yet to be read in full
+        unread = [set(stage['tables']) for stage in stages]
+        # the tables kept aside for each stage, as (name, file)
+        waiting = [[] for stage in stages]
+        done = 0    # stages done
+
+        if not self.testMode:
+            limit = None
+
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        table_data = table = kept = None
+        row_count = 0
+        for text in xml:
+            parser.feed(text)
+            for (event, elem) in parser.read_events():
+                if event == 'start':
+                    if elem.tag == 'table_data':
+                        (table_data, table) = (elem, elem.get('name'))
+                        kept = None
+                        row_count = 0
+                        if table not in stage_of:
+                            continue
+                        if stage_of[table] > done:
+                            kept = (tempfile.TemporaryFile(), [], [None])
+                            waiting[stage_of[table]].append((table, kept))
+                        else:
+                            logger.info("Processing %s", table)
+                    continue
+                if elem.tag == 'row':
+                    row_count += 1
+                    if table in stage_of and \
+                            (limit is None or row_count <= limit):
+                        row = self._xml_row(elem)
+                        if kept is None:
+                            stages[stage_of[table]]['tables'][table](row)
+                        else:
+                            self._keep_xml_row(kept, row)
+                    del table_data[:]
+                elif elem.tag == 'table_data':
+                    elem.clear()
+                    if table in stage_of:
+                        if kept is not None:
+                            self._keep_xml_row(kept, None)
+                        unread[stage_of[table]].discard(table)
+                        done = self._process_xml_stages(
+                            stages, unread, waiting, done)
+                    table_data = table = kept = None
+                elif elem.tag != 'field':
+                    elem.clear()
+        parser.close()
+
+        for tables in unread[done:]:
+            for table in tables:
+                logger.warning("Table %s not found", table)
+            tables.clear()
+        self._process_xml_stages(stages, unread, waiting, done)
+
+        return
+
+    @staticmethod
+    def _keep_xml_row(kept, row):
+        """
+        Keep a row of a table aside, in batches of the values of rows
+        of the same fields
+        :param kept: the temporary file, the batch of rows, and the names
+            of their fields
+        :param row: dict; None to write out the last batch
+        :return: None
+        """
+        (file, rows, fields) = kept
+        if row is None or len(rows) >= 1000 or \
+                (rows and tuple(row) != fields[0]):
+            if rows:
+                pickle.dump((fields[0], rows), file)
+            del rows[:]
+        if row is not None:
+            fields[0] = tuple(row)
+            rows.append(tuple(row.values()))
+
+        return
+
+    @staticmethod
+    def _process_xml_stages(stages, unread, waiting, done):
+        """
+        Finish the stages whose tables are all read, in turn,
+        processing the tables that were kept aside for them
+        :return: the number of stages done
+        """
+        while done < len(stages) and not unread[done]:
+            if stages[done].get('after') is not None:
+                stages[done]['after']()
+            done += 1
+            if done == len(stages):
+                break
+            for (table, (file, rows, fields)) in waiting[done]:
+                logger.info("Processing %s", table)
+                function = stages[done]['tables'][table]
+                file.seek(0)
+                while True:
+                    try:
+                        (names, values) = pickle.load(file)
+                    except EOFError:
+                        break
+                    for row in values:
+                        function(dict(zip(names, row)))
+                file.close()
+            waiting[done] = []
+
+        return done
+
     def _check_list_len(self, row, length):
         """
         Sanity check for csv parser
@@ -428,6 +635,127 @@ class Source:
 
         return md5.hexdigest()
 
+    def get_test_subset(self, file, is_test_row, test_ids, header_lines=0):
+        """
+        Pull the rows a test run needs out of a (large) raw file,
+        so that a test mode parse reads a few hundred rows and not the
+        whole download.
+        The raw file is scanned once, and the leading header lines and
+        each row where is_test_row(row) is true are written in the same
+        format (plain, .gz, or a single member .tar.gz) under
+        <rawdir>/test_subset/.
+        Subsets are listed in test_subset/index.json with the md5 of
+        the raw file and of the test ids they were built from, and are
+        only rebuilt when either changes.
+        :param file: path to the raw file
+        :param is_test_row: function taking a row (str, without newline)
+        :param test_ids: the ids the rows are selected by
+        :param header_lines: number of leading lines to always keep
+        :return: path to the subset file
+        """
+        subset_dir = '/'.join((self.rawdir, 'test_subset'))
+        if not os.path.exists(subset_dir):
+            os.makedirs(subset_dir)
+        name = os.path.basename(file)
+        subset = '/'.join((subset_dir, name))
+        index_file = '/'.join((subset_dir, 'index.json'))
+
+        index = {}
+        if os.path.exists(index_file):
+            with open(index_file, 'r') as f:
+                index = json.load(f)
+
+        ids_md5 = hashlib.md5(
+            '\n'.join(sorted(str(i) for i in test_ids)).encode()).hexdigest()
+        stat_info = os.stat(file)
+        entry = index.get(name)
+        if entry is not None and entry['ids_md5'] == ids_md5 and \
+                os.path.exists(subset):
+            # only checksum the raw file if it looks different
+            if entry['size'] == stat_info.st_size and \
+                    entry['mtime'] == stat_info.st_mtime:
+                logger.info("Using test subset %s", subset)
+                return subset
+            raw_md5 = self.get_file_md5(
+                os.path.dirname(file), os.path.basename(file))
+            if entry['md5'] == raw_md5:
+                logger.info("Using test subset %s", subset)
+                entry['mtime'] = stat_info.st_mtime
+                self._write_test_subset_index(index_file, index)
+                return subset
+        else:
+            raw_md5 = self.get_file_md5(
+                os.path.dirname(file), os.path.basename(file))
+
+        logger.info("Building test subset of %s", file)
+        start = time.time()
+        tmp = subset + '.tmp'
+        if name.endswith('.tar.gz'):
+            with tarfile.open(file, 'r:gz') as mytar:
+                # assume that the first entry is the item
+                member = mytar.getmembers()[0]
+                with mytar.extractfile(member) as raw_fh, \
+                        tempfile.TemporaryFile() as subset_fh:
+                    (kept, scanned) = self._filter_lines(
+                        raw_fh, subset_fh, is_test_row, header_lines)
+                    member.size = subset_fh.tell()
+                    subset_fh.seek(0)
+                    with tarfile.open(tmp, 'w:gz') as subset_tar:
+                        subset_tar.addfile(member, subset_fh)
+        elif name.endswith('.gz'):
+            with gzip.open(file, 'rb') as raw_fh, \
+                    gzip.open(tmp, 'wb') as subset_fh:
+                (kept, scanned) = self._filter_lines(
+                    raw_fh, subset_fh, is_test_row, header_lines)
+        else:
+            with open(file, 'rb') as raw_fh, open(tmp, 'wb') as subset_fh:
+                (kept, scanned) = self._filter_lines(
+                    raw_fh, subset_fh, is_test_row, header_lines)
+        os.replace(tmp, subset)
+
+        index[name] = {
+            'md5': raw_md5,
+            'size': stat_info.st_size,
+            'mtime': stat_info.st_mtime,
+            'ids_md5': ids_md5,
+            'rows_kept': kept,
+            'rows_scanned': scanned}
+        self._write_test_subset_index(index_file, index)
+        logger.info(
+            "Kept %d of %d rows from %s in %.2f sec",
+            kept, scanned, name, time.time() - start)
+
+        return subset
+
+    @staticmethod
+    def _filter_lines(raw_fh, subset_fh, is_test_row, header_lines):
+        """
+        Copy the header lines, and the lines passing is_test_row,
+        between two binary file handles
+        :return: (rows kept, rows scanned)
+        """
+        kept = 0
+        scanned = 0
+        for (line_num, line) in enumerate(raw_fh):
+            if line_num < header_lines:
+                subset_fh.write(line)
+                continue
+            scanned += 1
+            if is_test_row(line.decode('utf-8', 'replace').rstrip('\r\n')):
+                subset_fh.write(line)
+                kept += 1
+
+        return kept, scanned
+
+    @staticmethod
+    def _write_test_subset_index(index_file, index):
+        tmp = index_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp, index_file)
+
+        return
+
     def get_remote_content_len(self, remote, headers=None):
         """
         :param remote:
@@ -523,6 +851,485 @@ class Source:
 
         return
 
+    def set_memory_budget(self, megabytes):
+        """
+        Set a limit on the size of the process (in MB), past which
+        new triples for the main graph are spilled to disk.
+        Only applies to rdf_graph; a streamed graph is already on disk.
+        :param megabytes: int
+        :return: None
+        """
+        if isinstance(self.graph, RDFGraph):
+            self.graph.set_memory_budget(megabytes)
+        else:
+            logger.warning(
+                "Memory budget is only supported for rdf_graph")
+
+        return
+
+    def set_declared_cache(self, maxsize):
+        """
+        Remember up to maxsize class, type and taxon declarations made
+        on each graph, and skip repeats of them.
+        :param maxsize: int
+        :return: None
+        """
+        for g in [self.graph, self.testgraph]:
+            g.declared_cache = DeclaredCache(maxsize)
+
+        return
+
+    def set_processes(self, processes):
+        """
+        Let the sources that can, parse with this many worker processes.
+        :param processes: int
+        :return: None
+        """
+        self.processes = processes
+
+        return
+
+    def set_checkpointing(self, checkpointing):
+        """
+        Set that this source should save its progress while parsing,
+        for a later parse to resume from (see setresume()).
+        Off by default, since each save writes out the partial graph.
+        :param checkpointing:
+        :return: None
+        """
+        self.checkpointing = checkpointing
+
+        return
+
+    def setresume(self, resume):
+        """
+        Set that this source should continue parsing from its last
+        checkpoint, if there is one.
+        The saved lookup tables and partial graph are restored here,
+        and checkpointing is turned on.
+        Without resume, the checkpoint of an earlier parse is dropped.
+        :param resume:
+        :return: None
+        """
+
+        self.resume = resume
+        if resume:
+            self.checkpointing = True
+            self.load_checkpoint()
+        elif not self.testOnly:
+            self.clear_checkpoint()
+
+        return
+
+    def checkpoint(self, stage, position=None, force=False):
+        """
+        Record parsing progress so that an interrupted parse can resume.
+        Without a position, the stage is recorded as complete.
+        With a position (row number, or anything picklable)
+        the stage is in progress.
+        Progress is saved to disk, if checkpointing is on (see
+        set_checkpointing()), at most once every
+        ```checkpoint_interval``` seconds unless forced,
+        since each save writes out the partial graph.
+        Test mode parses are not checkpointed.
+
+        :param stage: str name of the stage (table, file, method)
+        :param position: where to pick up within the stage
+        :param force: save regardless of the interval
+        :return: None
+        """
+        if self.testMode:
+            return
+
+        if self.checkpoint_state is None:
+            self.checkpoint_state = {
+                'completed': [], 'stage': None, 'position': None}
+
+        if position is None:
+            if stage not in self.checkpoint_state['completed']:
+                self.checkpoint_state['completed'].append(stage)
+            self.checkpoint_state['stage'] = None
+            self.checkpoint_state['position'] = None
+        else:
+            self.checkpoint_state['stage'] = stage
+            self.checkpoint_state['position'] = position
+
+        if self.checkpointing and (
+                force or time.time() - self.last_checkpoint >=
+                self.checkpoint_interval):
+            self.save_checkpoint()
+
+        return
+
+    def run_stage(self, stage, function, *args):
+        """
+        Call ```function(*args)``` unless the checkpoint we resumed
+        from has already completed ```stage```,
+        then checkpoint the stage as complete.
+        :param stage: str name of the stage
+        :param function: the parsing method
+        :return: None
+        """
+        if self.checkpoint_done(stage):
+            logger.info("Skipping %s, completed before the checkpoint", stage)
+            return
+
+        function(*args)
+        self.checkpoint(stage)
+
+        return
+
+    def run_stages(self, stages):
+        """
+        Run a parser's stages, each a dict of
+            'stage':    str name, as for run_stage()
+            'function': the parsing method
+            'args':     tuple to call it with (optional)
+            'needs':    names of the lookups it reads (optional)
+            'gives':    names of the lookups it adds to (optional)
+        where a lookup is named by its attribute, such as 'geno_bkgd',
+        or by the attribute and a key, such as 'idhash:allele' for
+        self.idhash['allele'], or by the attribute and what part of it,
+        such as 'label_hash:strain', to say which entries are added.
+
+        The stages are listed in an order they may be run in, one after
+        the other, as they are with one process.
+        With more (see set_processes()) each stage is run in a forked
+        worker process as soon as those before it that it depends on
+        are done: those giving what it needs or gives, or needing what
+        it gives. A worker starts from the parent's lookups as they are,
+        and sends back the triples it made, the entries it added to
+        the lookups it gives, and the declarations and audited ids it
+        made (see set_declared_cache() and IdMinter), which are merged
+        in the listed order.
+        :param stages: list of dicts
+        :return: None
+        """
+        if self.processes <= 1 or \
+                'fork' not in multiprocessing.get_all_start_methods():
+            for stage in stages:
+                self.run_stage(
+                    stage['stage'], stage['function'], *stage.get('args', ()))
+            return
+
+        context = multiprocessing.get_context('fork')
+        depends = self._stage_dependencies(stages)
+        waiting = list(range(len(stages)))
+        running = {}    # connection: (stage number, process)
+        results = {}    # stage number: result, until merged
+        merged = 0
+        while merged < len(stages):
+            for i in list(waiting):
+                if len(running) >= self.processes:
+                    break
+                # the stages before it are merged, not just done,
+                # so that the worker starts with what they added
+                if any(j >= merged for j in depends[i]):
+                    continue
+                waiting.remove(i)
+                stage = stages[i]
+                if self.checkpoint_done(stage['stage']):
+                    logger.info(
+                        "Skipping %s, completed before the checkpoint",
+                        stage['stage'])
+                    results[i] = None
+                    continue
+                logger.info("Starting %s", stage['stage'])
+                (receiver, sender) = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=self._run_stage_worker, args=(stage, sender))
+                process.start()
+                sender.close()
+                running[receiver] = (i, process)
+
+            if running:
+                for receiver in multiprocessing.connection.wait(
+                        list(running)):
+                    (i, process) = running.pop(receiver)
+                    try:
+                        result = receiver.recv()
+                    except EOFError:
+                        result = ('error', 'the worker process exited')
+                    receiver.close()
+                    process.join()
+                    if result[0] == 'error':
+                        for (_, other) in running.values():
+                            other.terminate()
+                        raise RuntimeError("Stage {} failed: {}".format(
+                            stages[i]['stage'], result[1]))
+                    results[i] = result[1:]
+
+            # merged in order, so the graph and the checkpoints
+            # are as they would be with one process
+            while merged in results:
+                self._merge_stage(stages[merged], results.pop(merged))
+                merged += 1
+
+        return
+
+    @staticmethod
+    def _lookups_overlap(name, other):
+        """
+        :return: True if the lookups may share entries;
+            'idhash' overlaps 'idhash:allele', which does not overlap
+            'idhash:marker'
+        """
+        return name == other or name.split(':')[0] == other or \
+            other.split(':')[0] == name
+
+    @classmethod
+    def _stage_dependencies(cls, stages):
+        """
+        :param stages: as for run_stages()
+        :return: list of the set of the stage numbers each stage
+            must run after
+        """
+        depends = []
+        for (i, stage) in enumerate(stages):
+            needs = stage.get('needs', [])
+            gives = stage.get('gives', [])
+            after = set()
+            for (j, before) in enumerate(stages[:i]):
+                conflicts = itertools.chain(
+                    itertools.product(before.get('gives', []), needs),
+                    itertools.product(before.get('gives', []), gives),
+                    itertools.product(before.get('needs', []), gives))
+                if any(cls._lookups_overlap(a, b) for (a, b) in conflicts):
+                    after.add(j)
+            depends.append(after)
+
+        return depends
+
+    def _get_lookup(self, name):
+        """
+        :param name: of a lookup, as for run_stages()
+        :return: the name of the dict, list or set it is in,
+            and that dict, list or set
+        """
+        (attr, _, key) = name.partition(':')
+        lookup = getattr(self, attr)
+        if key != '' and isinstance(lookup, dict) and key in lookup:
+            return (name, lookup[key])
+
+        return (attr, lookup)
+
+    def _run_stage_worker(self, stage, sender):
+        """
+        Run a stage in a forked worker process, recording its triples,
+        then send them and the entries it added to its lookups
+        :param stage: as for run_stages()
+        :param sender: Connection to the parent
+        :return: None
+        """
+        try:
+            # the parent checkpoints the stage once it is merged
+            self.checkpoint_interval = float('inf')
+            graphs = {}
+            for attr in ['graph', 'testgraph']:
+                graphs[attr] = RecordingGraph(getattr(self, attr))
+                setattr(self, attr, graphs[attr])
+                if graphs[attr].declared_cache is not None:
+                    graphs[attr].declared_cache.record()
+            IdMinter.get().record()
+            before = {}
+            for name in stage.get('gives', []):
+                (name, lookup) = self._get_lookup(name)
+                if isinstance(lookup, IdTable):
+                    # its values are ids, not added to in place
+                    before[name] = lookup.copy()
+                elif isinstance(lookup, Mapping):
+                    # copy the lists and sets in it too, as those may be
+                    # added to in place
+                    before[name] = {
+                        key: value.copy()
+                        if isinstance(value, (list, set, dict)) else value
+                        for (key, value) in lookup.items()}
+                elif isinstance(lookup, set):
+                    before[name] = set(lookup)
+                else:
+                    before[name] = len(lookup)
+            batches = len(self.batches)
+
+            stage['function'](*stage.get('args', ()))
+            for batch in self.batches[batches:]:
+                batch.flush()
+
+            added = {}
+            for (name, was) in before.items():
+                lookup = self._get_lookup(name)[1]
+                if isinstance(lookup, Mapping):
+                    added[name] = {
+                        key: value for (key, value) in lookup.items()
+                        if key not in was or was[key] != value}
+                elif isinstance(lookup, set):
+                    added[name] = lookup - was
+                else:
+                    added[name] = lookup[was:]
+            declared = {
+                attr: graph.declared_cache.recorded()
+                for (attr, graph) in graphs.items()
+                if graph.declared_cache is not None}
+            sender.send((
+                'done', {attr: graph.triples for (attr, graph) in
+                         graphs.items()}, added, declared,
+                IdMinter.get().recorded()))
+        except Exception:
+            sender.send(('error', traceback.format_exc()))
+        sender.close()
+
+        return
+
+    def _merge_stage(self, stage, result):
+        """
+        Add what a worker made in a stage,
+        then checkpoint the stage as complete
+        :param stage: as for run_stages()
+        :param result: the triples of each graph, the entries added
+            to each lookup, the declarations recorded on each graph and
+            the ids audited; None if the stage was skipped
+        :return: None
+        """
+        if result is None:
+            return
+        (triples, added, declared, minted) = result
+        for (attr, graph_triples) in triples.items():
+            getattr(self, attr).addTriples(graph_triples)
+        for (attr, recorded) in declared.items():
+            getattr(self, attr).declared_cache.merge(recorded)
+        IdMinter.get().merge(minted)
+        for (name, entries) in added.items():
+            lookup = self._get_lookup(name)[1]
+            if isinstance(lookup, list):
+                lookup.extend(entries)
+            else:
+                lookup.update(entries)
+        logger.info("Finished %s", stage['stage'])
+        self.checkpoint(stage['stage'])
+
+        return
+
+    def checkpoint_done(self, stage):
+        """
+        :param stage:
+        :return: True if the checkpoint we resumed from has
+                 already completed this stage
+        """
+        return self.checkpoint_state is not None and \
+            stage in self.checkpoint_state['completed']
+
+    def checkpoint_position(self, stage):
+        """
+        :param stage:
+        :return: the position saved within an in-progress stage, or None
+        """
+        if self.checkpoint_state is not None and \
+                self.checkpoint_state['stage'] == stage:
+            return self.checkpoint_state['position']
+        return None
+
+    def save_checkpoint(self):
+        """
+        Write the checkpoint state, the lookup tables named in
+        ```checkpoint_attrs``` and the partial graph to the checkpoint dir.
+        The state is written last, so a crash while checkpointing
+        leaves the previous checkpoint in place.
+        :return: None
+        """
+        start = time.time()
+        if not os.path.exists(self.checkpoint_dir):
+            os.makedirs(self.checkpoint_dir)
+
+        # the buffered associations are from rows before the checkpoint
+        for batch in self.batches:
+            batch.flush()
+
+        state = dict(self.checkpoint_state)
+        state['attrs'] = {
+            attr: getattr(self, attr) for attr in self.checkpoint_attrs}
+
+        if isinstance(self.graph, RDFGraph):
+            graph_file = '/'.join((self.checkpoint_dir, 'graph.nt'))
+            if self.graph.has_spilled():
+                self.graph.write_spilled(file=graph_file + '.tmp')
+            else:
+                with open(graph_file + '.tmp', 'wb') as filewriter:
+                    self.graph.serialize(
+                        filewriter, format='nt', encoding='utf-8')
+            os.replace(graph_file + '.tmp', graph_file)
+        else:
+            # the streamed output is the partial graph; remember its end
+            self.graph.file_handle.flush()
+            state['offset'] = self.graph.file_handle.tell()
+
+        state_file = '/'.join((self.checkpoint_dir, 'state.pickle'))
+        with open(state_file + '.tmp', 'wb') as filewriter:
+            pickle.dump(state, filewriter, pickle.HIGHEST_PROTOCOL)
+        os.replace(state_file + '.tmp', state_file)
+
+        self.last_checkpoint = time.time()
+        logger.info(
+            "Checkpointed %s at stage %s position %s in %.1f sec",
+            self.name, state['stage'], state['position'],
+            self.last_checkpoint - start)
+
+        return
+
+    def load_checkpoint(self):
+        """
+        Restore the state, lookup tables and partial graph
+        from the last checkpoint
+        :return: True if a checkpoint was found
+        """
+        state_file = '/'.join((self.checkpoint_dir, 'state.pickle'))
+        if not os.path.exists(state_file):
+            logger.info("No checkpoint found for %s", self.name)
+            return False
+
+        with open(state_file, 'rb') as fh:
+            state = pickle.load(fh)
+        for attr, value in state.pop('attrs').items():
+            setattr(self, attr, value)
+
+        if isinstance(self.graph, RDFGraph):
+            # spilled again as it is read, past the memory budget
+            self.graph.load_ntriples(
+                '/'.join((self.checkpoint_dir, 'graph.nt')))
+        else:
+            # the output kept from the interrupted parse, up to the
+            # checkpoint, in place of what has been streamed since
+            self.graph.file_handle.close()
+            remaining = state.pop('offset')
+            with open('/'.join((self.checkpoint_dir, 'graph.nt')), 'rb') \
+                    as reader, open(self.outfile, 'wb') as writer:
+                while remaining > 0:
+                    chunk = reader.read(min(CHUNK, remaining))
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    remaining -= len(chunk)
+            self.graph.file_handle = open(self.outfile, 'a')
+
+        self.checkpoint_state = state
+        logger.info(
+            "Resuming %s after stages %s, in stage %s at %s",
+            self.name, ', '.join(state['completed']), state['stage'],
+            state['position'])
+
+        return True
+
+    def clear_checkpoint(self):
+        """
+        Remove the checkpoint once a parse has finished
+        :return: None
+        """
+        if self.testMode:
+            return
+        self.checkpoint_state = None
+        if os.path.exists(self.checkpoint_dir):
+            shutil.rmtree(self.checkpoint_dir)
+
+        return
+
     def settestmode(self, mode):
         """
         Set testMode to (mode).
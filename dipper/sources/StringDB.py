@@ -1,8 +1,11 @@
 from dipper.sources.Source import Source
 from dipper.sources.Ensembl import Ensembl
 from dipper.models.Dataset import Dataset
+import os
+import csv
 import logging
-import gzip
+import itertools
+import multiprocessing
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -25,6 +28,10 @@ class StringDB(Source):
     """
     STRING_BASE = "http://string-db.org/download/"
     DEFAULT_TAXA = [9606, 10090, 7955, 7227, 6239]
+    # rows of a links file read at a time
+    chunk_size = 500000
+    # RO:0002434 ! interacts_with
+    interacts_with = 'RO:0002434'
 
     def __init__(self, graph_type, are_bnodes_skolemized, tax_ids=None, version=None):
         super().__init__(graph_type, are_bnodes_skolemized, 'string')
@@ -92,12 +99,24 @@ class StringDB(Source):
         file_paths = self._get_file_paths(self.tax_ids, 'protein_links')
         self.get_files(is_dl_forced, file_paths)
         self.get_files(is_dl_forced, self.id_map_files)
+        if is_dl_forced:
+            # fetch the ensembl proteins again too
+            for taxon in self.tax_ids:
+                cache = self._get_protein_gene_map_cache(self.rawdir, taxon)
+                if os.path.exists(cache):
+                    os.remove(cache)
 
         return
 
     def parse(self, limit=None):
         """
         Override Source.parse()
+        Each taxon's links file is read in chunks, of the columns we use,
+        keeping only the rows over the score cutoff;
+        the proteins of these are mapped to genes by a join against
+        the taxon's protein to gene map (cached in the rawdir),
+        and the interactions added to the graph a chunk at a time.
+        With more than one process, the taxa are read in parallel.
         Args:
             :param limit (int, optional) limit the number of rows processed
         Returns:
@@ -107,87 +126,190 @@ class StringDB(Source):
             logger.info("Only parsing first %d rows", limit)
 
         protein_paths = self._get_file_paths(self.tax_ids, 'protein_links')
-        
+
+        args = []
         for taxon in protein_paths:
-            ensembl = Ensembl(self.graph_type, self.are_bnodes_skized)
             string_file_path = '/'.join((
                 self.rawdir, protein_paths[taxon]['file']))
-
-            fh = gzip.open(string_file_path, 'rb')
-            dataframe = pd.read_csv(fh, sep='\s+')
-            fh.close()
-            p2gene_map = dict()
-
+            map_file = None
             if taxon in self.id_map_files:
                 map_file = '/'.join((
                     self.rawdir, self.id_map_files[taxon]['file']))
+            args.append((
+                self.rawdir, string_file_path, map_file, taxon, limit,
+                self.chunk_size))
 
-                mfile_handle = open(map_file, 'r')
-                if taxon == 9606:
-                    for line in mfile_handle.readlines():
-                        gene, prot = line.rstrip("\n").split("\t")
-                        p2gene_map[prot.replace('9606.', '')] \
-                            = "NCBIGene:{}".format(gene)
-                else:
-                    for line in mfile_handle.readlines():
-                        prot, gene = line.rstrip("\n").split("\t")
-                        p2gene_map[prot] = gene
-                mfile_handle.close()
-            else:
-                logger.info("Fetching ensembl proteins "
-                            "for taxon {}".format(taxon))
-                p2gene_map = ensembl.fetch_protein_gene_map(taxon)
-                for key in p2gene_map.keys():
-                    p2gene_map[key] = "ENSEMBL:{}".format(p2gene_map[key])
-            if taxon == 9606:
-                temp_map = ensembl.fetch_protein_gene_map(taxon)
-                for key in temp_map:
-                    if key not in p2gene_map:
-                        p2gene_map[key] = "ENSEMBL:{}".format(temp_map[key])
+        if self.processes > 1 and len(args) > 1:
+            with multiprocessing.Pool(
+                    min(self.processes, len(args))) as pool:
+                results = [
+                    pool.apply_async(self._get_interactions, arg)
+                    for arg in args]
+                for result in results:
+                    self._add_interactions(*result.get())
+        else:
+            for arg in args:
+                self._add_interactions(*self._get_interactions(*arg))
 
-            logger.info("Finished fetching ENSP ID mappings, "
-                        "fetched {} proteins".format(len(p2gene_map)))
+        return
 
-            logger.info("Fetching protein protein interactions "
-                        "for taxon {}".format(taxon))
+    def _add_interactions(self, taxon, chunks, filtered_out_count):
+        for (gene1, gene2) in chunks:
+            self.graph.addTriples(zip(
+                gene1, itertools.repeat(self.interacts_with), gene2,
+                itertools.repeat(False), itertools.repeat(None)))
+
+        logger.info("Finished parsing p-p interactions for {},"
+                    " {} rows filtered out based on checking"
+                    " ensembl proteins".format(taxon, filtered_out_count))
+        return
+
+    @staticmethod
+    def _get_interactions(rawdir, string_file_path, map_file, taxon,
+                          limit=None, chunk_size=None, rank_min=700):
+        """
+        Read the interactions of a taxon (in a worker process, if parallel)
+        :param chunk_size: rows read at a time; chunk_size by default
+        :return: taxon, list of (gene1 array, gene2 array) per chunk,
+            number of rows filtered out for unmapped proteins
+        """
+        p2gene = StringDB._get_protein_gene_map(rawdir, taxon, map_file)
+        logger.info("Fetching protein protein interactions "
+                    "for taxon {}".format(taxon))
 
-            self._process_protein_links(dataframe, p2gene_map, taxon, limit)
+        chunks = []
+        filtered_out_count = 0
+        reader = pd.read_csv(
+            string_file_path, sep=r'\s+', compression='gzip',
+            usecols=['protein1', 'protein2', 'combined_score'],
+            dtype={'protein1': str, 'protein2': str, 'combined_score': int},
+            chunksize=StringDB.chunk_size if chunk_size is None
+            else chunk_size)
+        for links in reader:
+            links = links[links['combined_score'] > rank_min]
+            (index, gene1, gene2, filtered_out) = \
+                StringDB._map_interactions(links, p2gene, taxon)
+            filtered_out_count += filtered_out
+            stop = StringDB._stop_at(index, limit)
+            chunks.append((gene1[:stop], gene2[:stop]))
+            if limit is not None and stop <= len(index):
+                # the first one at or past the limit is in this chunk
+                break
+        reader.close()
+
+        return (taxon, chunks, filtered_out_count)
 
     def _process_protein_links(self, dataframe, p2gene_map, taxon,
                                limit=None, rank_min=700):
+        """
+        :param dataframe: of links, with protein1, protein2
+            and combined_score columns
+        :param p2gene_map: dict, or pandas Series, of protein id to gene
+        """
         filtered_df = dataframe[dataframe['combined_score'] > rank_min]
-        filtered_out_count = 0
-        for index, row in filtered_df.iterrows():
-            # Check if proteins are in same species
-            protein1 = row['protein1'].replace('{}.'.format(str(taxon)), '')
-            protein2 = row['protein2'].replace('{}.'.format(str(taxon)), '')
-
-            gene1_curie = None
-            gene2_curie = None
-
-            try:
-                # Keep orientation the same since RO:0002434 is symmetric
-                if protein1 > protein1:
-                    gene1_curie = p2gene_map[protein1]
-                    gene2_curie = p2gene_map[protein2]
-                else:
-                    gene1_curie = p2gene_map[protein2]
-                    gene2_curie = p2gene_map[protein1]
-            except KeyError:
-                filtered_out_count += 1
-
-            if gene1_curie is not None and gene2_curie is not None:
-                # RO:0002434 ! interacts_with
-                interacts_with = 'RO:0002434'
-                self.graph.addTriple(gene1_curie, interacts_with, gene2_curie)
-                if limit is not None and index >= limit:
-                    break
+        (index, gene1, gene2, filtered_out_count) = self._map_interactions(
+            filtered_df, pd.Series(p2gene_map, dtype=object), taxon)
+        stop = self._stop_at(index, limit)
+        self._add_interactions(
+            taxon, [(gene1[:stop], gene2[:stop])], filtered_out_count)
 
-        logger.info("Finished parsing p-p interactions for {},"
-                    " {} rows filtered out based on checking"
-                    " ensembl proteins".format(taxon, filtered_out_count))
         return
 
+    @staticmethod
+    def _map_interactions(links, p2gene, taxon):
+        """
+        Map both proteins of each link to their genes
+        :param links: DataFrame of protein1 and protein2
+        :param p2gene: Series of gene ids, by protein id
+        :param taxon:
+        :return: index, gene1 and gene2 arrays of the links with both
+            proteins mapped; the number of those without
+        """
+        prefix = '{}.'.format(str(taxon))
+        protein1 = links['protein1'].str.replace(prefix, '', regex=False)
+        protein2 = links['protein2'].str.replace(prefix, '', regex=False)
+
+        # RO:0002434 is symmetric; keep the orientation we have always
+        # had, the gene of protein2 first
+        gene1 = p2gene.reindex(protein2.values).to_numpy()
+        gene2 = p2gene.reindex(protein1.values).to_numpy()
+        mapped = pd.notna(gene1) & pd.notna(gene2)
+
+        return (links.index.to_numpy()[mapped], gene1[mapped],
+                gene2[mapped], int(len(mapped) - mapped.sum()))
+
+    @staticmethod
+    def _stop_at(index, limit):
+        """
+        :param index: of the (file) rows of the mapped links
+        :return: how many of them to keep, for rows up to the limit
+        """
+        if limit is None:
+            return len(index)
+        # as ever, through the first one at or past the limit
+        return int((index < limit).sum()) + 1
+
+    @staticmethod
+    def _get_protein_gene_map_cache(rawdir, taxon):
+        return '/'.join((rawdir, '{}.protein2gene.tsv'.format(taxon)))
+
+    @staticmethod
+    def _get_protein_gene_map(rawdir, taxon, map_file=None):
+        """
+        The protein to gene map of a taxon, from its id map file,
+        or ensembl biomart, or both for human.
+        It is cached in the rawdir, until the id map file is newer
+        (or the files are fetched again with is_dl_forced).
+        :param rawdir:
+        :param taxon:
+        :param map_file: the id map file of the taxon, if there is one
+        :return: pandas Series of gene curies, indexed by protein id
+        """
+        cache = StringDB._get_protein_gene_map_cache(rawdir, taxon)
+        if os.path.exists(cache) and (
+                map_file is None or
+                os.path.getmtime(cache) >= os.path.getmtime(map_file)):
+            p2gene = pd.read_csv(
+                cache, sep='\t', dtype=str, index_col='protein',
+                quoting=csv.QUOTE_NONE)['gene']
+            logger.info("Read {} ENSP ID mappings from {}".format(
+                len(p2gene), cache))
+            return p2gene
+
+        p2gene = pd.Series(dtype=object)
+        if map_file is not None:
+            if taxon == 9606:
+                columns = ['gene', 'protein']
+            else:
+                columns = ['protein', 'gene']
+            table = pd.read_csv(
+                map_file, sep='\t', header=None, names=columns, dtype=str,
+                quoting=csv.QUOTE_NONE)
+            if taxon == 9606:
+                table['protein'] = table['protein'].str.replace(
+                    '9606.', '', regex=False)
+                table['gene'] = 'NCBIGene:' + table['gene']
+            # the last mapping of a protein is the one used
+            table = table.drop_duplicates('protein', keep='last')
+            p2gene = table.set_index('protein')['gene']
+
+        if map_file is None or taxon == 9606:
+            logger.info("Fetching ensembl proteins "
+                        "for taxon {}".format(taxon))
+            ensembl = Ensembl('rdf_graph', True)
+            biomart = pd.Series(
+                ensembl.fetch_protein_gene_map(taxon), dtype=object)
+            biomart = 'ENSEMBL:' + biomart
+            p2gene = pd.concat(
+                [p2gene, biomart[~biomart.index.isin(p2gene.index)]])
+
+        logger.info("Finished fetching ENSP ID mappings, "
+                    "fetched {} proteins".format(len(p2gene)))
+        p2gene.rename_axis('protein').rename('gene').to_csv(
+            cache, sep='\t', header=True)
+
+        return p2gene
+
     def _get_file_paths(self, tax_ids, file_type):
         """
         Assemble file paths from tax ids
@@ -5,6 +5,7 @@ import logging
 from dipper.sources.Source import Source
 from dipper.sources.Monochrom import Monochrom, getChrPartTypeByNotation
 from dipper.models.GenomicFeature import Feature, makeChromID, makeChromLabel
+from dipper.models.FaldoEmitter import FaldoEmitter
 from dipper.models.Dataset import Dataset
 from dipper.models.Genotype import Genotype
 from dipper.models.Model import Model
@@ -376,7 +377,9 @@ class UCSCBands(Source):
 
         f.close()  # end looping through file
 
-        # loop through the hash and add the bands to the graph
+        # loop through the hash and add the bands to the graph,
+        # collecting their locations to add all at once
+        band_locations = ([], [], [], [])
         for b in mybands.keys():
             myband = mybands.get(b)
             band_class_id = makeChromID(b, taxon, 'CHR')
@@ -411,18 +414,21 @@ class UCSCBands(Source):
 
             # add the band as a feature
             # (which also instantiates the owl:Individual)
-            bfeature.addFeatureStartLocation(myband['min'], chrom_in_build_id)
-            bfeature.addFeatureEndLocation(myband['max'], chrom_in_build_id)
+            model.addIndividualToGraph(
+                bfeature.id, bfeature.label, bfeature.type)
+            for (column, value) in zip(
+                    band_locations, (band_build_id, chrom_in_build_id,
+                                     myband['min'], myband['max'])):
+                column.append(value)
             if 'stain' in myband and myband['stain'] is not None:
                 # TODO 'has_staining_intensity' being dropped by MB
                 bfeature.addFeatureProperty(
                     Feature.properties['has_staining_intensity'],
                     myband['stain'])
 
-            # type the band as a faldo:Region directly (add_region=False)
-            # bfeature.setNoBNodes(self.nobnodes)
-            # to come when we merge in ZFIN.py
-            bfeature.addFeatureToGraph(False)
+        # type the bands as a faldo:Region directly (add_region=False)
+        FaldoEmitter(self.graph).add_locations(
+            *band_locations, add_region=False)
 
         return
 
@@ -7,12 +7,14 @@ from dipper.utils import pysed
 from dipper.sources.Source import Source
 from dipper.models.assoc.Association import Assoc
 from dipper.models.Genotype import Genotype
+from dipper.models.GenotypeAssembler import GenotypeAssembler
 from dipper.models.assoc.OrthologyAssoc import OrthologyAssoc
 from dipper.models.Dataset import Dataset
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Environment import Environment
 from dipper.models.GenomicFeature import makeChromID
 from dipper.models.GenomicFeature import Feature
+from dipper.models.FaldoEmitter import FaldoEmitter
 from dipper.models.Reference import Reference
 from dipper.models.Model import Model
 from dipper import config
@@ -263,6 +265,12 @@ class ZFIN(Source):
             "ZDB-FISH-150901-1409"]
     }
 
+    # the lookups built up across files, kept with each checkpoint
+    checkpoint_attrs = [
+        'fish_parts', 'geno_alleles', 'id_label_map', 'genotype_backgrounds',
+        'extrinsic_id_to_enviro_id_hash', 'transgenic_parts',
+        'variant_loci_genes', 'environment_hash', 'wildtype_genotypes']
+
     def __init__(self, graph_type, are_bnodes_skolemized):
         super().__init__(graph_type, are_bnodes_skolemized, 'zfin')
         # update the dataset object with details about this resource
@@ -344,48 +352,103 @@ class ZFIN(Source):
         # else:
         #    g = self.graph
 
-        # basic information on classes and instances
-        self._process_genes(limit)
-        self._process_stages(limit)
-        self._process_pubinfo(limit)
-        self._process_pub2pubmed(limit)
+        # each stage says which lookups it needs and gives, so that with
+        # more processes, those not waiting on one another are run at the
+        # same time. The id_label_map is named by the kind of ids labelled.
+        stages = [
+            # basic information on classes and instances
+            {'stage': 'genes', 'function': self._process_genes,
+             'args': (limit,),
+             'gives': ['id_label_map:gene']},
+            {'stage': 'stages', 'function': self._process_stages,
+             'args': (limit,)},
+            {'stage': 'pubinfo', 'function': self._process_pubinfo,
+             'args': (limit,)},
+            {'stage': 'pub2pubmed', 'function': self._process_pub2pubmed,
+             'args': (limit,)}]
 
         # The knockdown reagents
         for t in ['morph', 'crispr', 'talen']:
-            self._process_targeting_reagents(t, limit)
-
-        self._process_gene_marker_relationships(limit)
-        self._process_features(limit)
-        self._process_feature_affected_genes(limit)
-        # only adds features on chromosomes, not positions
-        self._process_mappings(limit)
-
-        # These must be processed before G2P and expression
-        self._process_wildtypes(limit)
-        self._process_genotype_backgrounds(limit)
-        # REVIEWED - NEED TO REVIEW LABELS ON Deficiencies
-        self._process_genotype_features(limit)
-
-        self.process_fish(limit)
-        # Must be processed after morpholinos/talens/crisprs id/label
-        # self._process_pheno_enviro(limit)  # TODO waiting on issue #385
-
-        # once the genotypes and environments are processed,
-        # we can associate these with the phenotypes
-        self._process_g2p(limit)
-        self.process_fish_disease_models(limit)
-
-        # zfin-curated orthology calls to human genes
-        self._process_human_orthos(limit)
-        self.process_orthology_evidence(limit)
-
-        # coordinates of all genes - from ensembl
-        self._process_gene_coordinates(limit)
+            stages.append(
+                {'stage': 'targeting_reagents_' + t,
+                 'function': self._process_targeting_reagents,
+                 'args': (t, limit),
+                 'gives': ['id_label_map:' + t, 'variant_loci_genes:' + t]})
+
+        stages += [
+            {'stage': 'gene_marker_relationships',
+             'function': self._process_gene_marker_relationships,
+             'args': (limit,),
+             'gives': ['transgenic_parts', 'id_label_map:construct',
+                       'id_label_map:gene']},
+            {'stage': 'features', 'function': self._process_features,
+             'args': (limit,),
+             'gives': ['id_label_map:allele', 'id_label_map:construct']},
+            {'stage': 'feature_affected_genes',
+             'function': self._process_feature_affected_genes,
+             'args': (limit,),
+             'gives': ['variant_loci_genes:allele', 'id_label_map:allele',
+                       'id_label_map:gene']},
+            # only adds features on chromosomes, not positions
+            {'stage': 'mappings', 'function': self._process_mappings,
+             'args': (limit,)},
+
+            # These must be processed before G2P and expression
+            {'stage': 'wildtypes', 'function': self._process_wildtypes,
+             'args': (limit,),
+             'gives': ['id_label_map:genotype', 'wildtype_genotypes']},
+            {'stage': 'genotype_backgrounds',
+             'function': self._process_genotype_backgrounds,
+             'args': (limit,),
+             'gives': ['genotype_backgrounds']},
+            # REVIEWED - NEED TO REVIEW LABELS ON Deficiencies
+            {'stage': 'genotype_features',
+             'function': self._process_genotype_features,
+             'args': (limit,),
+             'needs': ['genotype_backgrounds', 'variant_loci_genes:allele',
+                       'id_label_map:allele', 'id_label_map:construct',
+                       'id_label_map:gene', 'id_label_map:genotype'],
+             'gives': ['geno_alleles', 'variant_loci_genes:allele',
+                       'id_label_map:allele', 'id_label_map:construct',
+                       'id_label_map:gene', 'id_label_map:genotype']},
+
+            # Must be processed after morpholinos/talens/crisprs id/label
+            {'stage': 'fish', 'function': self.process_fish,
+             'args': (limit,),
+             'needs': ['geno_alleles', 'variant_loci_genes', 'id_label_map',
+                       'transgenic_parts', 'wildtype_genotypes'],
+             'gives': ['fish_parts', 'id_label_map:fish']},
+            # self._process_pheno_enviro(limit)  # TODO waiting on issue #385
+
+            # once the genotypes and environments are processed,
+            # we can associate these with the phenotypes
+            {'stage': 'g2p', 'function': self._process_g2p,
+             'args': (limit,),
+             'needs': ['environment_hash']},
+            {'stage': 'fish_disease_models',
+             'function': self.process_fish_disease_models,
+             'args': (limit,),
+             'needs': ['id_label_map:fish', 'id_label_map:environment']},
+
+            # zfin-curated orthology calls to human genes
+            {'stage': 'human_orthos', 'function': self._process_human_orthos,
+             'args': (limit,)},
+            {'stage': 'orthology_evidence',
+             'function': self.process_orthology_evidence,
+             'args': (limit,)},
+
+            # coordinates of all genes - from ensembl
+            {'stage': 'gene_coordinates',
+             'function': self._process_gene_coordinates,
+             'args': (limit,)}]
+
+        self.run_stages(stages)
 
         # FOR THE FUTURE - needs verification
         # self._process_wildtype_expression(limit)
         # self._process_uniprot_ids(limit)
 
+        self.clear_checkpoint()
         logger.info("Finished parsing.")
         return
 
@@ -677,11 +740,14 @@ class ZFIN(Source):
         taxon_id = 'NCBITaxon:7955'  # hardcode to zebrafish
 
         geno_hash = {}  # This is used to store the genotype partonomy
-        gvc_hash = {}
 
         logger.info("Processing Genotypes")
         line_counter = 0
         geno = Genotype(g)
+        assembler = GenotypeAssembler(
+            g, self.id_label_map,
+            gvc_id_subs=((r'(ZFIN)?:', ''), (r'^_*', '')), sort_labels=True,
+            genotype_type=geno.genoparts['intrinsic_genotype'])
         with open(raw, 'r', encoding="utf8") as csvfile:
             filereader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             for row in filereader:
@@ -832,9 +898,8 @@ class ZFIN(Source):
                 print('skipping ', gt)
                 continue
 
-            if gt not in gvc_hash:
-                gvc_hash[gt] = []
-            gvcparts = gvc_hash[gt]
+            # labelled with its background, whatever its loci
+            assembler.add_genotype(gt)
 
             for locus_id in geno_hash[gt]:
                 # logger.info("locus id %s",locus_id)
@@ -932,85 +997,23 @@ class ZFIN(Source):
                 vslc_label = geno.make_vslc_label(gene_label, allele1_label,
                                                   allele2_label)
 
-                # add to global hash
-                self.id_label_map[vslc_id] = vslc_label
-
-                model.addIndividualToGraph(
-                    vslc_id, vslc_label,
-                    geno.genoparts['variant_single_locus_complement'])
-                geno.addPartsToVSLC(
-                    vslc_id, vloci1, vloci2, zygosity_id,
-                    geno.object_properties['has_alternate_part'],
-                    geno.object_properties['has_alternate_part'])
-
-                gvcparts += [vslc_id]
-
-            gvc_hash[gt] = gvcparts
+                assembler.add_allele_pair(
+                    gt, vslc_id, vslc_label, vloci1, vloci2, zygosity_id)
 
         # end loop through geno_hash
 
         logger.info('Finished finding all the intrinsic genotype parts')
         logger.info('Build pretty genotype labels')
-        # now loop through the gvc_hash, and build the gvc
-        for gt in gvc_hash:
+        for gt in geno_hash:
             if self.testMode and \
                     re.sub(r'ZFIN:', '', gt) not in self.test_ids['genotype']:
                 continue
 
-            gvc_parts = gvc_hash[gt]
-
-            # only need to make a gvc specifically if there's >1 vslc
-            if len(gvc_parts) > 1:
-                gvc_labels = []
-                # put these in order so they will always make the same id
-                gvc_parts.sort()
-
-                gvc_id = '-'.join(gvc_parts)
-                gvc_id = re.sub(r'(ZFIN)?:', '', gvc_id)
-                gvc_id = '_:' + re.sub(r'^_*', '', gvc_id)
-
-                for vslc_id in gvc_parts:
-                    # add the vslc to the gvc
-                    geno.addVSLCtoParent(vslc_id, gvc_id)
-
-                    # build the gvc label
-                    vslc_label = self.id_label_map[vslc_id]
-                    if vslc_label is not None:
-                        gvc_labels += [vslc_label]
-                    else:
-                        gvc_labels += [vslc_id]
-
-                gvc_labels.sort()
-                gvc_label = '; '.join(gvc_labels)
-
-                # add the gvc to the id-label hash
-                self.id_label_map[gvc_id] = gvc_label
-
-                # add the gvc
-                model.addIndividualToGraph(
-                    gvc_id, gvc_label,
-                    geno.genoparts['genomic_variation_complement'])
-            elif len(gvc_parts) == 1:
-                # assign the vslc to be also a gvc
-                vslc_id = gvc_parts[0]
-                gvc_id = vslc_id
-                gvc_label = self.id_label_map[vslc_id]
-                model.addType(
-                    vslc_id, geno.genoparts['genomic_variation_complement'])
-            else:
-                gvc_id = None
-                gvc_label = ''
-                logger.error("No GVC parts for %s", gt)
-
             if gt in self.genotype_backgrounds:
                 background_id = self.genotype_backgrounds[gt]
-                if background_id in self.id_label_map:
-                    background_label = self.id_label_map[background_id]
-                else:
-                    background_label = background_id
+                if background_id not in self.id_label_map:
                     logger.error("We don't have the label for %s stored",
                                  background_id)
-
             else:
                 background_num = re.sub(r'ZFIN:', '', gt)
                 background_id = '_:bkgd-'+background_num
@@ -1023,23 +1026,14 @@ class ZFIN(Source):
                 geno.addGenomicBackground(
                     background_id, background_label, None, background_desc)
                 geno.addGenomicBackgroundToGenotype(background_id, gt)
-                background_label = 'n.s.'
+                assembler.set_label(background_id, 'n.s.')
 
             geno.addTaxon(taxon_id, background_id)
+            assembler.set_background(gt, background_id)
 
-            genotype_name = gvc_label + ' [' + background_label + ']'
-
-            geno.addGenotype(gt, genotype_name)
-
-            self.id_label_map[gt] = genotype_name
-
-            # Add the GVC to the genotype
-            geno.addParts(
-                gvc_id, gt, geno.object_properties['has_alternate_part'])
-
-            # end of gvc loop
-
-        # end of genotype loop
+        # build the vslcs and the gvc, and label the genotype,
+        # putting the parts in order so they will always make the same id
+        assembler.assemble()
 
         # TODO this is almost complete;
         # deficiencies with >1 locus deleted are still not right
@@ -2419,6 +2413,9 @@ class ZFIN(Source):
         geno = Genotype(g)
 
         model = Model(g)
+        # gene locations, added in batches as parallel lists
+        faldo = FaldoEmitter(g)
+        locations = ([], [], [], [], [])
         raw = '/'.join((self.rawdir, self.files['gene_coordinates']['file']))
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             filereader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2452,15 +2449,21 @@ class ZFIN(Source):
                 chrom_in_build = makeChromID(chrom, build_id, 'MONARCH')
                 geno.addChromosomeInstance(
                     chrom, build_id, build_label, chrom_id)
-                f = Feature(g, gene_id, None, None)
-                f.addFeatureStartLocation(start, chrom_in_build, strand)
-                f.addFeatureEndLocation(end, chrom_in_build, strand)
-                f.addFeatureToGraph(True, None, True)
+                model.addClassToGraph(gene_id, None)
+                for (column, value) in zip(
+                        locations, (gene_id, chrom_in_build, start, end,
+                                    strand)):
+                    column.append(value)
+                if len(locations[0]) >= 10000:
+                    faldo.add_locations(*locations)
+                    locations = ([], [], [], [], [])
 
                 if not self.testMode \
                         and limit is not None and line_counter > limit:
                     break
 
+        faldo.add_locations(*locations)
+        faldo.report()
         logger.info("Done with gene coordinates")
 
         return
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FileIndex:
+    """
+    A sqlite index of a (large) raw file, built the first time it is
+    needed and kept next to the file, so that later runs look up what
+    they need rather than reading the whole file again.
+
+    The index records the size, mtime and md5 of the file it was built
+    from; when the size or mtime change the md5 is taken again,
+    and the index rebuilt only if that has changed too.
+
+    Subclasses say what the index is in _load(), which fills the tables
+    of a new index from the file, and add the lookups.
+
+    """
+
+    # suffix of the index file, in place of the raw file's extensions
+    suffix = '.db'
+
+    def __init__(self, raw_file, index_file=None):
+        """
+        :param raw_file: the file indexed
+        :param index_file: of the sqlite index; raw_file with its
+            extensions replaced by the suffix by default
+        """
+        self.raw_file = raw_file
+        self.index_file = index_file
+        if index_file is None:
+            (directory, name) = os.path.split(raw_file)
+            self.index_file = os.path.join(
+                directory, name.split('.')[0] + self.suffix)
+
+        if not self._is_current():
+            self.build()
+        self.connection = sqlite3.connect(
+            self.index_file, check_same_thread=False)
+
+        return
+
+    @staticmethod
+    def _md5(path, blocksize=2**20):
+        md5 = hashlib.md5()
+        with open(path, 'rb') as f:
+            for buffer in iter(lambda: f.read(blocksize), b''):
+                md5.update(buffer)
+
+        return md5.hexdigest()
+
+    def _version(self):
+        stat = os.stat(self.raw_file)
+        return {'size': str(stat.st_size), 'mtime': str(stat.st_mtime)}
+
+    def _is_current(self):
+        """
+        :return: True if the index was built from the raw file as is
+        """
+        if not os.path.exists(self.index_file):
+            return False
+        connection = sqlite3.connect(self.index_file)
+        try:
+            built = dict(connection.execute("SELECT key, value FROM version"))
+        except sqlite3.DatabaseError:
+            built = {}
+        current = self._version()
+        if 'md5' not in built:
+            connection.close()
+            return False
+        if all(built.get(key) == value for (key, value) in current.items()):
+            connection.close()
+            return True
+        # touched, perhaps copied or fetched again; is it the same file
+        is_current = built['md5'] == self._md5(self.raw_file)
+        if is_current:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO version VALUES (?, ?)",
+                    current.items())
+        connection.close()
+
+        return is_current
+
+    def _load(self, connection):
+        """
+        Create and fill the tables of the index from the raw file
+        :param connection: to the new index
+        :return: number of rows indexed
+        """
+        raise NotImplementedError
+
+    def build(self):
+        """
+        Index the raw file, replacing any index there is
+        :return: None
+        """
+        logger.info("Indexing %s in %s", self.raw_file, self.index_file)
+        md5 = self._md5(self.raw_file)
+        version = self._version()
+        building = self.index_file + '.part'
+        if os.path.exists(building):
+            os.remove(building)
+        connection = sqlite3.connect(building)
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute(
+            "CREATE TABLE version (key TEXT PRIMARY KEY, value TEXT)")
+        count = self._load(connection)
+        version['md5'] = md5
+        connection.executemany(
+            "INSERT INTO version VALUES (?, ?)", version.items())
+        connection.commit()
+        connection.close()
+        os.replace(building, self.index_file)
+        logger.info("Indexed %d rows of %s", count, self.raw_file)
+
+        return
+
+    def close(self):
+        self.connection.close()
+
+        return
@@ -0,0 +1,130 @@
+import os
+import gzip
+import logging
+import itertools
+import threading
+from dipper.utils.FileIndex import FileIndex
+
+logger = logging.getLogger(__name__)
+
+
+class GeneGroupIndex(FileIndex):
+    """
+    The orthology groups of NCBI's gene_group file, indexed on disk
+    (see FileIndex), so that the genes' orthologs are looked up
+    without hashing the whole file on every call.
+
+    Groups are led by (mostly human) genes, and the Ortholog rows of
+    the file are kept as
+        ortholog (group_num, gene_num)  the gene is in the lead's group
+        taxon (gene_num, tax_num)
+    in integers. The lead is one of its group's orthologs too.
+
+    Use the shared index of a gene_group file from GeneGroupIndex.get(),
+    so all the parsers of a run look up their genes in the one index.
+
+    """
+
+    batch_size = 100000
+    shared = {}
+    shared_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, gene_group_file):
+        """
+        :param gene_group_file: gene_group.gz
+        :return: the GeneGroupIndex of the file shared by the whole process
+        """
+        path = os.path.abspath(gene_group_file)
+        with cls.shared_lock:
+            if path not in cls.shared:
+                cls.shared[path] = GeneGroupIndex(path)
+
+        return cls.shared[path]
+
+    def _rows(self):
+        """
+        :return: generator of (tax_a, gene_a, tax_b, gene_b)
+            of the Ortholog rows of the gene_group file
+        """
+        with gzip.open(self.raw_file, 'rb') as gene_group:
+            for line in gene_group:
+                if line.startswith(b'#'):
+                    continue
+                (tax_a, gene_a, rel, tax_b, gene_b) = \
+                    line.rstrip(b'\r\n').split(b'\t')
+                if rel != b'Ortholog':
+                    continue
+                yield (int(tax_a), int(gene_a), int(tax_b), int(gene_b))
+
+    def _load(self, connection):
+        connection.execute(
+            "CREATE TABLE ortholog (group_num INTEGER, gene_num INTEGER)")
+        connection.execute(
+            "CREATE TABLE taxon (gene_num INTEGER PRIMARY KEY, "
+            "tax_num INTEGER)")
+        rows = self._rows()
+        count = 0
+        for batch in iter(
+                lambda: list(itertools.islice(rows, self.batch_size)), []):
+            connection.executemany(
+                "INSERT INTO ortholog VALUES (?, ?)",
+                [(gene_a, gene_b) for (_, gene_a, _, gene_b) in batch])
+            # a gene's taxon is as of its last row
+            connection.executemany(
+                "INSERT OR REPLACE INTO taxon VALUES (?, ?)",
+                [taxon for (tax_a, gene_a, tax_b, gene_b) in batch
+                 for taxon in ((gene_a, tax_a), (gene_b, tax_b))])
+            count += len(batch)
+        # indexed once loaded, rather than row by row
+        connection.execute(
+            "CREATE INDEX ortholog_gene ON ortholog (gene_num)")
+        connection.execute(
+            "CREATE INDEX ortholog_group ON ortholog (group_num)")
+
+        return count
+
+    def _select(self, query, nums):
+        """
+        :param query: with a placeholder for the nums
+        :param nums: list of int
+        :return: generator of the rows selected
+        """
+        # stay under sqlite's limit on the number of query variables
+        for start in range(0, len(nums), 500):
+            chunk = nums[start:start + 500]
+            yield from self.connection.execute(
+                query.format(','.join('?' * len(chunk))), chunk)
+
+    def get_orthologs(self, gene_nums):
+        """
+        :param gene_nums: iterable of NCBI gene numbers
+        :return: dict of gene number (int): list of (ortholog number,
+            taxon number), for each of the gene's groups, for the genes
+            in any group
+        """
+        gene_nums = sorted({int(gene_num) for gene_num in gene_nums})
+        gene_groups = {}
+        for (gene_num, group_num) in self._select(
+                "SELECT DISTINCT gene_num, group_num FROM ortholog "
+                "WHERE gene_num IN ({})", gene_nums):
+            gene_groups.setdefault(gene_num, []).append(group_num)
+
+        members = {}
+        for (group_num, gene_num) in self._select(
+                "SELECT DISTINCT group_num, gene_num FROM ortholog "
+                "WHERE group_num IN ({})",
+                sorted({g for groups in gene_groups.values() for g in groups})):
+            members.setdefault(group_num, {group_num}).add(gene_num)
+
+        taxa = dict(self._select(
+            "SELECT gene_num, tax_num FROM taxon WHERE gene_num IN ({})",
+            sorted({m for group in members.values() for m in group})))
+
+        orthologs = {}
+        for (gene_num, groups) in gene_groups.items():
+            orthologs[gene_num] = [
+                (member, taxa[member]) for group_num in sorted(groups)
+                for member in sorted(members[group_num])]
+
+        return orthologs
@@ -1,11 +1,11 @@
 import logging
-import hashlib
 from rdflib import URIRef, ConjunctiveGraph
 from rdflib import util as rdflib_util
 from rdflib.namespace import DC, RDF, OWL
 from xml.sax import SAXParseException
 
 from dipper.utils.CurieUtil import CurieUtil
+from dipper.utils.IdMinter import IdMinter
 
 __author__ = 'nlw'
 
@@ -54,6 +54,8 @@ class GraphUtils:
         property_set = set()
         for row in graph.predicates():
             property_set.add(row)
+        # predicates of triples spilled to disk under a memory budget
+        property_set.update(getattr(graph, 'spilled_predicates', set()))
 
         return property_set
 
@@ -143,4 +145,4 @@ class GraphUtils:
         : param str wordage arbitrary string
         : return str
         '''
-        return 'b' + hashlib.sha1(wordage.encode('utf-8')).hexdigest()[1:20]
+        return IdMinter.get().mint(wordage, 1, 20, 'b')
@@ -0,0 +1,168 @@
+import logging
+import hashlib
+import functools
+
+logger = logging.getLogger(__name__)
+
+
+class IdMinter:
+    """
+    Deterministic identifiers from the sha1 digest of a string.
+
+    The id schemes in use each keep a different slice of the hex digest:
+        Source.hash_id              'b' + [0:15]
+        Assoc.make_association_id   'MONARCH:' + [0:16]
+        GraphUtils.digest_id        'b' + [1:20]
+    so a scheme is given by (prefix, start, end).
+
+    Digests are memoized in a bounded LRU cache, since parsers tend to
+    mint the same id for every row mentioning the same thing.
+
+    In audit mode, the full digest behind each minted id is kept
+    (per slice, as 20 bytes), so that two different inputs truncated to
+    the same id are caught; they are logged when seen and summarized
+    by report(). A copy of the minter in a worker process can record()
+    the ids it audits, to be checked against those of the minter it was
+    copied from by merge().
+
+    Use the shared instance from IdMinter.get() so that all callers
+    share one cache and one audit.
+
+    """
+
+    shared = None
+
+    def __init__(self, cache_size=2**17, audit=False):
+        """
+        :param cache_size: number of digests to memoize
+        :param audit: check for collisions
+        """
+        self.cache_size = cache_size
+        self._digest = functools.lru_cache(maxsize=cache_size)(
+            self._sha1)
+        self.audit = audit
+        self.minted = {}
+        self.collisions = []
+        self.added = None
+        self.collisions_before = 0
+
+        return
+
+    @classmethod
+    def get(cls):
+        """
+        :return: the IdMinter shared by the whole process
+        """
+        if cls.shared is None:
+            cls.shared = IdMinter()
+
+        return cls.shared
+
+    @staticmethod
+    def _sha1(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def set_audit(self, audit):
+        """
+        Turn collision checking on or off
+        :param audit: boolean
+        :return: None
+        """
+        self.audit = audit
+        if not audit:
+            self.minted = {}
+
+        return
+
+    def mint(self, text, start=0, end=15, prefix='b'):
+        """
+        :param text: str to digest
+        :param start: first hex digit of the digest to keep
+        :param end: hex digit of the digest to stop at
+        :param prefix: str to put in front
+        :return: str prefix + digest[start:end]
+        """
+        digest = self._digest(text)
+        minted = prefix + digest[start:end]
+        if self.audit:
+            self._check(minted, bytes.fromhex(digest), text, start, end)
+
+        return minted
+
+    def mint_many(self, texts, start=0, end=15, prefix='b'):
+        """
+        Mint an id for each of an iterable of strings
+        :param texts: iterable of str
+        :return: list of str
+        """
+        if self.audit:
+            return [self.mint(text, start, end, prefix) for text in texts]
+        digest = self._digest
+
+        return [prefix + digest(text)[start:end] for text in texts]
+
+    def _check(self, minted, full, text, start, end):
+        seen = self.minted.setdefault((start, end), {})
+        previous = seen.get(minted)
+        if previous is None:
+            seen[minted] = full
+            if self.added is not None:
+                self.added.append((minted, full, text, start, end))
+        elif previous != full:
+            logger.error(
+                "Id collision: %s was minted from another input before %r",
+                minted, text)
+            self.collisions.append((minted, text))
+
+        return
+
+    def record(self):
+        """
+        Start keeping the ids audited from now on
+        :return: None
+        """
+        self.added = []
+        self.collisions_before = len(self.collisions)
+
+        return
+
+    def recorded(self):
+        """
+        :return: the ids first audited since record(), with their
+            full digests and inputs, and the collisions found since
+        """
+        return (self.added, self.collisions[self.collisions_before:])
+
+    def merge(self, recorded):
+        """
+        Audit the ids another copy of this minter recorded,
+        and add the collisions it found
+        :param recorded: as returned by its recorded()
+        :return: None
+        """
+        (added, collisions) = recorded
+        self.collisions.extend(collisions)
+        if self.audit:
+            for (minted, full, text, start, end) in added:
+                self._check(minted, full, text, start, end)
+
+        return
+
+    def report(self):
+        """
+        Log the memo cache use and, when auditing, the collisions found
+        :return: list of (id, input) collisions
+        """
+        info = self._digest.cache_info()
+        logger.info(
+            "Minted ids: %d cached digests used, %d computed",
+            info.hits, info.misses)
+        if self.audit:
+            logger.info(
+                "Audited %d distinct ids, found %d collisions",
+                sum(len(ids) for ids in self.minted.values()),
+                len(self.collisions))
+            for (minted, text) in self.collisions:
+                logger.warning("Collision on %s: %r", minted, text)
+
+        return self.collisions
@@ -0,0 +1,202 @@
+import logging
+from array import array
+from collections.abc import MutableMapping, ItemsView
+
+logger = logging.getLogger(__name__)
+
+EMPTY = -1
+
+
+class IdTable(MutableMapping):
+    """
+    A dict of the keys of database rows to what we make of them,
+    such as the idhash of the internal keys to public identifiers
+    of the parsers of database dumps (FlyBase, MGI).
+
+    The keys are read as the strings of integers; those are kept as
+    64 bit integers in an open addressing table, with the values
+    (as given, so a value used over and over is held once) alongside.
+    An entry takes some 30 bytes rather than the 100 or so of a dict
+    and the key's string. Any other keys are kept in a dict, so the
+    table may be used as the dict it stands in for, although it is not
+    ordered: its keys come back in no particular order.
+
+    """
+
+    min_capacity = 8
+
+    def __init__(self, items=None):
+        """
+        :param items: dict or iterable of (key, value) to start with
+        """
+        self.clear()
+        if items is not None:
+            self.update(items)
+
+        return
+
+    def clear(self):
+        self._keys = array('q', [EMPTY]) * self.min_capacity
+        self._values = [None] * self.min_capacity
+        self._shift = 64 - (self.min_capacity.bit_length() - 1)
+        self._used = 0
+        self._other = {}
+
+        return
+
+    @staticmethod
+    def _number(key):
+        """
+        :param key:
+        :return: the int of a key that is the string of one,
+            as str() would write it and under 2**63; else None
+        """
+        if type(key) is str and 0 < len(key) < 19 and key.isdigit() \
+                and key.isascii() and (key[0] != '0' or len(key) == 1):
+            return int(key)
+        return None
+
+    def _find(self, num):
+        """
+        :param num: int key
+        :return: the slot of the key; else the bitwise not
+            of the empty slot it would go in
+        """
+        keys = self._keys
+        mask = len(keys) - 1
+        i = (num * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> self._shift
+        while True:
+            k = keys[i]
+            if k == num:
+                return i
+            if k == EMPTY:
+                return ~i
+            i = (i + 1) & mask
+
+    def _resize(self, capacity):
+        keys = self._keys
+        values = self._values
+        self._keys = array('q', [EMPTY]) * capacity
+        self._values = [None] * capacity
+        self._shift = 64 - (capacity.bit_length() - 1)
+        for (i, num) in enumerate(keys):
+            if num != EMPTY:
+                slot = ~self._find(num)
+                self._keys[slot] = num
+                self._values[slot] = values[i]
+
+        return
+
+    def __getitem__(self, key):
+        num = self._number(key)
+        if num is None:
+            return self._other[key]
+        i = self._find(num)
+        if i < 0:
+            raise KeyError(key)
+        return self._values[i]
+
+    def get(self, key, default=None):
+        num = self._number(key)
+        if num is None:
+            return self._other.get(key, default)
+        i = self._find(num)
+        if i < 0:
+            return default
+        return self._values[i]
+
+    def __contains__(self, key):
+        num = self._number(key)
+        if num is None:
+            return key in self._other
+        return self._find(num) >= 0
+
+    def __setitem__(self, key, value):
+        num = self._number(key)
+        if num is None:
+            self._other[key] = value
+            return
+        i = self._find(num)
+        if i < 0:
+            # grow once more than two thirds full, as a dict does
+            if (self._used + 1) * 3 > len(self._keys) * 2:
+                self._resize(len(self._keys) * 2)
+                i = self._find(num)
+            i = ~i
+            self._keys[i] = num
+            self._used += 1
+        self._values[i] = value
+
+        return
+
+    def __delitem__(self, key):
+        num = self._number(key)
+        if num is None:
+            del self._other[key]
+            return
+        i = self._find(num)
+        if i < 0:
+            raise KeyError(key)
+        keys = self._keys
+        values = self._values
+        mask = len(keys) - 1
+        keys[i] = EMPTY
+        values[i] = None
+        self._used -= 1
+        # move back the keys after it that would not be found past the gap
+        j = i
+        while True:
+            j = (j + 1) & mask
+            num = keys[j]
+            if num == EMPTY:
+                break
+            home = \
+                (num * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> self._shift
+            if (i < j and (home <= i or home > j)) or \
+                    (j < i and home <= i and home > j):
+                keys[i] = num
+                values[i] = values[j]
+                keys[j] = EMPTY
+                values[j] = None
+                i = j
+
+        return
+
+    def __iter__(self):
+        for num in self._keys:
+            if num != EMPTY:
+                yield str(num)
+        yield from self._other
+
+    def __len__(self):
+        return self._used + len(self._other)
+
+    def items(self):
+        return IdTableItems(self)
+
+    def copy(self):
+        table = IdTable()
+        table._keys = array('q', self._keys)
+        table._values = list(self._values)
+        table._shift = self._shift
+        table._used = self._used
+        table._other = dict(self._other)
+
+        return table
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self.items()))
+
+
+class IdTableItems(ItemsView):
+    """
+    The items of an IdTable, read off its slots
+    rather than looked up key by key
+    """
+
+    def __iter__(self):
+        table = self._mapping
+        for (i, num) in enumerate(table._keys):
+            if num != EMPTY:
+                yield (str(num), table._values[i])
+        yield from table._other.items()
@@ -0,0 +1,221 @@
+import os
+import time
+import json
+import sqlite3
+import logging
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dipper.utils.TokenBucket import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class OMIMClient:
+    """
+    Fetches OMIM entries from their API into a local store,
+    so that a source is parsed from the store and a re-parse
+    makes no API calls at all.
+
+    The store is a sqlite file of the entries (as the API returns them
+    in its entryList) keyed by mimNumber, along with the fields included
+    and the entry's dateUpdated.
+    An entry is fetched when it is not in the store, or was stored with
+    fewer included fields than asked for. Once it has been in the store
+    for max_age seconds its basic record is fetched again, and the whole
+    entry only if its dateUpdated changed.
+
+    Batches of groupsize entries are fetched by a pool of threads,
+    all of them taking their turn from the shared 'omim' TokenBucket.
+    A batch that fails is retried one entry at a time, and an entry that
+    still fails is left out (and fetched again next time).
+
+    """
+
+    groupsize = 20  # the most entries the API returns with any include
+
+    def __init__(self, api, store_file=None, rate=4, workers=4,
+                 max_age=7 * 24 * 3600):
+        """
+        :param api: the entry url, ending with the apiKey parameter and '&'
+        :param store_file: of the sqlite store; in memory only if None
+        :param rate: requests per second, for all of the threads
+        :param workers: threads fetching batches
+        :param max_age: seconds before an entry is checked for an update;
+            never if None
+        """
+        self.api = api
+        self.max_age = max_age
+        self.workers = workers
+        self.bucket = TokenBucket.get('omim', rate, 1)
+        self.requests = 0
+        path = ':memory:'
+        if store_file is not None:
+            path = store_file
+            if os.path.dirname(path) != '':
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entry ("
+                "mim TEXT PRIMARY KEY, include TEXT, updated TEXT, "
+                "checked REAL, body TEXT)")
+
+        return
+
+    @staticmethod
+    def _include(included_fields):
+        if included_fields is None:
+            return ''
+        return ','.join(sorted(set(included_fields)))
+
+    @staticmethod
+    def _covers(stored, include):
+        """
+        :return: True if an entry stored with the fields in stored
+            has those in include
+        """
+        stored = set(stored.split(','))
+        wanted = set(include.split(',')) - {''}
+        return 'all' in stored or wanted <= stored
+
+    def _rows(self, mims):
+        # stay under sqlite's limit on the number of query variables
+        for start in range(0, len(mims), 500):
+            chunk = mims[start:start + 500]
+            yield from self.connection.execute(
+                "SELECT mim, include, updated, checked, body FROM entry "
+                "WHERE mim IN ({})".format(','.join('?' * len(chunk))), chunk)
+
+    def _request(self, mims, include):
+        """
+        :param mims: list of mimNumbers
+        :param include: comma separated fields
+        :return: list of entryList items
+        """
+        params = {'mimNumber': ','.join(mims)}
+        if include != '':
+            params['include'] = include
+        url = self.api + urllib.parse.urlencode(params)
+        self.bucket.acquire()
+        logger.info('fetching: %s', url)
+        self.requests += 1
+        with urllib.request.urlopen(url) as d:
+            resp = d.read().decode()
+
+        return json.loads(resp)['omim']['entryList']
+
+    def _fetch(self, mims, include):
+        """
+        Fetch a batch, or failing that, each entry of it
+        :return: list of entryList items fetched
+        """
+        try:
+            return self._request(mims, include)
+        except (OSError, ValueError, KeyError) as e:
+            if len(mims) == 1:
+                logger.error("Could not fetch OMIM:%s: %s", mims[0], e)
+                return []
+            logger.warning(
+                "Batch of %d failed (%s), retrying each", len(mims), e)
+        entries = []
+        for mim in mims:
+            entries += self._fetch([mim], include)
+
+        return entries
+
+    def _fetch_all(self, mims, include):
+        """
+        :return: generator of the entryList items of the mims, as fetched
+        """
+        batches = [
+            mims[start:start + self.groupsize]
+            for start in range(0, len(mims), self.groupsize)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(self._fetch, batch, include)
+                for batch in batches]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def _store(self, entries, include):
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entry VALUES (?, ?, ?, ?, ?)",
+                [(str(e['entry']['mimNumber']), include,
+                  e['entry'].get('dateUpdated'), now, json.dumps(e))
+                 for e in entries])
+
+        return
+
+    def update(self, mims, included_fields=None):
+        """
+        Bring the store up to date with the entries of mims
+        :param mims: list of mimNumbers, as str
+        :param included_fields: the fields to include in the entries
+        :return: None
+        """
+        include = self._include(included_fields)
+        missing = set(mims)
+        stale = {}
+        now = time.time()
+        for (mim, stored, updated, checked, _) in self._rows(list(mims)):
+            if not self._covers(stored, include):
+                continue
+            missing.discard(mim)
+            if self.max_age is not None and now - checked > self.max_age:
+                stale[mim] = (stored, updated)
+
+        if stale:
+            # the basic entries, to see which have changed
+            checked = []
+            for e in self._fetch_all(sorted(stale), ''):
+                mim = str(e['entry']['mimNumber'])
+                (stored, updated) = stale.pop(mim)
+                if stored == '':
+                    self._store([e], '')
+                elif e['entry'].get('dateUpdated') != updated:
+                    missing.add(mim)
+                else:
+                    checked.append(mim)
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE entry SET checked = ? WHERE mim = ?",
+                    [(now, mim) for mim in checked])
+            logger.info(
+                "%d stored OMIM entries are unchanged, %d have changed",
+                len(checked), len(missing))
+
+        fetched = 0
+        for e in self._fetch_all(sorted(missing), include):
+            self._store([e], include)
+            fetched += 1
+        logger.info(
+            "Fetched %d of %d OMIM entries, in %d requests",
+            fetched, len(mims), self.requests)
+
+        return
+
+    def entries(self, mims, included_fields=None):
+        """
+        :param mims: list of mimNumbers, as str
+        :param included_fields: the fields the entries need to include
+        :return: generator of the stored entryList items of mims, in order
+        """
+        include = self._include(included_fields)
+        for start in range(0, len(mims), 500):
+            chunk = mims[start:start + 500]
+            stored = {
+                mim: body for (mim, fields, _, _, body) in self._rows(chunk)
+                if self._covers(fields, include)}
+            for mim in chunk:
+                if mim in stored:
+                    yield json.loads(stored[mim])
+                else:
+                    logger.warning("OMIM:%s is not in the store", mim)
+
+    def close(self):
+        self.connection.close()
+
+        return
@@ -0,0 +1,190 @@
+import os
+import gzip
+import json
+import logging
+from rdflib import Graph, RDFS, URIRef
+from dipper import curie_map
+from dipper.utils.CurieUtil import CurieUtil
+
+logger = logging.getLogger(__name__)
+
+
+class OntologyIndex:
+    """
+    The labels and transitive rdfs:subClassOf ancestors of the classes
+    in an ontology, to answer
+        is_descendant(term, ancestor)  (ie. term rdfs:subClassOf+ ancestor)
+        label(term)
+    with a lookup, rather than a SPARQL property path query over the
+    whole ontology graph.
+
+    Terms are numbered, and each keeps the set of the numbers of its
+    ancestors. The index is written next to the ontology as gzipped
+    json lines, one per term:
+        ["<iri>", "<label>", [ancestor, ...]]
+    and read back as long as it is newer than the ontology file.
+    An ontology read from a url has no date to check, so it is parsed
+    every time, and no index is kept.
+
+    Terms may be given as IRIs or as curies from the curie map.
+
+    """
+
+    def __init__(self):
+        self.terms = []         # number: iri
+        self.index = {}         # iri: number
+        self.labels = []        # number: label
+        self.ancestors = []     # number: frozenset of ancestor numbers
+        self.curie_util = CurieUtil(curie_map.get())
+
+        return
+
+    def __len__(self):
+        return len(self.terms)
+
+    def _number(self, iri):
+        number = self.index.get(iri)
+        if number is None:
+            number = len(self.terms)
+            self.index[iri] = number
+            self.terms.append(iri)
+            self.labels.append(None)
+        return number
+
+    def _iri(self, term):
+        if term is None or term.startswith('http'):
+            return term
+        return self.curie_util.get_uri(term)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Index the named classes of an rdflib graph of an ontology
+        :param graph: rdflib Graph
+        :return: OntologyIndex
+        """
+        ontology = cls()
+        parents = {}
+        for (sub, obj) in graph.subject_objects(RDFS['subClassOf']):
+            # skip anonymous superclasses (restrictions, intersections)
+            if isinstance(sub, URIRef) and isinstance(obj, URIRef):
+                parents.setdefault(
+                    ontology._number(str(sub)), set()).add(
+                        ontology._number(str(obj)))
+        for (sub, label) in graph.subject_objects(RDFS['label']):
+            if isinstance(sub, URIRef):
+                number = ontology._number(str(sub))
+                if ontology.labels[number] is None:
+                    ontology.labels[number] = str(label)
+        ontology._close(parents)
+
+        return ontology
+
+    def _close(self, parents):
+        """
+        Compute the ancestors of every term from its direct parents.
+        A breadth first walk up from each term, that stops at the terms
+        whose ancestors are already known; cycles are walked through.
+        :param parents: dict of number: set of parent numbers
+        :return: None
+        """
+        ancestors = [None] * len(self.terms)
+        for number in range(len(self.terms)):
+            closure = set()
+            frontier = list(parents.get(number, ()))
+            while frontier:
+                parent = frontier.pop()
+                if parent in closure:
+                    continue
+                closure.add(parent)
+                if ancestors[parent] is not None:
+                    closure |= ancestors[parent]
+                else:
+                    frontier.extend(parents.get(parent, ()))
+            ancestors[number] = frozenset(closure)
+        self.ancestors = ancestors
+
+        return
+
+    @classmethod
+    def load(cls, ontology_file, index_file=None):
+        """
+        Read the index of an ontology if it is up to date,
+        otherwise parse the ontology and (re)write its index.
+        :param ontology_file: path or url of the owl (rdf/xml) file
+        :param index_file: path of the index; not kept if None,
+            nor if the ontology is not a local file
+        :return: OntologyIndex
+        """
+        if not os.path.exists(ontology_file):
+            index_file = None
+        if index_file is not None and os.path.exists(index_file) and \
+                os.path.getmtime(index_file) >= \
+                os.path.getmtime(ontology_file):
+            logger.info("Reading ontology index %s", index_file)
+            return cls.read(index_file)
+
+        logger.info("Indexing ontology %s", ontology_file)
+        graph = Graph()
+        graph.parse(ontology_file, format='xml')
+        ontology = cls.from_graph(graph)
+        logger.info("Indexed %d ontology terms", len(ontology))
+        if index_file is not None:
+            ontology.write(index_file)
+
+        return ontology
+
+    def write(self, index_file):
+        """
+        :param index_file: path
+        :return: None
+        """
+        with gzip.open(index_file, 'wt', encoding='utf-8') as f:
+            for (iri, label, ancestors) in zip(
+                    self.terms, self.labels, self.ancestors):
+                f.write(json.dumps(
+                    [iri, label, sorted(ancestors)], ensure_ascii=False))
+                f.write('\n')
+
+        return
+
+    @classmethod
+    def read(cls, index_file):
+        """
+        :param index_file: path
+        :return: OntologyIndex
+        """
+        ontology = cls()
+        with gzip.open(index_file, 'rt', encoding='utf-8') as f:
+            for line in f:
+                (iri, label, ancestors) = json.loads(line)
+                ontology.index[iri] = len(ontology.terms)
+                ontology.terms.append(iri)
+                ontology.labels.append(label)
+                ontology.ancestors.append(frozenset(ancestors))
+
+        return ontology
+
+    def is_descendant(self, term, ancestor):
+        """
+        :param term: iri or curie
+        :param ancestor: iri or curie
+        :return: True if term is a subclass of ancestor, at any depth
+        """
+        number = self.index.get(self._iri(term))
+        ancestor = self.index.get(self._iri(ancestor))
+        if number is None or ancestor is None:
+            return False
+
+        return ancestor in self.ancestors[number]
+
+    def label(self, term):
+        """
+        :param term: iri or curie
+        :return: its rdfs:label, or None
+        """
+        number = self.index.get(self._iri(term))
+        if number is None:
+            return None
+
+        return self.labels[number]
@@ -0,0 +1,360 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from dipper.utils.TokenBucket import TokenBucket
+from dipper.utils.ResolverCache import ResolverCache
+
+logger = logging.getLogger(__name__)
+
+
+class Resolver:
+    """
+    Looks up identifiers with remote services:
+        'symbol'      human gene symbol to NCBI gene curie (monarch solr)
+        'taxon'       organism label to NCBI taxon number (eutils)
+        'homologene'  NCBI gene number to its homologene record (eutils)
+
+    Answers are kept in a ResolverCache, so each key is fetched once;
+    the taxa and homologene records missing from it are fetched in
+    batches of one OR query plus an esummary, and only the keys a batch
+    could not answer unambiguously are asked for one at a time.
+    Gene symbols are always asked one at a time: the answer is the top
+    hit of a search for the symbol, which a combined query ranks apart.
+
+    Every request takes a token from the service's shared TokenBucket,
+    keeping eutils under the 3 requests/sec NCBI asks for.
+
+    Parsers may prefetch() all of their keys up front, to be fetched in
+    the background, then resolve() them as they go; resolving a key
+    being fetched waits for its batch.
+
+    Use the shared instance from Resolver.get(), whose cache persists in
+    cache_file once a Source has set it (see set_cache_file()),
+    and is kept in memory otherwise.
+
+    """
+
+    eutils = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils'
+    solr = 'https://solr.monarchinitiative.org/solr/search/select'
+    ereq = {'email': 'info@monarchinitiative.org', 'tool': 'Dipper'}
+    cache_file = None
+    shared = None
+
+    def __init__(self, cache=None, batch_size=100, workers=4,
+                 eutils=None, solr=None, buckets=None):
+        """
+        :param cache: ResolverCache; one in memory by default
+        :param batch_size: keys per batched query
+        :param workers: threads fetching prefetched batches
+        :param eutils: base url of NCBI eutils
+        :param solr: url of the monarch solr search
+        :param buckets: dict of 'eutils' and 'solr' TokenBuckets;
+            the shared ones by default
+        """
+        self.cache = ResolverCache() if cache is None else cache
+        self.batch_size = batch_size
+        if eutils is not None:
+            self.eutils = eutils
+        if solr is not None:
+            self.solr = solr
+        self.buckets = {
+            'eutils': TokenBucket.get('eutils', 3),
+            'solr': TokenBucket.get('solr', 10)}
+        if buckets is not None:
+            self.buckets.update(buckets)
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(max_retries=3)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = {}   # (kind, key): future of its batch
+        self.lock = threading.Lock()
+        self.fetchers = {
+            'symbol': (None, self._fetch_symbol),
+            'taxon': (self._fetch_taxa, self._fetch_taxon),
+            'homologene': (self._fetch_homologenes, self._fetch_homologene)}
+
+        return
+
+    @classmethod
+    def get(cls):
+        """
+        :return: the Resolver shared by the whole process
+        """
+        if cls.shared is None:
+            cls.shared = Resolver(ResolverCache(cls.cache_file))
+
+        return cls.shared
+
+    @classmethod
+    def set_cache_file(cls, path):
+        """
+        Set where the shared Resolver keeps its cache,
+        unless it is already in use
+        :param path: of the sqlite file
+        :return: None
+        """
+        if cls.shared is None:
+            cls.cache_file = path
+        elif path != cls.cache_file:
+            logger.warning(
+                "Resolver cache already open at %s, not %s",
+                cls.cache_file, path)
+
+        return
+
+    def _request(self, service, url, params):
+        self.buckets[service].acquire()
+        request = self.session.get(url, params=params)
+        logger.info('fetching: %s', request.url)
+        request.raise_for_status()
+
+        return request.json()
+
+    def _batches(self, keys):
+        for start in range(0, len(keys), self.batch_size):
+            yield keys[start:start + self.batch_size]
+
+    def _fetch(self, kind, keys):
+        """
+        Fetch, and cache, the answers for a batch of keys
+        :param kind: of lookup
+        :param keys: list of str
+        :return: dict of key: answer, for the keys fetched
+        """
+        (fetch_many, fetch_one) = self.fetchers[kind]
+        answers = {}
+        if fetch_many is not None and len(keys) > 1:
+            try:
+                answers = fetch_many(keys)
+            except (requests.RequestException, ValueError, KeyError) as e:
+                logger.warning("Batch %s lookup failed: %s", kind, e)
+        for key in keys:
+            if key not in answers:
+                try:
+                    answers[key] = fetch_one(key)
+                except (requests.RequestException, ValueError,
+                        KeyError) as e:
+                    # not cached, so that it is tried again next time
+                    logger.warning("%s lookup of %s failed: %s", kind, key, e)
+        self.cache.put_many(kind, answers)
+
+        return answers
+
+    def _done(self, kind, keys):
+        with self.lock:
+            for key in keys:
+                self.pending.pop((kind, key), None)
+
+    def prefetch(self, kind, keys):
+        """
+        Start fetching the answers of all the keys not cached,
+        in batches, in the background
+        :param kind: 'symbol', 'taxon' or 'homologene'
+        :param keys: iterable
+        :return: list of futures, one per batch, of dicts of key: answer;
+            see concurrent.futures.as_completed()
+        """
+        keys = list(dict.fromkeys(str(key) for key in keys))
+        with self.lock:
+            keys = [key for key in keys if (kind, key) not in self.pending]
+        cached = self.cache.get_many(kind, keys)
+        missing = [key for key in keys if key not in cached]
+        futures = []
+        for batch in self._batches(missing):
+            with self.lock:
+                future = self.executor.submit(self._fetch, kind, batch)
+                for key in batch:
+                    self.pending[(kind, key)] = future
+            future.add_done_callback(
+                lambda f, batch=batch: self._done(kind, batch))
+            futures.append(future)
+        logger.info("Prefetching %d of %d %s keys in %d batches",
+                    len(missing), len(keys), kind, len(futures))
+
+        return futures
+
+    def resolve_many(self, kind, keys):
+        """
+        :param kind: 'symbol', 'taxon' or 'homologene'
+        :param keys: iterable
+        :return: dict of key (as str): answer, None if not resolved
+        """
+        keys = list(dict.fromkeys(str(key) for key in keys))
+        with self.lock:
+            waiting = {
+                key: self.pending[(kind, key)] for key in keys
+                if (kind, key) in self.pending}
+        answers = self.cache.get_many(
+            kind, [key for key in keys if key not in waiting])
+        missing = [
+            key for key in keys if key not in waiting and key not in answers]
+        for batch in self._batches(missing):
+            answers.update(self._fetch(kind, batch))
+        for (key, future) in waiting.items():
+            answers[key] = future.result().get(key)
+
+        return {key: answers.get(key) for key in keys}
+
+    def resolve(self, kind, key):
+        """
+        :param kind: 'symbol', 'taxon' or 'homologene'
+        :param key:
+        :return: the answer, None if not resolved
+        """
+        return self.resolve_many(kind, [key])[str(key)]
+
+    # gene symbols
+
+    @staticmethod
+    def _solr_params():
+        return {
+            "qt": "standard",
+            "json.nl": "arrarr",
+            "fl": "*,score",
+            "start": "0",
+            "rows": "5",
+            "defType": "edismax",
+            "personality": "monarch_search",
+            "qf": [
+                "label_searchable^1",
+                "definition_searchable^1",
+                "synonym_searchable^1",
+                "label_std^2",
+                "synonym_std^1"
+            ],
+            "wt": "json",
+            "fq": ["taxon:\"NCBITaxon:9606\"", "category:\"gene\""]
+        }
+
+    def _fetch_symbol(self, gene_symbol):
+        """
+        Get ncbi gene id from symbol using monarch and mygene services
+        :param gene_symbol:
+        :return: the best hit's id, or None
+        """
+        params = self._solr_params()
+        params["q"] = "{0} \"{0}\"".format(gene_symbol)
+        response = self._request('solr', self.solr, params)
+        gene_id = None
+        if response['response']['numFound'] > 0:
+            gene_id = response['response']['docs'][0]['id']
+
+        return gene_id
+
+    # taxa
+
+    def _esearch(self, db, term, retmax=None):
+        req = {'db': db, 'retmode': 'json', 'term': term}
+        if retmax is not None:
+            req['retmax'] = retmax
+        req.update(self.ereq)
+
+        return self._request(
+            'eutils', self.eutils + '/esearch.fcgi', req)['esearchresult']
+
+    def _esummary(self, db, ids):
+        req = {'db': db, 'id': ','.join(ids), 'retmode': 'json'}
+        req.update(self.ereq)
+
+        return self._request('eutils', self.eutils + '/esummary.fcgi', req)
+
+    def _fetch_taxon(self, label):
+        """
+        Look up the NCBI Taxon number using some kind of label.
+        It will only return a result if there is a unique hit.
+        :param label:
+        :return: taxon number, or None
+        """
+        result = self._esearch('taxonomy', label)
+
+        # Occasionally eutils returns the json blob
+        # {'ERROR': 'Invalid db name specified: taxonomy'}
+        if 'ERROR' in result:
+            result = self._esearch('taxonomy', label)
+
+        tax_num = None
+        if 'count' in result and str(result['count']) == '1':
+            tax_num = result['idlist'][0]
+        else:
+            logger.warning(
+                'ESEARCH for taxon label "%s"  returns %s', label, str(result))
+
+        return tax_num
+
+    def _fetch_taxa(self, labels):
+        """
+        One search for many labels as scientific names,
+        keeping those naming exactly one taxon
+        :param labels: list
+        :return: dict of label: taxon number, for the labels found
+        """
+        result = self._esearch('taxonomy', ' OR '.join(
+            "\"{0}\"[Scientific Name]".format(label) for label in labels),
+            5 * len(labels))
+        if 'ERROR' in result or not result.get('idlist'):
+            return {}
+        summary = self._esummary('taxonomy', result['idlist'])['result']
+        named = {}
+        for uid in summary.get('uids', []):
+            name = summary[uid].get('scientificname', '').lower()
+            named.setdefault(name, []).append(uid)
+        tax_nums = {}
+        for label in labels:
+            uids = named.get(label.lower(), [])
+            if len(uids) == 1:
+                tax_nums[label] = uids[0]
+
+        return tax_nums
+
+    # homologene
+
+    def _fetch_homologene(self, gene_num):
+        """
+        :param gene_num: NCBI gene number
+        :return: the homologene record of the gene's group, or None
+        """
+        # first, get the homologene id from the gene id
+        homologene_ids = self._esearch(
+            'homologene', str(gene_num) + "[Gene ID]")['idlist']
+        if len(homologene_ids) != 1:
+            return None
+        hid = homologene_ids[0]
+        # now, fetch the homologene record
+        data = self._esummary('homologene', [hid])
+
+        homologs = None
+        if 'result' in data and hid in data['result']:
+            homologs = data['result'][hid]
+
+        return homologs
+
+    def _fetch_homologenes(self, gene_nums):
+        """
+        One search and one summary for the groups of many genes
+        :param gene_nums: list
+        :return: dict of gene number: homologene record (None when the
+            gene is in more than one group), for the genes found
+        """
+        hids = self._esearch('homologene', ' OR '.join(
+            "{0}[Gene ID]".format(gene_num) for gene_num in gene_nums),
+            10000)['idlist']
+        if not hids:
+            return {}
+        result = self._esummary('homologene', hids)['result']
+        groups = {}
+        for hid in hids:
+            for gene in result.get(hid, {}).get('genetable', []):
+                groups.setdefault(str(gene.get('geneid')), set()).add(hid)
+        homologs = {}
+        for gene_num in gene_nums:
+            found = sorted(groups.get(gene_num, ()))
+            if len(found) == 1:
+                homologs[gene_num] = result[found[0]]
+            elif len(found) > 1:
+                homologs[gene_num] = None
+
+        return homologs
@@ -0,0 +1,92 @@
+import os
+import time
+import json
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ResolverCache:
+    """
+    Persistent cache of the answers of remote lookups
+    (a gene symbol's NCBI id, a taxon label's number ...),
+    so that they are fetched once and reused across runs.
+
+    Answers are kept in a sqlite file, per kind of lookup and key,
+    as json, along with when they were fetched; they expire after ttl
+    seconds. Unresolved (None) answers are cached too.
+
+    """
+
+    def __init__(self, path=None, ttl=30 * 24 * 3600):
+        """
+        :param path: of the sqlite file; in memory only if None
+        :param ttl: seconds an answer stays valid
+        """
+        self.path = path
+        self.ttl = ttl
+        if path is None:
+            path = ':memory:'
+        elif os.path.dirname(path) != '':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS resolved ("
+                "kind TEXT, key TEXT, value TEXT, fetched REAL, "
+                "PRIMARY KEY (kind, key))")
+
+        return
+
+    def get_many(self, kind, keys):
+        """
+        :param kind: of lookup
+        :param keys: iterable of str
+        :return: dict of key: answer, for the keys cached and not expired
+        """
+        keys = list(keys)
+        oldest = time.time() - self.ttl
+        found = {}
+        with self.lock:
+            # stay under sqlite's limit on the number of query variables
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self.connection.execute(
+                    "SELECT key, value FROM resolved "
+                    "WHERE kind = ? AND fetched >= ? AND key IN ({})".format(
+                        ','.join('?' * len(chunk))),
+                    [kind, oldest] + chunk)
+                for (key, value) in rows:
+                    found[key] = json.loads(value)
+
+        return found
+
+    def put_many(self, kind, answers):
+        """
+        :param kind: of lookup
+        :param answers: dict of key: answer (json serializable)
+        :return: None
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO resolved VALUES (?, ?, ?, ?)",
+                [(kind, key, json.dumps(value), now)
+                 for (key, value) in answers.items()])
+
+        return
+
+    def purge(self):
+        """
+        Remove the expired answers
+        :return: number removed
+        """
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM resolved WHERE fetched < ?",
+                (time.time() - self.ttl,))
+
+        return cursor.rowcount
@@ -0,0 +1,73 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Rate limiter for a remote service, shared by all the threads
+    (and parsers) calling it.
+
+    The bucket holds up to capacity tokens and refills at rate tokens
+    per second; each request takes a token, waiting for one if the
+    bucket is empty. So no more than capacity requests go out in a burst,
+    and no more than rate per second on average.
+
+    Use the shared bucket of a service from TokenBucket.get(), so that
+    every caller of, say, NCBI eutils keeps under its 3 requests/sec.
+
+    """
+
+    shared = {}
+    shared_lock = threading.Lock()
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: tokens added per second
+        :param capacity: most tokens held; defaults to one second's worth
+        """
+        self.rate = float(rate)
+        if capacity is None:
+            capacity = max(1, rate)
+        self.capacity = float(capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+        return
+
+    @classmethod
+    def get(cls, name, rate, capacity=None):
+        """
+        :param name: of the service, such as 'eutils'
+        :param rate: used when the bucket is first made
+        :param capacity: used when the bucket is first made
+        :return: the TokenBucket shared by the whole process
+        """
+        with cls.shared_lock:
+            if name not in cls.shared:
+                cls.shared[name] = TokenBucket(rate, capacity)
+
+        return cls.shared[name]
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens, sleeping until the bucket has them
+        :param tokens: number to take
+        :return: seconds waited
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # take them now, going into debt for those not there yet
+            self.tokens -= tokens
+            wait = max(0.0, -self.tokens / self.rate)
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
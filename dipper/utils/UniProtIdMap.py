@@ -0,0 +1,113 @@
+import gzip
+import logging
+import itertools
+from dipper.utils.FileIndex import FileIndex
+
+logger = logging.getLogger(__name__)
+
+
+class UniProtIdMap(FileIndex):
+    """
+    The genes of UniProtKB accessions, from UniProt's idmapping_selected
+    file, indexed on disk (see FileIndex) so the multi-GB file is read
+    once, not on every run (nor for every selection of taxa).
+
+    The index is a sqlite file next to the idmapping file, of
+        accession, taxon, genes
+    where genes are the ';' separated NCBIGene curies of the accession,
+    or failing those its ENSEMBL curies. Accessions with neither are
+    left out.
+
+    Lookups are of the accessions of the given taxa only, one at a time
+    with get(), as a dict would be used, or many at once with get_many().
+
+    """
+
+    batch_size = 100000
+    # columns of idmapping_selected.tab
+    columns = {'ac': 0, 'geneid': 2, 'taxon': 12, 'ensembl': 18}
+
+    def __init__(self, idmap_file, tax_ids=None, index_file=None):
+        """
+        :param idmap_file: idmapping_selected.tab.gz
+        :param tax_ids: of the accessions to look up; all if None
+        :param index_file: of the sqlite index;
+            idmap_file with a .db suffix by default
+        """
+        super().__init__(idmap_file, index_file)
+        self.tax_ids = None
+        if tax_ids is not None:
+            self.tax_ids = sorted({int(t) for t in tax_ids})
+
+        query = "SELECT ac, genes FROM idmap WHERE ac IN ({})"
+        if self.tax_ids is not None:
+            query += " AND taxon IN ({})".format(
+                ','.join(str(t) for t in self.tax_ids))
+        self.query = query
+
+        return
+
+    def _rows(self):
+        """
+        :return: generator of (accession, taxon, genes) of the idmapping file
+        """
+        (ac, geneid, taxon, ensembl) = (
+            self.columns['ac'], self.columns['geneid'],
+            self.columns['taxon'], self.columns['ensembl'])
+        with gzip.open(self.raw_file, 'rb') as idmap:
+            for line in idmap:
+                row = line.rstrip(b'\r\n').split(b'\t')
+                if row[geneid].strip() != b'':
+                    (prefix, ids) = ('NCBIGene:', row[geneid])
+                elif row[ensembl].strip() != b'':
+                    (prefix, ids) = ('ENSEMBL:', row[ensembl])
+                else:
+                    continue
+                genes = ';'.join(
+                    prefix + i.strip() for i in ids.decode().split(';'))
+                yield (row[ac].strip().decode(), int(row[taxon]), genes)
+
+    def _load(self, connection):
+        logger.info("Indexing Uniprot ids to Entrez/ENSEMBL gene ids")
+        connection.execute(
+            "CREATE TABLE idmap (ac TEXT, taxon INTEGER, genes TEXT)")
+        rows = self._rows()
+        count = 0
+        for batch in iter(
+                lambda: list(itertools.islice(rows, self.batch_size)), []):
+            connection.executemany(
+                "INSERT INTO idmap VALUES (?, ?, ?)", batch)
+            count += len(batch)
+        # indexed once loaded, rather than row by row
+        connection.execute("CREATE INDEX idmap_ac ON idmap (ac)")
+
+        return count
+
+    def get(self, ac, default=None):
+        """
+        :param ac: UniProtKB accession
+        :return: list of gene curies, or default if the accession
+            is not mapped (in the taxa)
+        """
+        row = self.connection.execute(
+            self.query.format('?'), (ac,)).fetchone()
+        if row is None:
+            return default
+
+        return row[1].split(';')
+
+    def get_many(self, acs):
+        """
+        :param acs: iterable of UniProtKB accessions
+        :return: dict of accession: list of gene curies, for those mapped
+        """
+        acs = list(acs)
+        id_map = {}
+        # stay under sqlite's limit on the number of query variables
+        for start in range(0, len(acs), 500):
+            chunk = acs[start:start + 500]
+            for (ac, genes) in self.connection.execute(
+                    self.query.format(','.join('?' * len(chunk))), chunk):
+                id_map[ac] = genes.split(';')
+
+        return id_map
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import io
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.models.assoc.Association import Assoc
+from dipper.models.assoc.AssociationBatch import AssociationBatch
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class AssociationBatchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            ('NCBIGene:1', 'RO:0002434', 'NCBIGene:2', ['ECO:0000068'],
+             ['PMID:123', 'http://example.org/paper'], None, ['2017-01-01'],
+             ' a description ', 0.5),
+            ('NCBIGene:3', 'RO:HOM0000017', 'NCBIGene:4', ['ECO:0000080', ''],
+             None, ['MONARCH:b1234'], None, None, None)]
+
+    def _assoc_graph(self):
+        graph = RDFGraph(True)
+        for (sub, rel, obj, evidence, source, provenance, date,
+             description, score) in self.rows:
+            assoc = Assoc(graph, 'test', sub, obj, rel)
+            for e in evidence or []:
+                assoc.add_evidence(e)
+            for s in source or []:
+                assoc.add_source(s)
+            for p in provenance or []:
+                assoc.add_provenance(p)
+            for d in date or []:
+                assoc.add_date(d)
+            if description is not None:
+                assoc.set_description(description)
+            if score is not None:
+                assoc.set_score(score)
+            assoc.add_association_to_graph()
+        return graph
+
+    def test_same_triples_as_assoc(self):
+        graph = RDFGraph(True)
+        with AssociationBatch(graph, 'test', batch_size=1) as batch:
+            assoc_ids = batch.add_many(self.rows)
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(
+            assoc_ids[0],
+            Assoc.make_association_id(
+                'test', 'NCBIGene:1', 'RO:0002434', 'NCBIGene:2'))
+        self.assertEqual(set(graph), set(self._assoc_graph()))
+
+    def test_columns(self):
+        graph = RDFGraph(True)
+        batch = AssociationBatch(graph, 'test')
+        batch.add_columns(
+            ['NCBIGene:1', 'NCBIGene:3'], 'RO:0002434',
+            ['NCBIGene:2', 'NCBIGene:4'],
+            evidence=[['ECO:0000068'], ['ECO:0000080']])
+        # nothing is added until the batch is flushed
+        self.assertEqual(len(graph), 0)
+        batch.flush()
+        self.assertEqual(len(graph), 12)
+
+    def test_streamed_add_triples(self):
+        triples = [
+            ('NCBIGene:1', 'rdf:type', 'owl:Class', False, None),
+            ('NCBIGene:1', 'rdfs:label', 'one "1"', True, None),
+            ('MONARCH:b1', 'IAO:0000004', 0.5, True, 'xsd:float')]
+        one_by_one = io.StringIO()
+        graph = StreamedGraph(True, one_by_one)
+        for triple in triples:
+            graph.addTriple(*triple)
+        batched = io.StringIO()
+        StreamedGraph(True, batched).addTriples(triples)
+        self.assertEqual(one_by_one.getvalue(), batched.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
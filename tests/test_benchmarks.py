@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import os
+import shutil
+import tempfile
+import hashlib
+from benchmarks import generators
+from benchmarks.run_benchmarks import compare
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rawdir = tempfile.mkdtemp()
+        self.baseline = {
+            'size': 100,
+            'cases': {
+                'panther': {
+                    'rows_per_sec': 1000.0, 'triples_per_sec': 8000.0,
+                    'peak_rss_mb': 100.0, 'output_bytes': 50000}}}
+
+    def tearDown(self):
+        shutil.rmtree(self.rawdir)
+
+    def _digest(self, path):
+        with open(path, 'rb') as f:
+            return hashlib.md5(f.read()).hexdigest()
+
+    def test_generators_are_deterministic(self):
+        generators.panther_files(self.rawdir, 50, seed=7)
+        generators.ncbigene_files(self.rawdir, 50, seed=7)
+        files = sorted(os.listdir(self.rawdir))
+        first = [self._digest(os.path.join(self.rawdir, f)) for f in files]
+        generators.panther_files(self.rawdir, 50, seed=7)
+        generators.ncbigene_files(self.rawdir, 50, seed=7)
+        second = [self._digest(os.path.join(self.rawdir, f)) for f in files]
+        self.assertEqual(first, second)
+
+    def test_compare(self):
+        results = {
+            'size': 100,
+            'cases': {
+                'panther': {
+                    'rows_per_sec': 950.0, 'triples_per_sec': 6000.0,
+                    'peak_rss_mb': 150.0, 'output_bytes': 50000}}}
+        regressions = compare(results, self.baseline, tolerance=0.1)
+        self.assertEqual(
+            [(r[0], r[1]) for r in regressions],
+            [('panther', 'triples_per_sec'), ('panther', 'peak_rss_mb')])
+        self.assertEqual(compare(self.baseline, self.baseline), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import unittest
+import logging
+import multiprocessing
+from dipper.sources.Source import Source
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class CheckpointSource(Source):
+    """
+    A minimal source with a lookup table and two stages
+    """
+    checkpoint_attrs = ['idhash']
+
+    def __init__(self):
+        super().__init__('rdf_graph', True, 'checkpoint_test')
+        self.idhash = {}
+        self.set_checkpointing(True)
+        self.checkpoint_interval = 0
+
+    def first(self):
+        self.idhash['1'] = 'MGI:1'
+        self.graph.addTriple('MGI:1', 'rdf:type', 'owl:Class')
+
+    def second(self):
+        raise KeyboardInterrupt
+
+
+class StreamedSource(Source):
+    """
+    A source streaming its triples, killed in its second stage
+    after writing part of it
+    """
+
+    def __init__(self, graph_type='streamed_graph', killed=False):
+        super().__init__(graph_type, True, 'checkpoint_stream_test')
+        self.set_checkpointing(True)
+        self.checkpoint_interval = 0
+        self.killed = killed
+
+    def first(self):
+        for num in range(3):
+            self.graph.addTriple(
+                'MGI:' + str(num), 'rdf:type', 'owl:Class')
+
+    def second(self):
+        for num in range(3, 6):
+            self.graph.addTriple(
+                'MGI:' + str(num), 'rdf:type', 'owl:Class')
+            if self.killed:
+                self.graph.file_handle.flush()
+                os._exit(1)
+
+    def parse(self):
+        self.run_stage('first', self.first)
+        self.run_stage('second', self.second)
+        self.graph.file_handle.close()
+        self.clear_checkpoint()
+
+
+def _killed_parse():
+    source = StreamedSource(killed=True)
+    source.setresume(False)
+    source.parse()
+
+
+class CheckpointTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source = CheckpointSource()
+        self.source.clear_checkpoint()
+        # the raw directories made for the sources, to remove
+        self.rawdirs = [self.source.rawdir]
+
+    def tearDown(self):
+        self.source.clear_checkpoint()
+        self.source = None
+        for rawdir in self.rawdirs:
+            shutil.rmtree(rawdir, ignore_errors=True)
+
+    def test_resume(self):
+        self.source.run_stage('first', self.source.first)
+        self.source.checkpoint('second', 42)
+        with self.assertRaises(KeyboardInterrupt):
+            self.source.run_stage('second', self.source.second)
+
+        resumed = CheckpointSource()
+        resumed.setresume(True)
+        self.assertEqual(resumed.idhash, {'1': 'MGI:1'})
+        self.assertTrue(resumed.checkpoint_done('first'))
+        self.assertFalse(resumed.checkpoint_done('second'))
+        self.assertEqual(resumed.checkpoint_position('second'), 42)
+        self.assertIn(
+            (resumed.graph._getNode('MGI:1'),
+             resumed.graph._getNode('rdf:type'),
+             resumed.graph._getNode('owl:Class')), resumed.graph)
+
+    def test_resume_streamed(self):
+        source = StreamedSource()
+        self.rawdirs.append(source.rawdir)
+        source.parse()
+        with open(source.outfile) as fh:
+            expected = fh.read()
+
+        process = multiprocessing.get_context('fork').Process(
+            target=_killed_parse)
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 1)
+
+        resumed = StreamedSource()
+        resumed.setresume(True)
+        self.assertTrue(resumed.checkpoint_done('first'))
+        resumed.parse()
+        with open(resumed.outfile) as fh:
+            self.assertEqual(fh.read(), expected)
+
+        # started over without resume
+        restarted = StreamedSource()
+        restarted.parse()
+        with open(restarted.outfile) as fh:
+            self.assertEqual(fh.read(), expected)
+        os.remove(restarted.outfile)
+        os.remove(restarted.testfile.replace('.ttl', '.nt'))
+
+    def test_resume_spilled(self):
+        self.source.graph.set_memory_budget(0)
+        self.source.graph.budget_check_interval = 1
+        self.source.run_stage('first', self.source.first)
+        self.source.graph.addTriple('MGI:2', 'rdf:type', 'owl:Class')
+        self.source.checkpoint('second', 42)
+        self.assertTrue(self.source.graph.has_spilled())
+
+        resumed = CheckpointSource()
+        resumed.graph.set_memory_budget(0)
+        resumed.graph.budget_check_interval = 1
+        declared = len(resumed.graph)
+        resumed.setresume(True)
+        # at most the first triple read back, the rest spilled again
+        self.assertLessEqual(len(resumed.graph), declared + 1)
+        self.assertTrue(resumed.graph.has_spilled())
+        resumed.graph.load_spilled()
+        self.assertEqual(len(resumed.graph), declared + 2)
+
+    def test_off_by_default(self):
+        source = Source('rdf_graph', True, 'checkpoint_test')
+        source.checkpoint_interval = 0
+        source.checkpoint('first')
+        # recorded, but not saved
+        self.assertTrue(source.checkpoint_done('first'))
+        self.assertFalse(os.path.exists(source.checkpoint_dir))
+
+    def test_no_checkpoint(self):
+        resumed = CheckpointSource()
+        resumed.setresume(True)
+        self.assertIsNone(resumed.checkpoint_state)
+        self.assertEqual(resumed.idhash, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import logging
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from benchmarks import generators
+from dipper.sources.ClinVarXML import ClinVarXML, convert_clinvarset
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# a ClinVarSet without a disease
+UNDER_SPECIFIED = (
+    '<ClinVarSet ID="9"><RecordStatus>current</RecordStatus>'
+    '<ReferenceClinVarAssertion ID="9">'
+    '<ClinVarAccession Acc="RCV000000009" Version="1" Type="RCV"/>'
+    '<RecordStatus>current</RecordStatus>'
+    '<MeasureSet Type="Variant" ID="10009">'
+    '<Measure Type="Deletion" ID="10009">'
+    '<Name><ElementValue Type="Preferred">NM_000009.1:c.9del'
+    '</ElementValue></Name></Measure></MeasureSet>'
+    '</ReferenceClinVarAssertion></ClinVarSet>')
+
+
+class ClinVarXMLTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.source = ClinVarXML('rdf_graph', True)
+        self.source.rawdir = self.tmpdir
+        self.source.outdir = self.tmpdir
+        self.release = os.path.join(
+            self.tmpdir, ClinVarXML.files['f1']['file'])
+        generators.clinvar_xml(self.release, 30, 5)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        self.source = None
+
+    def _parse(self, processes):
+        self.source.set_processes(processes)
+        self.source.outfile = os.path.join(
+            self.tmpdir, 'clinvarxml_alpha_{}.nt'.format(processes))
+        self.source.parse()
+        self.source.write('nt')
+        with open(self.source.outfile) as nt:
+            return nt.readlines()
+
+    def test_parse(self):
+        triples = self._parse(1)
+        self.assertEqual(triples, sorted(set(triples)))
+        self.assertIn(
+            '<https://data.monarchinitiative.org/ttl/clinvarxml_alpha_1.nt> '
+            '<http://www.w3.org/2002/07/owl#versionInfo> "2017-04-01" .\n',
+            triples)
+        self.assertTrue(any(
+            '<http://purl.org/oban/association_has_subject> '
+            '<http://www.ncbi.nlm.nih.gov/clinvar/variation/'
+            in triple for triple in triples))
+
+        # the same triples from a pool of workers
+        parallel = self._parse(2)
+        self.assertEqual(
+            [t.replace('_2.nt', '_1.nt') for t in parallel], triples)
+
+    def test_test_mode(self):
+        with open(os.path.join(self.tmpdir, ClinVarXML.test_file), 'w') as f:
+            # by RCV, and by SCV
+            f.write('RCV000000003\nSCV000000070  # of RCV000000007\n')
+        self.source.settestonly(True)
+        self.source.outfile = os.path.join(self.tmpdir, 'clinvarxml_alpha.nt')
+        self.source.testfile = os.path.join(
+            self.tmpdir, 'clinvarxml_alpha_test.ttl')
+        self.source.parse()
+        self.source.write('nt')
+        with open(os.path.join(
+                self.tmpdir, 'clinvarxml_alpha_test.nt')) as nt:
+            triples = nt.read()
+        self.assertIn('RCV000000003', triples)
+        self.assertIn('RCV000000007', triples)
+        self.assertNotIn('RCV000000004', triples)
+        self.assertFalse(os.path.exists(self.source.outfile))
+
+    def test_read_stanzas(self):
+        # stanzas split over many blocks
+        self.source.block_size = 64
+        self.source.batch_size = 7
+        batches = list(self.source._read_stanzas(self.release))
+        self.assertEqual([len(b) for b in batches], [7, 7, 7, 7, 2])
+        self.assertEqual(self.source.release['Dated'], '2017-04-01')
+        ids = [ET.fromstring(s).get('ID') for b in batches for s in b]
+        self.assertEqual(ids, [str(i) for i in range(1, 31)])
+
+        batches = list(self.source._read_stanzas(self.release, 10))
+        self.assertEqual(sum(len(b) for b in batches), 10)
+
+    def test_rejected(self):
+        with gzip.open(self.release, 'wt') as xml:
+            xml.write(
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<ReleaseSet Dated="2017-04-01" Type="full">\n' +
+                UNDER_SPECIFIED + '\n</ReleaseSet>\n')
+        self.assertEqual(
+            convert_clinvarset(ET.fromstring(UNDER_SPECIFIED))[0], [])
+        self._parse(1)
+        with open(os.path.join(
+                self.tmpdir,
+                'ClinVarFullRelease_00-latest_REJECT.xml')) as reject:
+            self.assertIn('RCV000000009', reject.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import io
+from dipper.graph.DeclaredCache import DeclaredCache
+from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.models.Model import Model
+from dipper.models.Genotype import Genotype
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class DeclaredCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.graph = StreamedGraph(True, self.stream)
+
+    def tearDown(self):
+        self.graph = None
+
+    def test_repeats_are_emitted_once(self):
+        self.graph.declared_cache = DeclaredCache(16)
+        model = Model(self.graph)
+        geno = Genotype(self.graph)
+        for i in range(3):
+            model.addClassToGraph('NCBIGene:1', None)
+            model.addType('NCBIGene:1', 'SO:0000704')
+            geno.addTaxon('NCBITaxon:9606', 'NCBIGene:1')
+        # a different declaration of the same class is still made
+        model.addClassToGraph('NCBIGene:1', 'gene one')
+
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 5)
+        self.assertEqual(
+            self.graph.declared_cache.suppressed,
+            {'addClassToGraph': 2, 'addType': 2, 'addTaxon': 2})
+
+    def test_no_cache(self):
+        model = Model(self.graph)
+        for i in range(3):
+            model.addType('NCBIGene:1', 'SO:0000704')
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 3)
+
+    def test_bounded(self):
+        cache = DeclaredCache(2)
+        self.assertFalse(cache.seen('addType', 'a'))
+        self.assertFalse(cache.seen('addType', 'b'))
+        self.assertTrue(cache.seen('addType', 'a'))
+        # 'b' is now the least recently seen, and is forgotten
+        self.assertFalse(cache.seen('addType', 'c'))
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(cache.seen('addType', 'b'))
+        self.assertTrue(cache.seen('addType', 'c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import io
+from rdflib import RDF, OWL
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.models.GenomicFeature import Feature
+from dipper.models.FaldoEmitter import FaldoEmitter
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class FaldoEmitterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # (feature, reference, begin, end, strand)
+        self.features = [
+            ('ZFIN:1', 'MONARCH:danRer10chr1', 100, 200, '+'),
+            ('ZFIN:2', 'MONARCH:danRer10chr1', 100, 300, '+'),
+            ('ZFIN:3', 'MONARCH:danRer10chr1', 150, 200, '-'),
+            ('ZFIN:4', 'MONARCH:danRer10chr2', None, 200, '.'),
+            ('ZFIN:5', '_:b1', 5, 5, None),
+            ('ZFIN:1', 'MONARCH:danRer10chr1', 100, 200, '+')]
+
+    def _feature_graph(self, graph, add_region=True):
+        for (feature_id, reference, begin, end, strand) in self.features:
+            feature = Feature(graph, feature_id, None, None)
+            feature.addFeatureStartLocation(begin, reference, strand)
+            feature.addFeatureEndLocation(end, reference, strand)
+            feature.addFeatureToGraph(add_region)
+        return graph
+
+    def test_same_triples_as_feature(self):
+        for add_region in (True, False):
+            graph = RDFGraph(True)
+            FaldoEmitter(graph).add_locations(
+                *zip(*self.features), add_region=add_region)
+            expected = set(
+                triple for triple in self._feature_graph(
+                    RDFGraph(True), add_region)
+                if triple[1:] != (RDF.type, OWL.NamedIndividual))
+            self.assertEqual(set(graph), expected)
+
+    def test_positions_emitted_once(self):
+        stream = io.StringIO()
+        faldo = FaldoEmitter(StreamedGraph(True, stream))
+        region_ids = faldo.add_locations(*zip(*self.features))
+        self.assertEqual(region_ids[0], '_:danRer10chr1-100-200-plus-Region')
+        self.assertEqual(region_ids[0], region_ids[-1])
+        self.assertEqual(
+            faldo.add_location('ZFIN:6', 'MONARCH:danRer10chr1', 100, 300,
+                               '+'),
+            region_ids[1])
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), len(set(lines)))
+        feature_stream = io.StringIO()
+        self._feature_graph(StreamedGraph(True, feature_stream))
+        self.assertLess(
+            len(lines), len(feature_stream.getvalue().splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
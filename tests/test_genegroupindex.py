@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import logging
+import tempfile
+import unittest
+from dipper.utils.GeneGroupIndex import GeneGroupIndex
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+GENE_GROUP = [
+    '#tax_id\tGeneID\trelationship\tOther_tax_id\tOther_GeneID',
+    '9606\t1\tOrtholog\t10090\t11',
+    '9606\t1\tOrtholog\t7955\t12',
+    '9606\t1\tPotential readthrough\t9606\t13',
+    '9606\t2\tOrtholog\t10090\t11',
+    '9606\t3\tOrtholog\t10116\t31']
+
+
+class GeneGroupIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.gene_group = os.path.join(self.tmpdir, 'gene_group.gz')
+        with gzip.open(self.gene_group, 'wt') as gene_group:
+            gene_group.write('\n'.join(GENE_GROUP) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_orthologs(self):
+        index = GeneGroupIndex(self.gene_group)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.tmpdir, 'gene_group.db')))
+        self.assertEqual(index.get_orthologs(['11', 12, 13, 1, 31]), {
+            # in the groups of genes 1 and 2
+            11: [(1, 9606), (11, 10090), (12, 7955),
+                 (2, 9606), (11, 10090)],
+            12: [(1, 9606), (11, 10090), (12, 7955)],
+            31: [(3, 9606), (31, 10116)]})
+        index.close()
+
+    def test_shared(self):
+        index = GeneGroupIndex.get(self.gene_group)
+        self.assertIs(GeneGroupIndex.get(self.gene_group), index)
+        del GeneGroupIndex.shared[os.path.abspath(self.gene_group)]
+        index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
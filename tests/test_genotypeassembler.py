@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.models.Model import Model
+from dipper.models.Genotype import Genotype
+from dipper.models.GenotypeAssembler import GenotypeAssembler
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class GenotypeAssemblerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # (genotype, vslc, label, allele1, allele2, zygosity)
+        self.allele_pairs = [
+            ('MGI:1', '_:vslc2', 'b<1>/b<1>', 'MGI:21', 'MGI:21',
+             Genotype.zygosity['homozygous']),
+            ('MGI:2', '_:vslc3', 'c<1>/+', 'MGI:31', None,
+             Genotype.zygosity['heterozygous']),
+            ('MGI:1', '_:vslc1', 'a<1>/0', 'MGI:11', None,
+             Genotype.zygosity['hemizygous'])]
+        self.labels = {'MGI:100': 'C57BL/6J'}
+
+    def test_genotypes(self):
+        graph = RDFGraph(True)
+        assembler = GenotypeAssembler(graph, self.labels)
+        for row in self.allele_pairs:
+            assembler.add_allele_pair(*row)
+        assembler.set_background('MGI:1', 'MGI:100')
+        self.assertEqual(sorted(assembler.genotypes()), ['MGI:1', 'MGI:2'])
+        self.assertEqual(assembler.assemble(), 2)
+        self.assertEqual(assembler.genotypes(), [])
+
+        self.assertEqual(self.labels['_:vslc1-vslc2'], 'a<1>/0; b<1>/b<1>')
+        self.assertEqual(
+            self.labels['MGI:1'], 'a<1>/0; b<1>/b<1> [C57BL/6J]')
+        self.assertEqual(self.labels['MGI:2'], 'c<1>/+ [n.s.]')
+
+        # the same graph the parts would make added one by one
+        expected = RDFGraph(True)
+        model = Model(expected)
+        geno = Genotype(expected)
+        alt = geno.object_properties['has_alternate_part']
+        for (gt, vslc, label, allele1, allele2, zygosity) in \
+                self.allele_pairs:
+            model.addIndividualToGraph(
+                vslc, label, geno.genoparts['variant_single_locus_complement'])
+            geno.addPartsToVSLC(vslc, allele1, allele2, zygosity, alt, alt)
+        model.addIndividualToGraph(
+            '_:vslc1-vslc2', 'a<1>/0; b<1>/b<1>',
+            geno.genoparts['genomic_variation_complement'])
+        geno.addVSLCtoParent('_:vslc1', '_:vslc1-vslc2')
+        geno.addVSLCtoParent('_:vslc2', '_:vslc1-vslc2')
+        geno.addParts('_:vslc1-vslc2', 'MGI:1', alt)
+        model.addIndividualToGraph('MGI:1', 'a<1>/0; b<1>/b<1> [C57BL/6J]')
+        model.addType('_:vslc3', geno.genoparts['genomic_variation_complement'])
+        geno.addVSLCtoParent('_:vslc3', 'MGI:2')
+        model.addIndividualToGraph('MGI:2', 'c<1>/+ [n.s.]')
+        self.assertEqual(set(graph), set(expected))
+
+    def test_gvc_id_and_label_order(self):
+        graph = RDFGraph(True)
+        labels = {}
+        assembler = GenotypeAssembler(
+            graph, labels, gvc_id_subs=((r'(ZFIN)?:', ''), (r'^_*', '')),
+            sort_labels=True,
+            genotype_type=Genotype.genoparts['intrinsic_genotype'])
+        assembler.add_allele_pair(
+            'ZFIN:1', '_:1-2-WT', 'z<1>/+', 'ZFIN:2', None)
+        assembler.add_allele_pair(
+            'ZFIN:1', '_:3-4-WT', 'a<1>/+', 'ZFIN:4', None)
+        assembler.add_part('ZFIN:1', 'ZFIN:5')
+        assembler.set_background('ZFIN:1', '_:bkgd-1')
+        assembler.set_label('_:bkgd-1', 'n.s.')
+        assembler.assemble()
+
+        self.assertEqual(labels['_:1-2-WT-_3-4-WT'], 'a<1>/+; z<1>/+')
+        self.assertEqual(labels['ZFIN:1'], 'a<1>/+; z<1>/+ [n.s.]')
+        self.assertNotIn('_:bkgd-1', labels)
+        triples = set(graph)
+        for (sub, obj) in (('ZFIN:1', 'ZFIN:5'),
+                           ('ZFIN:1', '_:1-2-WT-_3-4-WT')):
+            self.assertIn(
+                (graph._getNode(sub), graph._getNode(
+                    Genotype.object_properties['has_alternate_part']),
+                 graph._getNode(obj)), triples)
+
+    def test_no_allele_pairs(self):
+        # a genotype whose loci were all wild type or unknown
+        graph = RDFGraph(True)
+        labels = {}
+        assembler = GenotypeAssembler(
+            graph, labels,
+            genotype_type=Genotype.genoparts['intrinsic_genotype'])
+        assembler.add_genotype('ZFIN:1')
+        assembler.add_genotype('ZFIN:2')
+        assembler.add_allele_pair(
+            'ZFIN:2', '_:1-2-WT', 'z<1>/+', 'ZFIN:2', None)
+        for gt in ('ZFIN:1', 'ZFIN:2'):
+            background = '_:bkgd-' + gt[5:]
+            assembler.set_background(gt, background)
+            assembler.set_label(background, 'n.s.')
+        self.assertEqual(assembler.assemble(), 2)
+
+        self.assertEqual(labels['ZFIN:1'], ' [n.s.]')
+        self.assertEqual(labels['ZFIN:2'], 'z<1>/+ [n.s.]')
+        self.assertIn(
+            (graph._getNode('ZFIN:1'), graph._getNode('rdf:type'),
+             graph._getNode(Genotype.genoparts['intrinsic_genotype'])),
+            set(graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
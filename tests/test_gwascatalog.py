@@ -4,7 +4,7 @@ import unittest
 import logging
 from tests.test_source import SourceTestCase
 from dipper.sources.GWASCatalog import GWASCatalog
-from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.OntologyIndex import OntologyIndex
 from rdflib import URIRef
 
 logging.basicConfig(level=logging.WARNING)
@@ -175,11 +175,7 @@ class TestGwasSNPModel(unittest.TestCase):
         test the _add_variant_trait_association
         :return:
         """
-        efo_ontology = RDFGraph()
-        logger.info("Loading EFO ontology in separate rdf graph")
-        efo_ontology.parse(self.source.files['efo']['url'], format='xml')
-        efo_ontology.bind_all_namespaces()
-        logger.info("Finished loading EFO ontology")
+        efo_ontology = OntologyIndex.load(self.source.files['efo']['url'])
 
         variant_curie, variant_type = \
             self.source._get_curie_and_type_from_id(self.test_data['snp_label'])
@@ -271,11 +267,7 @@ class TestGwasHaplotypeModel(unittest.TestCase):
         variant_curie, variant_type = \
             self.source._get_curie_and_type_from_id(self.test_data['snp_label'])
 
-        so_ontology = RDFGraph()
-        logger.info("Loading SO ontology in separate rdf graph")
-        so_ontology.parse(self.source.files['so']['url'], format='xml')
-        so_ontology.bind_all_namespaces()
-        logger.info("Finished loading SO ontology")
+        so_ontology = OntologyIndex.load(self.source.files['so']['url'])
 
         self.source._process_haplotype(
             variant_curie, self.test_data['snp_label'], self.test_data['chrom_num'],
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import hashlib
+from dipper.utils.IdMinter import IdMinter
+from dipper.utils.GraphUtils import GraphUtils
+from dipper.sources.Source import Source
+from dipper.models.assoc.Association import Assoc
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class IdMinterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.minter = IdMinter(cache_size=8)
+        self.words = ['MGI:1', 'MGI:2', 'some long label', 'MGI:1']
+
+    def tearDown(self):
+        self.minter = None
+
+    @staticmethod
+    def _sha1(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def test_existing_ids_unchanged(self):
+        for word in self.words:
+            self.assertEqual(Source.hash_id(word), 'b' + self._sha1(word)[0:15])
+            self.assertEqual(
+                GraphUtils.digest_id(word), 'b' + self._sha1(word)[1:20])
+        self.assertEqual(
+            Assoc.make_association_id('test', 'MGI:1', 'RO:1', None),
+            'MONARCH:' + self._sha1('test+MGI:1+RO:1+')[0:16])
+
+    def test_mint_many(self):
+        self.assertEqual(
+            self.minter.mint_many(self.words, 1, 20, 'b'),
+            [self.minter.mint(word, 1, 20, 'b') for word in self.words])
+
+    def test_audit(self):
+        self.minter.set_audit(True)
+        # keeping a single hex digit, collisions are certain
+        ids = self.minter.mint_many(
+            [str(i) for i in range(100)], 0, 1, '')
+        self.assertEqual(len(set(ids)), 16)
+        self.assertEqual(len(self.minter.report()), 100 - 16)
+        # the same input twice is not a collision
+        self.minter.mint('0', 0, 1, '')
+        self.assertEqual(len(self.minter.collisions), 100 - 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
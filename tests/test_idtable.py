@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import pickle
+import random
+import unittest
+import logging
+from dipper.utils.IdTable import IdTable
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class IdTableTestCase(unittest.TestCase):
+
+    def test_as_dict(self):
+        # the same as a dict through many inserts, updates and deletes,
+        # of integer keys and others
+        rng = random.Random(1)
+        keys = [str(rng.randrange(0, 2000)) for _ in range(3000)] + \
+            ['007', '', 'x', '-3', '99999999999999999999', 5]
+        table = IdTable()
+        expected = {}
+        for num in range(20000):
+            key = rng.choice(keys)
+            if rng.random() < 0.7:
+                table[key] = expected[key] = 'MGI:' + str(num)
+            elif key in expected:
+                del table[key]
+                del expected[key]
+            else:
+                with self.assertRaises(KeyError):
+                    del table[key]
+            self.assertEqual(table.get(key), expected.get(key))
+            self.assertEqual(key in table, key in expected)
+        self.assertEqual(len(table), len(expected))
+        self.assertEqual(dict(table.items()), expected)
+        self.assertEqual(set(table), set(expected))
+        self.assertEqual(table, expected)
+
+    def test_copy(self):
+        table = IdTable({'1': 'FlyBase:FBgn0000001', 'a': None})
+        copied = table.copy()
+        copied['2'] = 'FlyBase:FBgn0000002'
+        self.assertEqual(table, {'1': 'FlyBase:FBgn0000001', 'a': None})
+        self.assertEqual(len(copied), 3)
+        self.assertEqual(pickle.loads(pickle.dumps(copied)), copied)
+        # the int 1 is not the key '1'
+        self.assertNotIn(1, table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.models.Model import Model
+from dipper.models.Evidence import Evidence
+from dipper.models.GenomicFeature import Feature
+from dipper.models.Reference import Reference
+from dipper.models.assoc.Association import Assoc
+from dipper.models.assoc.G2PAssoc import G2PAssoc
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class ModelReuseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [('MGI:1', 'MP:1', 'ECO:0000015'),
+                     ('MGI:2', 'MP:2', None),
+                     ('MGI:1', 'MP:3', 'ECO:0000059')]
+
+    def test_reset_same_as_new(self):
+        new_graph = RDFGraph(True)
+        for (genotype_id, phenotype_id, eco_id) in self.rows:
+            assoc = G2PAssoc(new_graph, 'test', genotype_id, phenotype_id)
+            assoc.add_evidence(eco_id)
+            assoc.set_stage('UBERON:1', None)
+            assoc.add_association_to_graph()
+
+        reused_graph = RDFGraph(True)
+        assoc = G2PAssoc(reused_graph, 'test', None, None)
+        for (genotype_id, phenotype_id, eco_id) in self.rows:
+            assoc.reset(genotype_id, phenotype_id)
+            self.assertIsNone(assoc.start_stage_id)
+            self.assertEqual(assoc.evidence, [])
+            assoc.add_evidence(eco_id)
+            assoc.set_stage('UBERON:1', None)
+            assoc.add_association_to_graph()
+
+        self.assertEqual(set(new_graph), set(reused_graph))
+
+    def test_slots(self):
+        graph = RDFGraph(True)
+        for model in (Model(graph), Assoc(graph, 'test'),
+                      G2PAssoc(graph, 'test', 'MGI:1', 'MP:1'),
+                      Evidence(graph, None), Feature(graph),
+                      Reference(graph)):
+            self.assertFalse(hasattr(model, '__dict__'), type(model))
+        feature = Feature(graph, 'NCBIGene:1', 'one', 'SO:0000704')
+        feature.addTaxonToFeature('NCBITaxon:9606')
+        self.assertIsNone(feature.reset('NCBIGene:2').taxon)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
 
+import os
+import gzip
+import shutil
+import tempfile
 import unittest
 import logging
 # import os
@@ -36,5 +40,42 @@ class NCBITestCase(SourceTestCase):
     #    return
 
 
+class NCBIGeneLinesTestCase(unittest.TestCase):
+    """
+    The lines of our taxa are kept, in order, across block boundaries
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.gene_file = os.path.join(self.tmpdir, 'gene_history.gz')
+        self.rows = ['#tax_id\tGeneID\tDiscontinued_GeneID']
+        for gene_num in range(1, 301):
+            tax_num = (9606, 96060, 10090, 1090, 7955)[gene_num % 5]
+            self.rows.append('{}\t{}\t{}'.format(
+                tax_num, gene_num, gene_num + 1000))
+        with gzip.open(self.gene_file, 'wt') as gene_file:
+            gene_file.write('\n'.join(self.rows))
+        self.source = NCBIGene('rdf_graph', True, tax_ids=[9606, 7955])
+        self.source.block_size = 100
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_lines(self):
+        expected = [
+            row for row in self.rows
+            if row.split('\t')[0] in ('9606', '7955')]
+        self.assertEqual(list(self.source._get_lines(self.gene_file)), expected)
+
+        self.source.testMode = True
+        self.assertEqual(
+            list(self.source._get_lines(self.gene_file)), self.rows[1:])
+
+    def test_stop_early(self):
+        lines = self.source._get_lines(self.gene_file)
+        self.assertEqual(next(lines), self.rows[4])
+        lines.close()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from dipper.utils.OMIMClient import OMIMClient
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+MIMS = [str(mim) for mim in range(100000, 100050)]
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """
+    Serves the entries of MIMS, failing any request for 'missing'
+    """
+
+    requests = []
+    updated = {}
+
+    def log_message(self, *args):
+        return
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        mims = params['mimNumber'][0].split(',')
+        include = params.get('include', [''])[0]
+        StandIn.requests.append((len(mims), include))
+        if 'missing' in mims:
+            self.send_error(500)
+            return
+        entries = [{'entry': {
+            'mimNumber': int(mim), 'include': include,
+            'dateUpdated': StandIn.updated.get(mim, 'Mon, 01 Jan 2018')}}
+            for mim in mims]
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps(
+            {'omim': {'entryList': entries}}).encode('utf-8'))
+
+
+class OMIMClientTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StandIn)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.api = 'http://127.0.0.1:{}/api/entry?format=json&'.format(
+            cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandIn.requests = []
+        StandIn.updated = {}
+        self.tmpdir = tempfile.mkdtemp()
+        self.store = os.path.join(self.tmpdir, 'omim', 'entries.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _client(self, max_age=3600):
+        return OMIMClient(self.api, self.store, 1000, max_age=max_age)
+
+    def test_stored_once(self):
+        client = self._client()
+        client.update(MIMS + ['missing'], ['all'])
+        # three batches, the last failing, then retried one at a time
+        self.assertEqual(
+            sorted(StandIn.requests),
+            [(1, 'all')] * 11 + [(11, 'all')] + [(20, 'all')] * 2)
+        entries = list(client.entries(MIMS + ['missing'], ['all']))
+        self.assertEqual(
+            [str(e['entry']['mimNumber']) for e in entries], MIMS)
+        client.close()
+
+        # a re-parse, or one needing fewer fields, makes no requests
+        StandIn.requests = []
+        client = self._client()
+        client.update(MIMS, ['all'])
+        client.update(MIMS[:10], None)
+        self.assertEqual(len(list(client.entries(MIMS, None))), 50)
+        self.assertEqual(StandIn.requests, [])
+
+        # but needing more fields than stored does
+        client.update(['200000'], None)
+        client.update(['200000'], ['text'])
+        self.assertEqual(StandIn.requests, [(1, ''), (1, 'text')])
+
+    def test_refreshed_when_updated(self):
+        client = self._client()
+        client.update(MIMS, ['all'])
+        StandIn.requests = []
+        StandIn.updated = {MIMS[3]: 'Tue, 02 Jan 2018'}
+
+        client = self._client(max_age=-1)
+        client.update(MIMS, ['all'])
+        # the basic entries are checked, and the updated one fetched
+        self.assertEqual(
+            sorted(StandIn.requests),
+            [(1, 'all'), (10, ''), (20, ''), (20, '')])
+        entry = next(client.entries([MIMS[3]], ['all']))['entry']
+        self.assertEqual(entry['dateUpdated'], 'Tue, 02 Jan 2018')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+import logging
+import tempfile
+import shutil
+from xml.sax import SAXParseException
+from rdflib import Graph, RDFS, OWL, RDF, URIRef, BNode, Literal
+from dipper.utils.OntologyIndex import OntologyIndex
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+SO = 'http://purl.obolibrary.org/obo/SO_'
+
+
+class OntologyIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # 5 -> 4 -> 2 -> 1, 3 -> 1, and a cycle 6 <-> 7 -> 1
+        self.graph = Graph()
+        for (sub, obj) in (('5', '4'), ('4', '2'), ('2', '1'), ('3', '1'),
+                           ('6', '7'), ('7', '6'), ('7', '1')):
+            self.graph.add(
+                (URIRef(SO + sub), RDFS.subClassOf, URIRef(SO + obj)))
+        for num in ('1', '2', '3', '4', '6', '7'):
+            self.graph.add(
+                (URIRef(SO + num), RDFS.label, Literal('term ' + num)))
+        restriction = BNode()
+        self.graph.add((restriction, RDF.type, OWL.Restriction))
+        self.graph.add((URIRef(SO + '3'), RDFS.subClassOf, restriction))
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.owl = os.path.join(self.tmpdir, 'so.owl')
+        self.graph.serialize(self.owl, format='xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_same_as_sparql(self):
+        ontology = OntologyIndex.load(self.owl)
+        for sub in ('1', '2', '3', '4', '5', '6', '7', '8'):
+            for obj in ('1', '2', '4', '6'):
+                query = """
+                    SELECT ?label
+                    WHERE {{
+                        <{0}> rdfs:subClassOf+ <{1}> ;
+                            rdfs:label ?label .
+                    }}
+                """.format(SO + sub, SO + obj)
+                expected = [str(row[0]) for row in self.graph.query(query)]
+                found = ontology.is_descendant(SO + sub, 'SO:' + obj) and \
+                    ontology.label('SO:' + sub) is not None
+                self.assertEqual(found, len(expected) > 0, (sub, obj))
+                if found:
+                    self.assertEqual(ontology.label(SO + sub), expected[0])
+
+    def test_written_once(self):
+        index_file = self.owl + '.idx.gz'
+        ontology = OntologyIndex.load(self.owl, index_file)
+        self.assertTrue(os.path.exists(index_file))
+
+        # the index is read back, and the ontology not parsed again
+        with open(self.owl, 'w') as f:
+            f.write('not rdf')
+        os.utime(self.owl, (0, 0))
+        read = OntologyIndex.load(self.owl, index_file)
+        self.assertEqual(read.terms, ontology.terms)
+        self.assertEqual(read.labels, ontology.labels)
+        self.assertEqual(read.ancestors, ontology.ancestors)
+        self.assertTrue(read.is_descendant('SO:5', 'SO:1'))
+        self.assertFalse(read.is_descendant('SO:1', 'SO:5'))
+
+    def test_not_kept_for_url(self):
+        index_file = self.owl + '.idx.gz'
+        OntologyIndex.load(self.owl, index_file)
+        # an index kept for the file is not used for the ontology's url
+        url = 'file://' + self.owl
+        with open(self.owl, 'w') as f:
+            f.write('not rdf')
+        with self.assertRaises(SAXParseException):
+            OntologyIndex.load(url, index_file)
+        os.remove(index_file)
+        self.graph.serialize(self.owl, format='xml')
+        ontology = OntologyIndex.load(url, index_file)
+        self.assertTrue(ontology.is_descendant('SO:5', 'SO:1'))
+        self.assertFalse(os.path.exists(index_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
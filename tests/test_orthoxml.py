@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import logging
+import tempfile
+import unittest
+from dipper.sources.OrthoXML import OrthoXMLParser
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+ORTHOXML = """<?xml version="1.0" encoding="utf-8"?>
+<orthoXML xmlns="http://orthoXML.org/2011/" origin="OMA" version="0.3">
+  <species name="Homo sapiens" NCBITaxId="9606">
+    <database name="test" version="1"><genes>
+      <gene id="1" protId="P11111"/><gene id="2" protId="P22222"/>
+    </genes></database>
+  </species>
+  <species name="Mus musculus" NCBITaxId="10090">
+    <database name="test" version="1"><genes>
+      <gene id="3" protId="Q33333"/>
+    </genes></database>
+  </species>
+  <species name="Danio rerio" NCBITaxId="7955">
+    <database name="test" version="1"><genes>
+      <gene id="4" protId="Q44444"/>
+    </genes></database>
+  </species>
+  <groups>
+    <orthologGroup id="1">
+      <paralogGroup><geneRef id="1"/><geneRef id="2"/></paralogGroup>
+      <geneRef id="3"/>
+      <geneRef id="4"/>
+    </orthologGroup>
+    <orthologGroup id="2"><geneRef id="3"/><geneRef id="4"/></orthologGroup>
+  </groups>
+</orthoXML>
+"""
+
+
+class OrthoXMLParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.xml = os.path.join(self.tmpdir, 'hogs.orthoxml.gz')
+        with gzip.open(self.xml, 'wt') as f:
+            f.write(ORTHOXML)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @staticmethod
+    def _relations(parser, keep=None):
+        return sorted(
+            tuple(sorted((a, b))) + (rel,)
+            for (a, b, rel) in parser.extract_pairwise_relations(keep))
+
+    def test_pairwise_relations(self):
+        parser = OrthoXMLParser(self.xml)
+        self.assertEqual(self._relations(parser), [
+            ('1', '2', 'paralogGroup'),
+            ('1', '3', 'orthologGroup'), ('1', '4', 'orthologGroup'),
+            ('2', '3', 'orthologGroup'), ('2', '4', 'orthologGroup'),
+            ('3', '4', 'orthologGroup'), ('3', '4', 'orthologGroup')])
+        self.assertEqual(parser.gene_mapping['3'], ('Q33333', None))
+
+    def test_taxa_not_expanded(self):
+        def gene_info(gene):
+            species = gene.getparent().getparent().getparent()
+            return (gene.get('protId'), species.get('NCBITaxId'))
+
+        parser = OrthoXMLParser(self.xml, gene_info)
+        expanded = []
+
+        def keep(gene_id):
+            expanded.append(gene_id)
+            return parser.gene_mapping[gene_id][1] != '7955'
+
+        self.assertEqual(self._relations(parser, keep), [
+            ('1', '2', 'paralogGroup'),
+            ('1', '3', 'orthologGroup'), ('2', '3', 'orthologGroup')])
+        self.assertEqual(sorted(expanded), ['1', '2', '3', '3', '4', '4'])
+        self.assertEqual(parser.gene_mapping['4'], ('Q44444', '7955'))
+
+    def test_not_orthoxml(self):
+        with open(self.xml, 'w') as f:
+            f.write('<html><species/></html>')
+        with self.assertRaises(ValueError):
+            list(OrthoXMLParser(self.xml).extract_pairwise_relations())
+
+
+if __name__ == '__main__':
+    unittest.main()
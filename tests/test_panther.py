@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
 
+import io
+import os
+import shutil
+import tarfile
+import tempfile
 import unittest
 import logging
 from tests.test_source import SourceTestCase
@@ -31,5 +36,51 @@ class PantherTestCase(SourceTestCase):
     #    return
 
 
+class PantherParallelTestCase(unittest.TestCase):
+
+    rows = [
+        'HUMAN|HGNC=11477|UniProtKB=Q6GZX4\t'
+        'MOUSE|MGI=MGI=2176230|UniProtKB=Q8VBT6\tLDO\tEuarchontoglires'
+        '\tPTHR15964',
+        'RAT|RGD=1305887|UniProtKB=Q5XI21\t'
+        'MOUSE|MGI=MGI=1915720|UniProtKB=Q9D1R1\tO\tEuarchontoglires'
+        '\tPTHR10000',
+        'RAT|RGD=1305888|UniProtKB=Q5XI22\t'
+        'DANRE|ZFIN=ZDB-GENE-030131-1|UniProtKB=Q6P0B1\tO\tEuteleostomi'
+        '\tPTHR10001',
+        'RAT|Gene=Huwe1|UniProtKB=Q5XI23\t'
+        'HUMAN|HGNC=11478|UniProtKB=Q6GZX5\tP\tEuarchontoglires'
+        '\tPTHR10002']
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        for (key, rows) in (('refgenome', self.rows), ('hcop', self.rows[:2])):
+            data = ('#comment\n' + '\n'.join(rows) + '\n').encode()
+            info = tarfile.TarInfo(key)
+            info.size = len(data)
+            with tarfile.open(os.path.join(
+                    self.tmpdir, Panther.files[key]['file']), 'w:gz') as tar:
+                tar.addfile(info, io.BytesIO(data))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _parse(self, processes, tax_ids):
+        source = Panther('rdf_graph', True, tax_ids)
+        source.rawdir = self.tmpdir
+        source.set_processes(processes)
+        source.batch_size = 1
+        source.parse()
+        return set(source.graph)
+
+    def test_same_as_sequential(self):
+        for tax_ids in (None, [9606, 10090]):
+            graph = self._parse(2, tax_ids)
+            self.assertEqual(graph, self._parse(1, tax_ids))
+            self.assertGreater(len(graph), 0)
+        # the zebrafish pair is dropped by the taxon filter
+        self.assertNotEqual(graph, self._parse(2, None))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+from concurrent.futures import as_completed
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from dipper.utils.Resolver import Resolver
+from dipper.utils.ResolverCache import ResolverCache
+from dipper.utils.TokenBucket import TokenBucket
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# stands in for monarch solr and NCBI eutils
+GENES = {'BRCA1': 'NCBIGene:672', 'TP53': 'NCBIGene:7157'}
+ALIASES = {'P53': {'id': 'NCBIGene:7157', 'label': ['TP53']}}
+# the top hit for a symbol need not be labelled with it
+RANKED = {'ACE': [
+    {'id': 'NCBIGene:59272', 'label': ['ACE2']},
+    {'id': 'NCBIGene:1636', 'label': ['ACE']}]}
+TAXA = {'7227': 'Drosophila melanogaster', '7215': 'Drosophila'}
+GROUPS = {'5276': [672, 12189], '460': [7157, 22059]}
+
+
+class StandIn(BaseHTTPRequestHandler):
+
+    requests = []
+
+    def log_message(self, *args):
+        return
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        StandIn.requests.append(url.path)
+        if url.path == '/solr':
+            body = self._solr(params['q'][0])
+        elif url.path.endswith('esearch.fcgi'):
+            body = self._esearch(params['db'][0], params['term'][0])
+        else:
+            body = self._esummary(params['db'][0], params['id'][0].split(','))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode('utf-8'))
+
+    @staticmethod
+    def _solr(query):
+        docs = []
+        for symbol in re.findall(r'"([^"]+)"', query):
+            if symbol in GENES:
+                docs.append({'id': GENES[symbol], 'label': [symbol]})
+            elif symbol in ALIASES:
+                docs.append(ALIASES[symbol])
+            elif symbol in RANKED:
+                docs.extend(RANKED[symbol])
+        return {'response': {'numFound': len(docs), 'docs': docs}}
+
+    @staticmethod
+    def _esearch(db, term):
+        if db == 'taxonomy':
+            names = re.findall(r'"([^"]+)"', term) or [term]
+            ids = [uid for (uid, name) in TAXA.items()
+                   if any(name.startswith(n) for n in names)]
+        else:
+            genes = [int(gene) for gene in re.findall(r'(\d+)\[Gene ID\]', term)]
+            ids = [hid for (hid, members) in GROUPS.items()
+                   if set(members) & set(genes)]
+        return {'esearchresult': {'count': str(len(ids)), 'idlist': ids}}
+
+    @staticmethod
+    def _esummary(db, ids):
+        result = {'uids': ids}
+        for uid in ids:
+            if db == 'taxonomy':
+                result[uid] = {'scientificname': TAXA[uid]}
+            else:
+                result[uid] = {'genetable': [
+                    {'geneid': gene} for gene in GROUPS[uid]]}
+        return {'result': result}
+
+
+class ResolverTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StandIn)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.base = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandIn.requests = []
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmpdir, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _resolver(self, ttl=3600):
+        fast = TokenBucket(1000)
+        return Resolver(
+            ResolverCache(self.cache_file, ttl), eutils=self.base + '/eutils',
+            solr=self.base + '/solr', buckets={'eutils': fast, 'solr': fast})
+
+    def test_cached(self):
+        symbols = ['BRCA1', 'TP53', 'P53', 'ACE', 'NOPE']
+        # the top hit of each symbol's own query, whatever its label
+        expected = {
+            'BRCA1': 'NCBIGene:672', 'TP53': 'NCBIGene:7157',
+            'P53': 'NCBIGene:7157', 'ACE': 'NCBIGene:59272', 'NOPE': None}
+        self.assertEqual(
+            self._resolver().resolve_many('symbol', symbols), expected)
+        self.assertEqual(len(StandIn.requests), 5)
+
+        # cached on disk, for the next run
+        resolver = self._resolver()
+        self.assertEqual(resolver.resolve_many('symbol', symbols), expected)
+        self.assertEqual(resolver.resolve('symbol', 'NOPE'), None)
+        self.assertEqual(len(StandIn.requests), 5)
+
+        # until the answers expire
+        self._resolver(ttl=-1).resolve('symbol', 'BRCA1')
+        self.assertEqual(len(StandIn.requests), 6)
+
+    def test_prefetch(self):
+        resolver = self._resolver()
+        futures = resolver.prefetch('homologene', [672, 7157, 1, 672])
+        futures += resolver.prefetch(
+            'taxon', ['Drosophila melanogaster', 'Drosophila'])
+        for future in as_completed(futures):
+            self.assertIsInstance(future.result(), dict)
+
+        self.assertEqual(
+            resolver.resolve('homologene', 672)['genetable'][0]['geneid'],
+            672)
+        self.assertIsNone(resolver.resolve('homologene', '1'))
+        self.assertEqual(
+            resolver.resolve('taxon', 'Drosophila melanogaster'), '7227')
+        self.assertEqual(resolver.resolve('taxon', 'Drosophila'), '7215')
+        # searched on its own, a label hitting two taxa is not resolved
+        self.assertIsNone(resolver.resolve('taxon', 'Drosoph'))
+        count = len(StandIn.requests)
+        resolver.resolve_many('homologene', [672, 7157])
+        self.assertEqual(len(StandIn.requests), count)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(50, 1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertIs(TokenBucket.get('test', 1), TokenBucket.get('test', 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import io
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.graph.DeclaredCache import DeclaredCache
+from dipper.models.Evidence import Evidence
+from dipper.models.Provenance import Provenance
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class SharedNodeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.study = [
+            (Provenance.object_properties['has_agent'], 'IMPC:CENTER', False),
+            (Provenance.object_properties['measures'], 'IMPC:PARAM', False)]
+
+    def test_same_description_same_node(self):
+        provenance = Provenance(RDFGraph(True))
+        study = provenance.add_shared_provenance(
+            Provenance.provenance_types['study'], self.study)
+        self.assertTrue(study.startswith('_:b'))
+        self.assertEqual(
+            study, provenance.add_shared_provenance(
+                Provenance.provenance_types['study'],
+                list(reversed(self.study))))
+        self.assertNotEqual(
+            study, provenance.add_shared_provenance(
+                Provenance.provenance_types['study'], self.study[0:1]))
+        self.assertNotEqual(
+            study, provenance.add_shared_provenance(
+                Provenance.provenance_types['assay'], self.study))
+
+    def test_described_once(self):
+        stream = io.StringIO()
+        graph = StreamedGraph(True, stream)
+        graph.declared_cache = DeclaredCache()
+        provenance = Provenance(graph)
+        evidence = Evidence(graph, None)
+        evidence_lines = set()
+        for assoc_id in ('MONARCH:1', 'MONARCH:2', 'MONARCH:3'):
+            study = provenance.add_shared_provenance(
+                Provenance.provenance_types['study'], self.study)
+            pvalue = evidence.add_shared_data(
+                Evidence.evidence_types['pvalue'], 0.001,
+                [(Provenance.object_properties['output_of'], study, False)])
+            evidence.reset(assoc_id)
+            evidence_lines.add(evidence.add_shared_evidence('ECO:0000015', [
+                (Evidence.object_properties['has_supporting_data'],
+                 pvalue, False)]))
+        self.assertEqual(len(evidence_lines), 1)
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), len(set(lines)))
+        # 3 study, 3 pvalue and 2 evidence line triples, then 3 links
+        self.assertEqual(len(lines), 3 + 3 + 2 + 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import os
+import tempfile
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.GraphUtils import GraphUtils
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class SpillStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # a budget of zero spills everything after the first check
+        self.graph = RDFGraph(True, memory_budget=0)
+        self.graph.budget_check_interval = 1
+        self.graph.addTriple('MGI:1', 'rdf:type', 'owl:Class')
+        self.graph.addTriple('MGI:2', 'rdf:type', 'owl:Class')
+        self.graph.addTriple('MGI:2', 'rdfs:label', 'two', True)
+        self.graph.addTriple('MGI:2', 'rdf:type', 'owl:Class')
+        self.graph.spill_store.run_size = 1
+        self.graph.addTriple('MGI:3', 'RO:0002162', 'NCBITaxon:10090')
+
+    def tearDown(self):
+        if self.graph.spill_store is not None:
+            self.graph.spill_store.close()
+        self.graph = None
+
+    def test_spill(self):
+        self.assertEqual(len(self.graph), 1)
+        self.assertTrue(self.graph.has_spilled())
+        properties = GraphUtils.get_properties_from_graph(self.graph)
+        self.assertIn(
+            self.graph._getNode('RO:0002162'), properties)
+
+    def test_write_spilled(self):
+        (fd, path) = tempfile.mkstemp(suffix='.nt')
+        os.close(fd)
+        self.graph.write_spilled(file=path)
+        with open(path) as nt_file:
+            lines = nt_file.readlines()
+        os.remove(path)
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines, sorted(lines))
+
+    def test_load_spilled(self):
+        self.graph.load_spilled()
+        self.assertEqual(len(self.graph), 4)
+        self.assertIsNone(self.graph.spill_store)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import shutil
+import unittest
+import logging
+from dipper.sources.Source import Source
+from dipper.models.Model import Model
+from dipper.utils.IdMinter import IdMinter
+from dipper.utils.IdTable import IdTable
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class StagedSource(Source):
+    """
+    A minimal source with stages that depend on one another's lookups
+    """
+    checkpoint_attrs = ['idhash', 'label_hash', 'seen']
+
+    def __init__(self):
+        super().__init__('rdf_graph', True, 'stages_test')
+        self.idhash = {'gene': {}, 'allele': {}}
+        self.allele_genes = {}
+        self.label_hash = {}
+        self.seen = []
+
+    def genes(self, limit=None):
+        for num in range(1, 4):
+            self.idhash['gene'][str(num)] = 'MGI:' + str(num)
+            self.graph.addTriple('MGI:' + str(num), 'rdf:type', 'owl:Class')
+
+    def alleles(self, limit=None):
+        for num in range(1, 3):
+            self.idhash['allele'][str(num)] = 'MGI:10' + str(num)
+            self.seen.append('allele' + str(num))
+
+    def labels(self, limit=None):
+        for (key, gene_id) in self.idhash['gene'].items():
+            self.label_hash[gene_id] = 'gene ' + key
+            self.graph.addTriple(
+                gene_id, 'rdfs:label', 'gene ' + key, True)
+
+    def allele_genes_of(self, gene, limit=None):
+        for num in range(1, 3):
+            allele_id = 'MGI:10' + str(num)
+            if allele_id not in self.allele_genes:
+                self.allele_genes[allele_id] = []
+            self.allele_genes[allele_id] += [gene]
+
+    def declare(self, text, limit=None):
+        Model(self.graph).addType('MGI:1', 'SO:0000704')
+        # an empty slice of the digest, so every input collides
+        IdMinter.get().mint(text, 0, 0)
+
+    def failing(self, limit=None):
+        raise ValueError('bad row')
+
+    def stages(self):
+        return [
+            {'stage': 'genes', 'function': self.genes,
+             'gives': ['idhash:gene']},
+            {'stage': 'alleles', 'function': self.alleles, 'args': (None,),
+             'gives': ['idhash:allele', 'seen']},
+            {'stage': 'labels', 'function': self.labels,
+             'needs': ['idhash:gene'], 'gives': ['label_hash:gene']}]
+
+
+class StagesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source = StagedSource()
+        self.source.clear_checkpoint()
+
+    def tearDown(self):
+        self.source.clear_checkpoint()
+        shutil.rmtree(self.source.rawdir, ignore_errors=True)
+        self.source = None
+
+    def test_dependencies(self):
+        self.assertEqual(
+            Source._stage_dependencies(self.source.stages()),
+            [set(), set(), {0}])
+        self.assertTrue(Source._lookups_overlap('idhash', 'idhash:gene'))
+        self.assertFalse(
+            Source._lookups_overlap('idhash:allele', 'idhash:gene'))
+
+    def test_parallel_as_sequential(self):
+        self.source.run_stages(self.source.stages())
+
+        parallel = StagedSource()
+        parallel.set_processes(2)
+        parallel.run_stages(parallel.stages())
+        self.assertEqual(parallel.idhash, self.source.idhash)
+        self.assertEqual(parallel.label_hash, self.source.label_hash)
+        self.assertEqual(parallel.seen, ['allele1', 'allele2'])
+        self.assertEqual(set(parallel.graph), set(self.source.graph))
+        self.assertTrue(parallel.checkpoint_done('labels'))
+
+    def test_id_table(self):
+        self.source.idhash['gene'] = IdTable({'4': 'MGI:4'})
+        self.source.set_processes(2)
+        self.source.run_stages(self.source.stages())
+        self.assertIsInstance(self.source.idhash['gene'], IdTable)
+        self.assertEqual(dict(self.source.idhash['gene'].items()), {
+            '1': 'MGI:1', '2': 'MGI:2', '3': 'MGI:3', '4': 'MGI:4'})
+        self.assertEqual(self.source.label_hash['MGI:4'], 'gene 4')
+
+    def test_added_in_place(self):
+        stages = [
+            {'stage': 'allele_genes_' + gene,
+             'function': self.source.allele_genes_of, 'args': (gene,),
+             'gives': ['allele_genes']} for gene in ('MGI:1', 'MGI:2')]
+        self.source.set_processes(2)
+        self.source.run_stages(stages)
+        self.assertEqual(self.source.allele_genes, {
+            'MGI:101': ['MGI:1', 'MGI:2'], 'MGI:102': ['MGI:1', 'MGI:2']})
+
+    def test_worker_declarations_and_ids(self):
+        minter = IdMinter.shared
+        IdMinter.shared = IdMinter(audit=True)
+        try:
+            self.source.set_declared_cache(16)
+            self.source.set_processes(2)
+            self.source.run_stages([
+                {'stage': 'declare_' + text, 'function': self.source.declare,
+                 'args': (text,)} for text in ('a', 'b')])
+            self.assertTrue(Model(self.source.graph).is_declared(
+                'addType', 'MGI:1', 'SO:0000704'))
+            # each worker minted the id once, the second is caught
+            # when merged
+            self.assertEqual(IdMinter.shared.collisions, [('b', 'b')])
+        finally:
+            IdMinter.shared = minter
+
+    def test_failed_stage(self):
+        self.source.set_processes(2)
+        stages = self.source.stages()
+        stages.insert(1, {'stage': 'failing', 'function': self.source.failing})
+        with self.assertRaises(RuntimeError) as raised:
+            self.source.run_stages(stages)
+        self.assertIn('bad row', str(raised.exception))
+        self.assertFalse(self.source.checkpoint_done('labels'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
 
+import os
+import gzip
+import shutil
+import tempfile
 import unittest
 from dipper.sources.StringDB import StringDB
 from dipper.sources.Ensembl import Ensembl
@@ -74,3 +78,65 @@ class StringTestFakeData(unittest.TestCase):
         string_db._process_protein_links(dataframe, self.protein_list, 9606)
         self.assertEqual(len(string_db.graph), 3)
 
+
+class StringLocalFileTestCase(unittest.TestCase):
+    """
+    Parse a mouse links file, whose proteins are mapped by the
+    id map file alone
+    """
+
+    def setUp(self):
+        self.rawdir = tempfile.mkdtemp()
+        links = [
+            'protein1 protein2 neighborhood combined_score',
+            '10090.P1 10090.P2 0 900',    # mapped
+            '10090.P1 10090.P3 0 500',    # under the cutoff
+            '10090.P2 10090.P9 0 800',    # P9 is not mapped
+            '10090.P3 10090.P1 0 750',    # mapped
+            '10090.P2 10090.P3 0 999']    # mapped
+        with gzip.open(os.path.join(
+                self.rawdir, '10090.protein.links.detailed.v10.5.txt.gz'),
+                'wt') as links_file:
+            links_file.write('\n'.join(links) + '\n')
+        self.map_file = os.path.join(self.rawdir, '10090.string2mgi.tsv')
+        with open(self.map_file, 'w') as map_file:
+            map_file.write(
+                'P1\tMGI:1\nP2\tMGI:2\nP3\tMGI:0\nP3\tMGI:3\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.rawdir)
+
+    def _parse(self, limit=None):
+        string_db = StringDB('rdf_graph', True, tax_ids=[10090])
+        string_db.rawdir = self.rawdir
+        string_db.chunk_size = 2
+        add_interactions = string_db._add_interactions
+
+        def count_chunks(taxon, chunks, filtered_out_count):
+            chunks = list(chunks)
+            self.chunks = len(chunks)
+            add_interactions(taxon, chunks, filtered_out_count)
+        string_db._add_interactions = count_chunks
+        string_db.parse(limit)
+        return {
+            (str(s).split('/')[-1], str(o).split('/')[-1])
+            for (s, p, o) in string_db.graph
+            if str(p).endswith('RO_0002434')}
+
+    def test_parse(self):
+        self.assertEqual(self._parse(), {
+            ('MGI:2', 'MGI:1'), ('MGI:1', 'MGI:3'), ('MGI:3', 'MGI:2')})
+        # read two rows at a time
+        self.assertEqual(self.chunks, 3)
+        # the protein to gene map is cached for the next parse
+        self.assertTrue(os.path.exists(
+            os.path.join(self.rawdir, '10090.protein2gene.tsv')))
+        self.assertEqual(self._parse(), {
+            ('MGI:2', 'MGI:1'), ('MGI:1', 'MGI:3'), ('MGI:3', 'MGI:2')})
+
+    def test_limit(self):
+        # through the first interaction at or past the limit
+        self.assertEqual(self._parse(limit=2), {
+            ('MGI:2', 'MGI:1'), ('MGI:1', 'MGI:3')})
+        # stopping in the second chunk, at the row past the limit
+        self.assertEqual(self.chunks, 2)
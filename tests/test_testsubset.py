@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+import os
+import gzip
+import shutil
+import tarfile
+import tempfile
+from dipper.sources.Source import Source
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class TestSubsetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source = Source('rdf_graph', True, 'subset_test')
+        # the one Source made is left empty
+        os.rmdir(self.source.rawdir)
+        self.source.rawdir = tempfile.mkdtemp()
+        self.lines = [
+            b'#key\tvalue\n', b'1\tone\n', b'2\ttwo\n', b'3\tthree\n']
+
+    def tearDown(self):
+        shutil.rmtree(self.source.rawdir)
+        self.source = None
+
+    @staticmethod
+    def _is_test_row(row):
+        return row.split('\t')[0] in ['1', '3']
+
+    def _subset(self, path, test_ids=('1', '3')):
+        return self.source.get_test_subset(
+            path, self._is_test_row, test_ids, header_lines=1)
+
+    def test_plain_file(self):
+        raw = os.path.join(self.source.rawdir, 'view')
+        with open(raw, 'wb') as f:
+            f.writelines(self.lines)
+        subset = self._subset(raw)
+        self.assertNotEqual(subset, raw)
+        with open(subset, 'rb') as f:
+            self.assertEqual(
+                f.readlines(), [self.lines[0], self.lines[1], self.lines[3]])
+
+    def test_gzip_file(self):
+        raw = os.path.join(self.source.rawdir, 'gene_info.gz')
+        with gzip.open(raw, 'wb') as f:
+            f.writelines(self.lines)
+        with gzip.open(self._subset(raw), 'rb') as f:
+            self.assertEqual(
+                f.readlines(), [self.lines[0], self.lines[1], self.lines[3]])
+
+    def test_tar_file(self):
+        member = os.path.join(self.source.rawdir, 'Orthologs')
+        with open(member, 'wb') as f:
+            f.writelines(self.lines)
+        raw = os.path.join(self.source.rawdir, 'Orthologs.tar.gz')
+        with tarfile.open(raw, 'w:gz') as tar:
+            tar.add(member, arcname='Orthologs')
+        with tarfile.open(self._subset(raw), 'r:gz') as tar:
+            info = tar.getmembers()[0]
+            self.assertEqual(info.name, 'Orthologs')
+            self.assertEqual(
+                tar.extractfile(info).readlines(),
+                [self.lines[0], self.lines[1], self.lines[3]])
+
+    def test_cached_until_changed(self):
+        raw = os.path.join(self.source.rawdir, 'view')
+        with open(raw, 'wb') as f:
+            f.writelines(self.lines)
+        subset = self._subset(raw)
+        built = os.stat(subset).st_mtime_ns
+
+        # same raw file and ids: the subset is reused
+        os.utime(raw, ns=(0, 0))
+        self.assertEqual(self._subset(raw), subset)
+        self.assertEqual(os.stat(subset).st_mtime_ns, built)
+
+        # different ids: rebuilt
+        os.utime(subset, ns=(0, 0))
+        self._subset(raw, test_ids=('1',))
+        self.assertNotEqual(os.stat(subset).st_mtime_ns, 0)
+
+        # different contents: rebuilt
+        os.utime(subset, ns=(0, 0))
+        with open(raw, 'ab') as f:
+            f.write(b'4\tfour\n')
+        self._subset(raw, test_ids=('1',))
+        self.assertNotEqual(os.stat(subset).st_mtime_ns, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import logging
+import tempfile
+import unittest
+from unittest import mock
+from dipper.utils.UniProtIdMap import UniProtIdMap
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def idmap_row(ac, geneid, taxon, ensembl):
+    row = [''] * 22
+    (row[0], row[1], row[2], row[12], row[18]) = (
+        ac, ac + '_NAME', geneid, taxon, ensembl)
+    return '\t'.join(row)
+
+
+class UniProtIdMapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.idmap_file = os.path.join(self.tmpdir, 'idmapping_selected.tab.gz')
+        self._write([
+            idmap_row('P1', '672', '9606', 'ENSG1'),
+            idmap_row('P2', '11; 12', '9606', ''),
+            idmap_row('Q3', '', '10090', 'ENSMUSG3'),
+            idmap_row('Q4', '', '10090', ''),
+            idmap_row('R5', '55', '7955', '')])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, rows):
+        with gzip.open(self.idmap_file, 'wt') as idmap:
+            idmap.write('\n'.join(rows) + '\n')
+
+    def test_lookup(self):
+        id_map = UniProtIdMap(self.idmap_file, [9606, 10090])
+        self.assertTrue(os.path.exists(
+            os.path.join(self.tmpdir, 'idmapping_selected.db')))
+        self.assertEqual(id_map.get('P1'), ['NCBIGene:672'])
+        self.assertEqual(id_map.get('P2'), ['NCBIGene:11', 'NCBIGene:12'])
+        self.assertEqual(id_map.get('Q3'), ['ENSEMBL:ENSMUSG3'])
+        self.assertIsNone(id_map.get('Q4'))
+        # not one of the taxa
+        self.assertIsNone(id_map.get('R5'))
+        self.assertEqual(
+            id_map.get_many(['P1', 'Q3', 'Q4', 'R5']),
+            {'P1': ['NCBIGene:672'], 'Q3': ['ENSEMBL:ENSMUSG3']})
+        id_map.close()
+
+        id_map = UniProtIdMap(self.idmap_file)
+        self.assertEqual(id_map.get('R5'), ['NCBIGene:55'])
+        id_map.close()
+
+    def test_rebuilt_when_changed(self):
+        UniProtIdMap(self.idmap_file).close()
+
+        # the same file, touched, is not indexed again
+        mtime = os.path.getmtime(self.idmap_file)
+        os.utime(self.idmap_file, (mtime + 10, mtime + 10))
+        with mock.patch.object(UniProtIdMap, 'build') as build:
+            UniProtIdMap(self.idmap_file).close()
+            UniProtIdMap(self.idmap_file).close()
+        build.assert_not_called()
+
+        self._write([idmap_row('P1', '7157', '9606', '')])
+        id_map = UniProtIdMap(self.idmap_file)
+        self.assertEqual(id_map.get('P1'), ['NCBIGene:7157'])
+        self.assertIsNone(id_map.get('P2'))
+        id_map.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
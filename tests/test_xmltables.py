@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import shutil
+import unittest
+import logging
+from dipper.sources.Source import Source
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# tables in the (alphabetical) order of a mysqldump,
+# where those needed first come last
+DUMP = (
+    '<mysqldump xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+    '<database name="test">'
+    '<table_data name="Breed_Phene">'
+    '<row><field name="breed_id">1</field>'
+    '<field name="phene_id">2</field></row>'
+    '<row><field name="breed_id">2</field>'
+    '<field name="phene_id" xsi:nil="true" /></row>'
+    '</table_data>'
+    '<table_data name="Breeds">'
+    '<row><field name="breed_id">1</field>'
+    '<field name="species_id">9615</field></row>'
+    '<row><field name="breed_id">2</field>'
+    '<field name="species_id">9913</field></row>'
+    '</table_data>'
+    '<table_data name="Other"><row><field name="a">1</field></row>'
+    '</table_data>'
+    '<table_data name="Species">'
+    '<row><field name="species_id">9615</field>'
+    '<field name="name">dog &amp; wolf</field></row>'
+    '<row><field name="species_id">9913</field>'
+    '<field name="name">cattle</field></row>'
+    '</table_data>'
+    '</database></mysqldump>')
+
+
+class XMLTablesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source = Source('rdf_graph', True, 'xmltables_test')
+        self.seen = []
+
+    def tearDown(self):
+        shutil.rmtree(self.source.rawdir, ignore_errors=True)
+        self.source = None
+
+    def _stages(self):
+        def process(table):
+            return lambda row: self.seen.append((table, row))
+        return [
+            {'tables': {'Species': process('Species')}},
+            {'tables': {'Breeds': process('Breeds')},
+             'after': lambda: self.seen.append('after')},
+            {'tables': {'Breed_Phene': process('Breed_Phene'),
+                        'Missing': process('Missing')}}]
+
+    def test_stages(self):
+        # fed in small pieces
+        self.source.process_xml_tables(
+            (DUMP[i:i + 50] for i in range(0, len(DUMP), 50)),
+            self._stages())
+        self.assertEqual(self.seen, [
+            ('Species', {'species_id': '9615', 'name': 'dog & wolf'}),
+            ('Species', {'species_id': '9913', 'name': 'cattle'}),
+            ('Breeds', {'breed_id': '1', 'species_id': '9615'}),
+            ('Breeds', {'breed_id': '2', 'species_id': '9913'}),
+            'after',
+            ('Breed_Phene', {'breed_id': '1', 'phene_id': '2'}),
+            ('Breed_Phene', {'breed_id': '2', 'phene_id': None})])
+
+    def test_single_stages(self):
+        # the same rows as the stages, a table at a time
+        self.source.process_xml_tables([DUMP], self._stages())
+        rows = []
+        for table in ('Species', 'Breeds', 'Breed_Phene'):
+            self.source.process_xml_tables([DUMP], [{'tables': {
+                table: lambda row, table=table: rows.append((table, row))}}])
+        self.assertEqual(rows, [r for r in self.seen if r != 'after'])
+
+    def test_limit(self):
+        # in test mode, only so many rows of each table,
+        # whether processed as read or kept aside
+        self.source.process_xml_tables([DUMP], self._stages(), 1)
+        self.assertEqual(len(self.seen), 7)
+        self.seen = []
+        self.source.testMode = True
+        self.source.process_xml_tables([DUMP], self._stages(), 1)
+        self.assertEqual(self.seen, [
+            ('Species', {'species_id': '9615', 'name': 'dog & wolf'}),
+            ('Breeds', {'breed_id': '1', 'species_id': '9615'}),
+            'after',
+            ('Breed_Phene', {'breed_id': '1', 'phene_id': '2'})])
+
+
+if __name__ == '__main__':
+    unittest.main()